@@ -20,6 +20,7 @@ import hashlib
 import json
 import optparse
 import os
+import pickle
 import re
 import shutil
 import subprocess
@@ -122,6 +123,9 @@ Usage: ./build.py [command(s)] [options]
                     time the etg command is run.
       etg           Run the ETG scripts that are out of date to update their
                     SIP files and their Sphinx input files
+      etg_check     Check that running a few ETG scripts in parallel with the
+                    docs enabled produces the same files as running them one
+                    at a time
       sip           Run sip to generate the C++ wrapper source
 
       wxlib         Build the Sphinx input files for wx.lib
@@ -1126,17 +1130,16 @@ def cmd_version(options, args):
     print(cfg.VERSION)
 
 
-def _mergeParallelEtgOutput(parallelDir, scriptsRunInOrder):
+def _etgScriptId(script):
+    return os.path.splitext(os.path.basename(script))[0]
+
+
+def _mergeParallelItemMap(parallelDir, scriptsRunInOrder):
     """
-    Merge the per-script itemToModuleMap.json and .pyi contributions that
-    etg scripts wrote to parallelDir (see etgtools.generators.etgParallelOutputDir)
-    back into the real, shared files. The .pyi sections are applied in
-    scriptsRunInOrder so the result matches what a sequential run would have
-    produced.
+    Merge the per-script itemToModuleMap.json contributions that etg scripts
+    wrote to parallelDir back into the real, shared file, in scriptsRunInOrder.
     """
     from etgtools.item_module_map import ItemModuleMap
-    from etgtools.pi_generator import PiWrapperGenerator, checkAndWriteHeader, \
-                                       header_pyi, typing_imports, phoenixRoot
 
     mapFile = ItemModuleMap().fileName
     merged = {}
@@ -1144,8 +1147,7 @@ def _mergeParallelEtgOutput(parallelDir, scriptsRunInOrder):
         with open(mapFile, 'rt', encoding='utf-8') as fid:
             merged = json.load(fid) or {}
     for script in scriptsRunInOrder:
-        scriptId = os.path.splitext(os.path.basename(script))[0]
-        partial = opj(parallelDir, 'itemmap', scriptId + '.json')
+        partial = opj(parallelDir, 'itemmap', _etgScriptId(script) + '.json')
         if not os.path.exists(partial):
             continue
         with open(partial, 'rt', encoding='utf-8') as fid:
@@ -1153,10 +1155,53 @@ def _mergeParallelEtgOutput(parallelDir, scriptsRunInOrder):
     with open(mapFile, 'wt', encoding='utf-8') as fid:
         json.dump(merged, fid, sort_keys=True, indent=0, separators=(',', ':'))
 
+
+def _mergeParallelPickles(indexDir, scriptsRunInOrder):
+    """
+    Merge the updates that etg scripts made to the sphinx pickle files (see
+    sphinxtools.utilities.PickleFile) back into the real files. Applying them
+    with dict.update in scriptsRunInOrder keeps both the values and the order
+    of the keys the same as in a sequential run, so the files are identical.
+    """
+    from sphinxtools.constants import SPHINXROOT
+
+    merged = {}
+    for script in scriptsRunInOrder:
+        partialDir = opj(indexDir, 'pickles', _etgScriptId(script))
+        if not os.path.isdir(partialDir):
+            continue
+        for name in sorted(os.listdir(partialDir)):
+            if name not in merged:
+                pickleFile = opj(SPHINXROOT, name)
+                merged[name] = {}
+                if os.path.isfile(pickleFile):
+                    with open(pickleFile, 'rb') as fid:
+                        merged[name] = pickle.load(fid)
+            with open(opj(partialDir, name), 'rb') as fid:
+                merged[name].update(pickle.load(fid))
+
+    for name, items in merged.items():
+        with open(opj(SPHINXROOT, name), 'wb') as fid:
+            pickle.dump(items, fid)
+
+
+def _mergeParallelEtgOutput(parallelDir, scriptsRunInOrder):
+    """
+    Merge the per-script itemToModuleMap.json and .pyi contributions that
+    etg scripts wrote to parallelDir (see etgtools.generators.etgParallelOutputDir)
+    back into the real, shared files. The .pyi sections are applied in
+    scriptsRunInOrder so the result matches what a sequential run would have
+    produced.
+    """
+    from etgtools.pi_generator import PiWrapperGenerator, checkAndWriteHeader, \
+                                       header_pyi, typing_imports, phoenixRoot
+
+    if os.path.isdir(opj(parallelDir, 'itemmap')):
+        _mergeParallelItemMap(parallelDir, scriptsRunInOrder)
+
     piGen = PiWrapperGenerator()
     for script in scriptsRunInOrder:
-        scriptId = os.path.splitext(os.path.basename(script))[0]
-        partial = opj(parallelDir, 'pyi', scriptId + '.json')
+        partial = opj(parallelDir, 'pyi', _etgScriptId(script) + '.json')
         if not os.path.exists(partial):
             continue
         with open(partial, 'rt', encoding='utf-8') as fid:
@@ -1170,7 +1215,18 @@ def _mergeParallelEtgOutput(parallelDir, scriptsRunInOrder):
         piGen.writeSection(destFile_pyi, data['section'], data['text'])
 
 
-def _runEtgBatchParallel(options, scripts, flags):
+def _runEtgScripts(options, scripts, flags, env):
+    """Run a set of etg scripts concurrently, raising if any of them fail."""
+    maxWorkers = int(options.jobs) if options.jobs else max(2, numCPUs())
+    maxWorkers = min(maxWorkers, len(scripts))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+        futures = [executor.submit(runcmd, '"%s" %s %s' % (PYTHON, script, flags), env=env)
+                   for script in scripts]
+        for future in concurrent.futures.as_completed(futures):
+            future.result()  # re-raises on failure
+
+
+def _runEtgBatchParallel(options, scripts, flags, env=None):
     """Run one batch of etg scripts concurrently, then merge their shared-file
     contributions back in. See _runEtgScriptsParallel for why the full set of
     scripts to run gets split into batches rather than run as a single one.
@@ -1178,27 +1234,18 @@ def _runEtgBatchParallel(options, scripts, flags):
     if not scripts:
         return
     with tempfile.TemporaryDirectory(prefix='etg_parallel_') as parallelDir:
-        env = dict(os.environ, WXPY_ETG_PARALLEL_DIR=parallelDir)
-
-        maxWorkers = int(options.jobs) if options.jobs else max(2, numCPUs())
-        maxWorkers = min(maxWorkers, len(scripts))
-        with concurrent.futures.ThreadPoolExecutor(max_workers=maxWorkers) as executor:
-            futures = [executor.submit(runcmd, '"%s" %s %s' % (PYTHON, script, flags), env=env)
-                       for script in scripts]
-            for future in concurrent.futures.as_completed(futures):
-                future.result()  # re-raises on failure
-
+        env = dict(env or os.environ, WXPY_ETG_PARALLEL_DIR=parallelDir)
+        _runEtgScripts(options, scripts, flags, env)
         _mergeParallelEtgOutput(parallelDir, scripts)
 
 
-def _runEtgScriptsParallel(options, scripts, coreFamily, flags):
+def _runEtgScriptsParallel(options, scripts, coreFamily, flags, env=None):
     """
-    Run etg scripts concurrently. Only safe for --nodoc runs: that skips
-    the order-sensitive doc cross-referencing in the sphinx doc generator,
-    leaving the .pyi writer and itemToModuleMap.json as the only shared
-    state, both of which are made parallel-safe via etgParallelOutputDir()
-    (see etgtools/pi_generator.py and etgtools/item_module_map.py) and
-    merged back in afterwards.
+    Run etg scripts concurrently. The .pyi writer and itemToModuleMap.json
+    are the shared state for --nodoc runs, both of which are made
+    parallel-safe via etgParallelOutputDir() (see etgtools/pi_generator.py
+    and etgtools/item_module_map.py) and merged back in afterwards. See
+    _runEtgScriptsParallelWithDocs for what else is needed for the docs.
 
     Scripts outside the _core family read wx/core.pyi (FixWxPrefix in
     etgtools/tweaker_tools.py) to decide how to qualify core class names in
@@ -1208,8 +1255,51 @@ def _runEtgScriptsParallel(options, scripts, coreFamily, flags):
     """
     coreScripts = [s for s in scripts if s in coreFamily]
     otherScripts = [s for s in scripts if s not in coreFamily]
-    _runEtgBatchParallel(options, coreScripts, flags)
-    _runEtgBatchParallel(options, otherScripts, flags)
+    _runEtgBatchParallel(options, coreScripts, flags, env)
+    _runEtgBatchParallel(options, otherScripts, flags, env)
+
+
+def _runEtgScriptsParallelWithDocs(options, scripts, coreFamily, flags):
+    """
+    Run etg scripts concurrently with the sphinx doc generator enabled. The
+    docs cross-reference names from all modules through itemToModuleMap.json,
+    which a sequential run builds up as it goes, so this is done in two phases:
+
+      1. All the scripts are run with --index, which only collects the names
+         each script adds to the map. They are merged into the real file.
+
+      2. All the scripts are run again to generate the sip, pyi and doc
+         files. Each one reads the map as it was when a sequential run would
+         have reached it, rebuilt from the map from before the run and the
+         names collected from the scripts before it in `scripts` (see
+         etgtools.generators.etgIndexDir). The updates to the sphinx pickle
+         files are collected per script too, and merged in the same order.
+
+    The doc .txt files are named after the item they document, so each one
+    is only written by a single script.
+    """
+    from etgtools.item_module_map import ItemModuleMap
+
+    with tempfile.TemporaryDirectory(prefix='etg_index_') as indexDir:
+        mapFile = ItemModuleMap().fileName
+        items = {}
+        if os.path.isfile(mapFile):
+            with open(mapFile, 'rt', encoding='utf-8') as fid:
+                items = json.load(fid) or {}
+        with open(opj(indexDir, 'itemmap.json'), 'wt', encoding='utf-8') as fid:
+            json.dump(items, fid)
+        with open(opj(indexDir, 'order.json'), 'wt', encoding='utf-8') as fid:
+            json.dump([_etgScriptId(script) for script in scripts], fid)
+
+        # Phase 1: collect the index
+        env = dict(os.environ, WXPY_ETG_PARALLEL_DIR=indexDir)
+        _runEtgScripts(options, scripts, '--index', env)
+        _mergeParallelItemMap(indexDir, scripts)
+
+        # Phase 2: generate everything against the frozen index
+        env = dict(os.environ, WXPY_ETG_INDEX_DIR=indexDir)
+        _runEtgScriptsParallel(options, scripts, coreFamily, flags, env)
+        _mergeParallelPickles(indexDir, scripts)
 
 
 def cmd_etg(options, args):
@@ -1256,10 +1346,94 @@ def cmd_etg(options, args):
     if options.nodoc:
         _runEtgScriptsParallel(options, toRun, coreFamily, flags)
     else:
-        # The full doc generator does order-sensitive cross-module lookups,
-        # so it isn't safe to parallelize; run it the original way.
-        for script in toRun:
+        _runEtgScriptsParallelWithDocs(options, toRun, coreFamily, flags)
+
+
+# A few small modules whose etg scripts are run by the etg_check command
+ETG_CHECK_SCRIPTS = ['etg/_xml.py', 'etg/_html2.py', 'etg/_glcanvas.py', 'etg/_media.py']
+
+
+def _etgOutputFiles(cfg):
+    """The files that the etg scripts write to: the sip files, the pyi files
+    and the sphinx input files, pickles and item map."""
+    from sphinxtools.constants import SPHINXROOT
+
+    files = glob.glob(opj(cfg.SIPGEN, '*')) + glob.glob(opj('wx', '*.pyi'))
+    for dirpath, dirnames, filenames in os.walk(SPHINXROOT):
+        files += [opj(dirpath, name) for name in filenames]
+    return [os.path.relpath(name, cfg.ROOT_DIR) for name in files if os.path.isfile(name)]
+
+
+def _saveEtgOutput(cfg, destDir):
+    for name in _etgOutputFiles(cfg):
+        dest = opj(destDir, name)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        shutil.copy2(opj(cfg.ROOT_DIR, name), dest)
+
+
+def _restoreEtgOutput(cfg, srcDir):
+    saved = set(_filesUnder(srcDir))
+    for name in _etgOutputFiles(cfg):
+        if name not in saved:
+            os.remove(opj(cfg.ROOT_DIR, name))
+    for name in saved:
+        shutil.copy2(opj(srcDir, name), opj(cfg.ROOT_DIR, name))
+
+
+def _filesUnder(folder):
+    return [os.path.relpath(opj(dirpath, name), folder)
+            for dirpath, dirnames, filenames in os.walk(folder)
+            for name in filenames]
+
+
+def cmd_etg_check(options, args):
+    """
+    Run the etg scripts of the ETG_CHECK_SCRIPTS modules with the docs
+    generator enabled, first one at a time and then in parallel (see
+    _runEtgScriptsParallelWithDocs), and check that both runs generate
+    byte-identical sip, pyi, doc and pickle files. The files in the tree are
+    put back the way they were before each run, so both start from the same
+    state, and are left as the parallel run made them.
+    """
+    import filecmp
+
+    cmdTimer = CommandTimer('etg_check')
+    cfg = Config()
+    assert os.path.exists(cfg.DOXY_XML_DIR), "Doxygen XML folder not found: " + cfg.DOXY_XML_DIR
+
+    pwd = pushDir(cfg.ROOT_DIR)
+
+    flags = '--sip'
+    scripts = []
+    for script in ETG_CHECK_SCRIPTS:
+        scripts += loadETG(script).ETGFILES
+
+    with tempfile.TemporaryDirectory(prefix='etg_check_') as checkDir:
+        beforeDir, serialDir, parallelDir = [opj(checkDir, name) for name in
+                                             ('before', 'serial', 'parallel')]
+        _saveEtgOutput(cfg, beforeDir)
+
+        for script in scripts:
             runcmd('"%s" %s %s' % (PYTHON, script, flags))
+        _saveEtgOutput(cfg, serialDir)
+
+        _restoreEtgOutput(cfg, beforeDir)
+        _runEtgScriptsParallelWithDocs(options, scripts, set(), flags)
+        _saveEtgOutput(cfg, parallelDir)
+
+        serial = set(_filesUnder(serialDir))
+        parallel = set(_filesUnder(parallelDir))
+        problems = ['only made by the serial run: ' + name for name in sorted(serial - parallel)]
+        problems += ['only made by the parallel run: ' + name for name in sorted(parallel - serial)]
+        problems += ['different: ' + name for name in sorted(serial & parallel)
+                     if not filecmp.cmp(opj(serialDir, name), opj(parallelDir, name), shallow=False)]
+
+    if problems:
+        msg('The parallel etg run does not match the serial one:')
+        for problem in problems:
+            msg('    ' + problem)
+        sys.exit(1)
+    msg('The parallel etg run matches the serial one, %d files checked.' % len(serial))
 
 
 def cmd_sphinx(options, args):
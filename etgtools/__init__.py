@@ -20,6 +20,7 @@ sys.path.insert(0, os.path.abspath(os.path.split(__file__)[0]+'/..'))
 
 from buildtools.config import Config
 from .extractors import *
+from .doxy_cache import DoxyXMLCache
 
 #---------------------------------------------------------------------------
 cfg = Config(noWxConfig=True)
@@ -85,7 +86,7 @@ def parseDoxyXML(module, class_or_filename_list):
             print("Loading %s..." % pathname)
         _filesparsed.add(pathname)
 
-        root = ET.parse(pathname).getroot()
+        root = DoxyXMLCache().getRoot(pathname)
         for element in root:
             # extract and add top-level elements from the XML document
             item = module.addElement(element)
@@ -108,6 +109,9 @@ def parseDoxyXML(module, class_or_filename_list):
 
         _filesparsed.clear()
 
+    # The etg script has everything it needs from the XML files now
+    DoxyXMLCache().clear()
+
     module.parseCompleted()
 
 #---------------------------------------------------------------------------
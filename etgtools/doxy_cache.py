@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------
+# Name:        etgtools/doxy_cache.py
+# Author:      Robin Dunn
+#
+# Created:     18-Oct-2026
+# Copyright:   (c) 2026 by Total Control Software
+# License:     wxWindows License
+# ---------------------------------------------------------------------------
+
+"""
+This module provides a cache for the information that the extractors need
+over and over again from the Doxygen XML files, like the base classes found
+while walking up the class hierarchy of every class being extracted.
+
+The information is kept in a compact form, both in memory for the current
+process and on disk in files named after a hash of the XML file content, so
+it is shared by all the etg scripts of a build, including the ones that
+build.py runs concurrently, and by later builds. Only the XML files that have
+changed since they were last seen need to be parsed again.
+"""
+
+# Standard library imports
+import os
+import os.path as op
+import copy
+import hashlib
+import json
+import tempfile
+import collections
+import xml.etree.ElementTree as ET
+
+# Phoenix imports
+from sphinxtools.utilities import findDescendants
+
+# ---------------------------------------------------------------------------
+
+# Bump this when the format of the data saved in the cache files changes
+CACHE_VERSION = 1
+
+# How many parsed XML trees are kept in memory
+MAX_ROOTS = 8
+
+
+def defaultCacheDir():
+    """
+    The folder holding the cache files, which can be changed by setting the
+    WXPY_ETG_CACHE_DIR environment variable. Setting it to an empty string
+    disables the on-disk cache.
+    """
+    cacheDir = os.environ.get('WXPY_ETG_CACHE_DIR')
+    if cacheDir is None:
+        cacheDir = op.join(op.dirname(op.abspath(__file__)), '..', 'build', 'etgcache')
+    return cacheDir
+
+
+class DoxyXMLCache(object):
+    """
+    A persistent cache of data extracted from the Doxygen XML files. Like
+    ItemModuleMap this uses the Borg pattern, so all instances share the same
+    in-memory data.
+    """
+
+    __shared_state = dict(_roots=collections.OrderedDict(),
+                          _bases=dict(),
+                          cacheDir=None)
+
+    def __init__(self):
+        self.__dict__ = self.__shared_state
+        if self.cacheDir is None:
+            self.cacheDir = defaultCacheDir()
+
+
+    def parse(self, pathname):
+        """
+        Return the root element of an XML file and an index of its elements
+        by id. Only the last MAX_ROOTS files requested are kept in memory.
+        The tree is shared by all callers, so it must be treated as
+        read-only, see getRoot and findMember.
+        """
+        entry = self._roots.pop(pathname, None)
+        if entry is None:
+            root = ET.parse(pathname).getroot()
+            ids = dict()
+            for node in root.iter('memberdef'):
+                ids.setdefault(node.get('id'), node)
+            entry = (root, ids)
+        self._roots[pathname] = entry
+        while len(self._roots) > MAX_ROOTS:
+            self._roots.popitem(last=False)
+        return entry
+
+
+    def getRoot(self, pathname):
+        """
+        Return a copy of the root element of an XML file, for the extractors
+        to make items from. The items keep the elements of their docs and
+        the tweakers may change them, so they never get the shared tree.
+        """
+        root, ids = self.parse(pathname)
+        return copy.deepcopy(root)
+
+
+    def findMember(self, pathname, refid):
+        """
+        Return a copy of the memberdef element with the given id in an XML
+        file, or None if there is none. The extractors keep the elements and
+        the tweakers may change them, so they never get the shared one.
+        """
+        root, ids = self.parse(pathname)
+        node = ids.get(refid)
+        if node is not None:
+            node = copy.deepcopy(node)
+        return node
+
+
+    def getBaseCompounds(self, pathname):
+        """
+        Return a list of (name, refid) tuples for all the basecompoundref
+        elements found in an XML file.
+        """
+        bases = self._bases.get(pathname)
+        if bases is None:
+            with open(pathname, 'rb') as fid:
+                data = fid.read()
+            key = self._makeKey(data)
+            bases = self._read(key, 'bases')
+            if bases is None:
+                root = ET.fromstring(data)
+                bases = [(node.text, node.get('refid'))
+                         for node in findDescendants(root, 'basecompoundref')]
+                self._write(key, dict(bases=bases))
+            else:
+                bases = [tuple(item) for item in bases]
+            self._bases[pathname] = bases
+        return bases
+
+
+    def clear(self):
+        """
+        Forget the data held in memory. The cache files are left alone. This
+        is called by etgtools.parseDoxyXML once the items of a module have
+        been extracted.
+        """
+        self._roots.clear()
+        self._bases.clear()
+
+
+    # Methods for reading/writing the data from/to persistent storage.
+    def _makeKey(self, data):
+        digest = hashlib.sha1(data)
+        digest.update(b'\0v%d' % CACHE_VERSION)
+        return digest.hexdigest()
+
+
+    def _fileName(self, key):
+        return op.join(self.cacheDir, key[:2], key + '.json')
+
+
+    def _read(self, key, name):
+        if not self.cacheDir:
+            return None
+        try:
+            with open(self._fileName(key), 'rt', encoding='utf-8') as fid:
+                return json.load(fid).get(name)
+        except (OSError, ValueError):
+            return None
+
+
+    def _write(self, key, value):
+        if not self.cacheDir:
+            return
+        fileName = self._fileName(key)
+        tmpName = None
+        try:
+            os.makedirs(op.dirname(fileName), exist_ok=True)
+            # Several etg processes may write the same entry at once, so write
+            # to a temporary file and rename it to make the update atomic.
+            fd, tmpName = tempfile.mkstemp(suffix='.tmp', dir=op.dirname(fileName))
+            with os.fdopen(fd, 'wt', encoding='utf-8') as fid:
+                json.dump(value, fid, separators=(',', ':'))
+            os.replace(tmpName, fileName)
+        except OSError:
+            if tmpName and op.exists(tmpName):
+                os.remove(tmpName)
+
+
+
+# ---------------------------------------------------------------------------
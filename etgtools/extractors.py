@@ -22,7 +22,7 @@ import copy
 from .tweaker_tools import AutoConversionInfo, FixWxPrefix, MethodType, magicMethods, \
                            guessTypeInt, guessTypeFloat, guessTypeStr, \
                            textfile_open, Signature, removeWxPrefix
-from sphinxtools.utilities import findDescendants
+from .doxy_cache import DoxyXMLCache
 
 if sys.version_info >= (3, 11):
     from typing import Self
@@ -758,34 +758,36 @@ class ClassDef(BaseDef):
 
 
     def findHierarchy(self, element, all_classes, specials, read):
-        from etgtools import XMLSRC
+        if read:
+            return self.findBaseHierarchy(element.text, element.get('refid'),
+                                          all_classes, specials)
 
-        if not read:
-            fullname = self.name
-            specials = [fullname]
-        else:
-            fullname = element.text
+        fullname = self.name
+        specials = [fullname]
+        compounds = [(c.text, c.get('refid')) for c in element.findall('basecompoundref')]
+        return self._addHierarchy(fullname, compounds, all_classes, specials)
 
-        baselist = []
 
-        if read:
-            refid = element.get('refid')
-            if refid is None:
-                return all_classes, specials
+    def findBaseHierarchy(self, fullname, refid, all_classes, specials):
+        # The base classes of the base classes are looked up through the
+        # DoxyXMLCache, as the same few XML files (wxWindow, wxEvtHandler,
+        # wxObject, etc.) are needed for most of the classes.
+        from etgtools import XMLSRC
 
-            fname = os.path.join(XMLSRC, refid+'.xml')
-            root = ET.parse(fname).getroot()
-            compounds = findDescendants(root, 'basecompoundref')
-        else:
-            compounds = element.findall('basecompoundref')
+        if refid is None:
+            return all_classes, specials
+
+        fname = os.path.join(XMLSRC, refid+'.xml')
+        compounds = DoxyXMLCache().getBaseCompounds(fname)
+        return self._addHierarchy(fullname, compounds, all_classes, specials)
 
-        for c in compounds:
-            baselist.append(c.text)
 
+    def _addHierarchy(self, fullname, compounds, all_classes, specials):
+        baselist = [name for name, refid in compounds]
         all_classes[fullname] = (fullname, baselist)
 
-        for c in compounds:
-            all_classes, specials = self.findHierarchy(c, all_classes, specials, True)
+        for name, refid in compounds:
+            all_classes, specials = self.findBaseHierarchy(name, refid, all_classes, specials)
 
         return all_classes, specials
 
@@ -817,7 +819,7 @@ class ClassDef(BaseDef):
             from etgtools import XMLSRC
             ref = node.get('refid')
             fname = os.path.join(XMLSRC, ref+'.xml')
-            root = ET.parse(fname).getroot()
+            root = DoxyXMLCache().getRoot(fname)
             innerclass = root[0]
             kind = innerclass.get('kind')
             assert kind in ['class', 'struct']
@@ -1645,8 +1647,7 @@ class ModuleDef(BaseDef):
         from etgtools import XMLSRC
         refid = node.get('refid')
         fname = os.path.join(XMLSRC, refid.rsplit('_', 1)[0]) + '.xml'
-        root = ET.parse(fname).getroot()
-        return root.find(".//memberdef[@id='{}']".format(refid))
+        return DoxyXMLCache().findMember(fname, refid)
 
 
     def addCppFunction(self, type, name, argsString, body, doc=None, **kw):
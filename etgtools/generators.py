@@ -44,7 +44,7 @@ class SphinxGenerator(DocsGeneratorBase):
 
 def etgParallelOutputDir():
     """
-    When build.py runs etg scripts in parallel (--nodoc only), this env var
+    When build.py runs etg scripts in parallel, this env var
     points generators with shared, accumulated output files (eg. the .pyi
     files and itemToModuleMap.json) at a per-run scratch dir instead, so
     concurrent etg processes never write to the same file. build.py merges
@@ -54,6 +54,19 @@ def etgParallelOutputDir():
     return os.environ.get('WXPY_ETG_PARALLEL_DIR')
 
 
+def etgIndexDir():
+    """
+    When build.py runs etg scripts in parallel with the docs enabled, it first
+    runs all of them with --index to collect each script's contributions to
+    itemToModuleMap.json, and then runs them again to generate the real
+    output. For that second run this env var points at the folder holding
+    the collected index (see etgtools/item_module_map.py), so every script
+    sees the map exactly as it would have been when the script was reached
+    in a sequential run. Returns None otherwise.
+    """
+    return os.environ.get('WXPY_ETG_INDEX_DIR')
+
+
 def currentEtgScriptId():
     """The basename (no extension) of the etg script currently running, eg. 'accel'."""
     return os.path.splitext(os.path.basename(sys.argv[0]))[0]
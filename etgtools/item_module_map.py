@@ -22,7 +22,8 @@ import json
 
 
 # Phoenix imports
-from .generators import textfile_open, etgParallelOutputDir, currentEtgScriptId
+from .generators import textfile_open, etgParallelOutputDir, etgIndexDir, \
+                        currentEtgScriptId
 from sphinxtools.constants import SPHINXROOT
 
 # ---------------------------------------------------------------------------
@@ -54,6 +55,10 @@ class ItemModuleMap(object):
 
     # Methods for reading/writing the data from/to persistent storage.
     def read(self):
+        if etgIndexDir():
+            self._readFrozenIndex(etgIndexDir())
+            return
+
         if etgParallelOutputDir():
             # Running as one of several concurrent etg processes. Nothing
             # reads this map back in that mode (see flush() below), so
@@ -76,10 +81,38 @@ class ItemModuleMap(object):
         self._haveReadData = True
 
 
+    def _readFrozenIndex(self, indexDir):
+        # Rebuild the map as a sequential run would have had it when reaching
+        # the current script: the map from before the run, updated with the
+        # contributions of each of the scripts run before this one.
+        with textfile_open(op.join(indexDir, 'itemmap.json'), 'rt') as fid:
+            items = json.load(fid) or dict()
+        with textfile_open(op.join(indexDir, 'order.json'), 'rt') as fid:
+            order = json.load(fid)
+
+        scriptId = currentEtgScriptId()
+        for otherId in order:
+            if otherId == scriptId:
+                break
+            partial = op.join(indexDir, 'itemmap', otherId + '.json')
+            if op.isfile(partial):
+                with textfile_open(partial, 'rt') as fid:
+                    items.update(json.load(fid))
+
+        self._items.clear()
+        self._items.update(items)
+        self._haveReadData = True
+
+
     def flush(self):
         if not self._haveReadData and not self._items:
             return
 
+        if etgIndexDir():
+            # The index is frozen while the output is generated, and build.py
+            # already merged it into the real file after it was collected.
+            return
+
         parallelDir = etgParallelOutputDir()
         if parallelDir:
             # Don't touch the shared file directly; write this script's own
@@ -953,6 +953,13 @@ def getDocsGenerator():
 
 
 def runGenerators(module):
+    if '--index' in sys.argv:
+        # Only collect the names for itemToModuleMap.json. This is the first
+        # pass of build.py's parallel etg run, see etgtools.generators.etgIndexDir
+        from etgtools import map_generator
+        map_generator.ItemMapGenerator().generate(module)
+        return
+
     checkForUnitTestModule(module)
 
     generators = list()
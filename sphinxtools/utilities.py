@@ -21,6 +21,7 @@ import pickle
 from collections import UserDict
 from etgtools.tweaker_tools import removeWxPrefix
 from etgtools.item_module_map import ItemModuleMap
+from etgtools.generators import etgIndexDir, currentEtgScriptId
 
 # Phoenix-specific imports
 from .templates import TEMPLATE_CONTRIB
@@ -619,8 +620,18 @@ def chopDescription(text):
 class PickleFile(object):
     """
     A class to help simplify loading and saving data to pickle files.
+
+    When the etg scripts are run in parallel (see etgtools.generators.etgIndexDir)
+    each script only records its own updates, in a file of the same name in a
+    folder of its own, and build.py merges them in the sequential run order
+    once all the scripts are done.
     """
     def __init__(self, fileName):
+        indexDir = etgIndexDir()
+        if indexDir:
+            outDir = os.path.join(indexDir, 'pickles', currentEtgScriptId())
+            os.makedirs(outDir, exist_ok=True)
+            fileName = os.path.join(outDir, os.path.basename(fileName))
         self.fileName = fileName
 
     def __enter__(self) -> Self:
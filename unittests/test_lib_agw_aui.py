@@ -29,6 +29,33 @@ class lib_agw_aui_Tests(wtc.WidgetTestCase):
                           .Bottom())
         self._mgr.Update()
 
+    def test_lib_agw_auiPaneLookup(self):
+        self._mgr = aui.AuiManager()
+        self._mgr.SetManagedWindow(self.frame)
+
+        panels = [wx.Panel(self.frame) for i in range(3)]
+        self._mgr.AddPane(panels[0], aui.AuiPaneInfo().Name("center").CenterPane())
+        self._mgr.AddPane(panels[1], aui.AuiPaneInfo().Name("left").Left())
+        self._mgr.AddPane(panels[2], aui.AuiPaneInfo().Name("top").Top())
+
+        self.assertIs(self._mgr.GetPane("left").window, panels[1])
+        self.assertEqual(self._mgr.GetPane(panels[2]).name, "top")
+        self._mgr.GetPane("top").Name("bottom")
+        self.assertFalse(self._mgr.GetPane("top").IsOk())
+        self.assertIs(self._mgr.GetPane("bottom").window, panels[2])
+
+        # several scheduled updates result in one layout, Update() does it now
+        self._mgr.ScheduleUpdate()
+        self._mgr.ScheduleUpdate()
+        self.assertTrue(self._mgr._updatePending)
+        self._mgr.Update()
+        self.assertFalse(self._mgr._updatePending)
+
+        part = self._mgr.GetPanePart(panels[1])
+        rect = part.rect
+        self.assertIs(self._mgr.HitTest(rect.x + rect.width // 2, rect.y + rect.height // 2).pane,
+                      part.pane)
+
     def tearDown(self):
         self._mgr.UnInit()
 
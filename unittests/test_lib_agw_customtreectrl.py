@@ -112,6 +112,65 @@ class lib_agw_customtreectrl_Tests(wtc.WidgetTestCase):
         else:
             self.assertEqual(len(tree.GetChildren()), 0)
 
+    def test_lib_agw_customtreectrlVirtualRows(self):
+        tree = CT.CustomTreeCtrl(self.frame, agwStyle=CT.TR_DEFAULT_STYLE|CT.TR_VIRTUAL_ROWS)
+        root = tree.AddRoot('root item')
+        children = [tree.AppendItem(root, 'child %d' % i) for i in range(100)]
+        grandchild = tree.AppendItem(children[10], 'grandchild item')
+        tree.Expand(root)
+        tree.CalculatePositions()
+
+        rowIndex = tree._rowIndex
+        self.assertEqual(rowIndex.GetCount(), 101)
+        self.assertTrue(children[50].GetY() > children[49].GetY())
+
+        tree.Expand(children[10])
+        self.assertEqual(rowIndex.GetCount(), 102)
+        self.assertEqual(grandchild.GetY(), children[11].GetY() - tree.GetLineHeight(grandchild))
+
+        tree.Delete(children[0])
+        tree.Collapse(children[10])
+        self.assertEqual(rowIndex.GetCount(), 100)
+
+    def test_lib_agw_customtreectrlSubtreeDirty(self):
+        tree = CT.CustomTreeCtrl(self.frame, agwStyle=CT.TR_DEFAULT_STYLE|CT.TR_HAS_VARIABLE_ROW_HEIGHT)
+        root = tree.AddRoot('root item')
+        children = [tree.AppendItem(root, 'child %d' % i) for i in range(10)]
+        tree.Expand(root)
+        tree.CalculatePositions()
+
+        # New and changed rows are marked, not the whole tree
+        child = tree.InsertItem(root, 5, 'new child')
+        tree.SetItemText(children[2], 'two\nlines')
+        self.assertEqual(set(tree._dirtySubtrees), {child, children[2]})
+        tree.CalculatePositions()
+        positions = [item.GetY() for item in [root, child] + children]
+
+        tree.SetItemsDirty(root)
+        tree._dirty = True
+        tree.CalculatePositions()
+        self.assertEqual([item.GetY() for item in [root, child] + children], positions)
+
+        tree.Delete(children[9])
+        tree.Delete(child)
+        tree.CalculatePositions()
+        self.assertEqual(children[5].GetY(), children[4].GetY() + tree.GetLineHeight(children[4]))
+
+    def test_lib_agw_customtreectrlOnGetChildren(self):
+        class LazyTree(CT.CustomTreeCtrl):
+            def OnGetChildren(self, item):
+                return [('child %d' % i, i, i == 0) for i in range(3)]
+
+        tree = LazyTree(self.frame, agwStyle=CT.TR_DEFAULT_STYLE|CT.TR_VIRTUAL_ROWS)
+        root = tree.AddRoot('root item')
+        tree.SetItemHasChildren(root)
+        tree.Expand(root)
+
+        self.assertEqual(tree.GetChildrenCount(root, False), 3)
+        first = tree.GetFirstChild(root)[0]
+        self.assertEqual(tree.GetItemData(first), 0)
+        self.assertTrue(tree.ItemHasChildren(first))
+
     def test_lib_agw_customtreectrlConstantsExist(self):
         CT.TR_NO_BUTTONS
         CT.TR_SINGLE
@@ -134,6 +193,7 @@ class lib_agw_customtreectrl_Tests(wtc.WidgetTestCase):
         CT.TR_ALIGN_WINDOWS_RIGHT
         CT.TR_ELLIPSIZE_LONG_ITEMS
         CT.TR_TOOLTIP_ON_LONG_ITEMS
+        CT.TR_VIRTUAL_ROWS
 
         CT.TreeItemIcon_Normal
         CT.TreeItemIcon_Selected
@@ -119,6 +119,36 @@ class lib_agw_hypertreelist_Tests(wtc.WidgetTestCase):
         tree.SetItemBackgroundColour(root, wx.RED)
         tree.SetItemBackgroundColour(root, wx.GREEN, column=1)
 
+    def test_lib_agw_hypertreelistVirtualRows(self):
+        tree = HTL.HyperTreeList(self.frame, agwStyle=HTL.TR_DEFAULT_STYLE|
+                                                      HTL.TR_VIRTUAL_ROWS)
+        tree.AddColumn("First column")
+        root = tree.AddRoot('root item')
+        children = [tree.AppendItem(root, 'child %d' % i) for i in range(100)]
+        tree.AppendItem(children[10], 'grandchild item')
+        tree.Expand(root)
+        tree.Expand(children[10])
+
+        rowIndex = tree.GetMainWindow()._rowIndex
+        tree.GetMainWindow().CalculatePositions()
+        self.assertEqual(rowIndex.GetCount(), 102)
+
+        tree.Delete(children[10])
+        self.assertEqual(rowIndex.GetCount(), 100)
+
+    def test_lib_agw_hypertreelistOnGetChildren(self):
+        class LazyTree(HTL.HyperTreeList):
+            def OnGetChildren(self, item):
+                return [('child %d' % i, i, False) for i in range(3)]
+
+        tree = LazyTree(self.frame, agwStyle=HTL.TR_DEFAULT_STYLE|HTL.TR_VIRTUAL_ROWS)
+        tree.AddColumn("First column")
+        root = tree.AddRoot('root item')
+        tree.SetItemHasChildren(root)
+        tree.Expand(root)
+
+        self.assertEqual(tree.GetChildrenCount(root, False), 3)
+
 #---------------------------------------------------------------------------
 
 if __name__ == '__main__':
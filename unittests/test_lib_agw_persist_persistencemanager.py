@@ -63,6 +63,66 @@ class lib_agw_persist_persistencemanager_Tests(wtc.WidgetTestCase):
         self.assertEqual(cb.GetValue(), False, "Should be False as set in CTOR test")
 
 
+    def test_persistencemanagerEncodeValue(self):
+        import datetime
+        values = [None, True, 3, 2.5, "text", "(text", [1, 2], (1, (2, 3)),
+                  {1: True, "key": [1]}, datetime.date(2020, 1, 2)]
+        for value in values:
+            result = PM.DecodeValue(PM.EncodeValue(value))
+            self.assertEqual(result, value)
+            self.assertEqual(type(result), type(value))
+
+        # values written by older versions
+        self.assertEqual(PM.DecodeValue(repr(("list", "[1, (2, 3)]"))), [1, (2, 3)])
+        self.assertEqual(PM.DecodeValue(repr(("str", "abc"))), "abc")
+        self.assertEqual(PM.DecodeValue(repr(("int", "__import__('os')"))), None)
+
+        # anything which is not a string can't be decoded
+        self.assertEqual(PM.DecodeValue(42), None)
+        self.assertEqual(PM.DecodeValue(b"[1, 2]"), None)
+
+        # unsupported values are saved as tuples or strings
+        self.assertEqual(PM.DecodeValue(PM.EncodeValue(wx.Size(10, 20))), (10, 20))
+        self.assertEqual(PM.DecodeValue(PM.EncodeValue({1, 2})), (1, 2))
+        value = object()
+        self.assertEqual(PM.DecodeValue(PM.EncodeValue(value)), str(value))
+
+
+    def test_persistencemanagerJSONBatch(self):
+        dirName = os.path.dirname(os.path.abspath(__file__))
+        configFile = os.path.join(dirName, "PersistTest2.json")
+
+        self._persistMgr = PM.PersistenceManager.Get()
+        self._persistMgr.SetConfigurationHandler(PM.PersistenceJSONFile(configFile))
+
+        try:
+            self.frame.SetName('PersistTestFrame')
+            cb = wx.CheckBox(self.frame, name='PersistCheck')
+            cb.persistValue = True
+            cb.SetValue(True)
+
+            self._persistMgr.RegisterAndRestoreAll(self.frame)
+            self._persistMgr.BeginBatch()
+            self._persistMgr.SaveAndUnregister()
+            self.assertEqual(os.path.exists(configFile), False)
+            self._persistMgr.EndBatch()
+            self.assertEqual(os.path.exists(configFile), True)
+            with self.assertRaises(RuntimeError):
+                self._persistMgr.EndBatch()
+
+            self._persistMgr.SetConfigurationHandler(PM.PersistenceJSONFile(configFile))
+            cb.SetValue(False)
+            self._persistMgr.RegisterAndRestoreAll(self.frame)
+            self.assertEqual(cb.GetValue(), True)
+            self._persistMgr.Unregister(cb)
+            self._persistMgr.Unregister(self.frame)
+
+        finally:
+            self._persistMgr.SetConfigurationHandler(None)
+            if os.path.exists(configFile):
+                os.unlink(configFile)
+
+
     def test_persistencemanagerZZZZCleanup(self):
         # Just clean up the test file used by the other tests...
         # TODO: Fix these tests to be self-contained and to clean up after themselves
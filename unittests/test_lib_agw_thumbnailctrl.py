@@ -1,6 +1,9 @@
 import unittest
 from unittests import wtc
 import wx
+import os
+import shutil
+import tempfile
 
 import wx.lib.agw.scrolledthumbnail as ST
 import wx.lib.agw.thumbnailctrl as TNC
@@ -12,6 +15,44 @@ class lib_agw_thumbnailctrl_Tests(wtc.WidgetTestCase):
     def test_lib_agw_thumbnailctrlCtor(self):
         tnc = TNC.ThumbnailCtrl(self.frame, -1, imagehandler=TNC.NativeImageHandler)
 
+    def test_lib_agw_thumbnailctrlCache(self):
+        folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, folder, ignore_errors=True)
+        filename = os.path.join(folder, "image.png")
+        wx.Image(400, 200).SaveFile(filename, wx.BITMAP_TYPE_PNG)
+
+        cache = ST.ThumbnailCache(os.path.join(folder, "thumbnails"))
+        tnc = TNC.ThumbnailCtrl(self.frame, -1, imagehandler=TNC.NativeImageHandler,
+                                thumbnailcache=cache)
+        self.assertIs(tnc.GetThumbnailCache(), cache)
+        self.assertIsNone(cache.Load(filename, 96))
+
+        thumb = ST.Thumb(folder, "image.png", imagehandler=TNC.NativeImageHandler)
+        thumb.LoadImage(cache, 96)
+        self.assertTrue(thumb.IsLoaded(96))
+        self.assertFalse(thumb.IsLoaded(200))
+        self.assertEqual(thumb.GetImage().GetSize(), wx.Size(128, 64))
+
+        img, originalsize, alpha = cache.Load(filename, 96)
+        self.assertEqual(img.GetSize(), wx.Size(128, 64))
+        self.assertEqual(originalsize, (400, 200))
+
+        cache.Remove(filename)
+        self.assertIsNone(cache.Load(filename, 96))
+
+    def test_lib_agw_thumbnailctrlLoadFailed(self):
+        class FailingHandler(TNC.NativeImageHandler):
+            def Load(self, filename):
+                raise IOError(filename)
+
+        scrolled = ST.ScrolledThumbnail(self.frame, -1, imagehandler=TNC.NativeImageHandler)
+        thumb = ST.Thumb("folder", "image.png", imagehandler=FailingHandler)
+        scrolled.LoadThumb(thumb)
+
+        # a failed thumbnail shows the broken file image and is not requested again
+        self.assertTrue(thumb.IsLoaded(512))
+        self.assertEqual(thumb.GetImage().GetSize(), ST.file_broken.GetImage().GetSize())
+
     def test_lib_agw_thumbnailctrlEvents(self):
         ST.EVT_THUMBNAILS_SEL_CHANGED
         ST.EVT_THUMBNAILS_POINTED
@@ -20,6 +20,104 @@ class lib_agw_ultimatelistctrl_Tests(wtc.WidgetTestCase):
     def test_lib_agw_ultimatelistctrlCtorVirtual(self):
         ulc = ULC.UltimateListCtrl(self.frame, agwStyle=wx.LC_REPORT|wx.LC_VIRTUAL)
 
+    def test_lib_agw_ultimatelistctrlSortItemsByKey(self):
+        ulc = ULC.UltimateListCtrl(self.frame, agwStyle=wx.LC_REPORT)
+        ulc.InsertColumn(0, "Name")
+        ulc.InsertColumn(1, "Size")
+        for i, (name, size) in enumerate([("b", "2"), ("a", "2"), ("c", "1"), ("A", "1")]):
+            index = ulc.InsertStringItem(i, name)
+            ulc.SetStringItem(index, 1, size)
+            ulc.SetItemData(index, i)
+
+        ulc.SortItemsByKey(str.lower, columns=[1, (0, True)])
+        self.assertEqual([ulc.GetItemText(i) for i in range(4)], ["c", "A", "b", "a"])
+
+        ulc.SortItemsByKey(reverse=True)
+        self.assertEqual([ulc.GetItemData(i) for i in range(4)], [3, 2, 1, 0])
+
+    def test_lib_agw_ultimatelistctrlColumnStore(self):
+        ulc = ULC.UltimateListCtrl(self.frame, agwStyle=wx.LC_REPORT|wx.LC_VIRTUAL)
+        ulc.InsertColumn(0, "Name")
+        ulc.InsertColumn(1, "Size")
+
+        store = ULC.UltimateListColumnStore(2)
+        store.AppendRows([("b", "2"), ("a", "2"), ("c",)], data=[0, 1, 2])
+        store.SetColour(1, 0, wx.RED)
+        ulc.SetColumnStore(store)
+
+        self.assertEqual(ulc.GetItemCount(), 3)
+        self.assertEqual(ulc.OnGetItemText(2, 1), "")
+        self.assertEqual(ulc.OnGetItemColumnImage(0, 0), [])
+
+        ulc.SortItemsByKey(columns=0)
+        self.assertEqual([ulc.OnGetItemText(i, 0) for i in range(3)], ["a", "b", "c"])
+        self.assertEqual(ulc.OnGetItemTextColour(0, 0), wx.RED)
+        self.assertEqual(store.GetRow(2).GetData(), 2)
+
+    def test_lib_agw_ultimatelistctrlRowCache(self):
+        class VirtualList(ULC.UltimateListCtrl):
+            calls = []
+            def OnGetItemText(self, item, col):
+                self.calls.append(item)
+                return "%d-%d" % (item, col)
+            def OnGetItemsRange(self, itemFrom, itemTo):
+                self.calls.append((itemFrom, itemTo))
+                return [("%d-0" % item, "%d-1" % item) for item in range(itemFrom, itemTo + 1)]
+            def OnGetItemToolTip(self, item, col):
+                return ""
+            def OnGetItemTextColour(self, item, col):
+                return None
+
+        ulc = VirtualList(self.frame, agwStyle=wx.LC_REPORT|wx.LC_VIRTUAL)
+        ulc.InsertColumn(0, "Name")
+        ulc.InsertColumn(1, "Size")
+        ulc.SetItemCount(100)
+
+        ulc._mainWin.FetchLines(0, 9)
+        self.assertEqual(ulc.calls, [(0, 9)])
+        self.assertEqual(ulc.GetItemText(5), "5-0")
+        self.assertEqual(ulc.calls, [(0, 9)])
+
+        ulc.RefreshItem(5)
+        self.assertEqual(ulc.GetItemText(5), "5-0")
+        self.assertEqual(ulc.calls, [(0, 9), 5, 5])
+
+        ulc.SetRowCacheSize(0)
+        ulc.GetItemText(6)
+        ulc.GetItemText(6)
+        self.assertEqual(ulc.calls.count(6), 4)
+
+    def test_lib_agw_ultimatelistctrlVirtualCheck(self):
+        class VirtualList(ULC.UltimateListCtrl):
+            def OnGetItemText(self, item, col):
+                return "%d" % item
+            def OnGetItemToolTip(self, item, col):
+                return ""
+            def OnGetItemTextColour(self, item, col):
+                return None
+            def OnGetItemColumnKind(self, item, column=0):
+                return 1
+            def OnGetItemColumnCheck(self, item, column=0):
+                return self.checked[item]
+
+        ulc = VirtualList(self.frame, agwStyle=wx.LC_REPORT|wx.LC_VIRTUAL)
+        ulc.checked = [False] * 10
+        ulc.InsertColumn(0, "Name")
+        ulc.SetItemCount(10)
+
+        def OnChecked(event):
+            ulc.checked[event.GetIndex()] = event.GetItem().IsChecked()
+        ulc.Bind(ULC.EVT_LIST_ITEM_CHECKED, OnChecked)
+
+        self.assertFalse(ulc.IsItemChecked(3))
+        ulc._mainWin.CheckItem(ulc.GetItem(3), True)
+        self.assertTrue(ulc.checked[3])
+        self.assertTrue(ulc.IsItemChecked(3))
+
+        ulc.checked[3] = False
+        ulc._mainWin.RefreshLine(3)
+        self.assertFalse(ulc.IsItemChecked(3))
+
     def test_lib_agw_thumbnailctrlStyles(self):
         ULC.ULC_VRULES
         ULC.ULC_HRULES
@@ -1,6 +1,7 @@
 import unittest
 from unittests import wtc
 import wx
+from types import SimpleNamespace as NS
 
 try:
     import wx.lib.agw.xlsgrid as XG
@@ -10,12 +11,102 @@ except:
 
 #---------------------------------------------------------------------------
 
+# A minimal stand-in for the `xlrd` book and sheet, with two cell formats
+def _makeXF():
+    alignment = NS(hor_align=0, vert_align=2, rotation=0, text_wrapped=0,
+                   text_direction=0, indent_level=0, shrink_to_fit=0)
+    background = NS(pattern_colour_index=64, background_colour_index=65, fill_pattern=0)
+    border = NS(top_line_style=0, bottom_line_style=0, left_line_style=0, right_line_style=0,
+                diag_line_style=0, top_colour_index=0, bottom_colour_index=0,
+                left_colour_index=0, right_colour_index=0, diag_colour_index=0,
+                diag_down=0, diag_up=0)
+    return NS(font_index=0, format_key=0, alignment=alignment, background=background, border=border)
+
+def _makeBook():
+    font = NS(height=200, family=0, italic=0, weight=400, underline_type=0, struck_out=0,
+              name='Arial', colour_index=8, escapement=0, character_set=0, bold=0)
+    return NS(xf_list=[_makeXF(), _makeXF()], font_list=[font],
+              colour_map={0: (0, 0, 0), 8: (0, 0, 0), 64: None, 65: None},
+              format_map={0: NS(format_str='General')}, datemode=0)
+
+class _Sheet(object):
+    nrows, ncols = 20, 10
+    merged_cells = [(2, 4, 1, 3), (10, 11, 0, 5)]
+    hyperlink_map = {}
+    rich_text_runlist_map = {}
+
+    def cell(self, row, col):
+        return NS(ctype=1, value='%d-%d' % (row, col))
+
+    def cell_xf_index(self, row, col):
+        return (row + col) % 2
+
+
 class lib_agw_xlsgrid_Tests(wtc.WidgetTestCase):
 
     @unittest.skipIf(skipIt, 'Requires xlrd')
     def test_lib_agw_xlsgridCtor(self):
         xg = XG.XLSGrid(self.frame)
 
+    def _makeTable(self):
+        sheet = _Sheet()
+        texts = [['%d-%d' % (row, col) for col in range(sheet.ncols)] for row in range(sheet.nrows)]
+        comments = [[None] * sheet.ncols for row in range(sheet.nrows)]
+        table = XG.XLSTable(None, {}, sheet.nrows, sheet.ncols, _makeBook(), sheet, texts, comments)
+        for rlo, rhi, clo, chi in sheet.merged_cells:
+            table.SetCellSize(rlo, clo, rhi-rlo, chi-clo)
+        return table, sheet, texts, comments
+
+    def test_lib_agw_xlsgridLazyCells(self):
+        table, sheet, texts, comments = self._makeTable()
+        self.assertEqual(table.cells, {})
+
+        self.assertEqual(table.GetValue(5, 5), '5-5')
+        self.assertEqual(list(table.cells), [(5, 5)])
+        self.assertIs(table.GetCell(5, 5), table.cells[(5, 5)])
+
+    def test_lib_agw_xlsgridSharedFormats(self):
+        table, sheet, texts, comments = self._makeTable()
+
+        # same xf_index, same format and attribute
+        cell1, cell2 = table.GetCell(0, 1), table.GetCell(5, 6)
+        self.assertIs(cell1.text.format, cell2.text.format)
+        self.assertIs(cell1.background, cell2.background)
+        self.assertIs(table.GetAttr(0, 1, 0), table.GetAttr(5, 6, 0))
+        self.assertIsNot(table.GetCell(0, 0).text.format, cell1.text.format)
+        self.assertEqual(len(table.format_cache.formats), 2)
+
+    def test_lib_agw_xlsgridMergedCells(self):
+        table, sheet, texts, comments = self._makeTable()
+        book = table.book
+
+        # build the cells the way XLSGrid did before they were created lazily
+        eager = {}
+        for row in range(sheet.nrows):
+            for col in range(sheet.ncols):
+                eager[(row, col)] = XG.XLSCell(book, sheet.cell(row, col), sheet.cell_xf_index(row, col),
+                                               texts[row][col], comments[row][col], None, None, 10, wx.BLACK)
+        for rlo, rhi, clo, chi in sheet.merged_cells:
+            eager[(rlo, clo)].SetCellSize(rhi-rlo, chi-clo)
+
+        for (row, col), cell in eager.items():
+            self.assertEqual(table.GetCell(row, col).size, cell.size)
+
+        attr = table.GetAttr(2, 1, 0)
+        self.assertEqual(attr.GetSize(), (2, 2))
+        self.assertIsNot(attr, table.GetAttr(10, 0, 0))
+        self.assertEqual(table.GetAttr(10, 0, 0).GetSize(), (1, 5))
+
+    def test_lib_agw_xlsgridCompatibility(self):
+        # the attributes and methods moved to the shared formats still work
+        table, sheet, texts, comments = self._makeTable()
+        cell = table.GetCell(0, 1)
+        self.assertIsNone(cell.hyperlink)
+        self.assertIs(cell.text.font, cell.text.format.font)
+        self.assertEqual(cell.text.horizontal_alignment, cell.text.format.horizontal_alignment)
+        self.assertTrue(cell.text.CreateFont(table.book.font_list[0]).IsOk())
+        cell.text.CreateAlignment(table.book.xf_list[1].alignment, 10)
+
 #---------------------------------------------------------------------------
 
 if __name__ == '__main__':
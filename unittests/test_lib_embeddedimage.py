@@ -0,0 +1,84 @@
+import unittest
+from unittests import wtc
+import wx
+from wx.lib.embeddedimage import PyEmbeddedImage
+
+#---------------------------------------------------------------------------
+
+def _rawImage(colour):
+    # a 4x4 image, 4*4*4 = 64 bytes in the cache
+    return PyEmbeddedImage(bytes(colour) * 16, isBase64=False, size=(4, 4))
+
+
+class lib_embeddedimage_Tests(wtc.WidgetTestCase):
+
+    def tearDown(self):
+        PyEmbeddedImage.SetCacheSize(0)
+        PyEmbeddedImage.ClearCache()
+        super(lib_embeddedimage_Tests, self).tearDown()
+
+    def test_lib_embeddedimageRaw(self):
+        img = _rawImage((10, 20, 30)).GetImage()
+        self.assertEqual(img.GetSize(), wx.Size(4, 4))
+        self.assertEqual((img.GetRed(3, 3), img.GetGreen(3, 3), img.GetBlue(3, 3)),
+                         (10, 20, 30))
+
+    def test_lib_embeddedimageCacheLRU(self):
+        PyEmbeddedImage.SetCacheSize(128)
+        a, b, c = [_rawImage((i, i, i)) for i in (1, 2, 3)]
+
+        a.GetImage()
+        b.GetImage()
+        a.GetImage()    # a is now the most recently used
+        c.GetImage()    # so b is dropped to make room for c
+
+        keys = [key[0] for key in PyEmbeddedImage._cache]
+        self.assertEqual(keys, [a, c])
+        self.assertEqual(PyEmbeddedImage._cacheUsed, 128)
+
+        # the cached image is returned, as a copy
+        img = a.GetImage()
+        self.assertIsNot(img, PyEmbeddedImage._cache[(a, 'image', None)][0])
+        self.assertEqual(img.GetRed(0, 0), 1)
+
+    def test_lib_embeddedimageCacheData(self):
+        PyEmbeddedImage.SetCacheSize(1024)
+        a = _rawImage((1, 2, 3))
+        self.assertEqual(a.GetImage().GetRed(0, 0), 1)
+
+        a.data = bytes((7, 8, 9)) * 16
+        self.assertEqual(a.GetImage().GetRed(0, 0), 7)
+        self.assertEqual(len(PyEmbeddedImage._cache), 1)
+        self.assertEqual(PyEmbeddedImage._cacheUsed, 64)
+
+    def test_lib_embeddedimageCacheKinds(self):
+        # only what was asked for is cached, not the images it is made from
+        PyEmbeddedImage.SetCacheSize(1024)
+        a = _rawImage((1, 2, 3))
+        a.GetBitmap()
+        self.assertEqual(list(PyEmbeddedImage._cache), [(a, 'bitmap', None)])
+
+        img = a.GetImage((2, 2))
+        self.assertEqual(img.GetSize(), wx.Size(2, 2))
+        self.assertEqual(list(PyEmbeddedImage._cache),
+                         [(a, 'bitmap', None), (a, 'image', (2, 2))])
+        self.assertEqual(PyEmbeddedImage._cacheUsed, 64 + 16)
+
+    def test_lib_embeddedimageCacheDisabled(self):
+        PyEmbeddedImage.SetCacheSize(1024)
+        a = _rawImage((1, 2, 3))
+        a.GetBitmap()
+        self.assertTrue(len(PyEmbeddedImage._cache) > 0)
+
+        PyEmbeddedImage.SetCacheSize(0)
+        self.assertEqual(len(PyEmbeddedImage._cache), 0)
+        self.assertEqual(PyEmbeddedImage._cacheUsed, 0)
+
+        a.GetImage()
+        a.GetBitmap()
+        self.assertEqual(len(PyEmbeddedImage._cache), 0)
+
+#---------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    unittest.main()
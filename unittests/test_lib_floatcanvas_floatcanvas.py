@@ -167,6 +167,181 @@ class lib_floatcanvas_floatcanvas_Tests(wtc.WidgetTestCase):
         fccanvas.AddObject(obj)
         fccanvas.Destroy()
 
+    def test_lib_floatcanvas_spatialindex(self):
+        fccanvas = fc.FloatCanvas(self.frame)
+        fccanvas.SetSpatialIndex(True)
+
+        near = fccanvas.AddCircle((2, 2), 2)
+        far = fccanvas.AddRectangle((1000, 1000), (2, 2))
+        fore = fc.Point((3, 3), InForeground=True)
+        fccanvas.AddObject(fore)
+
+        BB = ((0, 0), (10, 10))
+        self.assertEqual(fccanvas._DrawListIndex.Query(BB), [near])
+        self.assertEqual(fccanvas._ForeDrawListIndex.Query(BB), [fore])
+
+        far.Move((-998, -998))
+        self.assertEqual(fccanvas._DrawListIndex.Query(BB), [near, far])
+
+        fccanvas.RemoveObject(near)
+        fore.PutInBackground()
+        self.assertEqual(fccanvas._DrawListIndex.Query(BB), [far, fore])
+        self.assertEqual(fccanvas._ForeDrawListIndex.Query(BB), [])
+        fccanvas.Destroy()
+
+    def test_lib_floatcanvas_batchdrawing(self):
+        fccanvas = fc.FloatCanvas(self.frame, size=(100, 100))
+        fccanvas.InitializePanel()
+        fccanvas.MakeNewBuffers()
+
+        # runs of consecutive objects of the same kind get batched
+        for i in range(10):
+            fccanvas.AddCircle((i, i), 2, FillColor="Red")
+        for i in range(10):
+            fccanvas.AddRectangle((i, -i), (2, 2))
+        for i in range(10):
+            fccanvas.AddPoint((-i, i), Diameter=3)
+        for i in range(10):
+            fccanvas.AddSquarePoint((-i, -i))
+        for i in range(10):
+            fccanvas.AddPolygon(((i, 0), (i + 2, 1), (i, 2)), FillColor="Green")
+        circle = fccanvas.AddCircle((0, 0), 4, FillColor="Blue")
+        circle.Bind(fc.EVT_FC_LEFT_DOWN, lambda obj: None)
+
+        self.assertEqual(circle._BatchKey()[0], fc.Circle)
+        self.assertIsNone(fc.Text("some text", (2, 2))._BatchKey())
+        fccanvas.ZoomToBB()
+
+        # the batched drawing is the same as drawing one object at a time
+        images = []
+        for UseBatchDrawing in (False, True):
+            fccanvas.UseBatchDrawing = UseBatchDrawing
+            fccanvas.Draw(Force=True)
+            images.append(bytes(fccanvas._Buffer.ConvertToImage().GetData()))
+        self.assertEqual(images[0], images[1])
+        fccanvas.Destroy()
+
+    def test_lib_floatcanvas_tilecache(self):
+        fccanvas = fc.FloatCanvas(self.frame, size=(300, 300))
+        fccanvas.InitializePanel()
+        fccanvas.MakeNewBuffers()
+        fccanvas.SetTileCache(True, TileSize=64, CacheSize=200)
+
+        for i in range(10):
+            fccanvas.AddCircle((i, i), 2, FillColor="Red")
+        fccanvas.ZoomToBB()
+        numTiles = len(fccanvas._TileCache)
+        self.assertTrue(numTiles > 0)
+
+        # a small pan re-uses the tiles already rendered
+        fccanvas.MoveImage((1, 0), 'Pixel')
+        self.assertTrue(len(fccanvas._TileCache) <= numTiles + 6)
+
+        circle = fccanvas.AddCircle((0, 0), 4)
+        self.assertEqual(len(fccanvas._TileCache), 0)
+
+        # so does a change of colour or visibility of a background object
+        fccanvas.MoveImage((1, 0), 'Pixel')
+        self.assertTrue(len(fccanvas._TileCache) > 0)
+        circle.SetFillColor("Blue")
+        self.assertEqual(len(fccanvas._TileCache), 0)
+        fccanvas.MoveImage((1, 0), 'Pixel')
+        self.assertTrue(len(fccanvas._TileCache) > 0)
+        circle.Hide()
+        self.assertEqual(len(fccanvas._TileCache), 0)
+        fccanvas.Destroy()
+
+    def test_lib_floatcanvas_hittestmodes(self):
+        fccanvas = fc.FloatCanvas(self.frame, size=(200, 200))
+        fccanvas.InitializePanel()
+        fccanvas.MakeNewBuffers()
+
+        circle = fccanvas.AddCircle((0, 0), 10, FillColor="Red")
+        line = fccanvas.AddLine(((20, 20), (30, 30)))
+        circle.Bind(fc.EVT_FC_LEFT_DOWN, lambda obj: None)
+        line.Bind(fc.EVT_FC_LEFT_DOWN, lambda obj: None)
+        fccanvas.ZoomToBB()
+
+        fccanvas.SetHitTestMode("Geometry")
+        self.assertIsNone(fccanvas._HTBitmap)
+        fccanvas.Draw()
+        self.assertIs(fccanvas.GetHitObject(fccanvas.WorldToPixel((0, 0))), circle)
+        self.assertIs(fccanvas.GetHitObject(fccanvas.WorldToPixel((25, 25))), line)
+        self.assertIsNone(fccanvas.GetHitObject(fccanvas.WorldToPixel((25, 0))))
+        self.assertEqual(fccanvas.GetHitTestColor(fccanvas.WorldToPixel((0, 0))),
+                         circle.HitColor)
+
+        fccanvas.SetHitTestMode("LazyBitmap")
+        self.assertIsNotNone(fccanvas._HTBitmap)
+        fccanvas.Draw()
+        self.assertTrue(fccanvas._HitTestDirty)
+        fccanvas.GetHitTestColor(fccanvas.WorldToPixel((0, 0)))
+        self.assertFalse(fccanvas._HitTestDirty)
+        # nothing was re-drawn, the hit test bitmap is still up to date
+        fccanvas.Draw()
+        self.assertFalse(fccanvas._HitTestDirty)
+        fccanvas.Draw(Force=True)
+        self.assertTrue(fccanvas._HitTestDirty)
+
+        with self.assertRaises(fc.FloatCanvasError):
+            fccanvas.SetHitTestMode("Nothing")
+        fccanvas.Destroy()
+
+    def test_lib_floatcanvas_levelofdetail(self):
+        import numpy as np
+        x = np.linspace(0, 100, 10001)
+        obj = fc.Line(np.column_stack((x, np.sin(x))))
+        scale = lambda s: (lambda L: np.asarray(L, float) * s)
+
+        # off by default
+        self.assertIs(obj._GetDrawPoints(scale(1.0)), obj.Points)
+
+        obj.SetLevelOfDetail(0.5)
+        zoomedOut = obj._GetDrawPoints(scale(1.0))
+        zoomedIn = obj._GetDrawPoints(scale(1000.0))
+        self.assertTrue(len(zoomedOut) < len(zoomedIn) <= len(obj.Points))
+        self.assertTrue((zoomedOut[0] == obj.Points[0]).all())
+        self.assertTrue((zoomedOut[-1] == obj.Points[-1]).all())
+        # cached per zoom band, and reset when the points change
+        self.assertIs(obj._GetDrawPoints(scale(1.0)), zoomedOut)
+        obj.Move((1, 1))
+        self.assertIsNot(obj._GetDrawPoints(scale(1.0)), zoomedOut)
+        # only a few zoom bands are kept
+        for s in (1.0, 2.0, 4.0, 8.0, 16.0, 32.0):
+            obj._GetDrawPoints(scale(s))
+        self.assertEqual(len(obj._LODCache), obj._LODCacheSize)
+
+    def test_lib_floatcanvas_levelofdetailzoom(self):
+        import numpy as np
+        x = np.linspace(0, 100, 10001)
+        obj = fc.Line(np.column_stack((x, np.sin(x))))
+        fccanvas = fc.FloatCanvas(self.frame)
+        fccanvas.AddObject(obj)
+        obj.SetLevelOfDetail(0.5)
+
+        # far zoomed in, the integer lengths from ScaleWorldToPixel would
+        # overflow, but all the points are still drawn
+        fccanvas.Zoom(1e9)
+        self.assertEqual(len(obj._GetDrawPoints(fccanvas.ScaleWorldToPixel)),
+                         len(obj.Points))
+        fccanvas.ZoomToBB()
+        self.assertTrue(2 < len(obj._GetDrawPoints(fccanvas.ScaleWorldToPixel))
+                        < len(obj.Points))
+
+        # without a canvas of its own (like in a Group), the scale comes from
+        # the canvas ScaleWorldToPixel is bound to
+        line = fc.Line(obj.Points.copy())
+        line.SetLevelOfDetail(0.5)
+        self.assertIsNone(line._Canvas)
+        self.assertEqual(len(line._GetDrawPoints(fccanvas.ScaleWorldToPixel)),
+                         len(obj._GetDrawPoints(fccanvas.ScaleWorldToPixel)))
+
+        obj.SetLevelOfDetail(0)
+        self.assertIs(obj._GetDrawPoints(fccanvas.ScaleWorldToPixel), obj.Points)
+        with self.assertRaises(ValueError):
+            obj.SetLevelOfDetail(-1)
+        fccanvas.Destroy()
+
     def test_lib_floatcanvas_floatcanvasEvents(self):
 
         fc.EVT_FC_ENTER_WINDOW
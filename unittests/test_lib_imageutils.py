@@ -16,6 +16,27 @@ class lib_imageutils_Tests(wtc.WidgetTestCase):
         self.assertEqual(white, wx.WHITE)
         self.assertEqual(black, wx.BLACK)
 
+    def test_lib_imageutils2(self):
+        img = wx.Image(4, 4)
+        img.SetRGB(wx.Rect(0, 0, 4, 4), 100, 120, 140)
+        img.SetRGB(0, 0, 255, 0, 255)
+        img.SetMaskColour(255, 0, 255)
+
+        wx.lib.imageutils.grayOut(img)
+        self.assertEqual((img.GetRed(1, 1), img.GetGreen(1, 1), img.GetBlue(1, 1)),
+                         wx.lib.imageutils.makeGray((100, 120, 140), 0.7, None))
+        self.assertEqual((img.GetRed(0, 0), img.GetGreen(0, 0), img.GetBlue(0, 0)), (255, 0, 255))
+
+        img.SetMask(False)
+        wx.lib.imageutils.brightenImage(img, 0)
+        self.assertEqual(img.GetRed(0, 0), 0)
+
+        wx.lib.imageutils.tintImage(img, wx.Colour(255, 255, 255), 1.0)
+        self.assertEqual(img.GetBlue(3, 3), 255)
+
+        wx.lib.imageutils.blendAlpha(img, 0.5)
+        self.assertEqual(img.GetAlpha(2, 2), 127)
+
 #---------------------------------------------------------------------------
 
 if __name__ == '__main__':
@@ -164,6 +164,35 @@ class lib_ogl_Tests(wtc.WidgetTestCase):
         aShape.AddConstraint(constraint)
         aShape.Recompute()
 
+    def test_lib_oglFindShape(self):
+        ogl.OGLInitialize()
+        osc = ogl.ShapeCanvas(self.frame)
+        self.diagram = ogl.Diagram()
+        osc.SetDiagram(self.diagram)
+        self.diagram.SetCanvas(osc)
+
+        shapes = []
+        for i in range(20):
+            aShape = ogl.RectangleShape(w=50, h=50)
+            aShape.SetCanvas(osc)
+            aShape.SetX(100 * i)
+            aShape.SetY(100)
+            aShape.Show(True)
+            self.diagram.AddShape(aShape)
+            shapes.append(aShape)
+
+        self.assertEqual(osc.FindShape(500, 100)[0], shapes[5])
+        self.assertEqual(osc.FindShape(550, 100)[0], None)
+        self.assertEqual(self.diagram.GetShapesInRect(500, 100, 600, 100), shapes[5:7])
+
+        dc = wx.MemoryDC()
+        shapes[5].Move(dc, 550, 100, False)
+        self.assertEqual(osc.FindShape(550, 100)[0], shapes[5])
+        self.assertEqual(osc.FindShape(500, 100)[0], None)
+
+        self.diagram.RemoveShape(shapes[5])
+        self.assertEqual(osc.FindShape(550, 100)[0], None)
+
     def test_lib_ogl_Constants(self):
         ogl.CONSTRAINT_CENTRED_VERTICALLY
         ogl.CONSTRAINT_CENTRED_HORIZONTALLY
@@ -49,6 +49,19 @@ class lib_pdfviewer_pdfviewer_Tests(wtc.WidgetTestCase):
         self.viewer.LoadFile(samplePdf)
         self.waitFor(500)
 
+    @unittest.skipIf(not havePyPDF,  "PyMuPDF or PyPDF2 required")
+    def test_lib_pdfviewer_pageCache(self):
+        from wx.lib.pdfviewer.viewer import pdfPageCache
+        cache = pdfPageCache(maxsize=2 * 100 * 100 * 4)
+        cache.Put(0, 1.0, wx.Bitmap(100, 100))
+        cache.Put(0, 0.25, wx.Bitmap(25, 25))
+        cache.Put(1, 1.0, wx.Bitmap(100, 100))
+
+        self.assertIsNone(cache.Get(0, 1.0))
+        self.assertEqual(cache.GetPlaceholder(0).GetWidth(), 25)
+        self.assertIsNotNone(cache.Get(1, 1.0))
+        self.assertIsNone(cache.GetPlaceholder(2))
+
 #---------------------------------------------------------------------------
 
 if __name__ == '__main__':
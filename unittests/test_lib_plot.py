@@ -13,6 +13,91 @@ class lib_plot_PlotCanvas_Tests(wtc.WidgetTestCase):
         """ Ctor? """
         p = wxplot.PlotCanvas(self.frame)
 
+    def test_lib_plot_plotcanvas_staticcache(self):
+        p = wxplot.PlotCanvas(self.frame, size=(200, 200))
+        line = wxplot.PolyLine([(0, 0), (1, 1), (2, 0)])
+        gfx = wxplot.PlotGraphics([line], 'Title', 'x', 'y')
+        p.Draw(gfx, xAxis=(0, 2), yAxis=(0, 1))
+        layer = p._staticLayer
+        self.assertIsNotNone(layer)
+
+        # new data, same axes: the static layer is re-used
+        line = wxplot.PolyLine([(0, 1), (2, 0)])
+        p.Draw(wxplot.PlotGraphics([line], 'Title', 'x', 'y'),
+               xAxis=(0, 2), yAxis=(0, 1))
+        self.assertIs(p._staticLayer, layer)
+
+        p.enableGrid = False
+        self.assertIsNot(p._staticLayer, layer)
+
+        p.enableStaticCache = False
+        p.Redraw()
+        self.assertIsNone(p._staticLayer)
+
+
+class lib_plot_PolyLine_Tests(wtc.WidgetTestCase):
+
+    def test_lib_plot_polyline_decimation(self):
+        import numpy as np
+        from wx.lib.plot.polyobjects import _minMaxDecimate
+        x = np.linspace(0, 100, 100001)
+        y = np.sin(x)
+        scaled = np.column_stack((x, y))
+        dec = _minMaxDecimate(scaled)
+        self.assertTrue(len(dec) <= 4 * 101)
+        self.assertTrue((dec[0] == scaled[0]).all())
+        self.assertTrue((dec[-1] == scaled[-1]).all())
+        self.assertEqual(dec[:, 1].min(), y.min())
+        self.assertEqual(dec[:, 1].max(), y.max())
+        # few points per column: nothing to do
+        sparse = scaled[::1000]
+        self.assertIs(_minMaxDecimate(sparse), sparse)
+
+    def test_lib_plot_streamingpolyline(self):
+        line = wxplot.StreamingPolyLine([(0, 0), (1, 5)], capacity=3)
+        line.append((2, -1))
+        line.extend([(3, 2), (4, 1)])
+        self.assertEqual(line.points.tolist(), [[2, -1], [3, 2], [4, 1]])
+        minXY, maxXY = line.boundingBox()
+        self.assertEqual(minXY.tolist(), [2, -1])
+        self.assertEqual(maxXY.tolist(), [4, 2])
+        line.scaleAndShift((2, 2), (1, 1))
+        self.assertEqual(line.scaled.tolist(), [[5, -1], [7, 5], [9, 3]])
+
+    def test_lib_plot_streamingpolyline_wrap(self):
+        line = wxplot.StreamingPolyLine(capacity=3)
+        line.extend([(0, 100), (1, 5)])
+        points = line.points
+        minXY, maxXY = line.boundingBox()
+        self.assertEqual(minXY.tolist(), [0, 5])
+        self.assertEqual(maxXY.tolist(), [1, 100])
+        # partly full -> full -> wrapped, dropping the point with the max y
+        line.extend([(2, 4), (3, 6)])
+        self.assertEqual(line.points.tolist(), [[1, 5], [2, 4], [3, 6]])
+        minXY, maxXY = line.boundingBox()
+        self.assertEqual(minXY.tolist(), [1, 4])
+        self.assertEqual(maxXY.tolist(), [3, 6])
+        line.append((4, 0))
+        minXY, maxXY = line.boundingBox()
+        self.assertEqual(minXY.tolist(), [2, 0])
+        self.assertEqual(maxXY.tolist(), [4, 6])
+        # the points returned earlier are not changed by the later ones
+        self.assertEqual(points.tolist(), [[0, 100], [1, 5]])
+
+    def test_lib_plot_polyline_closestpoint(self):
+        import numpy as np
+        x = np.arange(1000.0)
+        line = wxplot.PolyLine(np.column_stack((x[::-1], np.sin(x))))
+        index, pointXY, scaledXY, dist = line.getClosestPoint((500.2, 0),
+                                                              False)
+        self.assertEqual(index, 499)
+        self.assertEqual(pointXY.tolist(), [500, np.sin(499)])
+        self.assertAlmostEqual(dist, np.hypot(0.2, np.sin(499)))
+
+        # the index is rebuilt when the points change
+        line.points = np.array([(0.0, 0.0), (10.0, 10.0)])
+        self.assertEqual(line.getClosestPoint((9, 9), False)[0], 1)
+
 
 class lib_plot_Tests(wtc.WidgetTestCase):
     def test_lib_plot_tempstyle_contextmanager(self):
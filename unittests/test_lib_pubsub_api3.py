@@ -304,6 +304,114 @@ class lib_pubsub_Except(wtc.PubsubTestCase):
         check('t_1.t_17', ('arg2',), arg1='docs for arg1')
         check('t_3',      ('arg1',), arg2='docs for arg2')
 
+    def testDispatchPlanUpdates(self):
+        # the cached dispatch plan follows un/subscriptions on any topic
+        # up the tree
+        received = []
+        def listener1(arg1): received.append(('t1', arg1))
+        def listener2(arg1, arg2=None): received.append(('t2', arg1, arg2))
+
+        self.pub.subscribe(listener2, 'tdp.t2')
+        self.pub.sendMessage('tdp.t2', arg1=1, arg2=2)
+        self.assertEqual(received, [('t2', 1, 2)])
+
+        del received[:]
+        self.pub.subscribe(listener1, 'tdp')
+        self.pub.sendMessage('tdp.t2', arg1=3)
+        self.assertEqual(received, [('t2', 3, None), ('t1', 3)])
+
+        del received[:]
+        self.pub.unsubscribe(listener2, 'tdp.t2')
+        self.pub.sendMessage('tdp.t2', arg1=4)
+        self.assertEqual(received, [('t1', 4)])
+
+        del received[:]
+        self.pub.unsubAll('tdp')
+        self.pub.sendMessage('tdp.t2', arg1=5)
+        self.assertEqual(received, [])
+
+    def testDispatchPlanScope(self):
+        # un/subscribing only discards the dispatch plans of the topic and
+        # its subtopics, and the args are filtered for each parent topic
+        received = []
+        def listener1(arg1): received.append(('t1', arg1))
+        def listener2(arg1, arg2=None): received.append(('t2', arg1, arg2))
+        def listener3(arg1, arg2=None, arg3=None):
+            received.append(('t3', arg1, arg2, arg3))
+
+        self.pub.subscribe(listener1, 'tdps')
+        self.pub.subscribe(listener2, 'tdps.t2')
+        self.pub.subscribe(listener3, 'tdps.t2.t3')
+        self.pub.subscribe(listener2, 'tdps.other')
+        self.pub.sendMessage('tdps.t2.t3', arg1=1, arg2=2, arg3=3)
+        self.pub.sendMessage('tdps.other', arg1=1)
+        self.assertEqual(received, [('t3', 1, 2, 3), ('t2', 1, 2), ('t1', 1),
+                                    ('t2', 1, None), ('t1', 1)])
+
+        topicMgr = self.pub.getDefaultTopicMgr()
+        t3 = topicMgr.getTopic('tdps.t2.t3')
+        other = topicMgr.getTopic('tdps.other')
+        self.assertIsNotNone(other._Topic__dispatchPlan)
+        self.pub.unsubscribe(listener2, 'tdps.t2')
+        self.assertIsNone(t3._Topic__dispatchPlan)
+        self.assertIsNotNone(other._Topic__dispatchPlan)
+
+        del received[:]
+        self.pub.sendMessage('tdps.t2.t3', arg1=4, arg3=5)
+        self.assertEqual(received, [('t3', 4, None, 5), ('t1', 4)])
+
+    def testUnsubscribeDuringSend(self):
+        # a listener unsubscribed by another one during a send, from a
+        # parent topic, doesn't get the message
+        received = []
+        def listener1(arg1): received.append(('t1', arg1))
+        def listener2(arg1):
+            received.append(('t2', arg1))
+            self.pub.unsubscribe(listener1, 'tuds')
+        def listener3(arg1): received.append(('t3', arg1))
+
+        self.pub.subscribe(listener1, 'tuds')
+        self.pub.subscribe(listener2, 'tuds.t2')
+        self.pub.sendMessage('tuds.t2', arg1=1)
+        self.assertEqual(received, [('t2', 1)])
+
+        # and one subscribed during a send, to a parent topic, does
+        del received[:]
+        def listener4(arg1):
+            received.append(('t4', arg1))
+            self.pub.subscribe(listener3, 'tuds')
+        self.pub.subscribe(listener4, 'tuds.t2.t4')
+        self.pub.sendMessage('tuds.t2.t4', arg1=2)
+        self.assertEqual(received, [('t4', 2), ('t2', 2), ('t3', 2)])
+
+    def testSendMessageAsync(self):
+        from wx.lib.pubsub.core import AsyncSender
+        received = []
+        def listener(arg1): received.append(arg1)
+        self.pub.subscribe(listener, 'tasync')
+
+        drains = []
+        sender = AsyncSender(self.pub.getDefaultPublisher(), drainBudget=2,
+                             coalesce=True, callAfter=drains.append)
+        for arg1 in (1, 1, 2, 3, 1):
+            sender.sendMessage('tasync', arg1=arg1)
+        # one drain scheduled for the whole burst, nothing delivered yet
+        self.assertEqual(len(drains), 1)
+        self.assertEqual(received, [])
+        self.assertEqual(sender.getNumPending(), 4)
+
+        # each drain delivers at most drainBudget messages, in order
+        drains.pop(0)()
+        self.assertEqual(received, [1, 2])
+        self.assertEqual(len(drains), 1)
+        drains.pop(0)()
+        self.assertEqual(received, [1, 2, 3, 1])
+        self.assertEqual(drains, [])
+
+        sender.sendMessage('tasync', arg1=4)
+        sender.flush()
+        self.assertEqual(received, [1, 2, 3, 1, 4])
+
 
 #---------------------------------------------------------------------------
 
@@ -0,0 +1,105 @@
+import unittest
+from unittests import wtc
+import wx
+import wx.lib.wordwrap as ww
+
+#---------------------------------------------------------------------------
+
+class _Font(object):
+    def __init__(self, desc):
+        self.desc = desc
+    def GetNativeFontInfoDesc(self):
+        return self.desc
+
+
+class _DC(object):
+    # A DC with known character widths, counting the measured lines
+    widths = {'i': 4, 'W': 16}
+    defaultWidth = 10
+
+    def __init__(self, font='font'):
+        self.font = _Font(font)
+        self.calls = 0
+    def GetFont(self):
+        return self.font
+    def GetUserScale(self):
+        return (1.0, 1.0)
+    def GetTextExtent(self, text):
+        return (sum(self.widths.get(c, self.defaultWidth) for c in text), 12)
+    def GetPartialTextExtents(self, text):
+        self.calls += 1
+        extents, x = [], 0
+        for c in text:
+            x += self.widths.get(c, self.defaultWidth)
+            extents.append(x)
+        return extents
+
+
+class _WideDC(_DC):
+    defaultWidth = 20
+
+
+class lib_wordwrap_Tests(wtc.WidgetTestCase):
+
+    def setUp(self):
+        super(lib_wordwrap_Tests, self).setUp()
+        ww._extentsCache.clear()
+
+    def test_lib_wordwrapKnownOutput(self):
+        # the results of the wordwrap function before extents were cached
+        cases = [
+            # long words
+            ("Supercalifragilisticexpialidocious is long", 100, True, 0,
+             'Supercal\nifragilist\nicexpialid\nocious is \nlong'),
+            ("Supercalifragilisticexpialidocious is long", 100, False, 0,
+             'Supercalifragilisticexpialidocious \nis long'),
+            # multiple spaces
+            ("a  b   c    dddd eeee", 60, True, 0,
+             'a  b \n  c   \n dddd \neeee'),
+            # embedded newlines, with a margin
+            ("first line\nsecond line is here\n\nlast", 80, True, 1,
+             ' firs \n t  \n line \n seco \n nd  \n line  \n is  \n here \n  \n last '),
+            # width smaller than one character
+            ("Wide Words iiii", 5, True, 0,
+             '\nW\ni\nd\ne \nW\no\nr\nd\ns \ni\ni\ni\ni'),
+            ("Wide Words iiii", 5, False, 0,
+             'Wide \nWords \niiii'),
+            ]
+        for text, width, breakLongWords, margin, expected in cases:
+            self.assertEqual(ww.wordwrap(text, width, _DC(), breakLongWords, margin), expected)
+            wrapper = ww.WordWrapper(text, _DC(), breakLongWords, margin)
+            self.assertEqual(wrapper.Wrap(width), expected)
+            self.assertEqual(wrapper.WrapLines(width), expected.split('\n'))
+
+    def test_lib_wordwrapExtentsCache(self):
+        text = "some text to wrap\nover two lines"
+        dc = _DC()
+        first = ww.wordwrap(text, 100, dc)
+        self.assertEqual(dc.calls, 2)
+        self.assertEqual(ww.wordwrap(text, 100, dc), first)
+        self.assertEqual(ww.wordwrap(text, 60, _DC()), ww.WordWrapper(text, dc).Wrap(60))
+        self.assertEqual(dc.calls, 2)
+
+        # not shared with another font or another kind of DC
+        otherFont = _DC('other font')
+        ww.wordwrap(text, 100, otherFont)
+        self.assertEqual(otherFont.calls, 2)
+
+        wide = _WideDC()
+        self.assertNotEqual(ww.wordwrap(text, 100, wide), first)
+        self.assertEqual(wide.calls, 2)
+
+    def test_lib_wordwrapMemoryDC(self):
+        bmp = wx.Bitmap(100, 100)
+        dc = wx.MemoryDC(bmp)
+        dc.SetFont(wx.Font(10, wx.FONTFAMILY_SWISS, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_NORMAL))
+        text = "The quick brown fox jumps over the lazy dog\n\nagain and again"
+        wrapper = ww.WordWrapper(text, dc)
+        for width in (40, 80, 200):
+            self.assertEqual(wrapper.Wrap(width), ww.wordwrap(text, width, dc))
+        dc.SelectObject(wx.NullBitmap)
+
+#---------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    unittest.main()
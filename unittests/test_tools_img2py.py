@@ -0,0 +1,71 @@
+import unittest
+from unittests import wtc
+import wx
+import os
+import tempfile
+
+from wx.tools import img2py
+
+pngFile = os.path.join(os.path.dirname(__file__), 'smile.png')
+
+#---------------------------------------------------------------------------
+
+class tools_img2py_Tests(wtc.WidgetTestCase):
+
+    def _embed(self, **kw):
+        with tempfile.NamedTemporaryFile(suffix='.py', delete=False) as fid:
+            pyFile = fid.name
+        try:
+            img2py.img2py(pngFile, pyFile, imgName='Smile', **kw)
+            with open(pyFile, 'r') as fid:
+                source = fid.read()
+        finally:
+            os.remove(pyFile)
+        namespace = {}
+        exec(source, namespace)
+        return namespace['Smile']
+
+    def _checkSameImage(self, img, expected):
+        if expected.HasMask():
+            expected.InitAlpha()
+        self.assertEqual(img.GetSize(), expected.GetSize())
+        self.assertEqual(bytes(img.GetData()), bytes(expected.GetData()))
+        self.assertEqual(img.HasAlpha(), expected.HasAlpha())
+        if expected.HasAlpha():
+            self.assertEqual(bytes(img.GetAlpha()), bytes(expected.GetAlpha()))
+
+    def test_tools_img2py(self):
+        embedded = self._embed()
+        self.assertIsNone(embedded.size)
+        self._checkSameImage(embedded.GetImage(), wx.Image(pngFile))
+
+    def test_tools_img2pyRaw(self):
+        embedded = self._embed(raw=True)
+        self.assertEqual(embedded.size, (16, 16))
+        expected = wx.Image(pngFile)
+        self._checkSameImage(embedded.GetImage(), expected)
+
+        bmp = embedded.GetBitmap()
+        self.assertTrue(bmp.IsOk())
+        self.assertEqual(bmp.GetSize(), expected.GetSize())
+
+    def test_tools_img2pyRawCompatible(self):
+        # the old function interface can't return raw pixels
+        with tempfile.NamedTemporaryFile(suffix='.py', delete=False) as fid:
+            pyFile = fid.name
+        try:
+            img2py.img2py(pngFile, pyFile, imgName='Smile', raw=True,
+                          functionCompatible=True)
+            self.assertEqual(os.path.getsize(pyFile), 0)
+        finally:
+            os.remove(pyFile)
+
+    def test_tools_img2pyRawUncompressed(self):
+        embedded = self._embed(raw=True, compressed=False)
+        self.assertFalse(embedded.compressed)
+        self._checkSameImage(embedded.GetImage(), wx.Image(pngFile))
+
+#---------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    unittest.main()
@@ -125,6 +125,9 @@ else:
 # Define this as a translation function
 _ = wx.GetTranslation
 
+# Size in pixels of the grid cells used by AuiManager.HitTest()
+_hittest_cell_size = 64
+
 _winxptheme = False
 if wx.Platform == "__WXMSW__":
     try:
@@ -3989,6 +3992,13 @@ class AuiManager(wx.EvtHandler):
         self._docks = []
         self._uiparts = []
 
+        # lookup tables, rebuilt when found out of date
+        self._paneIndex = None
+        self._hitTestIndex = None
+        # the state the current layout was built from
+        self._layoutKey = None
+        self._updatePending = False
+
         self._guides = []
         self._notebooks = []
 
@@ -4093,8 +4103,15 @@ class AuiManager(wx.EvtHandler):
         :see: :meth:`~AuiManager.GetPane`
         """
 
-        for p in self._panes:
+        panes = self._panes
+        indx = self.GetPaneIndex()[1].get(id(window))
+        if indx is not None and indx < len(panes) and panes[indx].window is window:
+            return panes[indx]
+
+        for p in panes:
             if p.window == window:
+                # the index is out of date
+                self._paneIndex = None
                 return p
 
         return NonePaneInfo
@@ -4108,12 +4125,42 @@ class AuiManager(wx.EvtHandler):
         :see: :meth:`GetPane`
         """
 
-        for p in self._panes:
+        panes = self._panes
+        indx = self.GetPaneIndex()[0].get(name)
+        if indx is not None and indx < len(panes) and panes[indx].name == name:
+            return panes[indx]
+
+        for p in panes:
             if p.name == name:
+                # the index is out of date
+                self._paneIndex = None
                 return p
 
         return NonePaneInfo
 
+    def GetPaneIndex(self):
+        """
+        Returns the positions of the panes in the list of panes, as two dictionaries
+        keyed by pane name and by ``id()`` of the pane window. This is an internal
+        function used by :meth:`GetPaneByName` and :meth:`GetPaneByWidget`.
+
+        :note: The panes list is modified in many places, so the positions are not kept
+         up to date: they are checked when used, and the dictionaries are built again
+         when they turn out to be wrong.
+        """
+
+        if self._paneIndex is None:
+            byName = {}
+            byWindow = {}
+            for indx, p in enumerate(self._panes):
+                byName.setdefault(p.name, indx)
+                if p.window is not None:
+                    byWindow.setdefault(id(p.window), indx)
+
+            self._paneIndex = (byName, byWindow)
+
+        return self._paneIndex
+
     def GetPane(self, item):
         """
         Looks up a :class:`AuiPaneInfo` structure based on the supplied window pointer. Upon failure,
@@ -4178,13 +4225,13 @@ class AuiManager(wx.EvtHandler):
 
         result = None
 
-        for item in self._uiparts:
-            # we are not interested in typeDock, because this space
-            # isn't used to draw anything, just for measurements
-            # besides, the entire dock area is covered with other
-            # rectangles, which we are interested in.
-            if item.type == AuiDockUIPart.typeDock:
-                continue
+        # only look at the UI items in the same grid cell as the point
+        uiparts = self._uiparts
+        cell_size = _hittest_cell_size
+        cells = self.GetHitTestIndex()
+
+        for indx in cells.get((x // cell_size, y // cell_size), ()):
+            item = uiparts[indx]
 
             # if we already have a hit on a more specific item, we are not
             # interested in a pane hit.  If, however, we don't already have
@@ -4198,6 +4245,40 @@ class AuiManager(wx.EvtHandler):
 
         return result
 
+    def GetHitTestIndex(self):
+        """
+        Returns a grid of the UI items, used by :meth:`HitTest`: a dictionary mapping
+        the `(column, row)` of each grid cell to the positions (in order) of the UI
+        items which overlap it. The grid is built again after each layout.
+        """
+
+        uiparts = self._uiparts
+        index = self._hitTestIndex
+
+        if index is None or index[0] is not uiparts or index[1] != len(uiparts):
+            cell_size = _hittest_cell_size
+            cells = {}
+
+            for indx, item in enumerate(uiparts):
+                # we are not interested in typeDock, because this space
+                # isn't used to draw anything, just for measurements
+                # besides, the entire dock area is covered with other
+                # rectangles, which we are interested in.
+                if item.type == AuiDockUIPart.typeDock:
+                    continue
+
+                rect = item.rect
+                if rect.width <= 0 or rect.height <= 0:
+                    continue
+
+                for col in range(rect.x // cell_size, (rect.x + rect.width - 1) // cell_size + 1):
+                    for row in range(rect.y // cell_size, (rect.y + rect.height - 1) // cell_size + 1):
+                        cells.setdefault((col, row), []).append(indx)
+
+            index = self._hitTestIndex = (uiparts, len(uiparts), cells)
+
+        return index[2]
+
     def PaneHitTest(self, panes, pt):
         """
         Similar to :meth:`HitTest`, but it checks in which :class:`AuiManager` rectangle the
@@ -6189,11 +6270,38 @@ class AuiManager(wx.EvtHandler):
         return self._dock_constraint_x, self._dock_constraint_y
 
     def Update(self):
-        wx.CallAfter(self.DoUpdate)
-        
+        """
+        Realizes the changes made to the panes, see :meth:`DoUpdate`. The layout
+        is updated before this method returns.
+
+        :see: :meth:`ScheduleUpdate` to update the layout later on instead.
+        """
+
+        self.DoUpdate()
+
+    def ScheduleUpdate(self):
+        """
+        Schedules a call to :meth:`Update` to realize the changes made to the panes,
+        once the current event has been processed.
+
+        :note: All the calls made before the layout is actually updated result in a
+         single update, and a call to :meth:`Update` in the meantime makes the scheduled
+         one unnecessary. Use this only when nothing depends on the new layout until then.
+        """
+
+        if not self._updatePending:
+            self._updatePending = True
+            wx.CallAfter(self._ScheduledUpdate)
+
+    def _ScheduledUpdate(self):
+        """ Runs the update scheduled by :meth:`ScheduleUpdate`, unless it is done already. """
+
+        if self._updatePending:
+            self.Update()
+
     def DoUpdateEvt(self, evt):
         self.Unbind(wx.EVT_WINDOW_CREATE)
-        wx.CallAfter(self.DoUpdate)
+        self.ScheduleUpdate()
 
     def DoUpdate(self):
         """
@@ -6207,6 +6315,8 @@ class AuiManager(wx.EvtHandler):
         the whole layout at one time.
         """
 
+        self._updatePending = False
+
         if not self.GetManagedWindow():
             return
 
@@ -6358,15 +6468,20 @@ class AuiManager(wx.EvtHandler):
 
             old_pane_rects.append(r)
             
-        # delete old sizer first
-        self._frame.SetSizer(None)
+        if self._frame.GetSizer() is None or self.GetLayoutKey() != self._layoutKey:
+            # delete old sizer first
+            self._frame.SetSizer(None)
+
+            # create a layout for all of the panes
+            sizer = self.LayoutAll(self._panes, self._docks, self._uiparts, False)
 
-        # create a layout for all of the panes
-        sizer = self.LayoutAll(self._panes, self._docks, self._uiparts, False)
+            # apply the new sizer
+            self._frame.SetSizer(sizer)
+            self._frame.SetAutoLayout(False)
+            self._layoutKey = self.GetLayoutKey()
 
-        # apply the new sizer
-        self._frame.SetSizer(sizer)
-        self._frame.SetAutoLayout(False)
+        # if nothing the layout depends on has changed (say, only a caption
+        # or the active pane did), the current sizers are simply laid out again
         self.DoFrameLayout()
 
         # now that the frame layout is done, we need to check
@@ -6388,6 +6503,32 @@ class AuiManager(wx.EvtHandler):
         if not self._masterManager:
             e = self.FireEvent(wxEVT_AUI_PERSPECTIVE_CHANGED, None, canVeto=False)
 
+    def GetLayoutKey(self):
+        """
+        Returns the state of the panes and docks that the layout built by
+        :meth:`LayoutAll` depends on. This is an internal function used by
+        :meth:`DoUpdate` to reuse the current layout when this state has not changed.
+        """
+
+        art = self._art
+        key = [self._agwFlags, id(art), self._frame.GetClientSize().Get(),
+               self._dock_constraint_x, self._dock_constraint_y]
+        key.extend([art.GetMetric(metric) for metric in
+                    (AUI_DOCKART_SASH_SIZE, AUI_DOCKART_CAPTION_SIZE, AUI_DOCKART_GRIPPER_SIZE,
+                     AUI_DOCKART_PANE_BORDER_SIZE, AUI_DOCKART_PANE_BUTTON_SIZE)])
+
+        for p in self._panes:
+            key.append((id(p), id(p.window), p.state & ~AuiPaneInfo.optionActive,
+                        p.dock_direction, p.dock_layer, p.dock_row, p.dock_pos, p.dock_proportion,
+                        p.best_size.Get(), p.min_size.Get(), p.max_size.Get(),
+                        p.notebook_id, [id(button) for button in p.buttons]))
+
+        for dock in self._docks:
+            key.append((dock.dock_direction, dock.dock_layer, dock.dock_row, dock.size,
+                        dock.min_size, dock.resizable, dock.fixed, dock.toolbar))
+
+        return key
+
     def UpdateNotebook(self):
         """ Updates the automatic :class:`~wx.lib.agw.aui.auibook.AuiNotebook` in the layout (if any exists). """
 
@@ -6709,6 +6850,7 @@ class AuiManager(wx.EvtHandler):
         """
 
         self._frame.Layout()
+        self._hitTestIndex = None
 
         for part in self._uiparts:
             # get the rectangle of the UI part
@@ -7215,7 +7357,7 @@ class AuiManager(wx.EvtHandler):
         if self._masterManager:
             self._masterManager.OnTabEndDrag(event)
         else:
-            self.Update()
+            self.ScheduleUpdate()
             event.Skip()
 
     def OnTabPageClose(self, event):
@@ -9116,7 +9258,7 @@ class AuiManager(wx.EvtHandler):
             self._art.Init()
 
         if self._frame:
-            self.Update()
+            self.ScheduleUpdate()
             self._frame.Refresh()
 
     def OnChildFocus(self, event):
@@ -101,6 +101,8 @@ to the standard :class:`TreeCtrl` behaviour this class supports:
 * Tooltips on long items when the horizontal space is low, via the ``TR_TOOLTIP_ON_LONG_ITEMS``
   style (`New in version 0.9.3`).
 * Hiding items
+* Very large trees, via the ``TR_VIRTUAL_ROWS`` style, and children added on demand with
+  :meth:`~CustomTreeCtrl.OnGetChildren`.
 
 And a lot more. Check the demo for an almost complete review of the functionalities.
 
@@ -134,6 +136,14 @@ ellipsized and/or highlighted with a tooltip:
 - ``TR_TOOLTIP_ON_LONG_ITEMS``: shows tooltips on long items when the horizontal space
   for :class:`CustomTreeCtrl` is low (`New in version 0.9.3`);.
 
+And a style for trees with very many items:
+
+- ``TR_VIRTUAL_ROWS``: keeps a flat index of the shown rows, so that only the rows
+  in view are laid out and painted. Expanding, collapsing, inserting and deleting
+  items only update the rows they affect, instead of the whole tree. Together with
+  :meth:`~CustomTreeCtrl.OnGetChildren`, the children of an item can be created only
+  when the item is first expanded.
+
 All the methods available in :class:`TreeCtrl` are also available in :class:`CustomTreeCtrl`.
 
 
@@ -330,6 +340,7 @@ Window agwStyle Flags             Hex Value   Description
 ``TR_ALIGN_WINDOWS_RIGHT``            0x40000 Flag used to align windows (in items with windows) to the rightmost edge of :class:`CustomTreeCtrl`.
 ``TR_ELLIPSIZE_LONG_ITEMS``           0x80000 Flag used to ellipsize long items when the horizontal space for :class:`CustomTreeCtrl` is low.
 ``TR_TOOLTIP_ON_LONG_ITEMS``         0x100000 Flag used to show tooltips on long items when the horizontal space for :class:`CustomTreeCtrl` is low.
+``TR_VIRTUAL_ROWS``                  0x800000 Only lay out and paint the rows in view, for trees with very many items.
 ================================= =========== ==================================================
 
 The ``wx.TR_HAS_VARIABLE_LINE_HEIGHT`` style should be set if item rows might
@@ -401,6 +412,9 @@ Version 2.8
 # Version Info
 __version__ = "2.8"
 
+import bisect
+import itertools
+
 import wx
 from wx.lib.expando import ExpandoTextCtrl
 
@@ -415,6 +429,13 @@ _PIXELS_PER_UNIT = 10
 # been clicked/moved)
 _DELAY = 500
 
+# Beyond this many subtrees marked for recalculation, the whole tree is
+# calculated again instead
+_MAX_DIRTY_SUBTREES = 32
+
+# Maximum number of text extents kept in the (font, text) cache
+_MAX_TEXT_EXTENTS = 10000
+
 # wxPython version string
 _VERSION_STRING = wx.VERSION_STRING
 
@@ -488,6 +509,8 @@ TR_ELLIPSIZE_LONG_ITEMS = 0x80000                              # to ellipsize lo
 """ Flag used to ellipsize long items when the horizontal space for :class:`CustomTreeCtrl` is low."""
 TR_TOOLTIP_ON_LONG_ITEMS = 0x100000                            # to display tooltips on long items when horizontal space is low
 """ Flag used to show tooltips on long items when the horizontal space for :class:`CustomTreeCtrl` is low."""
+TR_VIRTUAL_ROWS = 0x800000                                     # only lay out and paint the rows in view
+""" Only lay out and paint the rows in view, for trees with very many items."""
 
 TR_DEFAULT_STYLE = wx.TR_DEFAULT_STYLE                         # default style for the tree control
 """ The set of flags that are closest to the defaults for the native control for a particular toolkit. """
@@ -819,6 +842,487 @@ def BisectChildren(children, y):
     # Always return the previous index (it may be partially visible).
     return lo - 1 if lo > 0 else 0
 
+#---------------------------------------------------------------------------
+# TreeRowIndex Implementation
+# This Class Keeps The Flat List Of The Rows Shown By A Tree With The
+# TR_VIRTUAL_ROWS Style.
+#---------------------------------------------------------------------------
+
+class TreeRowIndex(object):
+    """
+    A flat index of the rows shown by a tree with the ``TR_VIRTUAL_ROWS`` style,
+    i.e. of the items whose parents are all expanded, in display order.
+
+    The items' positions are worked out from their row when they are asked
+    for (see :meth:`GenericTreeItem.GetY`): from the line height for uniform
+    rows, or from the running sum of the row heights otherwise. Expanding,
+    collapsing, inserting or deleting items only splices the rows they affect,
+    instead of laying out the whole tree again.
+
+    The index is rebuilt from the tree after changes it does not follow
+    itself, like sorting or hiding items (see :meth:`~TreeRowIndex.Invalidate`).
+    """
+
+    def __init__(self):
+        """ Default class constructor. """
+
+        self._rows = None       # the shown items, None when it must be rebuilt
+        self._heights = None    # the row heights, for variable row heights only
+        self._tops = [0]        # the top of each row, computed up to where needed
+        self._hintsFrom = 0     # rows from here on may have a stale item._row
+
+        self.gen = 0            # changed every time the item positions change
+        self.scrollSize = (0, 0)
+
+        self._hideRoot = False
+        self._variable = False
+        self._top = 0
+        self._xColStart = 0
+        self._indent = 0
+        self._lineHeight = 0
+
+
+    def Configure(self, hideRoot, variable, top, xColStart, indent, lineHeight):
+        """
+        Sets the geometry of the rows.
+
+        :param bool `hideRoot`: ``True`` if the root item is not shown;
+        :param bool `variable`: ``True`` if the rows can have different heights;
+        :param integer `top`: the `y` position of the first row;
+        :param integer `xColStart`: the `x` position of the items at level 0;
+        :param integer `indent`: the indentation of each level;
+        :param integer `lineHeight`: the height of the rows, or of the rows not
+         measured yet for variable row heights.
+        """
+
+        if hideRoot != self._hideRoot or variable != self._variable:
+            self._hideRoot = hideRoot
+            self._variable = variable
+            self.Invalidate()
+
+        geometry = (top, xColStart, indent, lineHeight)
+        if geometry != (self._top, self._xColStart, self._indent, self._lineHeight):
+            self._top, self._xColStart, self._indent, self._lineHeight = geometry
+            self._tops = [top]
+            self.gen += 1
+
+
+    def IsValid(self):
+        """ Returns ``True`` if the index is up to date with the tree. """
+
+        return self._rows is not None
+
+
+    def Invalidate(self):
+        """ Marks the index for rebuilding, after a change it can't follow. """
+
+        self._rows = self._heights = None
+        self._tops = [self._top]
+        self.gen += 1
+
+
+    def Rebuild(self, root):
+        """
+        Rebuilds the index from the tree.
+
+        :param `root`: the root item of the tree (an instance of :class:`GenericTreeItem`), or ``None``.
+        """
+
+        rows = []
+        if root is not None:
+            if not self._hideRoot and not root.IsHidden():
+                rows.append(root)
+                rows.extend(self.GetShownDescendants(root))
+            elif self._hideRoot:
+                rows.extend(self.GetShownDescendants(root, True))
+
+        self._rows = []
+        self._heights = [] if self._variable else None
+        self._tops = [self._top]
+        self.Splice(0, 0, rows)
+        self._hintsFrom = len(rows)
+
+
+    def GetCount(self):
+        """ Returns the number of rows. """
+
+        return len(self._rows)
+
+
+    def GetHeight(self):
+        """ Returns the total height of the rows, including the top margin. """
+
+        return self.GetRowTop(len(self._rows))
+
+
+    def GetShownDescendants(self, item, expanded=False):
+        """
+        Returns the descendants of an item that are shown, in display order.
+
+        :param `item`: an instance of :class:`GenericTreeItem`;
+        :param bool `expanded`: ``True`` to treat the item as expanded (as for
+         a hidden root).
+        """
+
+        shown = []
+        if not (expanded or item.IsExpanded()):
+            return shown
+
+        stack = [iter(item.GetChildren())]
+        while stack:
+            for child in stack[-1]:
+                if child.IsHidden():
+                    continue
+                shown.append(child)
+                if child.IsExpanded() and child.HasChildren():
+                    stack.append(iter(child.GetChildren()))
+                    break
+            else:
+                stack.pop()
+
+        return shown
+
+
+    def IsShown(self, item):
+        """
+        Returns ``True`` if the item should have a row, i.e. it is not hidden and
+        all of its parents are expanded.
+
+        :param `item`: an instance of :class:`GenericTreeItem`.
+        """
+
+        if item.IsHidden():
+            return False
+
+        parent = item.GetParent()
+        if parent is None:
+            return not self._hideRoot
+
+        while parent is not None:
+            if not parent.IsExpanded():
+                return False
+            parent = parent.GetParent()
+
+        return True
+
+
+    def GetLevel(self, item):
+        """
+        Returns the level of an item in the tree hierarchy (0 for the root).
+
+        :param `item`: an instance of :class:`GenericTreeItem`.
+        """
+
+        level = 0
+        parent = item.GetParent()
+        while parent is not None:
+            level += 1
+            parent = parent.GetParent()
+
+        return level
+
+
+    def RowOf(self, item, search=True):
+        """
+        Returns the row of an item, or ``None`` if it has no row.
+
+        :param `item`: an instance of :class:`GenericTreeItem`;
+        :param bool `search`: if ``False``, only use the row recorded in the item
+         (which is cheap but may be out of date after a splice above it) and
+         return ``None`` if it is out of date.
+        """
+
+        rows = self._rows
+        if rows is None:
+            return None
+
+        row = item._row
+        if 0 <= row < len(rows) and rows[row] is item:
+            return row
+
+        if not search or self._hintsFrom >= len(rows) or not self.IsShown(item):
+            return None
+
+        # Bring the rows recorded in the items up to date, once for all the
+        # items below the splices done since the last time.
+        for row in range(self._hintsFrom, len(rows)):
+            rows[row]._row = row
+        self._hintsFrom = len(rows)
+
+        row = item._row
+        if 0 <= row < len(rows) and rows[row] is item:
+            return row
+
+        return None
+
+
+    def GetRowTop(self, row):
+        """
+        Returns the `y` position of a row.
+
+        :param integer `row`: the row index, from 0 to :meth:`~TreeRowIndex.GetCount`.
+        """
+
+        if self._heights is None:
+            return self._top + row * self._lineHeight
+
+        tops = self._tops
+        if row >= len(tops):
+            start = len(tops) - 1
+            heights = self._heights[start:row]
+            heights[0] += tops[-1]
+            tops.extend(itertools.accumulate(heights))
+
+        return tops[row]
+
+
+    def GetRowAt(self, y):
+        """
+        Returns the row at a logical `y` position. This is -1 above the first
+        row and :meth:`~TreeRowIndex.GetCount` below the last one.
+
+        :param integer `y`: the logical `y` position.
+        """
+
+        count = len(self._rows)
+        if self._heights is None:
+            if self._lineHeight <= 0:
+                return 0
+            return max(-1, min(count, (y - self._top) // self._lineHeight))
+
+        tops = self._tops
+        if len(tops) <= count and tops[-1] <= y:
+            self.GetRowTop(count)
+
+        return min(count, bisect.bisect_right(tops, y) - 1)
+
+
+    def SetLineHeight(self, lineHeight):
+        """
+        Sets the height of the rows, or of the rows not measured yet for
+        variable row heights.
+
+        :param integer `lineHeight`: the line height, in pixels.
+        """
+
+        if lineHeight != self._lineHeight:
+            self._lineHeight = lineHeight
+            self._tops = [self._top]
+            self.gen += 1
+
+
+    def SetRowHeight(self, row, height):
+        """
+        Records the measured height of a row. Used only for variable row heights.
+
+        :param integer `row`: the row index;
+        :param integer `height`: the height of the row, in pixels.
+        """
+
+        heights = self._heights
+        if heights is not None and heights[row] != height:
+            heights[row] = height
+            del self._tops[row + 1:]
+            self.gen += 1
+
+
+    def PlaceRow(self, row):
+        """
+        Sets the position of the item at the given row, and returns it.
+
+        :param integer `row`: the row index.
+        """
+
+        item = self._rows[row]
+        item._row = row
+        item._rowGen = self.gen
+        item._x = self._xColStart + self.GetLevel(item) * self._indent
+        item._y = self.GetRowTop(row)
+        return item
+
+
+    def Place(self, item):
+        """
+        Sets the position of an item from its row. Items without a row are left
+        alone.
+
+        :param `item`: an instance of :class:`GenericTreeItem`.
+        """
+
+        row = self.RowOf(item)
+        if row is not None:
+            self.PlaceRow(row)
+
+
+    def GetItemAt(self, y):
+        """
+        Returns the item at a logical `y` position, or ``None``.
+
+        :param integer `y`: the logical `y` position.
+        """
+
+        if self._rows is None:
+            return None
+
+        row = self.GetRowAt(y)
+        if 0 <= row < len(self._rows):
+            return self.PlaceRow(row)
+
+        return None
+
+
+    def Splice(self, start, stop, items):
+        """
+        Replaces the rows from `start` to `stop` with the given items.
+
+        :param integer `start`: the first row to replace;
+        :param integer `stop`: the row after the last one to replace;
+        :param list `items`: the items to put in their place.
+        """
+
+        rows = self._rows
+        for item in rows[start:stop]:
+            item._row = -1
+        rows[start:stop] = items
+
+        if self._heights is not None:
+            lineHeight = self._lineHeight
+            self._heights[start:stop] = [lineHeight if item.IsDirty() else item.GetHeight()
+                                         for item in items]
+
+        end = start + len(items)
+        for row in range(start, end):
+            item = rows[row]
+            item._row = row
+            item._rowIndex = self
+
+        if end - start != stop - start:
+            self._hintsFrom = min(self._hintsFrom, end)
+
+        del self._tops[start + 1:]
+        self.gen += 1
+
+
+    def _RowBelow(self, item, search=True):
+        """ Returns the row after the given item, where its children start. """
+
+        if item.GetParent() is None and self._hideRoot:
+            return 0
+
+        row = self.RowOf(item, search)
+        return None if row is None else row + 1
+
+
+    def InsertDescendants(self, item):
+        """
+        Adds the rows of the descendants of an item, after it has been expanded.
+
+        :param `item`: an instance of :class:`GenericTreeItem`.
+        """
+
+        if self._rows is None or not (item.GetParent() is None or self.IsShown(item)):
+            return
+
+        row = self._RowBelow(item)
+        if row is None:
+            self.Invalidate()
+        else:
+            self.Splice(row, row, self.GetShownDescendants(item))
+
+
+    def RemoveDescendants(self, item):
+        """
+        Removes the rows of the descendants of an item, before it is collapsed
+        or its children are deleted.
+
+        :param `item`: an instance of :class:`GenericTreeItem`.
+        """
+
+        if self._rows is None or not (item.GetParent() is None or self.IsShown(item)):
+            return
+
+        row = self._RowBelow(item)
+        if row is None:
+            self.Invalidate()
+        else:
+            count = len(self.GetShownDescendants(item, item.GetParent() is None))
+            if count:
+                self.Splice(row, row + count, [])
+
+
+    def InsertItem(self, item, index):
+        """
+        Adds the row of an item just inserted in the tree.
+
+        :param `item`: an instance of :class:`GenericTreeItem`;
+        :param integer `index`: the index of the item among its siblings.
+        """
+
+        if self._rows is None or not self.IsShown(item):
+            return
+
+        parent = item.GetParent()
+        siblings = parent.GetChildren()
+        if not (0 <= index < len(siblings) and siblings[index] is item):
+            index = siblings.index(item)
+
+        # The item goes after the rows of its previous shown sibling, or just
+        # after its parent.
+        index -= 1
+        while index >= 0 and siblings[index].IsHidden():
+            index -= 1
+
+        if index >= 0:
+            previous = siblings[index]
+            row = self.RowOf(previous, False)
+            if row is not None:
+                row += 1 + len(self.GetShownDescendants(previous))
+        else:
+            row = self._RowBelow(parent, False)
+
+        if row is None:
+            # Finding it would cost as much as rebuilding the index later
+            self.Invalidate()
+        else:
+            self.Splice(row, row, [item] + self.GetShownDescendants(item))
+
+
+    def RemoveItem(self, item):
+        """
+        Removes the rows of an item and of its descendants, before it is deleted.
+
+        :param `item`: an instance of :class:`GenericTreeItem`.
+        """
+
+        if self._rows is None:
+            return
+
+        if item.GetParent() is None:
+            self.Invalidate()
+            return
+
+        row = self.RowOf(item, False)
+        if row is not None:
+            self.Splice(row, row + 1 + len(self.GetShownDescendants(item)), [])
+        elif item._row >= 0 and self.IsShown(item):
+            # The item has a row, but it moved since it was recorded.
+            self.Invalidate()
+
+
+    def IsLastShownChild(self, item):
+        """
+        Returns ``True`` if no shown sibling comes after the given item.
+
+        :param `item`: an instance of :class:`GenericTreeItem`.
+        """
+
+        siblings = item.GetParent().GetChildren()
+        index = len(siblings) - 1
+        while index > 0 and siblings[index].IsHidden():
+            index -= 1
+
+        return siblings[index] is item
+
 #---------------------------------------------------------------------------
 # DragImage Implementation
 # This Class Handles The Creation Of A Custom Image In Case Of Item Drag
@@ -1723,6 +2227,13 @@ class GenericTreeItem(object):
     :class:`CustomTreeCtrl`. This is a generic implementation of :class:`TreeItem`.
     """
 
+    # Used only with the TR_VIRTUAL_ROWS style: the TreeRowIndex holding the
+    # item, the item's row in it and the index generation the position of
+    # the item was computed for. Class attributes to save memory otherwise.
+    _rowIndex = None
+    _row = -1
+    _rowGen = -1
+
     def __init__(self, parent, text="", ct_type=0, wnd=None, image=-1, selImage=-1, data=None, separator=False, on_the_right=True):
         """
         Default class constructor.
@@ -2046,12 +2557,18 @@ class GenericTreeItem(object):
     def GetX(self):
         """ Returns the `x` position on an item, in logical coordinates. """
 
+        rowIndex = self._rowIndex
+        if rowIndex is not None and self._rowGen != rowIndex.gen:
+            rowIndex.Place(self)
         return self._x
 
 
     def GetY(self):
         """ Returns the `y` position on an item, in logical coordinates. """
 
+        rowIndex = self._rowIndex
+        if rowIndex is not None and self._rowGen != rowIndex.gen:
+            rowIndex.Place(self)
         return self._y
 
 
@@ -2785,6 +3302,16 @@ class GenericTreeItem(object):
         return self._extents is not None
 
 
+    def SetExtents(self, extents):
+        """
+        Sets the text extents of this item, when they are already known.
+
+        :param `extents`: a 2-tuple of (width, height).
+        """
+
+        self._extents = extents
+
+
     def GetExtents(self, dc=None):
         """
         Calculate text extents of this item using the given ClientDc.
@@ -3087,6 +3614,8 @@ class CustomTreeCtrl(wx.ScrolledWindow):
         self._hasFocus = False
         self._dirty = False         # Indicates if tree recalculation required.
         self._selectedItems = set()
+        self._textExtents = {}      # Cache of text extents, by (font, text).
+        self._rowIndex = None       # Flat index of the shown rows (TR_VIRTUAL_ROWS).
 
         # Default line height: it will soon be changed
         self._lineHeight = 10
@@ -3220,6 +3749,8 @@ class CustomTreeCtrl(wx.ScrolledWindow):
         wx.ScrolledWindow.__init__(self, parent, id, pos, size, style | wx.HSCROLL | wx.VSCROLL, name)
 
         self._agwStyle = agwStyle
+        if agwStyle & TR_VIRTUAL_ROWS:
+            self._rowIndex = TreeRowIndex()
 
         # Create the default check image list
         self.SetImageListCheck(16, 16)
@@ -3931,6 +4462,7 @@ class CustomTreeCtrl(wx.ScrolledWindow):
             # if we will hide the root, make sure children are visible
             self._anchor.SetHasPlus()
             self._anchor.Expand()
+            self._dirty = True
             self.CalculatePositions()
 
         # right now, just sets the styles.  Eventually, we may
@@ -3943,9 +4475,17 @@ class CustomTreeCtrl(wx.ScrolledWindow):
                 self.SelectItem(select, False)
 
         self._agwStyle = agwStyle
+        if agwStyle & TR_VIRTUAL_ROWS:
+            if self._rowIndex is None:
+                self._rowIndex = TreeRowIndex()
+            self._rowIndex.Invalidate()
+        elif self._rowIndex is not None:
+            self._rowIndex.Invalidate()
+            self._rowIndex = None
         # Mark all items for recalculation.
         if self._anchor:
             self.SetItemsDirty(self._anchor, clear_extents=True)
+        self._dirty = True
         # Force re-calculation of tree. Required if item X positions change.
         self.CalculatePositions()
 
@@ -4140,14 +4680,15 @@ class CustomTreeCtrl(wx.ScrolledWindow):
 
         # If tree already dirty don't attempt to refresh line.
         if self._dirty:
+            self.SetSubtreeDirty(item)
             return
 
         # Calculate new size of item's text.
         dc = self._freezeDC if self._freezeDC else wx.ClientDC(self)
         new_size = item.GetExtents(dc)
-        # If text height changed (number of lines) we need to recalculate tree.
+        # If text height changed (number of lines) we need to recalculate its row.
         if old_size is None or new_size[1] != old_size[1]:
-            self._dirty = True
+            self.SetSubtreeDirty(item)
         else:
             self.RefreshLine(item)
 
@@ -4171,13 +4712,16 @@ class CustomTreeCtrl(wx.ScrolledWindow):
         if not self._dirty and item.IsDirty() and self.IsItemShown(item):
             # Calculate item size to see if it changed height.
             old_height = self.GetLineHeight(item)
+            subtree_height = self.GetSubtreeBottom(item) - item.GetY()
             dc = self._freezeDC if self._freezeDC else wx.ClientDC(self)
             self.CalculateSize(item, dc)
-            # If the height changes, we need to recalculate the tree.
+            # If the height changes, we need to recalculate its row.
             if self.GetLineHeight(item) != old_height:
-                self._dirty = True
+                self.SetSubtreeDirty(item, subtree_height)
             else:
                 self.RefreshLine(item)
+        elif item.IsDirty():
+            self.SetSubtreeDirty(item)
 
 
     def SetItemLeftImage(self, item, image):
@@ -4250,7 +4794,7 @@ class CustomTreeCtrl(wx.ScrolledWindow):
         # avoid redrawing the tree if no real change
         if item.IsBold() != bold:
             item.SetBold(bold)
-            self._dirty = True
+            self.SetSubtreeDirty(item)
 
 
     def SetItemItalic(self, item, italic=True):
@@ -4263,7 +4807,7 @@ class CustomTreeCtrl(wx.ScrolledWindow):
 
         if item.IsItalic() != italic:
             item.SetItalic(italic)
-            self._dirty = True
+            self.SetSubtreeDirty(item)
 
 
     def SetItemDropHighlight(self, item, highlight=True):
@@ -4330,7 +4874,7 @@ class CustomTreeCtrl(wx.ScrolledWindow):
         # Set item font and clear text extents so it gets recalculated.
         item.Attr().SetFont(font)
         item.SetDirty(True, clear_extents=True)
-        self._dirty = True
+        self.SetSubtreeDirty(item)
 
 
     def SetFont(self, font):
@@ -4376,34 +4920,206 @@ class CustomTreeCtrl(wx.ScrolledWindow):
             self.SetItemsDirty(child, clear_extents)
 
 
-    def GetHyperTextFont(self):
+    def _GetDirty(self):
+        """ Returns whether the tree must be calculated again. Used internally. """
+
+        return self._treeDirty
+
+
+    def _SetDirty(self, dirty):
         """
-        Returns the font used to render hypertext items.
+        Sets whether the whole tree must be calculated again. Used internally.
 
-        :return: An instance of :class:`wx.Font`.
+        :param bool `dirty`: ``True`` to calculate the whole tree again.
 
-        :note: This method is meaningful only for hypertext-like items.
+        :note: Setting the flag drops the subtrees marked with :meth:`~CustomTreeCtrl.SetSubtreeDirty`,
+         as they are calculated with the rest of the tree.
         """
 
-        return self._hypertextfont
+        self._treeDirty = dirty
+        self._dirtySubtrees = None
 
+    _dirty = property(_GetDirty, _SetDirty)
 
-    def SetHyperTextFont(self, font):
+
+    def SetSubtreeDirty(self, item, height=None):
         """
-        Sets the font used to render hypertext items.
+        Mark the rows of an item and of its descendants to be calculated again,
+        instead of the whole tree. The rows after them are then moved by the
+        difference in height.
 
-        :param `font`: a valid :class:`wx.Font` instance.
+        :param `item`: an instance of :class:`GenericTreeItem`;
+        :param integer `height`: the height of these rows as currently laid out,
+         if it can't be worked out from the item anymore (for instance 0 for an
+         item that was just inserted).
 
-        :note: This method is meaningful only for hypertext-like items.
+        :note: Falls back to calculating the whole tree again when the rows are
+         not laid out independently (for the ``TR_VIRTUAL_ROWS`` and ``TR_ALIGN_WINDOWS``
+         styles, or for the root item).
         """
 
-        self._hypertextfont = font
-        if self._anchor:
-            self.SetItemsDirty(self._anchor, clear_extents=True)
-        self._dirty = True
-
+        dirtySubtrees = self._dirtySubtrees
+        if self._treeDirty and dirtySubtrees is None:
+            # The whole tree will be calculated again.
+            return
 
-    def SetHyperTextNewColour(self, colour):
+        # Items in collapsed branches are not laid out (the children of a
+        # hidden root always are).
+        hideRoot = self.HasAGWFlag(TR_HIDE_ROOT)
+        parent = item.GetParent()
+        while parent is not None:
+            if not parent.IsExpanded() and not (hideRoot and parent is self._anchor):
+                return
+            parent = parent.GetParent()
+
+        if (item is self._anchor or self._rowIndex is not None or self.HasAGWFlag(TR_ALIGN_WINDOWS) or
+            (dirtySubtrees is not None and len(dirtySubtrees) >= _MAX_DIRTY_SUBTREES)):
+            self._dirty = True
+            return
+
+        if height is None:
+            if dirtySubtrees is not None and item in dirtySubtrees:
+                return
+            height = self.GetSubtreeBottom(item) - item.GetY()
+
+        if dirtySubtrees is None:
+            dirtySubtrees = self._dirtySubtrees = {}
+
+        dirtySubtrees[item] = height
+        self._treeDirty = True
+
+
+    def SetInsertedItemDirty(self, item, index):
+        """
+        Mark a new item to be laid out, before the rows after it are moved down.
+
+        :param `item`: an instance of :class:`GenericTreeItem`, just inserted in the tree;
+        :param integer `index`: the index of the item among its siblings.
+        """
+
+        if self._treeDirty and self._dirtySubtrees is None:
+            return
+
+        parent = item.GetParent()
+        if not parent.IsExpanded():
+            # Only the parent button may change.
+            self.SetSubtreeDirty(parent)
+            return
+
+        siblings = parent.GetChildren()
+        if not (0 <= index < len(siblings) and siblings[index] is item):
+            index = siblings.index(item)
+
+        # The new row goes below the previous sibling and its descendants,
+        # or just below the parent row.
+        if index > 0:
+            y = self.GetSubtreeBottom(siblings[index - 1])
+        elif parent is self._anchor and self.HasAGWFlag(TR_HIDE_ROOT):
+            y = 2
+        else:
+            y = self.GetSubtreeBottom(parent, False)
+
+        item.SetY(y)
+        self.SetSubtreeDirty(item, 0)
+
+
+    def SetDeletedItemDirty(self, item):
+        """
+        Mark the rows around an item to be calculated again, before the item is deleted.
+
+        :param `item`: an instance of :class:`GenericTreeItem`, about to be deleted.
+        """
+
+        if self._treeDirty and self._dirtySubtrees is None:
+            return
+
+        parent = item.GetParent()
+        if parent is None:
+            self._dirty = True
+            return
+
+        if not parent.IsExpanded():
+            # Only the parent button may change.
+            self.SetSubtreeDirty(parent)
+            return
+
+        height = self.GetSubtreeBottom(item) - item.GetY()
+
+        # Forget the marked rows that go away with the item.
+        dirtySubtrees = self._dirtySubtrees
+        if dirtySubtrees:
+            for other in list(dirtySubtrees):
+                if self.IsDescendantOf(item, other):
+                    del dirtySubtrees[other]
+
+        # The rows of the item are merged with the ones of its previous sibling,
+        # of its next sibling or of its parent, which are calculated again.
+        siblings = parent.GetChildren()
+        index = siblings.index(item)
+        if index > 0:
+            previous = siblings[index - 1]
+            self.SetSubtreeDirty(previous, self.GetSubtreeBottom(previous) - previous.GetY() + height)
+        elif index + 1 < len(siblings):
+            following = siblings[index + 1]
+            height += self.GetSubtreeBottom(following) - following.GetY()
+            following.SetY(item.GetY())
+            self.SetSubtreeDirty(following, height)
+        else:
+            self.SetSubtreeDirty(parent)
+
+
+    def GetSubtreeBottom(self, item, recursively=True):
+        """
+        Returns the vertical position below the rows of an item, as currently laid out.
+        Used internally.
+
+        :param `item`: an instance of :class:`GenericTreeItem`;
+        :param bool `recursively`: ``True`` to include the rows of the item descendants.
+        """
+
+        dirtySubtrees = self._dirtySubtrees or {}
+        while recursively and item not in dirtySubtrees:
+            children = item.GetChildren()
+            if not (item.IsExpanded() and children):
+                break
+            item = children[-1]
+
+        if item in dirtySubtrees:
+            return item.GetY() + dirtySubtrees[item]
+        if item.IsHidden():
+            return item.GetY()
+
+        return item.GetY() + self.GetLineHeight(item)
+
+
+    def GetHyperTextFont(self):
+        """
+        Returns the font used to render hypertext items.
+
+        :return: An instance of :class:`wx.Font`.
+
+        :note: This method is meaningful only for hypertext-like items.
+        """
+
+        return self._hypertextfont
+
+
+    def SetHyperTextFont(self, font):
+        """
+        Sets the font used to render hypertext items.
+
+        :param `font`: a valid :class:`wx.Font` instance.
+
+        :note: This method is meaningful only for hypertext-like items.
+        """
+
+        self._hypertextfont = font
+        if self._anchor:
+            self.SetItemsDirty(self._anchor, clear_extents=True)
+        self._dirty = True
+
+
+    def SetHyperTextNewColour(self, colour):
         """
         Sets the colour used to render a non-visited hypertext item.
 
@@ -5643,8 +6359,6 @@ class CustomTreeCtrl(wx.ScrolledWindow):
             # should we give a warning here?
             return self.AddRoot(text, ct_type, wnd, image, selImage, data)
 
-        self._dirty = True     # do this first so stuff below doesn't cause flicker
-
         item = GenericTreeItem(parent, text, ct_type, wnd, image, selImage,
                                data, separator, on_the_right)
 
@@ -5653,6 +6367,11 @@ class CustomTreeCtrl(wx.ScrolledWindow):
             self._itemWithWindow.add(item)
 
         parent.Insert(item, previous)
+        if self._rowIndex is not None:
+            self._rowIndex.InsertItem(item, previous)
+
+        # Only the new row needs to be calculated, the ones after it move down.
+        self.SetInsertedItemDirty(item, previous)
 
         return item
 
@@ -5709,6 +6428,8 @@ class CustomTreeCtrl(wx.ScrolledWindow):
         self._anchor = GenericTreeItem(None, text, ct_type=ct_type, wnd=wnd,
                                        image=image, selImage=selImage,
                                        data=data, on_the_right=on_the_right)
+        if self._rowIndex is not None:
+            self._rowIndex.Invalidate()
 
         if wnd is not None:
             self._hasWindows = True
@@ -6013,9 +6734,11 @@ class CustomTreeCtrl(wx.ScrolledWindow):
         :param `item`: an instance of :class:`GenericTreeItem`.
         """
         if item.HasChildren():
-            self._dirty = True     # do this first so stuff below doesn't cause flicker
+            self.SetSubtreeDirty(item)     # do this first so stuff below doesn't cause flicker
 
             self.ChildrenClosing(item)
+            if self._rowIndex is not None:
+                self._rowIndex.RemoveDescendants(item)
             item.DeleteChildren(self)
 
     def Delete(self, item):
@@ -6027,7 +6750,7 @@ class CustomTreeCtrl(wx.ScrolledWindow):
         :note: This method sends the ``EVT_TREE_DELETE_ITEM`` event.
         """
 
-        self._dirty = True     # do this first so stuff below doesn't cause flicker
+        self.SetDeletedItemDirty(item)     # do this first so stuff below doesn't cause flicker
 
         if self._editCtrl is not None and self.IsDescendantOf(item, self._editCtrl.item()):
             # can't delete the item being edited, cancel editing it first
@@ -6060,6 +6783,9 @@ class CustomTreeCtrl(wx.ScrolledWindow):
             self._current = None
             self._select_me = parent
 
+        if self._rowIndex is not None:
+            self._rowIndex.RemoveItem(item)
+
         # remove the item from the tree
         if parent:
 
@@ -6099,6 +6825,54 @@ class CustomTreeCtrl(wx.ScrolledWindow):
             self.Delete(self._anchor)
 
 
+    def OnGetChildren(self, item):
+        """
+        This function may be overloaded in the derived class to create the children
+        of an item only when it is expanded for the first time, for instance to show
+        very large trees (see also the ``TR_VIRTUAL_ROWS`` style).
+
+        Give the items a button with :meth:`~CustomTreeCtrl.SetItemHasChildren` instead
+        of adding their children, and return the children from here. It is called
+        (after the ``EVT_TREE_ITEM_EXPANDING`` event) when an item that has a button but
+        no children is expanded.
+
+        :param `item`: an instance of :class:`GenericTreeItem`, the item being expanded.
+
+        :return: ``None`` to expand the item as it is (the default), or a sequence of
+         ``(text, data, hasChildren)`` tuples, one for each child to append to `item`.
+         If the sequence is empty the item loses its button and is not expanded.
+        """
+
+        return None
+
+
+    def FetchChildren(self, item):
+        """
+        Appends the children returned by :meth:`~CustomTreeCtrl.OnGetChildren` to
+        an item. Used internally.
+
+        :param `item`: an instance of :class:`GenericTreeItem`.
+
+        :return: ``False`` if the item turned out to have no children, ``True`` otherwise.
+        """
+
+        children = self.OnGetChildren(item)
+        if children is None:
+            return True
+
+        for text, data, hasChildren in children:
+            child = self.AppendItem(item, text, data=data)
+            if hasChildren:
+                child.SetHasPlus()
+
+        if not item.HasChildren():
+            item.SetHasPlus(False)
+            self.RefreshLine(item)
+            return False
+
+        return True
+
+
     def Expand(self, item):
         """
         Expands an item, sending a ``EVT_TREE_ITEM_EXPANDING`` and
@@ -6128,12 +6902,22 @@ class CustomTreeCtrl(wx.ScrolledWindow):
                 # cancelled by program
                 return
 
+        if not item.HasChildren() and not self.FetchChildren(item):
+            return
+
+        # Only the expanded subtree needs to be calculated.
+        self.SetSubtreeDirty(item)
         item.Expand()
 
         if not self._sendEvent:
             # We are in ExpandAll/ExpandAllChildren
+            if self._rowIndex is not None:
+                self._rowIndex.Invalidate()
             return
 
+        if self._rowIndex is not None:
+            self._rowIndex.InsertDescendants(item)
+
         self.CalculatePositions()
         self.RefreshSubtree(item)
 
@@ -6214,6 +6998,9 @@ class CustomTreeCtrl(wx.ScrolledWindow):
             return
 
         self.ChildrenClosing(item)
+        if self._rowIndex is not None:
+            self._rowIndex.RemoveDescendants(item)
+        self.SetSubtreeDirty(item)
         item.Collapse()
 
         self.CalculatePositions()
@@ -6281,15 +7068,16 @@ class CustomTreeCtrl(wx.ScrolledWindow):
         if hide == item.IsHidden():
             # Item already in correct state. Don't do anything.
             return
+        # Its subtree needs to be recalculated (next paint or idle handler)
+        self.SetSubtreeDirty(item)
         item.Hide(hide)
+        if self._rowIndex is not None:
+            self._rowIndex.Invalidate()
 
         if hide is True and self._hasWindows:
             # Hide all windows for this item and its children.
             self.HideItemWindows(item)
 
-        # Tree needs to be recalculated (next paint or idle handler)
-        self._dirty = True
-
 
     def Unselect(self):
         """ Unselects the current selection. """
@@ -6803,9 +7591,11 @@ class CustomTreeCtrl(wx.ScrolledWindow):
         children = item.GetChildren()
 
         if len(children) > 1:
-            self._dirty = True
+            self.SetSubtreeDirty(item)
             from functools import cmp_to_key
             children.sort(key=cmp_to_key(self.OnCompareItems))
+            if self._rowIndex is not None:
+                self._rowIndex.Invalidate()
 
 
     def GetImageList(self):
@@ -6996,6 +7786,7 @@ class CustomTreeCtrl(wx.ScrolledWindow):
                 self._grayedImageListLeft.Add(newbmp)
 
         # Force re-calculation of tree as all item X positions will change.
+        self._dirty = True
         self.CalculatePositions()
 
 
@@ -7741,124 +8532,7 @@ class CustomTreeCtrl(wx.ScrolledWindow):
         exposed_y = dc.LogicalToDeviceY(y_top)
 
         if self.IsExposed(exposed_x, exposed_y, 10000, h):  # 10000 = very much
-            if wx.Platform == "__WXMAC__":
-                # don't draw rect outline if we already have the
-                # background colour under Mac
-                pen = ((item.IsSelected() and self._hasFocus) and [self._borderPen] or [wx.TRANSPARENT_PEN])[0]
-            else:
-                pen = self._borderPen
-
-            if item.IsSelected():
-                colText = wx.SystemSettings.GetColour(wx.SYS_COLOUR_HIGHLIGHTTEXT)
-
-                if self._vistaselection:
-                    colText = wx.BLACK
-                    attr = item.GetAttributes()
-
-                    if attr and attr.HasTextColour():
-                        colText = attr.GetTextColour()
-
-            else:
-                attr = item.GetAttributes()
-                if attr and attr.HasTextColour():
-                    colText = attr.GetTextColour()
-                else:
-                    colText = self.GetForegroundColour()
-
-            # prepare to draw
-            dc.SetTextForeground(colText)
-            dc.SetPen(pen)
-            oldpen = pen
-
-            # draw
-            self.PaintItem(item, dc, level, align)
-
-            if self.HasAGWFlag(TR_ROW_LINES):
-
-                # if the background colour is white, choose a
-                # contrasting colour for the lines
-                medium_grey = wx.Pen(wx.Colour(200, 200, 200))
-                dc.SetPen(((self.GetBackgroundColour() == wx.WHITE) and [medium_grey] or [wx.WHITE_PEN])[0])
-                dc.DrawLine(0, y_top, 10000, y_top)
-                dc.DrawLine(0, y, 10000, y)
-
-            # restore DC objects
-            dc.SetBrush(wx.WHITE_BRUSH)
-            dc.SetTextForeground(wx.BLACK)
-
-            if not self.HasAGWFlag(TR_NO_LINES):
-
-                # draw the horizontal line here
-                dc.SetPen(self._dottedPen)
-                x_start = x
-                if x > self._indent + self._leftWidth:
-                    x_start -= self._indent
-                elif self.HasAGWFlag(TR_LINES_AT_ROOT):
-                    x_start = 3
-                dc.DrawLine(x_start, y_mid, x + self._spacing, y_mid)
-                dc.SetPen(oldpen)
-
-            # should the item show a button?
-            if item.HasPlus() and self.HasButtons():
-
-                if self._imageListButtons:
-
-                    # draw the image button here
-                    image_h = 0
-                    image_w = 0
-                    image = (item.IsExpanded() and [TreeItemIcon_Expanded] or [TreeItemIcon_Normal])[0]
-                    if item.IsSelected():
-                        image += TreeItemIcon_Selected - TreeItemIcon_Normal
-
-                    image_w, image_h = self._imageListButtons.GetSize(image)
-                    xx = x - image_w // 2
-                    yy = y_mid - image_h // 2
-
-                    dc.SetClippingRegion(xx, yy, image_w, image_h)
-                    self._imageListButtons.Draw(image, dc, xx, yy,
-                                                wx.IMAGELIST_DRAW_TRANSPARENT)
-                    dc.DestroyClippingRegion()
-
-                else:   # no custom buttons
-
-                    if self.HasAGWFlag(TR_TWIST_BUTTONS):
-                        # We draw something like the Mac twist buttons
-
-                        dc.SetPen(wx.BLACK_PEN)
-                        dc.SetBrush(self._hilightBrush)
-                        button = [wx.Point(), wx.Point(), wx.Point()]
-
-                        if item.IsExpanded():
-                            button[0].x = x - 5
-                            button[0].y = y_mid - 3
-                            button[1].x = x + 5
-                            button[1].y = button[0].y
-                            button[2].x = x
-                            button[2].y = button[0].y + 6
-                        else:
-                            button[0].x = x - 3
-                            button[0].y = y_mid - 5
-                            button[1].x = button[0].x
-                            button[1].y = y_mid + 5
-                            button[2].x = button[0].x + 5
-                            button[2].y = y_mid
-
-                        dc.DrawPolygon(button)
-
-                    else:
-                        # These are the standard wx.TreeCtrl buttons as wx.RendererNative knows
-
-                        wImage = 11
-                        hImage = 11
-
-                        flag = 0
-
-                        if item.IsExpanded():
-                            flag |= _CONTROL_EXPANDED
-                        if item == self._underMouse:
-                            flag |= _CONTROL_CURRENT
-
-                        self._drawingfunction(self, dc, wx.Rect(x - wImage // 2, y_mid - hImage // 2, wImage, hImage), flag)
+            self.PaintRow(item, dc, level, align)
 
         # If this item is expanded, handle its children.
         if item.IsExpanded():
@@ -7918,6 +8592,242 @@ class CustomTreeCtrl(wx.ScrolledWindow):
         return y
 
 
+    def PaintRow(self, item, dc, level, align):
+        """
+        Paint the row of an item: the item itself, its button and its horizontal tree line.
+
+        :param `item`: an instance of :class:`GenericTreeItem`;
+        :param `dc`: an instance of :class:`wx.DC`;
+        :param integer `level`: the item level in the tree hierarchy;
+        :param integer `align`: the alignment type, see :meth:`~CustomTreeCtrl.PaintLevel`.
+        """
+
+        x = item.GetX() - self._spacing
+        h = self.GetLineHeight(item)
+        y_top = item.GetY()
+        y_mid = y_top + (h >> 1)
+        y = y_top + h
+
+        if wx.Platform == "__WXMAC__":
+            # don't draw rect outline if we already have the
+            # background colour under Mac
+            pen = ((item.IsSelected() and self._hasFocus) and [self._borderPen] or [wx.TRANSPARENT_PEN])[0]
+        else:
+            pen = self._borderPen
+
+        if item.IsSelected():
+            colText = wx.SystemSettings.GetColour(wx.SYS_COLOUR_HIGHLIGHTTEXT)
+
+            if self._vistaselection:
+                colText = wx.BLACK
+                attr = item.GetAttributes()
+
+                if attr and attr.HasTextColour():
+                    colText = attr.GetTextColour()
+
+        else:
+            attr = item.GetAttributes()
+            if attr and attr.HasTextColour():
+                colText = attr.GetTextColour()
+            else:
+                colText = self.GetForegroundColour()
+
+        # prepare to draw
+        dc.SetTextForeground(colText)
+        dc.SetPen(pen)
+        oldpen = pen
+
+        # draw
+        self.PaintItem(item, dc, level, align)
+
+        if self.HasAGWFlag(TR_ROW_LINES):
+
+            # if the background colour is white, choose a
+            # contrasting colour for the lines
+            medium_grey = wx.Pen(wx.Colour(200, 200, 200))
+            dc.SetPen(((self.GetBackgroundColour() == wx.WHITE) and [medium_grey] or [wx.WHITE_PEN])[0])
+            dc.DrawLine(0, y_top, 10000, y_top)
+            dc.DrawLine(0, y, 10000, y)
+
+        # restore DC objects
+        dc.SetBrush(wx.WHITE_BRUSH)
+        dc.SetTextForeground(wx.BLACK)
+
+        if not self.HasAGWFlag(TR_NO_LINES):
+
+            # draw the horizontal line here
+            dc.SetPen(self._dottedPen)
+            x_start = x
+            if x > self._indent + self._leftWidth:
+                x_start -= self._indent
+            elif self.HasAGWFlag(TR_LINES_AT_ROOT):
+                x_start = 3
+            dc.DrawLine(x_start, y_mid, x + self._spacing, y_mid)
+            dc.SetPen(oldpen)
+
+        # should the item show a button?
+        if item.HasPlus() and self.HasButtons():
+
+            if self._imageListButtons:
+
+                # draw the image button here
+                image_h = 0
+                image_w = 0
+                image = (item.IsExpanded() and [TreeItemIcon_Expanded] or [TreeItemIcon_Normal])[0]
+                if item.IsSelected():
+                    image += TreeItemIcon_Selected - TreeItemIcon_Normal
+
+                image_w, image_h = self._imageListButtons.GetSize(image)
+                xx = x - image_w // 2
+                yy = y_mid - image_h // 2
+
+                dc.SetClippingRegion(xx, yy, image_w, image_h)
+                self._imageListButtons.Draw(image, dc, xx, yy,
+                                            wx.IMAGELIST_DRAW_TRANSPARENT)
+                dc.DestroyClippingRegion()
+
+            else:   # no custom buttons
+
+                if self.HasAGWFlag(TR_TWIST_BUTTONS):
+                    # We draw something like the Mac twist buttons
+
+                    dc.SetPen(wx.BLACK_PEN)
+                    dc.SetBrush(self._hilightBrush)
+                    button = [wx.Point(), wx.Point(), wx.Point()]
+
+                    if item.IsExpanded():
+                        button[0].x = x - 5
+                        button[0].y = y_mid - 3
+                        button[1].x = x + 5
+                        button[1].y = button[0].y
+                        button[2].x = x
+                        button[2].y = button[0].y + 6
+                    else:
+                        button[0].x = x - 3
+                        button[0].y = y_mid - 5
+                        button[1].x = button[0].x
+                        button[1].y = y_mid + 5
+                        button[2].x = button[0].x + 5
+                        button[2].y = y_mid
+
+                    dc.DrawPolygon(button)
+
+                else:
+                    # These are the standard wx.TreeCtrl buttons as wx.RendererNative knows
+
+                    wImage = 11
+                    hImage = 11
+
+                    flag = 0
+
+                    if item.IsExpanded():
+                        flag |= _CONTROL_EXPANDED
+                    if item == self._underMouse:
+                        flag |= _CONTROL_CURRENT
+
+                    self._drawingfunction(self, dc, wx.Rect(x - wImage // 2, y_mid - hImage // 2, wImage, hImage), flag)
+
+
+    def PaintRows(self, dc, align):
+        """
+        Paint the rows in the update region, for trees with the ``TR_VIRTUAL_ROWS`` style.
+
+        :param `dc`: an instance of :class:`wx.DC`;
+        :param integer `align`: the alignment type, see :meth:`~CustomTreeCtrl.PaintLevel`.
+        """
+
+        rowIndex = self._rowIndex
+        if not rowIndex.IsValid():
+            self.CalculatePositions()
+
+        rect = self.GetUpdateRegion().GetBox()
+        start_y = self.CalcUnscrolledPosition(0, rect.y)[1]
+
+        first, stop, changed = self.LayoutRows(dc, start_y, start_y + rect.height)
+        if changed:
+            # Calculate the tree again in idle time, to update the scrollbars.
+            self._dirty = True
+
+        for row in range(first, stop):
+            item = rowIndex.PlaceRow(row)
+            level = rowIndex.GetLevel(item)
+            self.PaintRow(item, dc, level, align)
+            self.PaintRowLines(item, dc)
+
+
+    def PaintRowLines(self, item, dc):
+        """
+        Paint the parts of the vertical tree lines that cross the row of an item,
+        for trees with the ``TR_VIRTUAL_ROWS`` style.
+
+        :param `item`: an instance of :class:`GenericTreeItem`;
+        :param `dc`: an instance of :class:`wx.DC`.
+        """
+
+        if self.HasAGWFlag(TR_NO_LINES):
+            return
+
+        self.DrawRowLines(item, dc, -self._spacing, 5 if self.HasButtons() else 0,
+                          self.HasAGWFlag(TR_LINES_AT_ROOT))
+
+
+    def DrawRowLines(self, item, dc, x_offset, y_offset, lines_at_root=False):
+        """
+        Draws the parts of the vertical tree lines that cross the row of an item.
+        Used internally.
+
+        :param `item`: an instance of :class:`GenericTreeItem`;
+        :param `dc`: an instance of :class:`wx.DC`;
+        :param integer `x_offset`: where the line down to the children of an item is,
+         relative to the item `x` position;
+        :param integer `y_offset`: where the line down to the children of an item starts,
+         relative to the middle of its row;
+        :param bool `lines_at_root`: ``True`` to draw the line joining the items at
+         the first level when the root is hidden.
+        """
+
+        rowIndex = self._rowIndex
+        h = self.GetLineHeight(item)
+        y_top = item.GetY()
+        y_mid = y_top + (h >> 1)
+        y_bottom = y_top + h
+        x = item.GetX() + x_offset
+
+        dc.SetPen(self._dottedPen)
+
+        # The line down to the children, below the button.
+        if item.IsExpanded() and any(not child.IsHidden() for child in item.GetChildren()):
+            if y_mid + y_offset < y_bottom:
+                dc.DrawLine(x, y_mid + y_offset, x, y_bottom)
+
+        # The lines from the item parent and ancestors, down to their last child.
+        node = item
+        while True:
+            parent = node.GetParent()
+            if parent is None:
+                break
+
+            x -= self._indent
+            last = rowIndex.IsLastShownChild(node)
+
+            if parent.GetParent() is None and self.HasAGWFlag(TR_HIDE_ROOT):
+                # Line joining the items at the first level.
+                siblings = parent.GetChildren()
+                if lines_at_root and len(siblings) > 1:
+                    top = y_mid if (node is item and node is siblings[0]) else y_top
+                    bottom = y_mid if last else y_bottom
+                    if (node is item or not last) and top < bottom:
+                        dc.DrawLine(3, top, 3, bottom)
+                break
+
+            if node is item:
+                dc.DrawLine(x, y_top, x, y_mid if last else y_bottom)
+            elif not last:
+                dc.DrawLine(x, y_top, x, y_bottom)
+
+            node = parent
+
+
 # -----------------------------------------------------------------------------
 # wxWidgets callbacks
 # -----------------------------------------------------------------------------
@@ -7948,6 +8858,10 @@ class CustomTreeCtrl(wx.ScrolledWindow):
         elif self.HasAGWFlag(TR_ALIGN_WINDOWS_RIGHT):
             align = 2
 
+        if self._rowIndex is not None:
+            self.PaintRows(dc, align)
+            return
+
         y = 2
         self.PaintLevel(self._anchor, dc, 0, y, align)
 
@@ -8605,7 +9519,10 @@ class CustomTreeCtrl(wx.ScrolledWindow):
             return None, flags
 
         point = self.CalcUnscrolledPosition(*point)
-        hit, flags = self._anchor.HitTest(point, self, flags, 0)
+        if self._rowIndex is not None:
+            hit, flags = self.HitTestRows(point, flags)
+        else:
+            hit, flags = self._anchor.HitTest(point, self, flags, 0)
 
         if hit is None:
             flags = TREE_HITTEST_NOWHERE
@@ -8617,6 +9534,27 @@ class CustomTreeCtrl(wx.ScrolledWindow):
         return hit, flags
 
 
+    def HitTestRows(self, point, flags=0):
+        """
+        Finds the item at the given logical point, for trees with the ``TR_VIRTUAL_ROWS`` style.
+        Used internally by :meth:`~CustomTreeCtrl.HitTest`.
+
+        :param `point`: the logical point to test;
+        :param integer `flags`: a bitlist of hit locations.
+
+        :return: A 2-tuple of (item, flags). The item may be ``None``.
+        """
+
+        if self._dirty and not self._rowIndex.IsValid():
+            self.CalculatePositions()
+
+        item = self._rowIndex.GetItemAt(point[1])
+        if item is None or point[1] == item.GetY():
+            return None, flags
+
+        return item.HitTest(point, self, flags, self._rowIndex.GetLevel(item))
+
+
     def GetBoundingRect(self, item, textOnly=False):
         """
         Retrieves the rectangle bounding the item.
@@ -9153,7 +10091,8 @@ class CustomTreeCtrl(wx.ScrolledWindow):
         if self._freezeCount:
             return
 
-        self._dirty = False
+        # Keep the subtrees marked for calculation, if any.
+        self._treeDirty = False
 
         self.CalculatePositions()
         self.Refresh()
@@ -9202,7 +10141,7 @@ class CustomTreeCtrl(wx.ScrolledWindow):
                 font = self._italicFont         # Italics font.
             else:
                 font = self._normalFont         # Default font.
-            dc.SetFont(font)
+            item.SetExtents(self.GetTextExtents(dc, font, item.GetText()))
 
         text_w, text_h = item.GetExtents(dc)
         text_h += 2
@@ -9272,6 +10211,32 @@ class CustomTreeCtrl(wx.ScrolledWindow):
         """
 
         x = x_colstart + level * self._indent
+        y += self.CalculateRow(item, dc, level, x, y, align)
+
+        if not item.IsExpanded():
+            # we don't need to calculate collapsed branches
+            return y
+
+        # Recurse
+        for child in item.GetChildren():
+            y = self.CalculateLevel(child, dc, level + 1, x_colstart, y, align)
+        return y
+
+
+    def CalculateRow(self, item, dc, level, x, y, align=0):
+        """
+        Calculates the size of an item if required, and places it (and its window,
+        if any) at the given position.
+
+        :param `item`: an instance of :class:`GenericTreeItem`;
+        :param `dc`: an instance of :class:`wx.DC`;
+        :param integer `level`: the item level in the tree hierarchy;
+        :param integer `x`: the horizontal position of the item;
+        :param integer `y`: the vertical position of the item;
+        :param integer `align`: the alignment type, see :meth:`~CustomTreeCtrl.CalculateLevel`.
+
+        :return: The height of the item row (0 for hidden items).
+        """
 
         # Calculate the width and height of this item only if required.
         if item.IsDirty():
@@ -9283,7 +10248,7 @@ class CustomTreeCtrl(wx.ScrolledWindow):
 
         # hidden items don't get a height (height=0).
         if item.IsHidden():
-            return y
+            return 0
         item_height = self.GetLineHeight(item)
         item_width = item.GetWidth()
 
@@ -9305,19 +10270,34 @@ class CustomTreeCtrl(wx.ScrolledWindow):
                 if width > self.absoluteWindows.get(level, 0):
                     self.absoluteWindows[level] = width
         
-        # Advance Y to next item and update tree width.
-        y += item_height
+        # Update tree width.
         if not item.IsSeparator():
             self._width = max(self._width, x + item_width)
 
-        if not item.IsExpanded():
-            # we don't need to calculate collapsed branches
-            return y
+        return item_height
 
-        # Recurse
-        for child in item.GetChildren():
-            y = self.CalculateLevel(child, dc, level + 1, x_colstart, y, align)
-        return y
+
+    def GetTextExtents(self, dc, font, text):
+        """
+        Returns the extents of a text in a font, measuring it only the first time. Used internally.
+
+        :param `dc`: an instance of :class:`wx.DC`;
+        :param `font`: an instance of :class:`wx.Font`;
+        :param string `text`: the text to measure.
+
+        :return: A 2-tuple of (width, height).
+        """
+
+        key = (font.GetNativeFontInfoDesc(), text)
+        extents = self._textExtents.get(key)
+        if extents is None:
+            if len(self._textExtents) >= _MAX_TEXT_EXTENTS:
+                self._textExtents.clear()
+            dc.SetFont(font)
+            width, height, dummy = dc.GetFullMultiLineTextExtent(text)
+            extents = self._textExtents[key] = (width, height)
+
+        return extents
 
 
     def CalculatePositions(self):
@@ -9330,7 +10310,8 @@ class CustomTreeCtrl(wx.ScrolledWindow):
             return
         if self._freezeCount:
             # Don't calculate positions if frozen as it is CPU intensive.
-            self._dirty = True
+            # Keep the subtrees marked for calculation, if any.
+            self._treeDirty = True
             return
 
         self.absoluteWindows = {}
@@ -9338,9 +10319,15 @@ class CustomTreeCtrl(wx.ScrolledWindow):
         dc = wx.ClientDC(self)
         self.PrepareDC(dc)
 
-        # Save old tree dimensions. Reset width as CalculateLevel updates it.
+        # Save old tree dimensions.
         old_width, old_height = self._width, self._height
-        self._width = 0
+        rowIndex = self._rowIndex
+        if rowIndex is not None:
+            # Only the rows in view are calculated, so the width is the
+            # widest row seen since the index was built.
+            old_width, old_height = rowIndex.scrollSize
+            if not rowIndex.IsValid():
+                self._width = 0
 
         dc.SetFont(self._normalFont)
         dc.SetPen(self._dottedPen)
@@ -9371,25 +10358,206 @@ class CustomTreeCtrl(wx.ScrolledWindow):
         y = 2
 
         if not self.HasAGWFlag(TR_HIDE_ROOT):
-            # Calculate tree from root.
             x_colstart += self._indent
-            y = self.CalculateLevel(self._anchor, dc, 0, x_colstart, y, align)
+
+        if rowIndex is not None:
+            # Calculate only the rows in view.
+            y = self.CalculateRows(dc, x_colstart, y)
+        elif self._dirtySubtrees and self.CalculateSubtrees(dc, x_colstart):
+            # Only the subtrees that changed were calculated.
+            y = self._height
         else:
-            # A hidden root is not evaluated, but its children are.
-            for child in self._anchor.GetChildren():
-                y = self.CalculateLevel(child, dc, 1, x_colstart, y, align)
-        
+            # Reset width as CalculateLevel updates it.
+            self._width = 0
+            if not self.HasAGWFlag(TR_HIDE_ROOT):
+                # Calculate tree from root.
+                y = self.CalculateLevel(self._anchor, dc, 0, x_colstart, y, align)
+            else:
+                # A hidden root is not evaluated, but its children are.
+                for child in self._anchor.GetChildren():
+                    y = self.CalculateLevel(child, dc, 1, x_colstart, y, align)
+
         self._height = y
 
         # If the size of the tree has changed, update our scrollbars.
         if self._width != old_width or self._height != old_height:
             self.AdjustMyScrollbars(tree_size=(self._width, self._height))
+            if rowIndex is not None:
+                rowIndex.scrollSize = (self._width, self._height)
         # Clear tree dirty flag.
         self._dirty = False
         # Refresh client window.
         self.Refresh()
 
 
+    def CalculateSubtrees(self, dc, x_colstart):
+        """
+        Calculates again the subtrees marked with :meth:`~CustomTreeCtrl.SetSubtreeDirty`,
+        and moves the rows after each of them by its difference in height.
+
+        Used internally by :meth:`~CustomTreeCtrl.CalculatePositions`.
+
+        :param `dc`: an instance of :class:`wx.DC`;
+        :param integer `x_colstart`: the horizontal position of the items at level 0.
+
+        :return: ``False`` if the whole tree must be calculated instead.
+
+        :note: The tree width only grows here, it shrinks the next time the whole
+         tree is calculated.
+        """
+
+        dirtySubtrees = self._dirtySubtrees
+        variable = self.HasAGWFlag(TR_HAS_VARIABLE_ROW_HEIGHT)
+        lineHeight = self._lineHeight
+
+        for item, old_height in list(dirtySubtrees.items()):
+            level = 0
+            parent = item.GetParent()
+            while parent is not None and parent not in dirtySubtrees:
+                level += 1
+                parent = parent.GetParent()
+
+            if parent is not None:
+                # Calculated with its marked ancestor.
+                continue
+
+            y = item.GetY()
+            height = self.CalculateLevel(item, dc, level, x_colstart, y) - y
+
+            if not variable and self._lineHeight != lineHeight:
+                # A taller item changes the height of all the rows.
+                return False
+
+            if height != old_height:
+                self.MoveRowsAfter(item, dc, height - old_height)
+                self._height += height - old_height
+
+        return True
+
+
+    def MoveRowsAfter(self, item, dc, delta):
+        """
+        Moves down (or up) the rows after an item and its descendants. Used internally.
+
+        :param `item`: an instance of :class:`GenericTreeItem`;
+        :param `dc`: an instance of :class:`wx.DC`;
+        :param integer `delta`: how much to move the rows, in pixels.
+        """
+
+        moved = []
+        node = item
+        parent = node.GetParent()
+
+        while parent is not None:
+            siblings = parent.GetChildren()
+            stack = [itertools.islice(siblings, siblings.index(node) + 1, None)]
+            while stack:
+                for child in stack[-1]:
+                    child.SetY(child.GetY() + delta)
+                    if child.GetWindow():
+                        moved.append(child)
+                    if child.IsExpanded() and child.HasChildren():
+                        stack.append(iter(child.GetChildren()))
+                        break
+                else:
+                    stack.pop()
+
+            node = parent
+            parent = node.GetParent()
+
+        # Item windows must follow their rows.
+        for child in moved:
+            self.CalculateRow(child, dc, -1, child.GetX(), child.GetY())
+
+
+    def CalculateRows(self, dc, x_colstart, y):
+        """
+        Calculates the positions of the rows in view, for trees with the
+        ``TR_VIRTUAL_ROWS`` style. The other items are placed from their row
+        when their position is asked for.
+
+        Used internally by :meth:`~CustomTreeCtrl.CalculatePositions`.
+
+        :param `dc`: an instance of :class:`wx.DC`;
+        :param integer `x_colstart`: the horizontal position of the items at level 0;
+        :param integer `y`: the vertical position of the first row.
+
+        :return: The vertical position after the last row.
+        """
+
+        rowIndex = self._rowIndex
+        rowIndex.Configure(self.HasAGWFlag(TR_HIDE_ROOT),
+                           self.HasAGWFlag(TR_HAS_VARIABLE_ROW_HEIGHT),
+                           y, x_colstart, self._indent, self._lineHeight)
+        if not rowIndex.IsValid():
+            rowIndex.Rebuild(self._anchor)
+
+        width, height = self.GetClientSize()
+        start_y = self.CalcUnscrolledPosition(0, 0)[1]
+        self.LayoutRows(dc, start_y, start_y + height)
+
+        # Item windows must follow their rows, even out of view.
+        for item in list(self._itemWithWindow):
+            row = rowIndex.RowOf(item)
+            if row is not None:
+                self.LayoutRow(dc, row)
+
+        return rowIndex.GetHeight()
+
+
+    def LayoutRow(self, dc, row, align=None):
+        """
+        Places the item at the given row, calculating its size if required, for
+        trees with the ``TR_VIRTUAL_ROWS`` style. Used internally.
+
+        :param `dc`: an instance of :class:`wx.DC`;
+        :param integer `row`: the row index;
+        :param integer `align`: the alignment type, see :meth:`~CustomTreeCtrl.CalculateLevel`.
+         If ``None`` it is taken from the tree style.
+
+        :return: The item at the given row.
+        """
+
+        if align is None:
+            align = 1 if self.HasAGWFlag(TR_ALIGN_WINDOWS) else 0
+
+        rowIndex = self._rowIndex
+        item = rowIndex.PlaceRow(row)
+        height = self.CalculateRow(item, dc, rowIndex.GetLevel(item), item.GetX(), item.GetY(), align)
+        rowIndex.SetRowHeight(row, height)
+        return item
+
+
+    def LayoutRows(self, dc, start_y, last_y):
+        """
+        Places the items of the rows between two logical `y` positions, calculating
+        their sizes if required, for trees with the ``TR_VIRTUAL_ROWS`` style.
+
+        :param `dc`: an instance of :class:`wx.DC`;
+        :param integer `start_y`: the logical `y` position of the top of the area;
+        :param integer `last_y`: the logical `y` position of the bottom of the area.
+
+        :return: A tuple of (first, stop), the range of rows in the area, and a
+         flag which is ``True`` if the tree size changed, i.e. if the tree must
+         be calculated again.
+        """
+
+        rowIndex = self._rowIndex
+        align = 1 if self.HasAGWFlag(TR_ALIGN_WINDOWS) else 0
+        gen, width = rowIndex.gen, self._width
+
+        count = rowIndex.GetCount()
+        first = row = max(rowIndex.GetRowAt(start_y), 0)
+        while row < count and rowIndex.GetRowTop(row) <= last_y:
+            self.LayoutRow(dc, row, align)
+            row += 1
+
+        # Rows taller than the rest move all the others.
+        rowIndex.SetLineHeight(self._lineHeight)
+
+        return first, row, (gen != rowIndex.gen or width != self._width)
+
+
     def RefreshSubtree(self, item):
         """
         Refreshes a damaged subtree of an item.
@@ -137,6 +137,10 @@ ellipsized:
   hidden, and even different heights if the ``wx.TR_HAS_VARIABLE_ROW_HEIGHT``
   style is used.
 
+- ``TR_VIRTUAL_ROWS``: keeps a flat index of the shown rows, so that only the rows
+  in view are laid out and painted, as for :class:`~wx.lib.agw.customtreectrl.CustomTreeCtrl`.
+  Unlike ``TR_VIRTUAL``, the items themselves are real.
+
 Please note that most TreeCtrl-like APIs are available in this class, although
 they may not be visible to IDEs or other tools as they are automatically
 delegated to the :class:`CustomTreeCtrl` or other helper classes.
@@ -249,6 +253,7 @@ Window agwStyle Flags             Hex Value   Description
 ``TR_VIRTUAL``                       0x100000 :class:`HyperTreeList` will have virtual behaviour.
 ``TR_FILL_WHOLE_COLUMN_BACKGROUND``  0x200000 Use this style to fill the whole background of item columns. Modifies behavior of :meth:`SetItemBackgroundColour() <TreeListMainWindow.SetItemBackgroundColour>`.
 ``TR_LIVE_UPDATE``                   0x400000 Don't draw ``wx.INVERT`` line but resize columns immediately.
+``TR_VIRTUAL_ROWS``                  0x800000 Only lay out and paint the rows in view, for trees with very many items.
 ================================= =========== ==================================================
 
 See :mod:`~wx.lib.agw.customtreectrl` for more information on styles.
@@ -425,6 +430,13 @@ TR_LIVE_UPDATE = 0x400000
 """ Use this style to do live updates while resizing a column. """
 # --------------------------------------------------------------------------
 
+# --------------------------------------------------------------------------
+# Additional HyperTreeList style to only lay out and paint the rows in view,
+# see the CustomTreeCtrl documentation.
+TR_VIRTUAL_ROWS = 0x800000
+""" Only lay out and paint the rows in view, for trees with very many items. """
+# --------------------------------------------------------------------------
+
 # --------------------------------------------------------------------------
 # Additional HyperTreeList style autosize the columns based on the widest
 # width between column header and cells content
@@ -2687,6 +2699,8 @@ class TreeListMainWindow(CustomTreeCtrl):
             self._itemWithWindow.add(item)
 
         parent.Insert(item, previous)
+        if self._rowIndex is not None:
+            self._rowIndex.InsertItem(item, previous)
 
         return item
 
@@ -2728,6 +2742,8 @@ class TreeListMainWindow(CustomTreeCtrl):
         arr = [""] * self.GetColumnCount()
         arr[self._main_column] = text
         self._anchor = TreeListItem(self, None, arr, ct_type, wnd, image, selImage, data)
+        if self._rowIndex is not None:
+            self._rowIndex.Invalidate()
 
         if wnd is not None:
             self._hasWindows = True
@@ -2774,6 +2790,9 @@ class TreeListMainWindow(CustomTreeCtrl):
 
             itemKey = itemKey.GetParent()
 
+        if self._rowIndex is not None:
+            self._rowIndex.RemoveItem(item)
+
         parent = item.GetParent()
         if parent:
             parent.GetChildren().remove(item)  # remove by value
@@ -3484,97 +3503,7 @@ class TreeListMainWindow(CustomTreeCtrl):
         draw_row_lines = self.HasAGWFlag(TR_ROW_LINES)
 
         if self.IsExposed(exposed_x, exposed_y, _MAX_WIDTH, h + int(draw_row_lines)):
-            # Save window text color.
-            prevText = wx.Colour(*dc.GetTextForeground())
-
-            # draw item
-            self.PaintItem(item, dc)
-
-            # restore DC objects
-            dc.SetBrush(wx.WHITE_BRUSH)
-            dc.SetPen(self._dottedPen)
-
-            # clip to the column width
-            clip_width = self._owner.GetHeaderWindow().GetColumn(self._main_column).GetWidth()
-##            clipper = wx.DCClipper(dc, x_maincol, y_top, clip_width, 10000)
-
-            if not self.HasAGWFlag(wx.TR_NO_LINES):  # connection lines
-
-                # draw the horizontal line here
-                dc.SetPen(self._dottedPen)
-                x2 = x - self._indent
-                if x2 < (x_maincol + _MARGIN):
-                    x2 = x_maincol + _MARGIN
-                x3 = x + (self._btnWidth - self._btnWidth2)
-                if self.HasButtons():
-                    if item.HasPlus():
-                        dc.DrawLine(x2, y_mid, x - self._btnWidth2, y_mid)
-                        dc.DrawLine(x3, y_mid, x3 + _LINEATROOT, y_mid)
-                    else:
-                        dc.DrawLine(x2, y_mid, x3 + _LINEATROOT, y_mid)
-                else:
-                    dc.DrawLine(x2, y_mid, x - self._indent // 2, y_mid)
-
-            if item.HasPlus() and self.HasButtons():  # should the item show a button?
-
-                if self._imageListButtons:
-
-                    # draw the image button here
-                    image = wx.TreeItemIcon_Normal
-                    if item.IsExpanded():
-                        image = wx.TreeItemIcon_Expanded
-                    if item.IsSelected():
-                        image += wx.TreeItemIcon_Selected - wx.TreeItemIcon_Normal
-                    xx = x - self._btnWidth2 + _MARGIN
-                    yy = y_mid - self._btnHeight2
-                    dc.SetClippingRegion(xx, yy, self._btnWidth, self._btnHeight)
-                    self._imageListButtons.Draw(image, dc, xx, yy, wx.IMAGELIST_DRAW_TRANSPARENT)
-                    dc.DestroyClippingRegion()
-
-                elif self.HasAGWFlag(wx.TR_TWIST_BUTTONS):
-
-                    # draw the twisty button here
-                    dc.SetPen(wx.BLACK_PEN)
-                    dc.SetBrush(self._hilightBrush)
-                    button = [wx.Point() for j in range(3)]
-                    if item.IsExpanded():
-                        button[0].x = x - (self._btnWidth2 + 1)
-                        button[0].y = y_mid - (self._btnHeight // 3)
-                        button[1].x = x + (self._btnWidth2 + 1)
-                        button[1].y = button[0].y
-                        button[2].x = x
-                        button[2].y = button[0].y + (self._btnHeight2 + 1)
-                    else:
-                        button[0].x = x - (self._btnWidth // 3)
-                        button[0].y = y_mid - (self._btnHeight2 + 1)
-                        button[1].x = button[0].x
-                        button[1].y = y_mid + (self._btnHeight2 + 1)
-                        button[2].x = button[0].x + (self._btnWidth2 + 1)
-                        button[2].y = y_mid
-
-                    dc.SetClippingRegion(x_maincol + _MARGIN, y_top, clip_width, h)
-                    dc.DrawPolygon(button)
-                    dc.DestroyClippingRegion()
-
-                else:# if (HasAGWFlag(wxTR_HAS_BUTTONS))
-
-                    rect = wx.Rect(x - self._btnWidth2, y_mid - self._btnHeight2, self._btnWidth, self._btnHeight)
-                    flag = (item.IsExpanded() and [wx.CONTROL_EXPANDED] or [0])[0]
-                    wx.RendererNative.GetDefault().DrawTreeItemButton(self, dc, rect, flag)
-
-            if draw_row_lines:
-                total_width = self._owner.GetHeaderWindow().GetWidth()
-                # if the background colour is white, choose a
-                # contrasting colour for the lines
-                pen = wx.Pen(wx.SystemSettings.GetColour(wx.SYS_COLOUR_3DLIGHT), 1, wx.PENSTYLE_SOLID)
-                dc.SetPen((self.GetBackgroundColour() == wx.WHITE and [pen] or [wx.WHITE_PEN])[0])
-                dc.DrawLine(0, y_top, total_width, y_top)
-                dc.DrawLine(0, y_top + h, total_width, y_top + h)
-
-            # restore DC objects
-            dc.SetBrush(wx.WHITE_BRUSH)
-            dc.SetPen(self._dottedPen)
-            dc.SetTextForeground(prevText)
+            self.PaintRow(item, dc, level, x_maincol)
 
         # If this item is expanded, handle its children.
         if item.IsExpanded():
@@ -3635,6 +3564,135 @@ class TreeListMainWindow(CustomTreeCtrl):
         return y, x_maincol
 
 
+    def PaintRow(self, item, dc, level, x_maincol):
+        """
+        Paint the row of an item, with its connection line and button.
+
+        :param `item`: an instance of :class:`TreeListItem`;
+        :param `dc`: an instance of :class:`wx.DC`;
+        :param `level`: the item level in the tree hierarchy;
+        :param `x_maincol`: the horizontal position of the main column.
+        """
+
+        x = item.GetX()
+        h = self.GetLineHeight(item)
+        y_top = item.GetY()
+        y_mid = y_top + (h // 2)
+        draw_row_lines = self.HasAGWFlag(TR_ROW_LINES)
+
+        # Save window text color.
+        prevText = wx.Colour(*dc.GetTextForeground())
+
+        # draw item
+        self.PaintItem(item, dc)
+
+        # restore DC objects
+        dc.SetBrush(wx.WHITE_BRUSH)
+        dc.SetPen(self._dottedPen)
+
+        # clip to the column width
+        clip_width = self._owner.GetHeaderWindow().GetColumn(self._main_column).GetWidth()
+##        clipper = wx.DCClipper(dc, x_maincol, y_top, clip_width, 10000)
+
+        if not self.HasAGWFlag(wx.TR_NO_LINES):  # connection lines
+
+            # draw the horizontal line here
+            dc.SetPen(self._dottedPen)
+            x2 = x - self._indent
+            if x2 < (x_maincol + _MARGIN):
+                x2 = x_maincol + _MARGIN
+            x3 = x + (self._btnWidth - self._btnWidth2)
+            if self.HasButtons():
+                if item.HasPlus():
+                    dc.DrawLine(x2, y_mid, x - self._btnWidth2, y_mid)
+                    dc.DrawLine(x3, y_mid, x3 + _LINEATROOT, y_mid)
+                else:
+                    dc.DrawLine(x2, y_mid, x3 + _LINEATROOT, y_mid)
+            else:
+                dc.DrawLine(x2, y_mid, x - self._indent // 2, y_mid)
+
+        if item.HasPlus() and self.HasButtons():  # should the item show a button?
+
+            if self._imageListButtons:
+
+                # draw the image button here
+                image = wx.TreeItemIcon_Normal
+                if item.IsExpanded():
+                    image = wx.TreeItemIcon_Expanded
+                if item.IsSelected():
+                    image += wx.TreeItemIcon_Selected - wx.TreeItemIcon_Normal
+                xx = x - self._btnWidth2 + _MARGIN
+                yy = y_mid - self._btnHeight2
+                dc.SetClippingRegion(xx, yy, self._btnWidth, self._btnHeight)
+                self._imageListButtons.Draw(image, dc, xx, yy, wx.IMAGELIST_DRAW_TRANSPARENT)
+                dc.DestroyClippingRegion()
+
+            elif self.HasAGWFlag(wx.TR_TWIST_BUTTONS):
+
+                # draw the twisty button here
+                dc.SetPen(wx.BLACK_PEN)
+                dc.SetBrush(self._hilightBrush)
+                button = [wx.Point() for j in range(3)]
+                if item.IsExpanded():
+                    button[0].x = x - (self._btnWidth2 + 1)
+                    button[0].y = y_mid - (self._btnHeight // 3)
+                    button[1].x = x + (self._btnWidth2 + 1)
+                    button[1].y = button[0].y
+                    button[2].x = x
+                    button[2].y = button[0].y + (self._btnHeight2 + 1)
+                else:
+                    button[0].x = x - (self._btnWidth // 3)
+                    button[0].y = y_mid - (self._btnHeight2 + 1)
+                    button[1].x = button[0].x
+                    button[1].y = y_mid + (self._btnHeight2 + 1)
+                    button[2].x = button[0].x + (self._btnWidth2 + 1)
+                    button[2].y = y_mid
+
+                dc.SetClippingRegion(x_maincol + _MARGIN, y_top, clip_width, h)
+                dc.DrawPolygon(button)
+                dc.DestroyClippingRegion()
+
+            else:# if (HasAGWFlag(wxTR_HAS_BUTTONS))
+
+                rect = wx.Rect(x - self._btnWidth2, y_mid - self._btnHeight2, self._btnWidth, self._btnHeight)
+                flag = (item.IsExpanded() and [wx.CONTROL_EXPANDED] or [0])[0]
+                wx.RendererNative.GetDefault().DrawTreeItemButton(self, dc, rect, flag)
+
+        if draw_row_lines:
+            total_width = self._owner.GetHeaderWindow().GetWidth()
+            # if the background colour is white, choose a
+            # contrasting colour for the lines
+            pen = wx.Pen(wx.SystemSettings.GetColour(wx.SYS_COLOUR_3DLIGHT), 1, wx.PENSTYLE_SOLID)
+            dc.SetPen((self.GetBackgroundColour() == wx.WHITE and [pen] or [wx.WHITE_PEN])[0])
+            dc.DrawLine(0, y_top, total_width, y_top)
+            dc.DrawLine(0, y_top + h, total_width, y_top + h)
+
+        # restore DC objects
+        dc.SetBrush(wx.WHITE_BRUSH)
+        dc.SetPen(self._dottedPen)
+        dc.SetTextForeground(prevText)
+
+
+    def PaintRowLines(self, item, dc):
+        """
+        Paint the parts of the vertical tree lines that cross the row of an item,
+        for trees with the ``TR_VIRTUAL_ROWS`` style.
+
+        :param `item`: an instance of :class:`TreeListItem`;
+        :param `dc`: an instance of :class:`wx.DC`.
+        """
+
+        if self.HasAGWFlag(wx.TR_NO_LINES):
+            return
+
+        if self.HasButtons():
+            y_offset = self._btnHeight2                 # Half of ButtonHeight
+        else:
+            y_offset = self.GetLineHeight(item) // 2    # Half of LineHeight
+
+        self.DrawRowLines(item, dc, 0, y_offset)
+
+
 # ----------------------------------------------------------------------------
 # wxWindows callbacks
 # ----------------------------------------------------------------------------
@@ -3684,6 +3742,10 @@ class TreeListMainWindow(CustomTreeCtrl):
 
         # Paint the tree.
         x_maincol = self._x_maincol
+        if self._rowIndex is not None:
+            self.PaintRows(dc, x_maincol)
+            return
+
         y = 2
         y, x_maincol = self.PaintLevel(self._anchor, dc, 0, y, x_maincol)
 
@@ -3742,7 +3804,16 @@ class TreeListMainWindow(CustomTreeCtrl):
             return None, flags, column
 
         pt = wx.Point(self.CalcUnscrolledPosition(point.x, point.y))
-        hit, flags, column = self._anchor.HitTest(pt, self, flags, column, 0)
+        if self._rowIndex is not None:
+            # Only the item at the row under the point can be hit.
+            if self._dirty and not self._rowIndex.IsValid():
+                self.CalculatePositions()
+            hit = self._rowIndex.GetItemAt(pt.y)
+            if hit is not None:
+                level = self._rowIndex.GetLevel(hit)
+                hit, flags, column = hit.HitTest(pt, self, flags, column, level)
+        else:
+            hit, flags, column = self._anchor.HitTest(pt, self, flags, column, 0)
         if not hit:
             flags = wx.TREE_HITTEST_NOWHERE
             column = -1
@@ -4263,6 +4334,35 @@ class TreeListMainWindow(CustomTreeCtrl):
         # Indent according to level
         x = x_colstart + level * self._indent
 
+        # Advance Y to next item.
+        y += self.CalculateRow(item, dc, level, x, y)
+
+        if item.IsHidden() or not item.IsExpanded():
+            # We don't need to calculate collapsed branches
+            return y
+
+        level = level + 1
+        for child in item.GetChildren():
+            y = self.CalculateLevel(child, dc, level, y, x_colstart)  # recurse
+
+        return y
+
+
+    def CalculateRow(self, item, dc, level, x, y, align=0):
+        """
+        Calculates the size of an item if required, and sets its position.
+
+        :param `item`: an instance of :class:`TreeListItem`;
+        :param `dc`: an instance of :class:`wx.DC`;
+        :param `level`: the item level in the tree hierarchy;
+        :param `x`: the horizontal position of the item;
+        :param `y`: the vertical position of the item;
+        :param `align`: unused, present to comply with
+         :meth:`CustomTreeCtrl.CalculateRow() <lib.agw.customtreectrl.CustomTreeCtrl.CalculateRow>`.
+
+        :return: The height of the item row (0 for hidden items).
+        """
+
         # Calculate the width and height of this item only if required.
         if item.IsDirty():
             self.CalculateSize(item, dc)
@@ -4273,7 +4373,7 @@ class TreeListMainWindow(CustomTreeCtrl):
 
         # hidden items don't get a height (height=0).
         if item.IsHidden():
-            return y
+            return 0
         height = self.GetLineHeight(item)
 
         for wnd in item.GetWindows():
@@ -4284,20 +4384,11 @@ class TreeListMainWindow(CustomTreeCtrl):
                 ya += (height - wndHeight) // 2
             if wndy != ya:
                 wnd.Move(wndx, ya, flags=wx.SIZE_ALLOW_MINUS_ONE)
-            
-        # Advance Y to next item and update tree width.
-        y += height
-        self._width = max(self._width, x + item.GetWidth())
 
-        if not item.IsExpanded():
-            # We don't need to calculate collapsed branches
-            return y
-
-        level = level + 1
-        for child in item.GetChildren():
-            y = self.CalculateLevel(child, dc, level, y, x_colstart)  # recurse
+        # Update tree width.
+        self._width = max(self._width, x + item.GetWidth())
 
-        return y
+        return height
 
 
     def CalculatePositions(self):
@@ -4318,7 +4409,11 @@ class TreeListMainWindow(CustomTreeCtrl):
 
         # Save old tree dimensions. Reset width as CalculateLevel updates it.
         old_width, old_height = self._width, self._height
-        self._width = 0
+        rowIndex = self._rowIndex
+        if rowIndex is None or not rowIndex.IsValid():
+            # With TR_VIRTUAL_ROWS only the rows in view are calculated, so
+            # the width is the widest row seen since the index was built.
+            self._width = 0
 
         # pre-calculate tree button size
         if self._imageListButtons:
@@ -4373,7 +4468,13 @@ class TreeListMainWindow(CustomTreeCtrl):
 
         # Calculate size of entire tree recursively.
         y = 2
-        if not self.HasAGWFlag(TR_HIDE_ROOT):
+        if rowIndex is not None:
+            # Calculate only the rows in view. The items at the first level
+            # are not indented when the root is hidden.
+            if self.HasAGWFlag(TR_HIDE_ROOT):
+                x_colstart -= self._indent
+            y = self.CalculateRows(dc, x_colstart, y)
+        elif not self.HasAGWFlag(TR_HIDE_ROOT):
             # Calculate tree from root.
             y = self.CalculateLevel(self._anchor, dc, 0, y, x_colstart)
         else:
@@ -4438,6 +4539,17 @@ class TreeListMainWindow(CustomTreeCtrl):
             return item.GetText(column)
 
 
+    def OnGetChildren(self, item):
+        """
+        Returns the children to append to an item when it is first expanded, from
+        :meth:`HyperTreeList.OnGetChildren`.
+
+        :param `item`: an instance of :class:`TreeListItem`, the item being expanded.
+        """
+
+        return self._owner.OnGetChildren(item)
+
+
     def GetItemWidth(self, item, column):
         """
         Returns the item width.
@@ -5408,6 +5520,22 @@ class HyperTreeList(wx.Control):
         return ""
 
 
+    def OnGetChildren(self, item):
+        """
+        This function may be overloaded in the derived class to create the children
+        of an item only when it is expanded for the first time (see also the
+        ``TR_VIRTUAL_ROWS`` style). It works as :meth:`CustomTreeCtrl.OnGetChildren()
+        <lib.agw.customtreectrl.CustomTreeCtrl.OnGetChildren>`.
+
+        :param `item`: an instance of :class:`TreeListItem`, the item being expanded.
+
+        :return: ``None`` to expand the item as it is (the default), or a sequence of
+         ``(text, data, hasChildren)`` tuples, one for each child to append to `item`.
+        """
+
+        return None
+
+
     def SortChildren(self, item):
         """
         Sorts the children of the given item using :meth:`~HyperTreeList.OnCompareItems` method of :class:`HyperTreeList`.
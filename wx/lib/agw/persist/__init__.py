@@ -156,6 +156,22 @@ to derive MyPersistentWidget directly from PersistentObject and so implement its
 can be only done automatically for windows.
 
 
+Saving Many Windows At Once
+===========================
+
+Every value saved by `PersistenceManager` is written to the configuration file straight
+away. When saving many windows at once, as `PersistenceManager.SaveAndUnregister()` does
+when called without arguments, the values can be written in one go by surrounding the
+calls with `PersistenceManager.BeginBatch()` and `PersistenceManager.EndBatch()`.
+
+The settings can also be stored in a single JSON file or in a SQLite database instead of
+a :class:`FileConfig`, by passing a `PersistenceJSONFile` or a `PersistenceSQLiteFile` to
+`PersistenceManager.SetConfigurationHandler()`::
+
+    persistMgr = PM.PersistenceManager.Get()
+    persistMgr.SetConfigurationHandler(PM.PersistenceJSONFile("settings.json"))
+
+
 TODOs
 =====
 
@@ -186,3 +202,4 @@ __date__ = "16 November 2009"
 from .persist_constants import *
 from .persistencemanager import *
 from .persist_handlers import *
+from .persist_backends import *
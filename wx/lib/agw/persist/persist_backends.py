@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+# --------------------------------------------------------------------------- #
+#
+# Tags:        phoenix-port, unittest, documented, py3-port
+#
+# End Of Comments
+# --------------------------------------------------------------------------- #
+
+"""
+This module contains alternative storage backends for :class:`~wx.lib.agw.persist.persistencemanager.PersistenceManager`,
+to be used with :meth:`PersistenceManager.SetConfigurationHandler() <lib.agw.persist.persistencemanager.PersistenceManager.SetConfigurationHandler>`
+instead of the default :class:`FileConfig`.
+
+Both backends keep the saved values in memory (or in an open transaction) until
+`Flush()` is called, which :class:`~wx.lib.agw.persist.persistencemanager.PersistenceManager`
+does once per batch of changes, see :meth:`PersistenceManager.BeginBatch() <lib.agw.persist.persistencemanager.PersistenceManager.BeginBatch>`.
+"""
+
+import os
+import json
+import tempfile
+
+# ----------------------------------------------------------------------------------- #
+
+class PersistenceJSONFile(object):
+    """
+    A configuration handler storing all the persistent settings in a single JSON file.
+
+    The whole file is read when the handler is created and rewritten by :meth:`~PersistenceJSONFile.Flush`
+    if any value has changed.
+    """
+
+    def __init__(self, fileName):
+        """
+        Default class constructor.
+
+        :param `fileName`: the name of the JSON file, it is created by the first
+         call to :meth:`~PersistenceJSONFile.Flush` if it doesn't exist yet.
+        """
+
+        self._fileName = fileName
+        self._values = {}
+        self._modified = False
+
+        if os.path.exists(fileName):
+            with open(fileName, "r", encoding="utf-8") as fid:
+                self._values = json.load(fid)
+
+
+    def GetFileName(self):
+        """ Returns the name of the JSON file. """
+
+        return self._fileName
+
+
+    def SaveValue(self, key, value):
+        """
+        Saves a value, keeping it in memory until :meth:`~PersistenceJSONFile.Flush` is called.
+
+        :param `key`: the key name, as returned by :meth:`PersistenceManager.GetKey() <lib.agw.persist.persistencemanager.PersistenceManager.GetKey>`;
+        :param `value`: the encoded value, a string.
+        """
+
+        if self._values.get(key) != value:
+            self._values[key] = value
+            self._modified = True
+
+        return True
+
+
+    def RestoreValue(self, key):
+        """
+        Returns the value saved for `key`, or ``None`` if there is none.
+
+        :param `key`: the key name, as returned by :meth:`PersistenceManager.GetKey() <lib.agw.persist.persistencemanager.PersistenceManager.GetKey>`.
+        """
+
+        return self._values.get(key)
+
+
+    def Flush(self):
+        """ Writes the JSON file if any value has changed since it was last written. """
+
+        if not self._modified:
+            return
+
+        dirName = os.path.dirname(os.path.abspath(self._fileName))
+        if not os.path.exists(dirName):
+            os.makedirs(dirName)
+
+        # Write to a temporary file first, so that a crash while writing can
+        # not leave a truncated file behind
+        fd, tmpName = tempfile.mkstemp(suffix=".tmp", dir=dirName)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fid:
+                json.dump(self._values, fid, indent=1, sort_keys=True)
+            os.replace(tmpName, self._fileName)
+        except (OSError, TypeError, ValueError):
+            os.remove(tmpName)
+            raise
+
+        self._modified = False
+
+
+# ----------------------------------------------------------------------------------- #
+
+class PersistenceSQLiteFile(object):
+    """
+    A configuration handler storing the persistent settings in a SQLite database.
+
+    The saved values are written in a single transaction, committed by
+    :meth:`~PersistenceSQLiteFile.Flush`.
+    """
+
+    def __init__(self, fileName):
+        """
+        Default class constructor.
+
+        :param `fileName`: the name of the database file, it is created if it
+         doesn't exist yet.
+        """
+
+        import sqlite3
+
+        self._fileName = fileName
+        self._connection = sqlite3.connect(fileName)
+        self._connection.execute("CREATE TABLE IF NOT EXISTS persistence "
+                                 "(key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._connection.commit()
+
+
+    def GetFileName(self):
+        """ Returns the name of the database file. """
+
+        return self._fileName
+
+
+    def SaveValue(self, key, value):
+        """
+        Saves a value, it is committed to the database by :meth:`~PersistenceSQLiteFile.Flush`.
+
+        :param `key`: the key name, as returned by :meth:`PersistenceManager.GetKey() <lib.agw.persist.persistencemanager.PersistenceManager.GetKey>`;
+        :param `value`: the encoded value, a string.
+        """
+
+        self._connection.execute("INSERT OR REPLACE INTO persistence (key, value) VALUES (?, ?)",
+                                 (key, value))
+        return True
+
+
+    def RestoreValue(self, key):
+        """
+        Returns the value saved for `key`, or ``None`` if there is none.
+
+        :param `key`: the key name, as returned by :meth:`PersistenceManager.GetKey() <lib.agw.persist.persistencemanager.PersistenceManager.GetKey>`.
+        """
+
+        row = self._connection.execute("SELECT value FROM persistence WHERE key = ?",
+                                       (key,)).fetchone()
+        if row is not None:
+            return row[0]
+
+
+    def Flush(self):
+        """ Commits the values saved since the last call. """
+
+        self._connection.commit()
+
+
+    def Close(self):
+        """ Commits the pending changes and closes the database. """
+
+        self._connection.commit()
+        self._connection.close()
@@ -30,6 +30,9 @@ and :class:`~wx.lib.agw.persist.persitencemanager.PersistenceManager` objects.
 """
 
 import os
+import ast
+import json
+import numbers
 import warnings
 import datetime
 
@@ -41,6 +44,128 @@ from .persist_handlers import FindHandler, HasCtrlHandler
 from .persist_constants import BAD_DEFAULT_NAMES, CONFIG_PATH_SEPARATOR
 from .persist_constants import PM_DEFAULT_STYLE, PM_PERSIST_CONTROL_VALUE
 
+# ----------------------------------------------------------------------------------- #
+
+def EncodeValue(value):
+    """
+    Converts a value into the string stored in the configuration file.
+
+    The value is written as JSON, with tuples, dictionaries and dates tagged
+    so that :func:`DecodeValue` gives back an object of the same type.
+
+    :param `value`: a ``None``, ``bool``, ``int``, ``float`` or string value, a
+     `datetime.date` or `datetime.datetime` instance, or a list, tuple or dictionary
+     made of these.
+
+    :note: Other values are never refused: sequences like :class:`wx.Size`, :class:`wx.Point`
+     or :class:`wx.Colour` are saved as tuples, and anything else as its string
+     representation.
+    """
+
+    return json.dumps(ToJSONValue(value), separators=(",", ":"))
+
+
+def DecodeValue(text):
+    """
+    Converts a string stored in the configuration file back into a value.
+
+    Strings written by earlier versions of :class:`PersistenceManager`, which
+    stored the ``repr`` of a ``(kind, str(value))`` tuple, are understood too.
+    None of the two formats is ever evaluated as Python code.
+
+    :param `text`: the string returned by :func:`EncodeValue`.
+
+    :returns: The decoded value, or ``None`` if `text` is not a string or can not
+     be decoded.
+    """
+
+    # Custom configuration handlers may give back anything
+    if not isinstance(text, str):
+        return None
+
+    try:
+        if text.startswith("("):
+            kind, value = ast.literal_eval(text)
+            if kind in ("unicode", "str"):
+                return value
+            elif kind == "datetime.date":
+                y, m, d = value.split("-")
+                return datetime.date(int(y), int(m), int(d))
+
+            return ast.literal_eval(value)
+
+        return FromJSONValue(json.loads(text))
+
+    except (ValueError, TypeError, SyntaxError):
+        return None
+
+
+def ToJSONValue(value):
+    """
+    Converts a value into an object which can be serialized by :mod:`json`,
+    see :func:`EncodeValue` for the supported types.
+
+    :param `value`: the value to convert.
+    """
+
+    if value is None or isinstance(value, bool):
+        return value
+    elif isinstance(value, numbers.Integral):
+        # This also turns enumerations and NumPy integers into plain integers
+        return int(value)
+    elif isinstance(value, numbers.Real):
+        return float(value)
+    elif isinstance(value, str):
+        return str(value)
+    elif isinstance(value, list):
+        return [ToJSONValue(item) for item in value]
+    elif isinstance(value, tuple):
+        return {"tuple": [ToJSONValue(item) for item in value]}
+    elif isinstance(value, dict):
+        return {"dict": [[ToJSONValue(key), ToJSONValue(item)] for key, item in value.items()]}
+    elif isinstance(value, datetime.datetime):
+        return {"datetime": value.isoformat()}
+    elif isinstance(value, datetime.date):
+        return {"date": value.isoformat()}
+
+    # Like the earlier versions of PersistenceManager, save anything else
+    # rather than fail to save all the windows after it
+    try:
+        items = tuple(value)
+    except TypeError:
+        return str(value)
+
+    return {"tuple": [ToJSONValue(item) for item in items]}
+
+
+def FromJSONValue(value):
+    """
+    Converts an object created by :func:`ToJSONValue` back into the original value.
+
+    :param `value`: the object to convert.
+    """
+
+    if isinstance(value, list):
+        return [FromJSONValue(item) for item in value]
+    elif not isinstance(value, dict):
+        return value
+
+    if len(value) != 1:
+        raise ValueError("Invalid persisted value: %r"%value)
+
+    kind, data = list(value.items())[0]
+    if kind == "tuple":
+        return tuple([FromJSONValue(item) for item in data])
+    elif kind == "dict":
+        return dict([(FromJSONValue(key), FromJSONValue(item)) for key, item in data])
+    elif kind == "datetime":
+        return datetime.datetime.fromisoformat(data)
+    elif kind == "date":
+        return datetime.date.fromisoformat(data)
+
+    raise ValueError("Invalid persisted value: %r"%value)
+
+
 # ----------------------------------------------------------------------------------- #
 
 class PersistentObject:
@@ -268,6 +393,13 @@ class PersistenceManager(object):
         # wx.FileConfig (i.e., ConfigObj, ConfigParser etc...)
         self._customConfigHandler = None
 
+        # The wx.FileConfig object opened by GetPersistenceFile, kept until the
+        # persistence file changes
+        self._config = None
+
+        # Nesting level of the BeginBatch/EndBatch calls
+        self._batchLevel = 0
+
         # Specifies the PersistenceManager style
         self._style = PM_DEFAULT_STYLE
 
@@ -368,6 +500,10 @@ class PersistenceManager(object):
          custom configuration handler (i.e., by using ConfigObj/ConfigParser/cPickle etc...).
         """
 
+        if self._config is not None:
+            self._config.Flush()
+            self._config = None
+
         self._configFile = fileName
         self._persistentObjects = {}
 
@@ -376,10 +512,16 @@ class PersistenceManager(object):
         """
         Returns the persistent configuration file for :class:`PersistenceManager`.
 
+        The file is opened the first time this method is called, the same :class:`FileConfig`
+        object is returned afterwards until :meth:`~PersistenceManager.SetPersistenceFile` is called.
+
         :note: The return value of this method is not used if you are using your own
          custom configuration handler (i.e., by using ConfigObj/ConfigParser/cPickle etc...).
         """
 
+        if self._config is not None:
+            return self._config
+
         if self._configFile is not None:
             persistenceDir, fileName = os.path.split(self._configFile)
             fileName = self._configFile
@@ -393,8 +535,8 @@ class PersistenceManager(object):
             # Create the data folder, it still doesn't exist
             os.makedirs(persistenceDir)
 
-        config = wx.FileConfig(localFilename=fileName)
-        return config
+        self._config = wx.FileConfig(localFilename=fileName)
+        return self._config
 
 
     def SetConfigurationHandler(self, handler):
@@ -402,7 +544,11 @@ class PersistenceManager(object):
         Sets the persistent configuration handler for :class:`PersistenceManager`.
 
         :param `handler`: an object capable of saving/restoring UI settings. This
-         can be a cPickle object or a ConfigObj one, for example.
+         can be a cPickle object or a ConfigObj one, for example. It must provide
+         `SaveValue(key, value)` and `RestoreValue(key)` methods and may provide a
+         `Flush()` method, called to commit the saved values to storage. See
+         :class:`~wx.lib.agw.persist.persist_backends.PersistenceJSONFile` and
+         :class:`~wx.lib.agw.persist.persist_backends.PersistenceSQLiteFile`.
 
         :note: UI settings are stored as dictionaries key <=> tuple: the tuple value
          contains two items. The first is the value *type* (i.e., float, int, bool etc...)
@@ -594,17 +740,72 @@ class PersistenceManager(object):
         self._doRestore = True
 
 
+    def BeginBatch(self):
+        """
+        Starts a batch of changes: the saved values are not written to the configuration
+        file (or committed by the custom configuration handler) until the matching call
+        to :meth:`~PersistenceManager.EndBatch`, so that saving many windows updates the
+        storage only once.
+
+        Calls to :meth:`~PersistenceManager.BeginBatch` and :meth:`~PersistenceManager.EndBatch`
+        can be nested.
+        """
+
+        self._batchLevel += 1
+
+
+    def EndBatch(self):
+        """
+        Ends a batch of changes started by :meth:`~PersistenceManager.BeginBatch`, writing
+        all the saved values to storage if this is the outermost batch.
+        """
+
+        if self._batchLevel == 0:
+            raise RuntimeError("EndBatch called without a matching BeginBatch")
+
+        self._batchLevel -= 1
+        if self._batchLevel == 0:
+            self.Flush()
+
+
+    def IsBatching(self):
+        """ Returns ``True`` if a batch of changes is in progress. """
+
+        return self._batchLevel > 0
+
+
+    def Flush(self):
+        """
+        Writes the saved values to the configuration file, or commits them if a custom
+        configuration handler with a `Flush()` method is used.
+
+        :note: This is done automatically after every saved value, unless a batch of
+         changes is in progress (see :meth:`~PersistenceManager.BeginBatch`).
+        """
+
+        if self._customConfigHandler is not None:
+            if hasattr(self._customConfigHandler, "Flush"):
+                self._customConfigHandler.Flush()
+        elif self._config is not None:
+            self._config.Flush()
+
+
     def SaveAndUnregister(self, window=None):
         """
         Combines both :meth:`~PersistenceManager.Save` and :meth:`~PersistenceManager.Unregister` calls.
 
         :param `window`: an instance of :class:`wx.Window`. If it is ``None``, all the
-         windows previously registered are saved and then unregistered.
+         windows previously registered are saved and then unregistered, writing the
+         configuration file only once.
         """
 
         if window is None:
-            for name, obj in list(self._persistentObjects.items()):
-                self.SaveAndUnregister(obj.GetWindow())
+            self.BeginBatch()
+            try:
+                for name, obj in list(self._persistentObjects.items()):
+                    self.SaveAndUnregister(obj.GetWindow())
+            finally:
+                self.EndBatch()
 
             return
 
@@ -778,17 +979,19 @@ class PersistenceManager(object):
 
         :param `obj`: an instance of :class:`PersistentObject`;
         :param `keyName`: a string specifying the key name;
-        :param `value`: the value to store in the configuration file.
+        :param `value`: the value to store in the configuration file, see :func:`EncodeValue`
+         for the supported types.
         """
 
-        kind = repr(value.__class__).split("'")[1]
+        key = self.GetKey(obj, keyName)
 
         if self._customConfigHandler is not None:
-            result = self._customConfigHandler.SaveValue(self.GetKey(obj, keyName), repr((kind, str(value))))
+            result = self._customConfigHandler.SaveValue(key, EncodeValue(value))
         else:
-            config = self.GetPersistenceFile()
-            result = config.Write(self.GetKey(obj, keyName), repr((kind, str(value))))
-            config.Flush()
+            result = self.GetPersistenceFile().Write(key, EncodeValue(value))
+
+        if not self._batchLevel:
+            self.Flush()
 
         return result
 
@@ -841,15 +1044,7 @@ class PersistenceManager(object):
             result = config.Read(self.GetKey(obj, keyName))
 
         if result:
-            kind, result = eval(result)
-            if kind in ("unicode", "str"):
-                return result
-            elif kind == "datetime.date":
-                y, m, d = result.split("-")
-                result = datetime.date(int(y), int(m), int(d))
-                return result
-
-            return eval(result)
+            return DecodeValue(result)
 
 
     def AddBadDefaultName(self, name):
@@ -127,7 +127,13 @@ With :class:`ScrolledThumbnail` you can:
 - Use local (when at least one thumbnail is selected) or global (no need for
   thumbnail selection) popup menus;
 - possibility to show tooltips on thumbnails, which display file information
-  (like file name, size, last modification date and thumbnail size).
+  (like file name, size, last modification date and thumbnail size);
+- Keep the thumbnails in a persistent on-disk :class:`ThumbnailCache`, laid out
+  as described by the freedesktop.org thumbnail managing standard.
+
+Images are decoded by a small pool of worker threads: the thumbnails currently
+visible are loaded first, followed by the ones just above and below the visible
+area, and the pending requests for thumbnails scrolled out of view are cancelled.
 
 :note: Using highlight thumbnails on mouse hovering may be slow on slower
  computers.
@@ -177,12 +183,18 @@ import io
 import os
 import wx
 import zlib
+import heapq
+import struct
+import hashlib
+import pathlib
+import itertools
+import tempfile
+import threading
+import traceback
 from math import radians
 
 from wx.lib.embeddedimage import PyEmbeddedImage
 
-import _thread as thread
-
 #----------------------------------------------------------------------
 # Get Default Icon/Data
 #----------------------------------------------------------------------
@@ -346,6 +358,13 @@ THUMB_OUTLINE_RECT = 2
 THUMB_OUTLINE_IMAGE = 4
 """ Only the image rectangle outlined on selection. """
 
+# Thumbnail Sizes Stored By ThumbnailCache, As (Folder Name, Maximum Edge In Pixels)
+THUMB_CACHE_FLAVOURS = (("normal", 128), ("large", 256), ("x-large", 512))
+""" The freedesktop.org thumbnail sizes used by :class:`ThumbnailCache`. """
+
+THUMB_LOADER_THREADS = min(4, os.cpu_count() or 1)
+""" Default number of worker threads used by :class:`ThumbnailLoader`. """
+
 # ThumbnailCtrl Events:
 # wxEVT_THUMBNAILS_SEL_CHANGED: Event Fired When You Change Thumb Selection
 # wxEVT_THUMBNAILS_POINTED: Event Fired When You Point A Thumb
@@ -376,6 +395,386 @@ EVT_THUMBNAILS_THUMB_CHANGED = wx.PyEventBinder(wxEVT_THUMBNAILS_THUMB_CHANGED,
 EVT_THUMBNAILS_CHAR = wx.PyEventBinder(wxEVT_THUMBNAILS_CHAR, 1)
 """ A character has been typed. """
 
+# ---------------------------------------------------------------------------- #
+# Class ThumbnailCache
+# Persistent On-Disk Storage For The Thumbnail Images
+# ---------------------------------------------------------------------------- #
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def ReadPNGText(data):
+    """
+    Returns a dictionary with the ``tEXt`` chunks of a PNG file, or ``None`` if
+    `data` is not a PNG stream.
+
+    :param `data`: the content of the PNG file, as bytes.
+    """
+
+    if data[:8] != PNG_SIGNATURE:
+        return None
+
+    text = {}
+    pos = 8
+
+    while pos + 8 <= len(data):
+        length, kind = struct.unpack(">I4s", data[pos:pos+8])
+        if kind == b"IEND":
+            break
+        if kind == b"tEXt":
+            key, sep, value = data[pos+8:pos+8+length].partition(b"\0")
+            text[key.decode("latin-1")] = value.decode("latin-1")
+        pos = pos + length + 12
+
+    return text
+
+
+def WritePNGText(data, text):
+    """
+    Returns a copy of a PNG stream with some ``tEXt`` chunks added after its header.
+
+    :param `data`: the content of the PNG file, as bytes;
+    :param `text`: a sequence of ``(keyword, value)`` string tuples.
+    """
+
+    pos = 8 + 12 + struct.unpack(">I", data[8:12])[0]
+    chunks = []
+
+    for key, value in text:
+        body = b"tEXt" + key.encode("latin-1") + b"\0" + value.encode("latin-1")
+        chunks.append(struct.pack(">I", len(body) - 4) + body +
+                      struct.pack(">I", zlib.crc32(body) & 0xffffffff))
+
+    return data[:pos] + b"".join(chunks) + data[pos:]
+
+
+class ThumbnailCache(object):
+    """
+    A persistent on-disk cache of thumbnail images, laid out as described by the
+    freedesktop.org thumbnail managing standard: every thumbnail is a PNG file
+    named after the MD5 digest of the image URI, stored in a sub-folder which
+    depends on the thumbnail size. The image modification time and file size are
+    saved with the thumbnail, so that a thumbnail is discarded as soon as the
+    image it was made from changes.
+
+    A single instance can be shared by several :class:`ScrolledThumbnail` and
+    :class:`ThumbnailCtrl` windows, and it is safe to use from the thumbnail
+    loader threads.
+    """
+
+    def __init__(self, folder=None):
+        """
+        Default class constructor.
+
+        :param `folder`: the folder in which the thumbnails are stored. If defaulted to
+         ``None``, the standard ``$XDG_CACHE_HOME/thumbnails`` folder is used, so that
+         the thumbnails are shared with the other applications following the standard.
+        """
+
+        if folder is None:
+            folder = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+            folder = os.path.join(folder, "thumbnails")
+
+        self._folder = folder
+
+
+    def GetFolder(self):
+        """ Returns the folder in which the thumbnails are stored. """
+
+        return self._folder
+
+
+    def GetFlavour(self, size):
+        """
+        Returns the name of the sub-folder and the maximum thumbnail edge used for
+        thumbnails displayed at `size` pixels, as a tuple. If `size` is larger than
+        any stored thumbnail, ``(None, None)`` is returned.
+
+        :param `size`: the largest thumbnail edge, in pixels.
+        """
+
+        for name, edge in THUMB_CACHE_FLAVOURS:
+            if size <= edge:
+                return name, edge
+
+        return None, None
+
+
+    def GetURI(self, filename):
+        """
+        Returns the ``file://`` URI identifying an image in the cache.
+
+        :param `filename`: the image file name.
+        """
+
+        return pathlib.Path(os.path.abspath(filename)).as_uri()
+
+
+    def GetCacheFileName(self, filename, size):
+        """
+        Returns the name of the file holding the thumbnail of an image, or ``None``
+        if `size` is too large to be cached.
+
+        :param `filename`: the image file name;
+        :param `size`: the largest thumbnail edge, in pixels.
+        """
+
+        name, edge = self.GetFlavour(size)
+        if name is None:
+            return None
+
+        digest = hashlib.md5(self.GetURI(filename).encode("utf-8")).hexdigest()
+        return os.path.join(self._folder, name, digest + ".png")
+
+
+    def Load(self, filename, size):
+        """
+        Loads the thumbnail of an image from the cache.
+
+        :param `filename`: the image file name;
+        :param `size`: the largest thumbnail edge, in pixels.
+
+        :return: a tuple ``(image, originalsize, alpha)`` as returned by the image
+         handlers, or ``None`` if no up-to-date thumbnail is available.
+        """
+
+        cachefile = self.GetCacheFileName(filename, size)
+        if cachefile is None:
+            return None
+
+        try:
+            stats = os.stat(filename)
+            with open(cachefile, "rb") as fid:
+                data = fid.read()
+        except OSError:
+            return None
+
+        text = ReadPNGText(data)
+        if not text or text.get("Thumb::URI") != self.GetURI(filename) or \
+           text.get("Thumb::MTime") != str(int(stats.st_mtime)) or \
+           text.get("Thumb::Size") != str(stats.st_size):
+            return None
+
+        img = wx.Image(io.BytesIO(data), wx.BITMAP_TYPE_PNG)
+        if not img.IsOk():
+            return None
+
+        try:
+            originalsize = (int(text["Thumb::Image::Width"]), int(text["Thumb::Image::Height"]))
+        except (KeyError, ValueError):
+            originalsize = (img.GetWidth(), img.GetHeight())
+
+        return img, originalsize, img.HasAlpha()
+
+
+    def Save(self, filename, size, img, originalsize):
+        """
+        Stores the thumbnail of an image in the cache.
+
+        :param `filename`: the image file name;
+        :param `size`: the largest thumbnail edge, in pixels;
+        :param `img`: the image, as a :class:`wx.Image`. It is scaled down to the
+         thumbnail size if needed;
+        :param `originalsize`: the original image width and height, in pixels.
+
+        :return: the image as stored in the cache.
+        """
+
+        name, edge = self.GetFlavour(size)
+        if name is None:
+            return img
+
+        width, height = img.GetWidth(), img.GetHeight()
+        if width > edge or height > edge:
+            scale = min(float(edge)/width, float(edge)/height)
+            img = img.Scale(max(1, int(width*scale)), max(1, int(height*scale)),
+                            wx.IMAGE_QUALITY_HIGH)
+
+        try:
+            stats = os.stat(filename)
+        except OSError:
+            return img
+
+        stream = io.BytesIO()
+        if not img.SaveFile(stream, wx.BITMAP_TYPE_PNG):
+            return img
+
+        text = [("Thumb::URI", self.GetURI(filename)),
+                ("Thumb::MTime", str(int(stats.st_mtime))),
+                ("Thumb::Size", str(stats.st_size)),
+                ("Thumb::Image::Width", str(originalsize[0])),
+                ("Thumb::Image::Height", str(originalsize[1])),
+                ("Software", "wxPython ScrolledThumbnail")]
+
+        data = WritePNGText(stream.getvalue(), text)
+
+        # Write to a temporary file first, so that other readers never see
+        # a partially written thumbnail
+        cachefile = self.GetCacheFileName(filename, size)
+        folder = os.path.dirname(cachefile)
+        tmpname = None
+
+        try:
+            os.makedirs(folder, 0o700, exist_ok=True)
+            fd, tmpname = tempfile.mkstemp(".png", dir=folder)
+            with os.fdopen(fd, "wb") as fid:
+                fid.write(data)
+            os.replace(tmpname, cachefile)
+        except OSError:
+            if tmpname is not None and os.path.exists(tmpname):
+                os.remove(tmpname)
+
+        return img
+
+
+    def Remove(self, filename):
+        """
+        Removes all the thumbnails of an image from the cache.
+
+        :param `filename`: the image file name.
+        """
+
+        for name, edge in THUMB_CACHE_FLAVOURS:
+            try:
+                os.remove(self.GetCacheFileName(filename, edge))
+            except OSError:
+                pass
+
+
+# ---------------------------------------------------------------------------- #
+# Class ThumbnailLoader
+# Pool Of Worker Threads Loading The Thumbnail Images By Priority
+# ---------------------------------------------------------------------------- #
+
+class ThumbnailLoader(object):
+    """
+    A pool of worker threads which load the thumbnail images in order of priority.
+
+    Every :class:`Thumb` has at most one pending request: scheduling it again with
+    a different priority replaces the previous request, and a cancelled request is
+    simply skipped when it reaches the top of the queue. A thumbnail which is being
+    loaded can not be scheduled again until its loading is complete.
+
+    Used internally.
+    """
+
+    def __init__(self, callback, threads=THUMB_LOADER_THREADS):
+        """
+        Default class constructor.
+
+        :param `callback`: a callable invoked from a worker thread with the
+         :class:`Thumb` to load;
+        :param `threads`: the number of worker threads.
+        """
+
+        self._callback = callback
+        self._threads = []
+        self._maxthreads = max(1, threads)
+        self._condition = threading.Condition()
+        self._queue = []
+        self._pending = {}
+        self._loading = set()
+        self._counter = itertools.count()
+        self._stopped = False
+
+
+    def Schedule(self, thumb, priority):
+        """
+        Requests the loading of a thumbnail.
+
+        :param `thumb`: an instance of :class:`Thumb`;
+        :param `priority`: any comparable value, lower priorities are loaded first.
+        """
+
+        with self._condition:
+            if self._stopped or thumb in self._loading or self._pending.get(thumb) == priority:
+                return
+
+            self._pending[thumb] = priority
+            heapq.heappush(self._queue, (priority, next(self._counter), thumb))
+
+            if len(self._threads) < min(self._maxthreads, len(self._pending)):
+                worker = threading.Thread(target=self.Run, name="ThumbnailLoader")
+                worker.daemon = True
+                worker.start()
+                self._threads.append(worker)
+
+            self._condition.notify()
+
+
+    def Cancel(self, thumb=None):
+        """
+        Cancels a pending request.
+
+        :param `thumb`: an instance of :class:`Thumb`, or ``None`` to cancel all the
+         pending requests. A thumbnail already being loaded is not interrupted.
+        """
+
+        with self._condition:
+            if thumb is None:
+                self._pending.clear()
+                self._queue = []
+            else:
+                self._pending.pop(thumb, None)
+
+
+    def IsPending(self, thumb):
+        """
+        Returns ``True`` if the loading of a thumbnail has been requested but not
+        started yet.
+
+        :param `thumb`: an instance of :class:`Thumb`.
+        """
+
+        with self._condition:
+            return thumb in self._pending
+
+
+    def Stop(self):
+        """ Cancels all the pending requests and terminates the worker threads. """
+
+        with self._condition:
+            self._stopped = True
+            self._pending.clear()
+            self._queue = []
+            self._condition.notify_all()
+
+
+    def Run(self):
+        """ The worker thread main loop. Used internally. """
+
+        while True:
+
+            with self._condition:
+                thumb = None
+
+                while thumb is None:
+                    if self._stopped:
+                        self._threads.remove(threading.current_thread())
+                        return
+
+                    if not self._queue:
+                        self._condition.wait()
+                        continue
+
+                    priority, count, thumb = heapq.heappop(self._queue)
+
+                    # Skip requests which have been cancelled or rescheduled
+                    if self._pending.get(thumb) != priority:
+                        thumb = None
+                    else:
+                        del self._pending[thumb]
+                        self._loading.add(thumb)
+
+            try:
+                self._callback(thumb)
+            except Exception:
+                traceback.print_exc()
+            finally:
+                with self._condition:
+                    self._loading.discard(thumb)
+
+
 # ---------------------------------------------------------------------------- #
 # Class PILImageHandler, handles loading and highlighting images with PIL
 # ---------------------------------------------------------------------------- #
@@ -555,9 +954,14 @@ class Thumb(object):
         self._lastmod = lastmod
         self._captionbreaks = []
         self._image = wx.Image(1, 1)
+        self._originalsize = (0, 0)
         self._alpha = None
         self._imagehandler = imagehandler()
         self._bitmap = None
+        self._bitmapsource = None
+        self._bitmapsize = None
+        self._loaded = False
+        self._loadedsize = None
 
 
     def SetCaption(self, caption=""):
@@ -585,6 +989,8 @@ class Thumb(object):
         """
 
         self._image = image
+        self._loaded = True
+        self._loadedsize = None
 
 
     def GetFileName(self):
@@ -654,12 +1060,18 @@ class Thumb(object):
         :param `height`: the associated bitmap height.
         """
 
-        if self._bitmap:
-            if self._bitmap.GetWidth() == width and self._bitmap.GetHeight() == height:
-                return self._bitmap
+        # The image may be replaced by a loader thread at any time, so the
+        # bitmap is only reused if it has been made from the current one
+        img = self._image
+        if self._bitmap is not None and self._bitmapsource is img and \
+           self._bitmapsize == (width, height):
+            return self._bitmap
 
-        img = self.GetThumbnail(width, height)
-        bmp = img.ConvertToBitmap()
+        bmp = self.GetThumbnail(width, height).ConvertToBitmap()
+
+        self._bitmap = bmp
+        self._bitmapsource = img
+        self._bitmapsize = (width, height)
 
         return bmp
 
@@ -793,13 +1205,57 @@ class Thumb(object):
         return thumbinfo
 
 
-    def LoadImage(self):
-        """ Load image using imagehandler. """
+    def IsLoaded(self, size=0):
+        """
+        Returns ``True`` if the image has been loaded with enough resolution.
+
+        :param `size`: the largest thumbnail edge the image will be displayed at, in pixels.
+        """
+
+        return self._loaded and (self._loadedsize is None or size <= self._loadedsize)
+
+
+    def LoadImage(self, cache=None, size=0):
+        """
+        Load image using imagehandler.
+
+        :param `cache`: an optional :class:`ThumbnailCache`. If given, the image is
+         read from (or stored into) the cache, scaled down to the cached thumbnail size;
+        :param `size`: the largest thumbnail edge the image will be displayed at, in pixels.
+        """
+
         filename = self.GetFullFileName()
-        img, size, alpha = self._imagehandler.Load(filename)
+        loadedsize = None
+        cached = None
+
+        if cache is not None:
+            flavour, loadedsize = cache.GetFlavour(size)
+            if loadedsize is not None:
+                cached = cache.Load(filename, loadedsize)
+
+        if cached is not None:
+            img, originalsize, alpha = cached
+        else:
+            img, originalsize, alpha = self._imagehandler.Load(filename)
+            if loadedsize is not None:
+                img = cache.Save(filename, loadedsize, img, originalsize)
+
         self._image = img
-        self._originalsize = size
+        self._originalsize = originalsize
         self._alpha = alpha
+        self._loaded = True
+        self._loadedsize = loadedsize
+
+
+    def SetLoadFailed(self):
+        """ Marks the image as loaded after its loading failed, showing the broken file image instead. """
+
+        img = file_broken.GetImage()
+        self._image = img
+        self._originalsize = (img.GetWidth(), img.GetHeight())
+        self._alpha = False
+        self._loaded = True
+        self._loadedsize = None
 
 
     def Rotate(self, angle):
@@ -832,7 +1288,7 @@ class ScrolledThumbnail(wx.ScrolledWindow):
 
     def __init__(self, parent, id=wx.ID_ANY, pos=wx.DefaultPosition,
                  size=wx.DefaultSize, thumboutline=THUMB_OUTLINE_IMAGE,
-                 imagehandler=None):
+                 imagehandler=None, thumbnailcache=None):
         """
         Default class constructor.
 
@@ -854,12 +1310,18 @@ class ScrolledThumbnail(wx.ScrolledWindow):
          =========================== ======= ==================================
 
         :param `imagehandler`: can be :class:`PILImageHandler` if PIL is installed (faster), or
-         :class:`NativeImageHandler` which only uses wxPython image methods.
+         :class:`NativeImageHandler` which only uses wxPython image methods;
+        :param `thumbnailcache`: an optional :class:`ThumbnailCache` used to store the
+         thumbnails on disk across sessions.
         """
 
         wx.ScrolledWindow.__init__(self, parent, id, pos, size)
 
         self._items = []
+        self._cache = thumbnailcache
+        self._loader = ThumbnailLoader(self.LoadThumb)
+        self._requested = set()
+        self._refreshpending = False
         self.SetThumbSize(96, 80)
         self._tOutline = thumboutline
         self._selected = -1
@@ -909,6 +1371,7 @@ class ScrolledThumbnail(wx.ScrolledWindow):
         self.Bind(wx.EVT_SIZE, self.OnResize)
         self.Bind(wx.EVT_ERASE_BACKGROUND, lambda x: None)
         self.Bind(wx.EVT_PAINT, self.OnPaint)
+        self.Bind(wx.EVT_WINDOW_DESTROY, self.OnDestroy)
 
 
     def GetSelectedItem(self, index):
@@ -1176,6 +1639,8 @@ class ScrolledThumbnail(wx.ScrolledWindow):
     def Clear(self):
         """ Clears :class:`ThumbnailCtrl`. """
 
+        self._loader.Cancel()
+        self._requested = set()
         self._items = []
         self._selected = -1
         self._selectedarray = []
@@ -1183,47 +1648,75 @@ class ScrolledThumbnail(wx.ScrolledWindow):
         self.Refresh()
 
 
-    def ThreadImage(self, filenames):
+    def SetThumbnailCache(self, cache=None):
         """
-        Threaded method to load images. Used internally.
+        Sets the on-disk thumbnail cache.
 
-        :param `filenames`: a Python list of file names containing images.
+        :param `cache`: an instance of :class:`ThumbnailCache`, or ``None`` to load the
+         full size images without caching them.
         """
 
-        count = 0
+        self._cache = cache
 
-        while count < len(filenames):
 
-            if not self._isrunning:
-                self._isrunning = False
-                thread.exit()
-                return
+    def GetThumbnailCache(self):
+        """ Returns the on-disk thumbnail cache, an instance of :class:`ThumbnailCache` or ``None``. """
 
-            self.LoadImages(filenames[count], count)
-            if count < 4:
-                self.Refresh()
-            elif count%4 == 0:
-                self.Refresh()
+        return self._cache
+
+
+    def LoadThumb(self, thumb):
+        """
+        Loads a thumbnail image. Called from the loader threads, used internally.
+
+        :param `thumb`: an instance of :class:`Thumb`.
+        """
+
+        try:
+            thumb.LoadImage(self._cache, max(self._tWidth, self._tHeight))
+        except Exception:
+            # Show the broken file image, instead of retrying at every repaint
+            traceback.print_exc()
+            thumb.SetLoadFailed()
 
-            count = count + 1
+        # Coalesce the refreshes of the thumbnails loaded in a row
+        if not self._refreshpending:
+            self._refreshpending = True
+            wx.CallAfter(self.OnThumbLoaded)
 
-        self._isrunning = False
-        thread.exit()
 
+    def OnThumbLoaded(self):
+        """ Refreshes :class:`ScrolledThumbnail` after some thumbnails have been loaded. Used internally. """
 
-    def LoadImages(self, newfile, imagecount):
+        if not self:
+            return
+
+        self._refreshpending = False
+        self.Refresh()
+
+
+    def RequestThumbs(self, requests):
         """
-        Threaded method to load images. Used internally.
+        Schedules the loading of the thumbnails about to be shown, and cancels the
+        pending requests for the thumbnails which have been scrolled away. Used internally.
 
-        :param `newfile`: a file name containing an image to thumbnail;
-        :param `imagecount`: the number of images loaded until now.
+        :param `requests`: a list of ``(priority, index)`` tuples, lower priorities are
+         loaded first.
         """
 
-        if not self._isrunning:
-            thread.exit()
-            return
+        size = max(self._tWidth, self._tHeight)
+        requested = set()
+
+        for priority, index in requests:
+            thumb = self._items[index]
+            if not thumb.IsLoaded(size):
+                self._loader.Schedule(thumb, (priority, index))
+                requested.add(thumb)
 
-        self._items[imagecount].LoadImage()
+        for thumb in self._requested - requested:
+            self._loader.Cancel(thumb)
+
+        self._requested = requested
 
 
     def ShowThumbs(self, thumbs):
@@ -1231,25 +1724,22 @@ class ScrolledThumbnail(wx.ScrolledWindow):
         Shows all the thumbnails.
 
         :param `thumbs`: should be a sequence with instances of :class:`Thumb`;
+
+        :note: The images are loaded in background threads as the thumbnails are
+         scrolled into view.
         """
 
-        self._isrunning = False
+        self._loader.Cancel()
+        self._requested = set()
 
         # update items
         self._items = thumbs
-        myfiles = [thumb.GetFullFileName() for thumb in thumbs]
-
-        self._isrunning = True
-
-        thread.start_new_thread(self.ThreadImage, (myfiles,))
-        wx.MilliSleep(20)
 
         self._selectedarray = []
         self.UpdateProp()
         self.Refresh()
 
 
-
     def SetSelection(self, value=-1):
         """
         Sets thumbnail selection.
@@ -1695,6 +2185,11 @@ class ScrolledThumbnail(wx.ScrolledWindow):
 
         w, h = self.GetClientSize()
 
+        # thumbnails within one page of the visible area are preloaded
+        preloadRect = wx.Rect(paintRect)
+        preloadRect.Inflate(0, paintRect.height)
+        requests = []
+
         # items
         row = -1
         xwhite = self._tBorder
@@ -1713,9 +2208,16 @@ class ScrolledThumbnail(wx.ScrolledWindow):
             tw = self._tWidth + self._tBorder
             th = self._tHeight + self.GetCaptionHeight(row) + self._tBorder
             # visible?
-            if not paintRect.Intersects(wx.Rect(tx, ty, tw, th)):
+            thumbRect = wx.Rect(tx, ty, tw, th)
+            if not preloadRect.Intersects(thumbRect):
                 continue
 
+            if not paintRect.Intersects(thumbRect):
+                requests.append((1, ii))
+                continue
+
+            requests.append((0, ii))
+
             thmb = wx.Bitmap(tw, th)
             self.DrawThumbnail(thmb, self._items[ii], ii)
             dc.DrawBitmap(thmb, tx, ty)
@@ -1740,6 +2242,21 @@ class ScrolledThumbnail(wx.ScrolledWindow):
                      self.GetCaptionHeight(0, self._rows - 1)
             dc.DrawRectangle(rect)
 
+        self.RequestThumbs(requests)
+
+
+    def OnDestroy(self, event):
+        """
+        Handles the ``wx.EVT_WINDOW_DESTROY`` event for :class:`ThumbnailCtrl`.
+
+        :param `event`: a :class:`wx.WindowDestroyEvent` event to be processed.
+        """
+
+        if event.GetEventObject() is self:
+            self._loader.Stop()
+
+        event.Skip()
+
 
     def OnResize(self, event):
         """
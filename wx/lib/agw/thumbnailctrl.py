@@ -154,7 +154,7 @@ import os
 import time
 
 from wx.lib.agw.scrolledthumbnail import (ScrolledThumbnail, EVT_THUMBNAILS_CHAR,
-PILImageHandler, NativeImageHandler, Thumb)
+PILImageHandler, NativeImageHandler, Thumb, ThumbnailCache)
 
 # Image File Name Extensions: Am I Missing Some Extensions Here?
 extensions = [".jpeg", ".jpg", ".bmp", ".png", ".ico", ".tiff", ".ani", ".cur", ".gif",
@@ -245,7 +245,7 @@ class ThumbnailCtrl(wx.Panel):
     def __init__(self, parent, id=wx.ID_ANY, pos=wx.DefaultPosition,
                  size=wx.DefaultSize, thumboutline=THUMB_OUTLINE_IMAGE,
                  thumbfilter=None,   # Ignored, included for backward compatibility
-                 imagehandler=PILImageHandler):
+                 imagehandler=PILImageHandler, thumbnailcache=None):
         """
         Default class constructor.
 
@@ -268,7 +268,9 @@ class ThumbnailCtrl(wx.Panel):
 
         :param `thumbfilter`: filter for image/video/audio files.  Ignored.
         :param `imagehandler`: can be :class:`PILImageHandler` if PIL is installed (faster), or
-         :class:`NativeImageHandler` which only uses wxPython image methods.
+         :class:`NativeImageHandler` which only uses wxPython image methods;
+        :param `thumbnailcache`: an optional :class:`ThumbnailCache` used to store the
+         thumbnails on disk, so that folders visited again are shown quickly.
         """
 
         wx.Panel.__init__(self, parent, id, pos, size)
@@ -277,7 +279,8 @@ class ThumbnailCtrl(wx.Panel):
 
         self._combo = wx.ComboBox(self, -1, style=wx.CB_DROPDOWN | wx.CB_READONLY)
         self._scrolled = ScrolledThumbnail(self, -1, thumboutline=thumboutline,
-                                           imagehandler = imagehandler)
+                                           imagehandler = imagehandler,
+                                           thumbnailcache = thumbnailcache)
 
         subsizer = wx.BoxSizer(wx.HORIZONTAL)
         subsizer.Add((3, 0), 0)
@@ -300,7 +303,8 @@ class ThumbnailCtrl(wx.Panel):
                    "SetSelection", "GetSelection", "SetZoomFactor",
                    "GetZoomFactor", "SetCaptionFont", "GetCaptionFont", "GetItemIndex",
                    "InsertItem", "RemoveItemAt", "IsSelected", "Rotate", "ZoomIn", "ZoomOut",
-                   "EnableToolTips", "GetThumbInfo", "SetDropShadow", "GetDropShadow"]
+                   "EnableToolTips", "GetThumbInfo", "SetDropShadow", "GetDropShadow",
+                   "SetThumbnailCache", "GetThumbnailCache"]
 
         for method in methods:
             setattr(self, method, getattr(self._scrolled, method))
@@ -511,6 +515,8 @@ class ThumbnailCtrl(wx.Panel):
                     os.remove(filename)
                     self._scrolled.RemoveItemAt(index)
                     count = count + 1
+                    if self._scrolled.GetThumbnailCache() is not None:
+                        self._scrolled.GetThumbnailCache().Remove(filename)
                 except:
                     errordelete.append(self._scrolled.GetFileName(index))
 
@@ -235,10 +235,12 @@ Version 0.8
 
 import wx
 import math
+import array
 import bisect
 import io
 import zlib
 from functools import cmp_to_key
+from collections import OrderedDict
 
 from wx.lib.expando import ExpandoTextCtrl
 
@@ -584,6 +586,30 @@ def CheckVariableRowHeight(listCtrl, text):
             raise Exception("Multiline text items are not allowed without the ULC_HAS_VARIABLE_ROW_HEIGHT style.")
 
 
+def GetSortColumns(columns, reverse=False):
+    """
+    Returns the columns to sort on as a list of `(column, reverse)` tuples, the
+    most significant column first.
+
+    :param `columns`: an integer or a Python list of column indexes and/or
+     `(column, reverse)` tuples;
+    :param `reverse`: the sort order of the columns given without one.
+    """
+
+    if isinstance(columns, int):
+        columns = [columns]
+
+    sortColumns = []
+    for column in columns:
+        if isinstance(column, int):
+            sortColumns.append((column, reverse))
+        else:
+            column, colReverse = column
+            sortColumns.append((column, bool(colReverse)))
+
+    return sortColumns
+
+
 def CreateListItem(itemOrId, col):
     """
     Creates a new instance of :class:`UltimateListItem`.
@@ -1136,6 +1162,358 @@ class SelectionStore(object):
         self._count = count
 
 
+# ----------------------------------------------------------------------------
+# UltimateListColumnStore: a compact storage for the items of virtual controls
+# ----------------------------------------------------------------------------
+
+class UltimateListRowView(object):
+    """
+    A lightweight view of one row of a :class:`UltimateListColumnStore`. It holds
+    no data of its own, only the store and the row index.
+    """
+
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store, row):
+        """
+        Default class constructor.
+
+        :param `store`: an instance of :class:`UltimateListColumnStore`;
+        :param `row`: the row index.
+        """
+
+        self._store = store
+        self._row = row
+
+
+    def GetId(self):
+        """ Returns the row index. """
+
+        return self._row
+
+
+    def GetText(self, col=0):
+        """
+        Returns the text of the row in the given column.
+
+        :param `col`: the column index.
+        """
+
+        return self._store.GetText(self._row, col)
+
+
+    def GetImage(self, col=0):
+        """
+        Returns the images of the row in the given column, as a Python list.
+
+        :param `col`: the column index.
+        """
+
+        return self._store.GetImage(self._row, col)
+
+
+    def GetColour(self, col=0):
+        """
+        Returns the text colour of the row in the given column, or ``None``.
+
+        :param `col`: the column index.
+        """
+
+        return self._store.GetColour(self._row, col)
+
+
+    def GetData(self):
+        """ Returns the data associated with the row. """
+
+        return self._store.GetData(self._row)
+
+
+class UltimateListColumnStore(object):
+    """
+    UltimateListColumnStore keeps the items of a virtual :class:`UltimateListCtrl`
+    in report mode as one array per column (texts, images and text colours)
+    instead of one :class:`UltimateListLineData` per line, so that lists with
+    hundreds of thousands of items use a fraction of the memory.
+
+    Images and colours are only stored for the columns that use them, and each
+    cell holds at most one image. Attach the store with
+    :meth:`UltimateListCtrl.SetColumnStore() <UltimateListCtrl.SetColumnStore>`,
+    which provides the virtual callbacks (:meth:`~UltimateListCtrl.OnGetItemText`
+    and friends) from it; call it again after adding or removing rows.
+    """
+
+    def __init__(self, columnCount):
+        """
+        Default class constructor.
+
+        :param `columnCount`: the number of columns in the store.
+        """
+
+        self._texts = [[] for col in range(columnCount)]
+        # created on first use, one array('i') per column, -1 for no image
+        self._images = [None]*columnCount
+        # created on first use, one list per column, None for the default colour
+        self._colours = [None]*columnCount
+        self._data = []
+
+
+    def __len__(self):
+
+        return len(self._data)
+
+
+    def GetColumnCount(self):
+        """ Returns the number of columns in the store. """
+
+        return len(self._texts)
+
+
+    def GetItemCount(self):
+        """ Returns the number of rows in the store. """
+
+        return len(self._data)
+
+
+    def Clear(self):
+        """ Removes all the rows from the store. """
+
+        columnCount = self.GetColumnCount()
+        self._texts = [[] for col in range(columnCount)]
+        self._images = [None]*columnCount
+        self._colours = [None]*columnCount
+        self._data = []
+
+
+    def AppendRows(self, rows, data=None):
+        """
+        Appends many rows at once.
+
+        :param `rows`: an iterable of sequences, with one text per column (missing
+         texts are empty);
+        :param `data`: if not ``None``, an iterable with the data of each row.
+
+        :return: The index of the first row appended.
+        """
+
+        first = len(self._data)
+        columnCount = len(self._texts)
+        padding = ("",)*columnCount
+
+        count = 0
+        for row in rows:
+            row = tuple(row)
+            if len(row) > columnCount:
+                raise Exception("Too many texts for the number of columns")
+            row += padding[len(row):]
+            for texts, text in zip(self._texts, row):
+                texts.append(text)
+            count += 1
+
+        if data is None:
+            self._data.extend([None]*count)
+        else:
+            data = list(data)
+            if len(data) != count:
+                raise Exception("The number of data items does not match the number of rows")
+            self._data.extend(data)
+
+        for col in range(columnCount):
+            if self._images[col] is not None:
+                self._images[col].extend([-1]*count)
+            if self._colours[col] is not None:
+                self._colours[col].extend([None]*count)
+
+        return first
+
+
+    def Append(self, texts, data=None):
+        """
+        Appends one row.
+
+        :param `texts`: a sequence with one text per column;
+        :param `data`: the data associated with the row.
+
+        :return: The index of the new row.
+        """
+
+        return self.AppendRows([texts], [data])
+
+
+    def DeleteRow(self, row):
+        """
+        Deletes a row.
+
+        :param `row`: the row index.
+        """
+
+        for texts in self._texts:
+            del texts[row]
+        for column in self._images + self._colours:
+            if column is not None:
+                del column[row]
+        del self._data[row]
+
+
+    def GetRow(self, row):
+        """
+        Returns a :class:`UltimateListRowView` for the given row.
+
+        :param `row`: the row index.
+        """
+
+        if row < 0 or row >= len(self._data):
+            raise Exception("Invalid row index")
+
+        return UltimateListRowView(self, row)
+
+
+    def GetText(self, row, col=0):
+        """
+        Returns the text of a cell.
+
+        :param `row`: the row index;
+        :param `col`: the column index.
+        """
+
+        return self._texts[col][row]
+
+
+    def SetText(self, row, col, text):
+        """
+        Sets the text of a cell.
+
+        :param `row`: the row index;
+        :param `col`: the column index;
+        :param `text`: the new text.
+        """
+
+        self._texts[col][row] = text
+
+
+    def GetImage(self, row, col=0):
+        """
+        Returns the images of a cell, as a Python list.
+
+        :param `row`: the row index;
+        :param `col`: the column index.
+        """
+
+        images = self._images[col]
+        if images is None or images[row] < 0:
+            return []
+
+        return [images[row]]
+
+
+    def SetImage(self, row, col, image):
+        """
+        Sets the image of a cell.
+
+        :param `row`: the row index;
+        :param `col`: the column index;
+        :param `image`: the image index in the image list, or an empty list or -1
+         for no image.
+        """
+
+        image = to_list(image)
+        if len(image) > 1:
+            raise Exception("UltimateListColumnStore can only hold one image per cell")
+        image = (image and [image[0]] or [-1])[0]
+
+        images = self._images[col]
+        if images is None:
+            if image < 0:
+                return
+            images = self._images[col] = array.array("i", [-1])*len(self._data)
+
+        images[row] = image
+
+
+    def GetColour(self, row, col=0):
+        """
+        Returns the text colour of a cell, or ``None`` for the default colour.
+
+        :param `row`: the row index;
+        :param `col`: the column index.
+        """
+
+        colours = self._colours[col]
+        if colours is None:
+            return None
+
+        return colours[row]
+
+
+    def SetColour(self, row, col, colour):
+        """
+        Sets the text colour of a cell.
+
+        :param `row`: the row index;
+        :param `col`: the column index;
+        :param `colour`: a valid :class:`wx.Colour` object, or ``None`` for the default colour.
+        """
+
+        colours = self._colours[col]
+        if colours is None:
+            if colour is None:
+                return
+            colours = self._colours[col] = [None]*len(self._data)
+
+        colours[row] = colour
+
+
+    def GetData(self, row):
+        """
+        Returns the data associated with a row.
+
+        :param `row`: the row index.
+        """
+
+        return self._data[row]
+
+
+    def SetData(self, row, data):
+        """
+        Sets the data associated with a row.
+
+        :param `row`: the row index;
+        :param `data`: any Python object.
+        """
+
+        self._data[row] = data
+
+
+    def Sort(self, key=None, columns=None, reverse=False):
+        """
+        Sorts the rows. The sort is stable: rows that compare equal keep their order.
+
+        :param `key`: a function of one argument, applied to the texts of the sort
+         columns, or to the row data if `columns` is ``None``;
+        :param `columns`: the columns to sort on, see :func:`GetSortColumns`;
+        :param `reverse`: ``True`` to sort in descending order.
+        """
+
+        order = range(len(self._data))
+
+        if columns is None:
+            sortKeys = [(self._data, reverse)]
+        else:
+            sortKeys = [(self._texts[col], colReverse) for col, colReverse in GetSortColumns(columns, reverse)]
+
+        # Least significant column first, as each sort is stable
+        for values, colReverse in reversed(sortKeys):
+            if key is not None:
+                values = list(map(key, values))
+            order = sorted(order, key=values.__getitem__, reverse=colReverse)
+
+        self._texts = [list(map(texts.__getitem__, order)) for texts in self._texts]
+        self._images = [(images is not None and [array.array("i", map(images.__getitem__, order))] or [None])[0]
+                        for images in self._images]
+        self._colours = [(colours is not None and [list(map(colours.__getitem__, order))] or [None])[0]
+                         for colours in self._colours]
+        self._data = list(map(self._data.__getitem__, order))
+
+
 # ----------------------------------------------------------------------------
 # UltimateListItemAttr: a structure containing the visual attributes of an item
 # ----------------------------------------------------------------------------
@@ -6095,6 +6473,10 @@ class UltimateListMainWindow(wx.ScrolledWindow):
         self._aColWidths = []
 
         self._selStore = SelectionStore()
+        # the items fetched from the virtual callbacks, by line index, the
+        # least recently used first
+        self._rowCache = OrderedDict()
+        self._rowCacheSize = 1000
         self.SetBackgroundStyle(wx.BG_STYLE_CUSTOM)
 
         # Background image settings
@@ -6517,7 +6899,8 @@ class UltimateListMainWindow(wx.ScrolledWindow):
 
     def CacheLineData(self, line):
         """
-        Saves the current line attributes.
+        Saves the current line attributes, from the row cache or from the virtual
+        callbacks.
 
         :param `line`: an instance of :class:`UltimateListLineData`.
 
@@ -6525,21 +6908,140 @@ class UltimateListMainWindow(wx.ScrolledWindow):
          style set.
         """
 
-        listctrl = self.GetListCtrl()
         ld = self.GetDummyLine()
 
+        rowCache = self._rowCache
+        row = rowCache.pop(line, None)
+        if row is None or len(row[0]) != self.GetColumnCount():
+            row = self._FetchRow(line)
+
+        if self._rowCacheSize > 0:
+            # most recently used last
+            rowCache[line] = row
+            if len(rowCache) > self._rowCacheSize:
+                rowCache.popitem(last=False)
+
+        columns, attr = row
+        for col, (text, tooltip, colour, image, kind, checked) in enumerate(columns):
+            ld.SetText(col, text)
+            ld.SetToolTip(col, tooltip)
+            ld.SetColour(col, colour)
+            ld.SetImage(col, image)
+            ld.SetKind(col, kind)
+            if kind > 0:
+                ld.Check(col, checked)
+
+        ld.SetAttr(attr)
+
+
+    def FetchLines(self, lineFrom, lineTo):
+        """
+        Gets the items in a range of lines from the virtual callbacks, if they are
+        not in the row cache yet. The texts are asked for all at once with
+        :meth:`UltimateListCtrl.OnGetItemsRange() <UltimateListCtrl.OnGetItemsRange>`,
+        if it is overloaded.
+
+        :param `lineFrom`: the first line to fetch;
+        :param `lineTo`: the last line to fetch.
+
+        :note: This method is used only if the :class:`UltimateListCtrl` has the ``ULC_VIRTUAL``
+         style set.
+        """
+
+        if self._rowCacheSize <= 0:
+            return
+
+        lineTo = min(lineTo, lineFrom + self._rowCacheSize - 1, self.GetItemCount() - 1)
         countCol = self.GetColumnCount()
-        for col in range(countCol):
-            ld.SetText(col, listctrl.OnGetItemText(line, col))
-            ld.SetToolTip(col, listctrl.OnGetItemToolTip(line, col))
-            ld.SetColour(col, listctrl.OnGetItemTextColour(line, col))
-            ld.SetImage(col, listctrl.OnGetItemColumnImage(line, col))
+        rowCache = self._rowCache
+
+        missing = [line for line in range(lineFrom, lineTo + 1)
+                   if line not in rowCache or len(rowCache[line][0]) != countCol]
+        if not missing:
+            return
+
+        lineFrom, lineTo = missing[0], missing[-1]
+        rows = self.GetListCtrl().OnGetItemsRange(lineFrom, lineTo)
+        if rows is not None and len(rows) != lineTo - lineFrom + 1:
+            raise Exception("OnGetItemsRange() should return one row per line")
+
+        for line in missing:
+            rowCache.pop(line, None)
+            texts = (rows is not None and [rows[line - lineFrom]] or [None])[0]
+            rowCache[line] = self._FetchRow(line, texts)
+
+        while len(rowCache) > self._rowCacheSize:
+            rowCache.popitem(last=False)
+
+
+    def _FetchRow(self, line, texts=None):
+        """
+        Gets the items of a line from the virtual callbacks.
+
+        :param `line`: the line index;
+        :param `texts`: if not ``None``, the texts of the line, one per column.
+
+        :return: A tuple with a tuple of `(text, tooltip, colour, image, kind, checked)`
+         per column and the line :class:`UltimateListItemAttr`.
+        """
+
+        listctrl = self.GetListCtrl()
+
+        columns = []
+        for col in range(self.GetColumnCount()):
+            if texts is None:
+                text = listctrl.OnGetItemText(line, col)
+            else:
+                text = texts[col]
             kind = listctrl.OnGetItemColumnKind(line, col)
-            ld.SetKind(col, kind)
+            checked = None
             if kind > 0:
-                ld.Check(col, listctrl.OnGetItemColumnCheck(line, col))
+                checked = listctrl.OnGetItemColumnCheck(line, col)
+            columns.append((text, listctrl.OnGetItemToolTip(line, col),
+                            listctrl.OnGetItemTextColour(line, col),
+                            listctrl.OnGetItemColumnImage(line, col), kind, checked))
+
+        return tuple(columns), listctrl.OnGetItemAttr(line)
+
+
+    def InvalidateLines(self, lineFrom=0, lineTo=None):
+        """
+        Removes a range of lines from the row cache, so that their items are asked
+        for again to the virtual callbacks.
+
+        :param `lineFrom`: the first line to remove;
+        :param `lineTo`: the last line to remove, or ``None`` to remove all the
+         lines from `lineFrom`.
+        """
+
+        rowCache = self._rowCache
+        if lineFrom <= 0 and lineTo is None:
+            rowCache.clear()
+        elif lineTo is not None and lineTo - lineFrom < len(rowCache):
+            for line in range(lineFrom, lineTo + 1):
+                rowCache.pop(line, None)
+        else:
+            for line in [line for line in rowCache
+                         if line >= lineFrom and (lineTo is None or line <= lineTo)]:
+                del rowCache[line]
+
+
+    def SetRowCacheSize(self, size):
+        """
+        Sets the maximum number of lines kept in the row cache of a virtual control.
+
+        :param `size`: the number of lines, 0 to disable the cache.
+        """
+
+        self._rowCacheSize = size
+        while len(self._rowCache) > max(size, 0):
+            self._rowCache.popitem(last=False)
 
-        ld.SetAttr(listctrl.OnGetItemAttr(line))
+
+    def GetRowCacheSize(self):
+        """ Returns the maximum number of lines kept in the row cache of a virtual control. """
+
+        return self._rowCacheSize
 
 
     def GetDummyLine(self):
@@ -6943,8 +7445,14 @@ class UltimateListMainWindow(wx.ScrolledWindow):
         Redraws the input line.
 
         :param `line`: an instance of :class:`UltimateListLineData`.
+
+        :note: For a virtual :class:`UltimateListCtrl`, the line is also removed
+         from the row cache, so that it is asked for again to the virtual callbacks.
         """
 
+        if self.IsVirtual():
+            self.InvalidateLines(line, line)
+
         if self.InReportView():
 
             visibleFrom, visibleTo = self.GetVisibleLinesRange()
@@ -6962,8 +7470,14 @@ class UltimateListMainWindow(wx.ScrolledWindow):
 
         :param `lineFrom`: an integer representing the first line to refresh;
         :param `lineTo`: an integer representing the last line to refresh.
+
+        :note: For a virtual :class:`UltimateListCtrl`, the lines are also removed
+         from the row cache, so that they are asked for again to the virtual callbacks.
         """
 
+        if self.IsVirtual():
+            self.InvalidateLines(lineFrom, lineTo)
+
         if self.InReportView():
 
             visibleFrom, visibleTo = self.GetVisibleLinesRange()
@@ -7113,6 +7627,8 @@ class UltimateListMainWindow(wx.ScrolledWindow):
                 evCache.m_itemIndex = visibleTo
                 self.GetParent().GetEventHandler().ProcessEvent(evCache)
 
+                self.FetchLines(visibleFrom, visibleTo)
+
             no_highlight = self.HasAGWFlag(ULC_NO_HIGHLIGHT)
 
             for line in range(visibleFrom, visibleTo+1):
@@ -9040,6 +9556,10 @@ class UltimateListMainWindow(wx.ScrolledWindow):
         le.SetEventObject(parent)
         parent.GetEventHandler().ProcessEvent(le)
 
+        if self.IsVirtual():
+            # The application usually updates its data in the event handler
+            self.InvalidateLines(item._itemId, item._itemId)
+
 
     def AutoCheckChild(self, isChecked, column):
         """
@@ -9467,6 +9987,7 @@ class UltimateListMainWindow(wx.ScrolledWindow):
 
         self._selStore.SetItemCount(count)
         self._countVirt = count
+        self.InvalidateLines()
 
         self.ResetVisibleLinesRange()
 
@@ -10026,6 +10547,7 @@ class UltimateListMainWindow(wx.ScrolledWindow):
         if self.IsVirtual():
             self._countVirt = 0
             self._selStore.Clear()
+            self.InvalidateLines()
 
         if self.InReportView():
             self.ResetVisibleLinesRange(True)
@@ -10452,6 +10974,69 @@ class UltimateListMainWindow(wx.ScrolledWindow):
         self.RecalculatePositions(True)
 
 
+    def SortItemsByKey(self, key=None, columns=None, reverse=False):
+        """
+        Sorts the items using a key function, which is called once per item and
+        column instead of once per comparison as in :meth:`~UltimateListMainWindow.SortItems`.
+        The sort is stable.
+
+        :param `key`: a function of one argument, applied to the item texts in the
+         sort columns, or to the item data if `columns` is ``None``. If ``None``, the
+         texts (or the data) are compared directly;
+        :param `columns`: the columns to sort on, see :func:`GetSortColumns`;
+        :param `reverse`: ``True`` to sort in descending order.
+
+        :note: Virtual controls can only be sorted when they use a
+         :class:`UltimateListColumnStore`.
+        """
+
+        if self.IsVirtual():
+            store = self.GetListCtrl().GetColumnStore()
+            if store is None:
+                raise Exception("Virtual controls can only be sorted with a column store")
+
+        elif columns is not None:
+            sortColumns = GetSortColumns(columns, reverse)
+            for col, colReverse in sortColumns:
+                if self._lines and not 0 <= col < len(self._lines[0]._items):
+                    raise Exception("Invalid column index in SortItemsByKey()")
+
+        self.HighlightAll(False)
+        self.ResetCurrent()
+
+        if self._hasWindows:
+            self.HideWindows()
+
+        if self.IsVirtual():
+            store.Sort(key, columns, reverse)
+            self.InvalidateLines()
+            self.RefreshAll()
+            return
+
+        if columns is None:
+            if key is None:
+                lineKey = lambda line: line._items[0]._data
+            else:
+                lineKey = lambda line: key(line._items[0]._data)
+            self._lines.sort(key=lineKey, reverse=reverse)
+
+        else:
+            # Least significant column first, as each sort is stable
+            for col, colReverse in reversed(sortColumns):
+                if key is None:
+                    lineKey = lambda line: line._items[col]._text
+                else:
+                    lineKey = lambda line: key(line._items[col]._text)
+                self._lines.sort(key=lineKey, reverse=colReverse)
+
+        if self.IsShownOnScreen():
+            self._dirty = True
+            self._lineHeight = 0
+            self.ResetLineDimensions(True)
+
+        self.RecalculatePositions(True)
+
+
 # ----------------------------------------------------------------------------
 # scrolling
 # ----------------------------------------------------------------------------
@@ -10860,6 +11445,7 @@ class UltimateListCtrl(wx.Control):
         self._imageListNormal = None
         self._imageListSmall = None
         self._imageListState = None
+        self._columnStore = None
 
         if not agwStyle & ULC_MASK_TYPE:
             raise Exception("UltimateListCtrl style should have exactly one mode bit set")
@@ -12254,6 +12840,38 @@ class UltimateListCtrl(wx.Control):
         return True
 
 
+    def SortItemsByKey(self, key=None, columns=None, reverse=False):
+        """
+        Sorts the items using a key function rather than a comparison function:
+        the key is computed once per item, and the items are then sorted by Python
+        itself, which is much faster than :meth:`~UltimateListCtrl.SortItems` for long lists.
+        The sort is stable, i.e. items with equal keys keep their order.
+
+        For example, to sort on the third column (ignoring case), then on the first
+        one in descending order::
+
+            list_ctrl.SortItemsByKey(str.lower, columns=[2, (0, True)])
+
+
+        :param `key`: a function of one argument, applied to the item texts in the
+         sort columns, or to the item data if `columns` is ``None``. If ``None``, the
+         texts (or the data) are compared directly;
+        :param `columns`: an integer or a Python list of column indexes and/or
+         `(column, reverse)` tuples, the most significant column first. If ``None``,
+         the items are sorted by their data;
+        :param `reverse`: ``True`` to sort in descending order (for the columns which
+         don't specify their own order).
+
+        :note: Virtual controls can only be sorted when they use a
+         :class:`UltimateListColumnStore`, see :meth:`~UltimateListCtrl.SetColumnStore`.
+        """
+
+        self._mainWin.SortItemsByKey(key, columns, reverse)
+        wx.CallAfter(self.Refresh)
+
+        return True
+
+
 # ----------------------------------------------------------------------------
 # event handlers
 # ----------------------------------------------------------------------------
@@ -12592,16 +13210,48 @@ class UltimateListCtrl(wx.Control):
 # virtual list control support
 # ----------------------------------------------------------------------------
 
+    def SetColumnStore(self, store):
+        """
+        Sets the :class:`UltimateListColumnStore` holding the items of a virtual control.
+        The default implementations of :meth:`~UltimateListCtrl.OnGetItemText`,
+        :meth:`~UltimateListCtrl.OnGetItemTextColour`, :meth:`~UltimateListCtrl.OnGetItemToolTip`
+        and :meth:`~UltimateListCtrl.OnGetItemColumnImage` then return the store contents,
+        so they don't need to be overloaded.
+
+        Call this method again after adding or removing rows in the store, to update
+        the number of items.
+
+        :param `store`: an instance of :class:`UltimateListColumnStore`, or ``None``
+         to detach the current store.
+        """
+
+        if not self._mainWin.IsVirtual():
+            raise Exception("This is for virtual controls only")
+
+        self._columnStore = store
+        self._mainWin.SetItemCount((store is not None and [len(store)] or [0])[0])
+        self._mainWin.RefreshAll()
+
+
+    def GetColumnStore(self):
+        """ Returns the :class:`UltimateListColumnStore` of a virtual control, or ``None``. """
+
+        return self._columnStore
+
+
     def OnGetItemText(self, item, col):
         """
         This function **must** be overloaded in the derived class for a control with
-        ``ULC_VIRTUAL`` style. It should return the string containing the text of
-        the given column for the specified item.
+        ``ULC_VIRTUAL`` style, unless it uses a :class:`UltimateListColumnStore`. It should
+        return the string containing the text of the given column for the specified item.
 
         :param `item`: an integer specifying the item index;
         :param `col`: the column index to which the item belongs to.
         """
 
+        if self._columnStore is not None:
+            return self._columnStore.GetText(item, col)
+
         # this is a pure virtual function, in fact - which is not really pure
         # because the controls which are not virtual don't need to implement it
         raise Exception("UltimateListCtrl.OnGetItemText not supposed to be called")
@@ -12617,6 +13267,9 @@ class UltimateListCtrl(wx.Control):
         :param `col`: the column index to which the item belongs to.
         """
 
+        if self._columnStore is not None:
+            return self._columnStore.GetColour(item, col)
+
         # this is a pure virtual function, in fact - which is not really pure
         # because the controls which are not virtual don't need to implement it
         raise Exception("UltimateListCtrl.OnGetItemTextColour not supposed to be called")
@@ -12632,6 +13285,9 @@ class UltimateListCtrl(wx.Control):
         :param `col`: the column index to which the item belongs to.
         """
 
+        if self._columnStore is not None:
+            return ""
+
         # this is a pure virtual function, in fact - which is not really pure
         # because the controls which are not virtual don't need to implement it
         raise Exception("UltimateListCtrl.OnGetItemToolTip not supposed to be called")
@@ -12668,9 +13324,13 @@ class UltimateListCtrl(wx.Control):
 
         :param `item`: an integer specifying the item index.
 
-        :note: The base class version always returns an empty Python list.
+        :note: The base class version returns the images from the :class:`UltimateListColumnStore`,
+         if any, or an empty Python list.
         """
 
+        if self._columnStore is not None:
+            return self._columnStore.GetImage(item, column)
+
         if column == 0:
             return self.OnGetItemImage(item)
 
@@ -12809,6 +13469,48 @@ class UltimateListCtrl(wx.Control):
         self._mainWin.RefreshLines(itemFrom, itemTo)
 
 
+    def OnGetItemsRange(self, itemFrom, itemTo):
+        """
+        This function may be overloaded in the derived class for a control with
+        ``ULC_VIRTUAL`` style, to fetch the texts of many items in one call (for
+        instance with a single database query) instead of calling
+        :meth:`~UltimateListCtrl.OnGetItemText` for each item and column. It is
+        called for the lines about to be painted which are not in the row cache yet.
+
+        It should return a Python list with one entry per item from `itemFrom` to
+        `itemTo` (inclusive), each being a sequence of the texts of the item columns.
+        The other item properties are still asked for with the other virtual callbacks.
+
+        :param `itemFrom`: the index of the first item;
+        :param `itemTo`: the index of the last item.
+
+        :note: The base class version returns ``None``, i.e. the texts are asked for
+         one by one with :meth:`~UltimateListCtrl.OnGetItemText`.
+        """
+
+        return None
+
+
+    def SetRowCacheSize(self, size):
+        """
+        Sets the maximum number of lines whose items are kept in the row cache of a
+        virtual control (1000 by default). Cached items are not asked for again to the
+        virtual callbacks when their lines are painted, until they are refreshed with
+        :meth:`~UltimateListCtrl.RefreshItem`, :meth:`~UltimateListCtrl.RefreshItems`,
+        :meth:`~UltimateListCtrl.Refresh` or :meth:`~UltimateListCtrl.SetItemCount`.
+
+        :param `size`: the number of lines, 0 to disable the cache.
+        """
+
+        self._mainWin.SetRowCacheSize(size)
+
+
+    def GetRowCacheSize(self):
+        """ Returns the maximum number of lines kept in the row cache of a virtual control. """
+
+        return self._mainWin.GetRowCacheSize()
+
+
 #
 # Generic UltimateListCtrl is more or less a container for two other
 # windows which drawings are done upon. These are namely
@@ -12829,9 +13531,15 @@ class UltimateListCtrl(wx.Control):
          event loop iteration, if you need to update the window immediately you should
          use :meth:`~UltimateListCtrl.Update` instead.
 
+        :note: In a virtual control, this also empties the row cache, so the items
+         are asked for again to the virtual callbacks.
+
         :note: Overridden from :class:`wx.Control`.
         """
 
+        if self._mainWin and self._mainWin.IsVirtual():
+            self._mainWin.InvalidateLines()
+
         if not rect:
 
             # The easy case, no rectangle specified.
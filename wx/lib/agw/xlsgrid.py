@@ -14,9 +14,9 @@
 #    supports those (from version 0.7.2 in SVN) but there is no easy way to handle
 #    changing fonts/colours/formatting in the same string in wxPython;
 #
-# 2. XLSGrid is sufficiently efficient and fast for reasonably small Excel files.
-#    There might be some improvement to be made in the code to make it work with
-#    bigger files and in a faster way;
+# 2. XLSGrid creates the cells only when they are shown and shares the cell
+#    formats, but the WYSIWYG texts and the comments coming from pywin32 are
+#    still read for the whole worksheet upfront, which is slow for big files;
 #
 # 3. There is currently no support for strikethrough fonts, although xlrd correctly
 #    reports this format. The issue is a bug in wxWidgets itself which doesn't
@@ -51,8 +51,10 @@ every instance of :class:`XLSGrid`).
 
 :class:`XLSGrid` is a completely owner-drawn control, and it relies on the power of
 :class:`grid.PyGridTableBase` and :class:`grid.PyGridCellRenderer` to draw the cell
-content. For this reasons (and for some others, see the TODOs section), it will
-work efficiently only for relatively small Excel files.
+content. The cells are created only when they are first shown, and all the cells
+with the same Excel format share the same fonts, colours, pens and brushes, so
+that big worksheets don't need a full set of drawing objects for every cell (see
+also the TODOs section).
 
 :note:
 
@@ -192,9 +194,9 @@ Sample usage::
 TODOs
 =====
 
-1. :class:`XLSGrid` is sufficiently efficient and fast for reasonably small Excel files.
-   There might be some improvement to be made in the code to make it work with
-   bigger files and in a faster way;
+1. :class:`XLSGrid` creates the cells only when they are shown and shares the cell
+   formats, but the WYSIWYG texts and the comments coming from `pywin32` are
+   still read for the whole worksheet upfront, which is slow for big files;
 2. :class:`grid.Grid` seems to completely redraw itself at every resize event, even
    if the cell content has not changed and it has not been damaged (this seems
    to be fixed in wxPython 2.9.2.1);
@@ -595,54 +597,78 @@ class Excel(object):
             return cell.Text
 
 
-class XLSText(object):
+class XLSFormatCache(object):
     """
-    This is a class which holds information about the cell content, in terms
-    of actual cell value, font, text colour, alignment and formatting.
+    This is a class which creates and holds the cell formats (instances of
+    :class:`XLSFormat`) and the fonts used by a workbook, so that all the cells
+    sharing the same Excel format also share the same fonts, colours, pens and
+    brushes instead of creating their own.
     """
 
-    def __init__(self, book, cell, xf_index, display_text=None, hyperlink=None, default_width=10):
+    def __init__(self, book, default_width=10, default_colour=None):
         """
         Default class constructor.
 
         :param `book`: an instance of the `xlrd.Book` class;
-        :param `cell`: an instance of `xlrd.sheet.Cell` class;
-        :param `xf_index`: an index into `xlrd.Book.xf_list`, which holds a
-         reference to the `xlrd.sheet.Cell` class (the actual cell for `xlrd`);
-        :param `display_text`: if Mark Hammonds' `pywin32` package is available,
-         this is the WYSIWYG cell content;
-        :param `hyperlink`: if this cell contains a hyperlink, it will be displayed
-         accordingly;
         :param `default_width`: this is the default width of the text in 1/256
          of the width of the zero character, using default Excel font (first FONT
-         record in the Excel file).
+         record in the Excel file);
+        :param `default_colour`: the "magic" colour used by Excel to draw non-custom
+         border lines. If it is ``None``, black is used.
+        """
 
-        :note: If you are using version 0.7.1 or lower for `xlrd`, the *hyperlink*
-         parameter will always be ``None`` as this feature is available only in
-         `xlrd` 0.7.2 (SVN).
+        if default_colour is None:
+            default_colour = wx.BLACK
+
+        self.book = book
+        self.default_width = default_width
+        self.default_colour = default_colour
+
+        self.formats = {}
+        self.fonts = {}
+
+
+    def GetFormat(self, xf_index):
         """
+        Returns the format shared by all the cells using the Excel format `xf_index`.
 
-        XFClass = book.xf_list[xf_index]
+        :param `xf_index`: an index into `xlrd.Book.xf_list`.
 
-        font = book.font_list[XFClass.font_index]
-        self.font = self.CreateFont(font)
+        :returns: an instance of :class:`XLSFormat`.
+        """
 
-        text_colour = book.colour_map[font.colour_index]
-        self.text_colour = self.CreateTextColour(text_colour)
+        xls_format = self.formats.get(xf_index)
 
-        if display_text is not None:
-            self.value = display_text
-        else:
-            format = book.format_map[XFClass.format_key]
-            self.CreateFormat(format, cell, book.datemode)
+        if xls_format is None:
+            xls_format = XLSFormat(self, xf_index)
+            self.formats[xf_index] = xls_format
 
-        alignment = XFClass.alignment
-        self.CreateAlignment(alignment, default_width)
+        return xls_format
 
-        if hyperlink is not None:
-            self.SetupHyperlink(hyperlink)
-        else:
-            self.tooltip = None
+
+    def GetFont(self, font_index):
+        """
+        Returns the wxPython font and text colour for an Excel font.
+
+        :param `font_index`: an index into `xlrd.Book.font_list`.
+
+        :returns: a tuple containing an instance of :class:`wx.Font` and an
+         instance of :class:`wx.Colour`.
+        """
+
+        font_data = self.fonts.get(font_index)
+
+        if font_data is None:
+            font = self.book.font_list[font_index]
+
+            wx_font = self.CreateFont(font)
+            wx_font.escapement = font.escapement
+
+            text_colour = self.book.colour_map[font.colour_index]
+            font_data = wx_font, self.CreateTextColour(text_colour)
+            self.fonts[font_index] = font_data
+
+        return font_data
 
 
     def CreateFont(self, font):
@@ -707,6 +733,38 @@ class XLSText(object):
         return text_colour
 
 
+class XLSFormat(object):
+    """
+    This is a class which holds everything about the appearance of a cell that
+    only depends on its Excel format: font, text colour, alignment, background
+    and borders. A single instance is shared by all the cells with the same
+    format, see :class:`XLSFormatCache`.
+    """
+
+    def __init__(self, cache, xf_index):
+        """
+        Default class constructor.
+
+        :param `cache`: the :class:`XLSFormatCache` creating this format;
+        :param `xf_index`: an index into `xlrd.Book.xf_list`, which holds a
+         reference to the `xlrd.sheet.Cell` class (the actual cell for `xlrd`).
+        """
+
+        book = cache.book
+        XFClass = book.xf_list[xf_index]
+
+        self.cache = cache
+        self.xf_index = xf_index
+
+        self.font, self.text_colour = cache.GetFont(XFClass.font_index)
+        self.number_format = book.format_map.get(XFClass.format_key)
+
+        self.CreateAlignment(XFClass.alignment, cache.default_width)
+
+        self.background = XLSBackground(book, xf_index)
+        self.borders = XLSBorderFactory(book, XFClass.border, cache.default_colour)
+
+
     def CreateAlignment(self, alignment, default_width):
         """
         Creates a suitable wxPython alignment flag for the text starting from a
@@ -725,17 +783,8 @@ class XLSText(object):
         self.indent_level = alignment.indent_level
         self.shrink_to_fit = alignment.shrink_to_fit
         self.text_wrapped = alignment.text_wrapped
+        self.text_direction = alignment.text_direction
 
-        text_direction = 1
-
-        if alignment.text_direction == 0:
-            for char in self.value:
-                if char not in USELESS_CHARS:
-                    if ord(char) in RTL_UNICODE:
-                        text_direction = 2
-                        break
-
-        self.text_direction = text_direction
         self.default_width = default_width
 
         if alignment.rotation > 90:
@@ -744,6 +793,101 @@ class XLSText(object):
             self.rotation = alignment.rotation
 
 
+    def CombineAttr(self, attr):
+        """
+        Combines the input attribute `attr` with the features of the :class:`XLSFormat` class.
+
+        :param `attr`: an instance of :class:`grid.GridCellAttr`.
+        """
+
+        attr.SetAlignment(self.horizontal_alignment, self.vertical_alignment)
+        attr.SetTextColour(self.text_colour)
+        attr.SetFont(self.font)
+
+
+class XLSText(object):
+    """
+    This is a class which holds information about the cell content, in terms
+    of actual cell value, font, text colour, alignment and formatting.
+
+    The font, text colour and alignment are shared with all the cells having the
+    same Excel format, see :class:`XLSFormat`.
+    """
+
+    __slots__ = ("format", "value", "tooltip", "text_direction")
+
+    # for backward compatibility, these used to be attributes of every XLSText
+    font = property(lambda self: self.format.font)
+    text_colour = property(lambda self: self.format.text_colour)
+    horizontal_alignment = property(lambda self: self.format.horizontal_alignment)
+    vertical_alignment = property(lambda self: self.format.vertical_alignment)
+    indent_level = property(lambda self: self.format.indent_level)
+    shrink_to_fit = property(lambda self: self.format.shrink_to_fit)
+    text_wrapped = property(lambda self: self.format.text_wrapped)
+    rotation = property(lambda self: self.format.rotation)
+    default_width = property(lambda self: self.format.default_width)
+
+    def __init__(self, book, cell, xf_index, display_text=None, hyperlink=None, default_width=10, xls_format=None):
+        """
+        Default class constructor.
+
+        :param `book`: an instance of the `xlrd.Book` class;
+        :param `cell`: an instance of `xlrd.sheet.Cell` class;
+        :param `xf_index`: an index into `xlrd.Book.xf_list`, which holds a
+         reference to the `xlrd.sheet.Cell` class (the actual cell for `xlrd`);
+        :param `display_text`: if Mark Hammonds' `pywin32` package is available,
+         this is the WYSIWYG cell content;
+        :param `hyperlink`: if this cell contains a hyperlink, it will be displayed
+         accordingly;
+        :param `default_width`: this is the default width of the text in 1/256
+         of the width of the zero character, using default Excel font (first FONT
+         record in the Excel file);
+        :param `xls_format`: the :class:`XLSFormat` for `xf_index`. If it is ``None``,
+         a new one is created.
+
+        :note: If you are using version 0.7.1 or lower for `xlrd`, the *hyperlink*
+         parameter will always be ``None`` as this feature is available only in
+         `xlrd` 0.7.2 (SVN).
+        """
+
+        if xls_format is None:
+            xls_format = XLSFormatCache(book, default_width).GetFormat(xf_index)
+
+        self.format = xls_format
+
+        if display_text is not None:
+            self.value = display_text
+        else:
+            self.CreateFormat(xls_format.number_format, cell, book.datemode)
+
+        self.CreateTextDirection(xls_format.text_direction)
+
+        if hyperlink is not None:
+            self.SetupHyperlink(hyperlink)
+        else:
+            self.tooltip = None
+
+
+    def CreateTextDirection(self, text_direction):
+        """
+        Guesses the direction of the text when Excel uses the "context" text
+        direction.
+
+        :param `text_direction`: the text direction reported by `xlrd`.
+        """
+
+        direction = 1
+
+        if text_direction == 0:
+            for char in self.value:
+                if char not in USELESS_CHARS:
+                    if ord(char) in RTL_UNICODE:
+                        direction = 2
+                        break
+
+        self.text_direction = direction
+
+
     def CreateFormat(self, format, cell, datemode):
         """
         This method tries to guess the best format to apply to the current text
@@ -887,9 +1031,53 @@ class XLSText(object):
         :param `attr`: an instance of :class:`grid.GridCellAttr`.
         """
 
-        attr.SetAlignment(self.horizontal_alignment, self.vertical_alignment)
-        attr.SetTextColour(self.text_colour)
-        attr.SetFont(self.font)
+        self.format.CombineAttr(attr)
+
+
+    def CreateFont(self, font):
+        """
+        Creates a suitable wxPython font starting from an Excel font.
+
+        :param `font`: an instance of `xlrd.formatting.Font` class.
+
+        :note: Kept for backward compatibility, the fonts are now created by
+         :meth:`XLSFormatCache.CreateFont`.
+        """
+
+        return self.format.cache.CreateFont(font)
+
+
+    def CreateTextColour(self, text_colour):
+        """
+        Creates a suitable wxPython colour for the text starting from a `xlrd`
+        tuple representing this colour.
+
+        :param `text_colour`: a tuple representing the RGB components of the
+         colour. If `text_colour` is ``None``, use the default ``wx.SYS_COLOUR_WINDOWTEXT``.
+
+        :note: Kept for backward compatibility, the colours are now created by
+         :meth:`XLSFormatCache.CreateTextColour`.
+        """
+
+        return self.format.cache.CreateTextColour(text_colour)
+
+
+    def CreateAlignment(self, alignment, default_width):
+        """
+        Creates a suitable wxPython alignment flag for the text starting from a
+        `xlrd` class representing this alignment.
+
+        :param `alignment`: an instance of `xlrd.formatting.XFAlignment` class;
+        :param `default_width`: this is the default width of the text in 1/256
+         of the width of the zero character, using default Excel font (first FONT
+         record in the Excel file).
+
+        :note: Kept for backward compatibility. The alignment is stored in the
+         :class:`XLSFormat` of the cell, so it changes for all the cells sharing
+         the same Excel format.
+        """
+
+        self.format.CreateAlignment(alignment, default_width)
 
 
     def GetValue(self):
@@ -907,28 +1095,29 @@ class XLSText(object):
         """
 
         new_rect = wx.Rect(*rect)
+        xls_format = self.format
 
         xshift = yshift = 0
-        if self.rotation:
-            xshift = cos(self.rotation*pi/180)
-            yshift = sin(self.rotation*pi/180)
+        if xls_format.rotation:
+            xshift = cos(xls_format.rotation*pi/180)
+            yshift = sin(xls_format.rotation*pi/180)
 
-        dc.SetTextForeground(self.text_colour)
-        dc.SetFont(self.font)
+        dc.SetTextForeground(xls_format.text_colour)
+        dc.SetFont(xls_format.font)
 
         value = self.value
         text_width, text_height = dc.GetTextExtent(value)
 
-        default_width = int(round(float(self.default_width)*text_width/256.0))
+        default_width = int(round(float(xls_format.default_width)*text_width/256.0))
 
-        indentation = int(256.0*default_width/float(self.default_width))
+        indentation = int(256.0*default_width/float(xls_format.default_width))
 
-        if xshift == 0 and self.indent_level:
+        if xshift == 0 and xls_format.indent_level:
             new_rect.SetLeft(new_rect.x + indentation)
         else:
-            if self.horizontal_alignment == wx.ALIGN_LEFT:
+            if xls_format.horizontal_alignment == wx.ALIGN_LEFT:
                 new_rect.SetLeft(new_rect.x + 3)
-            elif self.horizontal_alignment == wx.ALIGN_RIGHT:
+            elif xls_format.horizontal_alignment == wx.ALIGN_RIGHT:
                 new_rect.SetWidth(new_rect.width - 1)
 
         new_width = rect.width
@@ -936,9 +1125,9 @@ class XLSText(object):
         if xshift > 0:
             new_width = new_width/xshift
 
-        if self.shrink_to_fit:
+        if xls_format.shrink_to_fit:
 
-            font = FontFromFont(self.font)
+            font = FontFromFont(xls_format.font)
             point_size = font.GetPointSize()
 
             while 1:
@@ -950,24 +1139,24 @@ class XLSText(object):
                 font.SetPointSize(point_size)
                 dc.SetFont(font)
 
-        elif self.text_wrapped:
+        elif xls_format.text_wrapped:
 
             value = wordwrap(self.value, new_width, dc)
             text_width, text_height, dummy = dc.GetFullMultiLineTextExtent(value)
 
-        if self.rotation:
-            if self.shrink_to_fit:
+        if xls_format.rotation:
+            if xls_format.shrink_to_fit:
                 text_width, text_height = dc.GetTextExtent(value)
 
             xc, yc = (rect.x+rect.width/2, rect.y+rect.height/2)
             xp = xc - (text_width/2)*xshift - (text_height/2)*yshift
             yp = yc + (text_width/2)*yshift - (text_height/2)*xshift
 
-            dc.DrawRotatedText(value, int(xp), int(yp), self.rotation)
+            dc.DrawRotatedText(value, int(xp), int(yp), xls_format.rotation)
 
         else:
 
-            dc.DrawLabel(value, new_rect, self.horizontal_alignment|self.vertical_alignment)
+            dc.DrawLabel(value, new_rect, xls_format.horizontal_alignment|xls_format.vertical_alignment)
 
 
 class XLSRichText(XLSText):
@@ -978,7 +1167,7 @@ class XLSRichText(XLSText):
     content.
     """
 
-    def __init__(self, book, cell, xf_index, display_text=None, hyperlink=None, rich_text=None, default_width=10):
+    def __init__(self, book, cell, xf_index, display_text=None, hyperlink=None, rich_text=None, default_width=10, xls_format=None):
         """
         Default class constructor.
 
@@ -994,7 +1183,9 @@ class XLSRichText(XLSText):
          will do its best to render the text as rich text;
         :param `default_width`: this is the default width of the text in 1/256
          of the width of the zero character, using default Excel font (first FONT
-         record in the Excel file).
+         record in the Excel file);
+        :param `xls_format`: the :class:`XLSFormat` for `xf_index`. If it is ``None``,
+         a new one is created.
 
         :note: If you are using version 0.7.1 or lower for `xlrd`, the *hyperlink*
          parameter will always be ``None`` as this feature is available only in
@@ -1010,7 +1201,7 @@ class XLSRichText(XLSText):
 
         """
 
-        XLSText.__init__(self, book, cell, xf_index, display_text, hyperlink, default_width)
+        XLSText.__init__(self, book, cell, xf_index, display_text, hyperlink, default_width, xls_format)
 
         self.BuildChunks(book, xf_index, rich_text)
 
@@ -1027,6 +1218,9 @@ class XLSRichText(XLSText):
         """
 
         XFClass = book.xf_list[xf_index]
+
+        # Work on a copy, the run list belongs to the xlrd sheet
+        rich_text = list(rich_text)
         offset, index = rich_text[0]
 
         if offset != 0:
@@ -1043,12 +1237,7 @@ class XLSRichText(XLSText):
 
             chunk = value[offset_start:offset_end]
 
-            font = book.font_list[index_start]
-            ffont = self.CreateFont(font)
-            text_colour = book.colour_map[font.colour_index]
-            colour = self.CreateTextColour(text_colour)
-
-            ffont.escapement = font.escapement
+            ffont, colour = self.format.cache.GetFont(index_start)
             attributes.append([chunk, ffont, colour])
 
         self.attributes = attributes
@@ -1082,28 +1271,29 @@ class XLSRichText(XLSText):
         """
 
         new_rect = wx.Rect(*rect)
+        xls_format = self.format
 
         text_width, text_height = dc.GetTextExtent(self.value)
-        default_width = int(round(float(self.default_width)*text_width/256.0))
-        indentation = int(256.0*default_width/float(self.default_width))
+        default_width = int(round(float(xls_format.default_width)*text_width/256.0))
+        indentation = int(256.0*default_width/float(xls_format.default_width))
 
         maxH, full_width = self.Measure(dc)
 
-        if self.indent_level:
+        if xls_format.indent_level:
             new_rect.SetLeft(new_rect.x + indentation)
         else:
-            if self.horizontal_alignment == wx.ALIGN_LEFT:
+            if xls_format.horizontal_alignment == wx.ALIGN_LEFT:
                 new_rect.SetLeft(new_rect.x + 3)
-            elif self.horizontal_alignment == wx.ALIGN_RIGHT:
+            elif xls_format.horizontal_alignment == wx.ALIGN_RIGHT:
                 new_rect.SetLeft(new_rect.x + (new_rect.width - full_width) - 1)
             else:
                 space = int((new_rect.width - full_width)/2.0)
                 new_rect.SetLeft(new_rect.x + space)
                 new_rect.SetWidth(full_width+space)
 
-        if self.vertical_alignment == wx.ALIGN_TOP:
+        if xls_format.vertical_alignment == wx.ALIGN_TOP:
             vspace = 0
-        elif self.vertical_alignment == wx.ALIGN_BOTTOM:
+        elif xls_format.vertical_alignment == wx.ALIGN_BOTTOM:
             vspace = (new_rect.height - maxH - 1)
         else:
             vspace = int((new_rect.height - maxH)/2.0)
@@ -1487,9 +1677,14 @@ class XLSCell(object):
     This is a class which holds information about a single cell in :class:`XLSGrid`.
     It stores (via auxiliary classes), all details about cell background, text,
     font, colours and borders.
+
+    Only the cell value, comment and size belong to the cell itself, everything
+    else is shared with the other cells having the same Excel format (see :class:`XLSFormat`).
     """
 
-    def __init__(self, book, cell, xf_index, xls_text, xls_comment, hyperlink, rich_text, default_width, default_colour):
+    __slots__ = ("text", "comment", "hyperlink", "raw_value", "size", "value")
+
+    def __init__(self, book, cell, xf_index, xls_text, xls_comment, hyperlink, rich_text, default_width, default_colour, format_cache=None):
         """
         Default class constructor.
 
@@ -1506,7 +1701,9 @@ class XLSCell(object):
          of the width of the zero character, using default Excel font (first FONT
          record in the Excel file);
         :param `default_colour`: the "magic" colour used by Excel to draw non-custom
-         border lines.
+         border lines;
+        :param `format_cache`: the :class:`XLSFormatCache` holding the formats of
+         the workbook. If it is ``None``, the cell gets its own formats.
 
         :note: If you are using version 0.7.1 or lower for `xlrd`, the *hyperlink*
          parameter will always be ``None`` as this feature is available only in
@@ -1529,10 +1726,10 @@ class XLSCell(object):
         self.comment = None
         self.hyperlink = None
 
-        self.SetupCell(book, cell, xf_index, xls_text, xls_comment, hyperlink, rich_text, default_width, default_colour)
+        self.SetupCell(book, cell, xf_index, xls_text, xls_comment, hyperlink, rich_text, default_width, default_colour, format_cache)
 
 
-    def SetupCell(self, book, cell, xf_index, xls_text, xls_comment, hyperlink, rich_text, default_width, default_colour):
+    def SetupCell(self, book, cell, xf_index, xls_text, xls_comment, hyperlink, rich_text, default_width, default_colour, format_cache=None):
         """
         Actually sets up the :class:`XLSCell` class. This is an auxiliary method to
         avoid cluttering the :meth:`~xlsgrid.XLSCell.__init__` method.
@@ -1550,7 +1747,9 @@ class XLSCell(object):
          of the width of the zero character, using default Excel font (first FONT
          record in the Excel file);
         :param `default_colour`: the "magic" colour used by Excel to draw non-custom
-         border lines.
+         border lines;
+        :param `format_cache`: the :class:`XLSFormatCache` holding the formats of
+         the workbook. If it is ``None``, the cell gets its own formats.
 
         :note: If you are using version 0.7.1 or lower for `xlrd`, the *hyperlink*
          parameter will always be ``None`` as this feature is available only in
@@ -1568,37 +1767,46 @@ class XLSCell(object):
          parameter will always be ``None``.
         """
 
+        if format_cache is None:
+            format_cache = XLSFormatCache(book, default_width, default_colour)
+
+        xls_format = format_cache.GetFormat(xf_index)
+
         cvalue = cell.value
         self.raw_value = cvalue
 
         if rich_text:
-            self.text = XLSRichText(book, cell, xf_index, xls_text, hyperlink, rich_text, default_width)
+            self.text = XLSRichText(book, cell, xf_index, xls_text, hyperlink, rich_text, default_width, xls_format)
         else:
-            self.text = XLSText(book, cell, xf_index, xls_text, hyperlink, default_width)
+            self.text = XLSText(book, cell, xf_index, xls_text, hyperlink, default_width, xls_format)
 
-        self.background = XLSBackground(book, xf_index)
+        if xls_comment:
+            self.comment = XLSComment(xls_comment)
 
-        XFClass = book.xf_list[xf_index]
-        border = XFClass.border
 
-        self.borders = XLSBorderFactory(book, border, default_colour)
+    @property
+    def background(self):
+        """ Returns the cell background, an instance of :class:`XLSBackground`. """
 
-        if xls_comment:
-            self.comment = XLSComment(xls_comment)
+        return self.text.format.background
 
-        self.attr = None
+
+    @property
+    def borders(self):
+        """ Returns the cell borders, an instance of :class:`XLSBorderFactory`. """
+
+        return self.text.format.borders
 
 
     def GetAttr(self):
         """
-        Returns the attribute to use for this specific cell.
+        Returns a new attribute to use for this specific cell.
 
         :returns: an instance of :class:`grid.GridCellAttr`.
-        """
 
-        if self.attr is not None:
-            self.attr.IncRef()
-            return self.attr
+        :note: :class:`XLSTable` doesn't use this method, it shares the same attribute
+         among all the cells which are not merged.
+        """
 
         attr = gridlib.GridCellAttr()
 
@@ -1606,10 +1814,8 @@ class XLSCell(object):
 
         attr.SetSize(*self.size)
         attr.SetOverflow(True)
-        self.attr = attr
-        self.attr.IncRef()
 
-        return self.attr
+        return attr
 
 
     def GetValue(self):
@@ -1667,15 +1873,17 @@ class XLSRenderer(gridlib.GridCellRenderer):
 
     """
 
-    def __init__(self, cell):
+    def __init__(self, cell=None):
         """
         Default class constructor.
 
-        :param `cell`: an instance of :class:`XLSCell`.
+        :param `cell`: an instance of :class:`XLSCell`. If it is ``None``, the renderer
+         draws any cell of the :class:`XLSTable` used by the grid.
         """
 
         gridlib.GridCellRenderer.__init__(self)
         self.cell = cell
+        self.selection_brush = None
 
 
     def Draw(self, grid, attr, dc, rect, row, col, isSelected):
@@ -1696,6 +1904,8 @@ class XLSRenderer(gridlib.GridCellRenderer):
         dc.SetBackgroundMode(wx.SOLID)
 
         cell = self.cell
+        if cell is None:
+            cell = grid.GetTable().GetCell(row, col)
 
         cell.background.Draw(dc, rect)
 
@@ -1711,10 +1921,12 @@ class XLSRenderer(gridlib.GridCellRenderer):
 
             gdc = wx.GCDC(dc)
 
-            sys_colour = wx.SystemSettings.GetColour(wx.SYS_COLOUR_HIGHLIGHT)
-            brush_colour = wx.Colour(sys_colour.Red(), sys_colour.Green(), sys_colour.Blue(), 90)
+            if self.selection_brush is None:
+                sys_colour = wx.SystemSettings.GetColour(wx.SYS_COLOUR_HIGHLIGHT)
+                brush_colour = wx.Colour(sys_colour.Red(), sys_colour.Green(), sys_colour.Blue(), 90)
+                self.selection_brush = wx.Brush(brush_colour)
 
-            gdc.SetBrush(wx.Brush(brush_colour))
+            gdc.SetBrush(self.selection_brush)
             gdc.SetPen(wx.TRANSPARENT_PEN)
 
             gdc.DrawRectangle(rect)
@@ -1727,17 +1939,36 @@ class XLSTable(gridlib.GridTableBase):
     A grid table is responsible for storing the grid data and, indirectly, grid
     cell attributes. The data can be stored in the way most convenient for the
     application but has to be provided in string form to :class:`grid.Grid`.
+
+    When an `xlrd` sheet is given, the cells (instances of :class:`XLSCell`) are
+    only created the first time the grid needs them, i.e. when they are scrolled
+    into view.
     """
 
-    def __init__(self, grid, cells, rows, cols):
+    def __init__(self, grid, cells, rows, cols, book=None, sheet=None, display_texts=None,
+                 comments=None, default_width=10, default_colour=None):
         """
         Default class constructor.
 
         :param `grid`: an instance of :class:`grid.Grid`;
         :param `cells`: a Python dictionary. For every key `(row, col)`, the
-         corresponding value is an instance of :class:`XLSCell`;
+         corresponding value is an instance of :class:`XLSCell`. The cells created
+         on demand are added to it;
         :param `rows`: the number of rows in the table;
-        :param `cols`: the number of columns in the table.
+        :param `cols`: the number of columns in the table;
+        :param `book`: an instance of the `xlrd.Book` class;
+        :param `sheet`: an instance of the `xlrd.sheet` class, used to create the
+         cells missing from `cells`;
+        :param `display_texts`: if Mark Hammonds' `pywin32` package is available,
+         this is the WYSIWYG cell content for all the cells in the Excel worksheet;
+        :param `comments`: if Mark Hammonds' `pywin32` package is available,
+         this is a nested list of cell comments (notes) for all the cells in the
+         Excel worksheet;
+        :param `default_width`: this is the default width of the text in 1/256
+         of the width of the zero character, using default Excel font (first FONT
+         record in the Excel file);
+        :param `default_colour`: the "magic" colour used by Excel to draw non-custom
+         border lines.
         """
 
         # The base class must be initialized *first*
@@ -1746,6 +1977,28 @@ class XLSTable(gridlib.GridTableBase):
         self.cells = cells
         self.dimens = (rows, cols)
 
+        self.book = book
+        self.sheet = sheet
+        self.display_texts = display_texts
+        self.comments = comments
+        self.default_width = default_width
+        self.default_colour = default_colour
+
+        self.format_cache = None
+        if book is not None:
+            self.format_cache = XLSFormatCache(book, default_width, default_colour)
+
+        # New in xlrd version 0.7.2 from SVN
+        self.hyperlinks = getattr(sheet, "hyperlink_map", {})
+        self.rich_text_list = getattr(sheet, "rich_text_runlist_map", {})
+
+        # The sizes of the merged cells, and their attributes
+        self.cell_sizes = {}
+        self.cell_attrs = {}
+
+        # The attribute shared by all the other cells
+        self.attr = None
+
 
     def GetNumberCols(self):
         """ Returns the number of columns in the table. """
@@ -1759,6 +2012,71 @@ class XLSTable(gridlib.GridTableBase):
         return self.dimens[0]
 
 
+    def GetCell(self, row, col):
+        """
+        Returns the cell for the specified row and column, creating it if needed.
+
+        :param `row`: the row in which this cell lives;
+        :param `col`: the column in which this cell lives.
+
+        :returns: an instance of :class:`XLSCell`.
+        """
+
+        cell = self.cells.get((row, col))
+
+        if cell is None and self.sheet is not None:
+            cell = self.CreateCell(row, col)
+            self.cells[(row, col)] = cell
+
+        return cell
+
+
+    def CreateCell(self, row, col):
+        """
+        Creates the cell for the specified row and column from the `xlrd` sheet.
+
+        :param `row`: the row in which this cell lives;
+        :param `col`: the column in which this cell lives.
+
+        :returns: an instance of :class:`XLSCell`.
+        """
+
+        sheet = self.sheet
+
+        cell = sheet.cell(row, col)
+        xf_index = sheet.cell_xf_index(row, col)
+        xls_text, xls_comment = self.display_texts[row][col], self.comments[row][col]
+
+        hyperlink = self.hyperlinks.get((row, col))
+        rich_text = self.rich_text_list.get((row, col))
+
+        gridCell = XLSCell(self.book, cell, xf_index, xls_text, xls_comment, hyperlink, rich_text,
+                           self.default_width, self.default_colour, self.format_cache)
+
+        if (row, col) in self.cell_sizes:
+            gridCell.SetCellSize(*self.cell_sizes[(row, col)])
+
+        return gridCell
+
+
+    def SetCellSize(self, row, col, rows, cols):
+        """
+        Sets the size of the cell at (`row`, `col`), see :meth:`XLSCell.SetCellSize() <XLSCell.SetCellSize>`.
+
+        :param `row`: the row in which this cell lives;
+        :param `col`: the column in which this cell lives;
+        :param `rows`: number of rows to be occupied by this cell, must be >= 1;
+        :param `cols`: number of columns to be occupied by this cell, must be >= 1.
+        """
+
+        self.cell_sizes[(row, col)] = (rows, cols)
+        self.cell_attrs.pop((row, col), None)
+
+        cell = self.cells.get((row, col))
+        if cell is not None:
+            cell.SetCellSize(rows, cols)
+
+
     def GetValue(self, row, col):
         """
         Returns the cell content for the specified row and column.
@@ -1767,7 +2085,7 @@ class XLSTable(gridlib.GridTableBase):
         :param `col`: the column in which this cell lives.
         """
 
-        cell = self.cells[(row, col)]
+        cell = self.GetCell(row, col)
         return cell.GetValue()
 
 
@@ -1780,7 +2098,7 @@ class XLSTable(gridlib.GridTableBase):
         :param `value`: the new value to assign to the specified cell.
         """
 
-        cell = self.cells[(row, col)]
+        cell = self.GetCell(row, col)
         cell.SetValue(value)
 
 
@@ -1791,10 +2109,44 @@ class XLSTable(gridlib.GridTableBase):
         :param `row`: the row in which this cell lives;
         :param `col`: the column in which this cell lives;
         :param `kind`: the kind of the attribute to return.
+
+        :note: All the cells share the same attribute, whose renderer draws the
+         cell it is asked to, except the merged cells which need their own size.
+        """
+
+        cell = self.GetCell(row, col)
+
+        if cell.size == (1, 1):
+            if self.attr is None:
+                self.attr = self.CreateAttr(cell.size)
+            attr = self.attr
+        else:
+            attr = self.cell_attrs.get((row, col))
+            if attr is None:
+                attr = self.CreateAttr(cell.size)
+                self.cell_attrs[(row, col)] = attr
+
+        attr.IncRef()
+        return attr
+
+
+    def CreateAttr(self, size):
         """
+        Creates a cell attribute using a :class:`XLSRenderer`.
+
+        :param `size`: the number of rows and columns occupied by the cell.
 
-        cell = self.cells[(row, col)]
-        return cell.GetAttr()
+        :returns: an instance of :class:`grid.GridCellAttr`.
+        """
+
+        attr = gridlib.GridCellAttr()
+
+        attr.SetRenderer(XLSRenderer())
+
+        attr.SetSize(*size)
+        attr.SetOverflow(True)
+
+        return attr
 
 
     def GetRawValue(self, row, col):
@@ -1805,7 +2157,7 @@ class XLSTable(gridlib.GridTableBase):
         :param `col`: the column in which this cell lives.
         """
 
-        cell = self.cells[(row, col)]
+        cell = self.GetCell(row, col)
         return cell.raw_value
 
 
@@ -1817,8 +2169,8 @@ class XLSGrid(gridlib.Grid):
 
     :class:`XLSGrid` is a completely owner-drawn control, and it relies on the power of
     :class:`grid.PyGridTableBase` and :class:`grid.PyGridCellRenderer` to draw the cell
-    content. For this reasons (and for some others, see the TODOs section), it will
-    work efficiently only for relatively small Excel files.
+    content. The cells are created only when they are first shown, and all the cells
+    with the same Excel format share the same fonts, colours, pens and brushes.
     """
 
     def __init__(self, parent):
@@ -1837,6 +2189,9 @@ class XLSGrid(gridlib.Grid):
         self.tip_window = None
         self.tip_shown = False
 
+        self.table = None
+        self.cells = {}
+
 
     def DestroyTip(self):
         """
@@ -1885,7 +2240,7 @@ class XLSGrid(gridlib.Grid):
 
                 self.prev_rowcol[:] = [row, col]
                 self.DestroyTip()
-                cell = self.cells[(row, col)]
+                cell = self.table.GetCell(row, col)
                 rect = self.CellToRect(row, col)
                 comment = cell.GetComment()
 
@@ -1907,7 +2262,10 @@ class XLSGrid(gridlib.Grid):
     def PopulateGrid(self, book, sheet, display_texts, comments):
         """
         This is the main method of this class, and it is used to actually create
-        the cells, size the columns and rows, merging cells, etc...
+        the table, size the columns and rows, merging cells, etc...
+
+        The cells themselves are only created when they are first shown, see
+        :class:`XLSTable`.
 
         :param `book`: an instance of the `xlrd.Book` class;
         :param `sheet`: an instance of the `xlrd.sheet` class;
@@ -1926,31 +2284,10 @@ class XLSGrid(gridlib.Grid):
         default_width, default_height = self.GetDefaultFontData(book)
         default_colour = self.GetGridLineColour()
 
-        hyperlinks, rich_text_list = {}, {}
-        if hasattr(sheet, "hyperlink_map"):
-            # New in xlrd version 0.7.2 from SVN
-            hyperlinks = sheet.hyperlink_map
-
-        if hasattr(sheet, "rich_text_runlist_map"):
-            # New in xlrd version 0.7.2 from SVN
-            rich_text_list = sheet.rich_text_runlist_map
-
         self.cells = {}
 
-        for i in range(nrows):
-
-            for j in range(ncols):
-
-                hyperlink = rich_text = None
-
-                if (i, j) in hyperlinks:
-                    hyperlink = hyperlinks[(i, j)]
-                if (i, j) in rich_text_list:
-                    rich_text = rich_text_list[(i, j)]
-
-                self.FormatCell(book, sheet, i, j, display_texts, comments, hyperlink, rich_text, default_width, default_colour)
-
-        self.table = XLSTable(self, self.cells, nrows, ncols)
+        self.table = XLSTable(self, self.cells, nrows, ncols, book, sheet, display_texts,
+                              comments, default_width, default_colour)
         self.SetTable(self.table)
 
         row_height = sheet.default_row_height
@@ -1976,8 +2313,8 @@ class XLSGrid(gridlib.Grid):
 
         for merged in sheet.merged_cells:
             rlo, rhi, clo, chi = merged
-            if rlo >= 0 and rlo < len(self.cells) and clo >= 0:
-                self.cells[(rlo, clo)].SetCellSize(rhi-rlo, chi-clo)
+            if rlo >= 0 and rlo < nrows and clo >= 0 and clo < ncols:
+                self.table.SetCellSize(rlo, clo, rhi-rlo, chi-clo)
 
         self.EnableEditing(False)
         self.EnableGridLines(False)
@@ -1990,6 +2327,9 @@ class XLSGrid(gridlib.Grid):
         """
         Processes the creation of a single cell (an instance of :class:`XLSCell`).
 
+        :note: :class:`XLSTable` creates the cells by itself when they are needed,
+         this method can be used to create a cell in advance.
+
         :param `book`: an instance of the `xlrd.Book` class;
         :param `sheet`: an instance of the `xlrd.sheet` class;
         :param `row`: the row in which this cell lives;
@@ -2026,7 +2366,14 @@ class XLSGrid(gridlib.Grid):
         xf_index = sheet.cell_xf_index(row, col)
         xls_text, xls_comment = display_texts[row][col], comments[row][col]
 
-        gridCell = XLSCell(book, cell, xf_index, xls_text, xls_comment, hyperlink, rich_text, default_width, default_colour)
+        format_cache = None
+        if self.table is not None:
+            format_cache = self.table.format_cache
+
+        gridCell = XLSCell(book, cell, xf_index, xls_text, xls_comment, hyperlink, rich_text, default_width, default_colour, format_cache)
+
+        if self.table is not None and (row, col) in self.table.cell_sizes:
+            gridCell.SetCellSize(*self.table.cell_sizes[(row, col)])
 
         self.cells[(row, col)] = gridCell
 
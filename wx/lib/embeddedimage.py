@@ -13,6 +13,8 @@
 #----------------------------------------------------------------------
 
 import base64
+import zlib
+from collections import OrderedDict
 from io import BytesIO
 
 import wx
@@ -39,19 +41,130 @@ class PyEmbeddedImage:
     from a database.  In this case pass False for isBase64 (unless the
     data actually is base64 encoded.)  Any image type that
     wx.Image can handle should be okay.
+
+    If size is given the data is not an image file but raw pixels, as
+    written by img2py with the -r option: width*height RGB triplets,
+    followed by width*height alpha values if hasAlpha is True, and
+    optionally compressed with zlib.  Loading these skips the PNG
+    decoder.
+
+    Decoded images and bitmaps can be kept in a cache shared by all
+    instances, see SetCacheSize.  It is disabled by default.
     """
 
-    def __init__(self, data, isBase64=True):
+    # LRU cache of decoded objects: (instance, kind, size) -> (object,
+    # number of bytes, data it was decoded from)
+    _cache = OrderedDict()
+    _cacheSize = 0
+    _cacheUsed = 0
+
+    def __init__(self, data, isBase64=True, size=None, hasAlpha=False, compressed=False):
         self.data = data
         self.isBase64 = isBase64
+        self.size = size
+        self.hasAlpha = hasAlpha
+        self.compressed = compressed
+
+    @classmethod
+    def SetCacheSize(cls, size):
+        """
+        Cache the images and bitmaps decoded by all PyEmbeddedImage
+        instances, using at most about size bytes.  The least recently
+        used entries are dropped first.  A size of 0 disables the cache.
+        """
+        cls._cacheSize = size
+        cls._TrimCache()
+
+    @classmethod
+    def GetCacheSize(cls):
+        return cls._cacheSize
+
+    @classmethod
+    def ClearCache(cls):
+        cls._cache.clear()
+        cls._cacheUsed = 0
+
+    @classmethod
+    def _TrimCache(cls):
+        while cls._cache and cls._cacheUsed > cls._cacheSize:
+            key, entry = cls._cache.popitem(last=False)
+            cls._cacheUsed -= entry[1]
+
+    def _GetCached(self, kind, size, create):
+        # Return the object made by create(), from the cache if enabled
+        cls = PyEmbeddedImage
+        if not cls._cacheSize:
+            return create()
+
+        key = (self, kind, size)
+        entry = cls._cache.get(key)
+        if entry is not None and entry[2] is self.data:
+            cls._cache.move_to_end(key)
+            return entry[0]
+
+        obj = create()
+        if kind == 'bundle':
+            width, height = obj.GetDefaultSize()
+        else:
+            width, height = obj.GetWidth(), obj.GetHeight()
+
+        if entry is not None:
+            cls._cacheUsed -= entry[1]
+        cls._cache[key] = (obj, width * height * 4, self.data)
+        cls._cacheUsed += width * height * 4
+        cls._TrimCache()
+        return obj
+
+    def _DecodeImage(self):
+        if self.size is None:
+            stream = BytesIO(self.GetData())
+            return wx.Image(stream)
+
+        width, height = self.size
+        data = self.GetData()
+        if self.hasAlpha:
+            rgb = width * height * 3
+            return wx.Image(width, height, data[:rgb], data[rgb:])
+        return wx.Image(width, height, data)
+
+    def _MakeImage(self, size):
+        image = self._DecodeImage()
+        if size is not None:
+            image = image.Scale(size[0], size[1], wx.IMAGE_QUALITY_HIGH)
+        return image
+
+    def _GetImage(self, size):
+        if size is not None:
+            size = tuple(size)
+        return self._GetCached('image', size, lambda: self._MakeImage(size))
+
+    def GetBitmap(self, size=None):
+        """
+        Return the image as a wx.Bitmap, rescaled to size (a (width,
+        height) tuple) if given.
+        """
+        if size is not None:
+            size = tuple(size)
+        bitmap = self._GetCached('bitmap', size, lambda: wx.Bitmap(self._MakeImage(size)))
+        if PyEmbeddedImage._cacheSize:
+            # A reference counted copy, unshared if the caller modifies it
+            bitmap = wx.Bitmap(bitmap)
+        return bitmap
 
-    def GetBitmap(self):
-        return wx.Bitmap(self.GetImage())
+    def GetBitmapBundle(self):
+        """
+        Return a wx.BitmapBundle made from the image.  The bundle keeps
+        the versions rescaled for other DPI values, so when the cache is
+        enabled they are only created once.
+        """
+        return self._GetCached('bundle', None, lambda: wx.BitmapBundle.FromImage(self._MakeImage(None)))
 
     def GetData(self):
         data = self.data
         if self.isBase64:
             data = b64decode(self.data)
+        if self.compressed:
+            data = zlib.decompress(data)
         return data
 
     def GetIcon(self):
@@ -59,9 +172,16 @@ class PyEmbeddedImage:
         icon.CopyFromBitmap(self.GetBitmap())
         return icon
 
-    def GetImage(self):
-        stream = BytesIO(self.GetData())
-        return wx.Image(stream)
+    def GetImage(self, size=None):
+        """
+        Return the image as a wx.Image, rescaled to size (a (width,
+        height) tuple) if given.
+        """
+        image = self._GetImage(size)
+        if PyEmbeddedImage._cacheSize:
+            # Callers may modify the image, do not hand out the cached one
+            image = image.Copy()
+        return image
 
     # added for backwards compatibility
     getBitmap = wx.deprecated(GetBitmap)
@@ -71,6 +191,7 @@ class PyEmbeddedImage:
 
     # define properties, for convenience
     Bitmap = property(GetBitmap)
+    BitmapBundle = property(GetBitmapBundle)
     Data = property(GetData)
     Icon = property(GetIcon)
     Image = property(GetImage)
@@ -98,6 +98,64 @@ def _colorGenerator():
     return _cycleidxs(indexcount=3, maxvalue=256, step=1)
 
 
+## Geometry used by the geometric hit test, all in pixel coordinates
+
+def _DistanceToSegments(xy, Points, Closed=False):
+    """
+    Returns the distance from the point xy to the polyline through Points,
+    or to the polygon if Closed is True.
+    """
+    Points = np.asarray(Points, float).reshape((-1, 2))
+    xy = np.asarray(xy, float)
+    if len(Points) == 1:
+        return np.hypot(*(xy - Points[0]))
+    if Closed:
+        Points = np.concatenate((Points, Points[:1]))
+    A = Points[:-1]
+    D = Points[1:] - A
+    LengthSq = (D**2).sum(1)
+    LengthSq[LengthSq == 0] = 1 # zero length segments: t is 0 anyway
+    t = np.clip(((xy - A) * D).sum(1) / LengthSq, 0, 1)
+    Closest = A + D * t[:, None]
+    return np.hypot(*(Closest - xy).T).min()
+
+def _PointInPolygon(xy, Points):
+    """
+    Returns True if the point xy is inside the polygon, using the even-odd
+    rule, like wx.DC.DrawPolygon does by default.
+    """
+    Points = np.asarray(Points, float).reshape((-1, 2))
+    x, y = xy
+    X, Y = Points[:, 0], Points[:, 1]
+    X1, Y1 = np.roll(X, -1), np.roll(Y, -1)
+    Crosses = (Y > y) != (Y1 > y)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        XCross = X + (y - Y) * (X1 - X) / (Y1 - Y)
+    return bool(np.count_nonzero(Crosses & (x < XCross)) % 2)
+
+def _DecimatePoints(Points, CellSize, Unique=False):
+    """
+    Pixel-bucket decimation of a set of points.
+
+    The points are put in square buckets of CellSize, and of each run of
+    consecutive points in the same bucket only the first is kept (the last
+    point is always kept). With Unique set, only the first point in each
+    bucket is kept, whether they are consecutive or not, which is right for
+    sets of unconnected points.
+
+    The dropped points are all within one bucket diagonal of a kept point,
+    so the result is the same as the original to within that distance.
+    """
+    Cells = np.floor(Points / CellSize)
+    if Unique:
+        Keep = np.sort(np.unique(Cells, axis=0, return_index=True)[1])
+        return Points[Keep]
+    Keep = np.ones(len(Points), bool)
+    Keep[1:] = (Cells[1:] != Cells[:-1]).any(1)
+    Keep[-1] = True
+    return Points[Keep]
+
+
 class DrawObject:
     """
     This is the base class for all the objects that can be drawn.
@@ -219,6 +277,7 @@ class DrawObject:
         self.CallBackFuncs[Event] = CallBackFun
         self.HitAble = True
         self._Canvas.UseHitTest = True
+        self._Canvas._InvalidateTiles() # the cached tiles have no hit test info for it
         if self.InForeground and self._Canvas._ForegroundHTBitmap is None:
             self._Canvas.MakeNewForegroundHTBitmap()
         elif self._Canvas._HTBitmap is None:
@@ -272,6 +331,7 @@ class DrawObject:
                 (FillColor, FillStyle),
                 wx.Brush(FillColor, self.FillStyleList[FillStyle]))
             #print("Setting Brush, BrushList length:", len(self.BrushList))
+        self._AppearanceChanged()
 
     def SetPen(self, LineColor, LineStyle, LineWidth):
         """
@@ -290,6 +350,7 @@ class DrawObject:
             self.Pen = self.PenList.setdefault(
                 (LineColor, LineStyle, LineWidth),
                 wx.Pen(LineColor, int(LineWidth), self.LineStyleList[LineStyle]))
+        self._AppearanceChanged()
 
     def SetHitBrush(self, HitColor):
         """
@@ -418,6 +479,7 @@ class DrawObject:
             self._Canvas._DrawList.append(self)
             self._Canvas._BackgroundDirty = True
             self.InForeground = False
+            self._Canvas._ObjectChangedLayer(self)
 
     def PutInForeground(self):
         """Put the object in the foreground."""
@@ -426,14 +488,64 @@ class DrawObject:
             self._Canvas._DrawList.remove(self)
             self._Canvas._BackgroundDirty = True
             self.InForeground = True
+            self._Canvas._ObjectChangedLayer(self)
+
+    def _BBoxChanged(self):
+        """
+        Let the canvas know that the bounding box of the object has changed,
+        so it can keep its bounding box and spatial index up to date.
+        """
+        if self._Canvas:
+            self._Canvas._ObjectBBoxChanged(self)
+
+    def _AppearanceChanged(self):
+        """
+        Let the canvas know that the object will look different, for
+        instance because its colour changed, so it can drop what it keeps
+        of the old drawing.
+        """
+        if self._Canvas:
+            self._Canvas._ObjectAppearanceChanged(self)
+
+    def _BatchKey(self):
+        """
+        Returns a key for drawing this object in a batch, or ``None`` if it
+        has to be drawn on its own.
+
+        When the canvas draws with batching turned on, runs of consecutive
+        objects with the same key are drawn with one call to the
+        ``_DrawBatch`` method of their class, instead of one call to
+        ``_Draw`` per object. The key must include everything the batch
+        needs to be the same for all its objects, such as the pen and brush.
+        """
+        return None
+
+    def _HitTest(self, xy, WorldToPixel, ScaleWorldToPixel):
+        """
+        Geometric hit test, used by canvases that don't use a hit test
+        bitmap.
+
+        Returns True if the point xy, in pixel coordinates, is on the
+        object. The default checks that it is in the bounding box of the
+        object, subclasses do an exact test for their shape.
+        """
+        BB = self.BoundingBox
+        if not np.isfinite(BB).all():
+            return False
+        Corners = WorldToPixel(BB)
+        Tol = self.HitLineWidth / 2.0
+        return bool((xy >= Corners.min(0) - Tol).all() and
+                    (xy <= Corners.max(0) + Tol).all())
 
     def Hide(self):
         """Hide the object."""
         self.Visible = False
+        self._AppearanceChanged()
 
     def Show(self):
         """Show the object."""
         self.Visible = True
+        self._AppearanceChanged()
 
 
 class ColorOnlyMixin:
@@ -544,6 +656,34 @@ class LineAndFillMixin(LineOnlyMixin):
         return ( WorldToPixel(self.XY),
                  ScaleWorldToPixel(self.WH) )
 
+    @staticmethod
+    def _SetUpDrawBatch(ObjectList, dc, WorldToPixel, ScaleWorldToPixel, HTdc):
+        """
+        Setup for drawing a batch of objects sharing the same pen, brush
+        and size limits.
+
+        Returns the (N, 4) array of the pixel (x, y, w, h) of the objects
+        to draw, and the list and the indexes in that array of the ones to
+        draw on the hit test dc.
+        """
+        first = ObjectList[0]
+        dc.SetPen(first.Pen)
+        dc.SetBrush(first.Brush)
+        XY = WorldToPixel(np.array([obj.XY for obj in ObjectList]))
+        WH = ScaleWorldToPixel(np.array([obj.WH for obj in ObjectList]))
+        MinSize = first.MinSize
+        WH[np.abs(WH) < MinSize] = MinSize
+        xywh = np.column_stack((XY, WH))
+        if first.DisappearWhenSmall:
+            # don't try to draw them too tiny
+            keep = np.abs(WH).min(1) > MinSize
+            xywh = xywh[keep]
+            ObjectList = [obj for obj, k in zip(ObjectList, keep) if k]
+        hit = []
+        if HTdc:
+            hit = [i for i, obj in enumerate(ObjectList) if obj.HitAble]
+        return xywh, [ObjectList[i] for i in hit], hit
+
 
 class XYObjectMixin:
     """
@@ -563,8 +703,7 @@ class XYObjectMixin:
         self.XY += Delta
         self.BoundingBox += Delta
 
-        if self._Canvas:
-            self._Canvas.BoundingBoxDirty = True
+        self._BBoxChanged()
 
     def CalcBoundingBox(self):
         """Calculate the bounding box."""
@@ -578,8 +717,7 @@ class XYObjectMixin:
         self.XY = xy
         self.CalcBoundingBox()
 
-        if self._Canvas:
-            self._Canvas.BoundingBoxDirty = True
+        self._BBoxChanged()
 
 class PointsObjectMixin:
     """
@@ -587,6 +725,76 @@ class PointsObjectMixin:
     with objects that have a set of (x, y) coordinate pairs.
 
     """
+    ## level of detail: None means always draw all the points
+    LODTolerance = None
+    _LODCache = None
+    ## how many zoom bands the decimated points are kept for
+    _LODCacheSize = 4
+
+    def SetLevelOfDetail(self, Tolerance=0.5):
+        """
+        Turn level of detail drawing on or off.
+
+        With level of detail on, the object is drawn from a decimated set of
+        its points when zoomed out, dropping the points that would land
+        within ``Tolerance`` pixels of the ones kept. The decimated sets are
+        computed once per zoom band (scales a factor of two apart), and
+        cached until the points change.
+
+        :param float `Tolerance`: the maximum distance, in pixels, between
+         the original and the decimated shapes, or ``None`` or 0 to turn the
+         level of detail off.
+
+        """
+        if Tolerance is not None and Tolerance < 0:
+            raise ValueError("The level of detail tolerance must be positive, not %s" % Tolerance)
+        self.LODTolerance = Tolerance or None
+        self._LODCache = {}
+
+    def _GetDrawPoints(self, ScaleWorldToPixel, Unique=False):
+        """
+        Returns the points to draw at the current scale, the decimated ones
+        if level of detail is on.
+        """
+        Points = self.Points
+        if (self.LODTolerance is None or ScaleWorldToPixel is None or
+            len(Points) < 3):
+            return Points
+        # ScaleWorldToPixel truncates to integers, which is no good for
+        # finding the scale when zoomed far in or out, so the scale is taken
+        # from the canvas, which is the one ScaleWorldToPixel is bound to for
+        # the objects in a Group.
+        Canvas = self._Canvas
+        if Canvas is None:
+            Canvas = getattr(ScaleWorldToPixel, '__self__', None)
+        TransformVector = getattr(Canvas, 'TransformVector', None)
+        if TransformVector is not None:
+            PixelsPerUnit = np.abs(TransformVector).max()
+        else:
+            Lengths = np.asarray(ScaleWorldToPixel((1.0, 1.0)))
+            if Lengths.dtype.kind != 'f':
+                # no way to know the scale well enough
+                return Points
+            PixelsPerUnit = np.abs(Lengths).max()
+        BB = self.BoundingBox
+        Extent = max((BB[1] - BB[0]).max(), 1e-300)
+        if PixelsPerUnit <= 0:
+            # the whole object is within a pixel
+            CellSize = Extent
+        else:
+            CellSize = self.LODTolerance / np.sqrt(2) / PixelsPerUnit
+        # round down to the zoom band, so the tolerance is never exceeded
+        Band = int(np.floor(np.log2(CellSize)))
+        Decimated = self._LODCache.pop(Band, None)
+        if Decimated is None:
+            Decimated = _DecimatePoints(Points, 2.0**Band, Unique)
+            if len(Decimated) < 3 and not Unique:
+                Decimated = Points[[0, len(Points) // 2, -1]]
+            if len(self._LODCache) >= self._LODCacheSize:
+                # drop the least recently used band
+                del self._LODCache[next(iter(self._LODCache))]
+        self._LODCache[Band] = Decimated
+        return Decimated
 
     def Move(self, Delta):
         """
@@ -600,14 +808,16 @@ class PointsObjectMixin:
         Delta = Delta.reshape((2,))
         self.Points += Delta
         self.BoundingBox += Delta
-        if self._Canvas:
-            self._Canvas.BoundingBoxDirty = True
+        if self._LODCache:
+            self._LODCache = {}
+        self._BBoxChanged()
 
     def CalcBoundingBox(self):
         """Calculate the bounding box."""
         self.BoundingBox = BBox.fromPoints(self.Points)
-        if self._Canvas:
-            self._Canvas.BoundingBoxDirty = True
+        if self._LODCache:
+            self._LODCache = {}
+        self._BBoxChanged()
 
     def SetPoints(self, Points, copy=True):
         """
@@ -685,7 +895,7 @@ class Polygon(PointsObjectMixin, LineAndFillMixin, DrawObject):
         self.SetBrush(FillColor,FillStyle)
 
     def _Draw(self, dc , WorldToPixel, ScaleWorldToPixel = None, HTdc=None):
-        Points = WorldToPixel(self.Points)
+        Points = WorldToPixel(self._GetDrawPoints(ScaleWorldToPixel))
         dc.SetPen(self.Pen)
         dc.SetBrush(self.Brush)
         dc.DrawPolygon(Points)
@@ -694,6 +904,33 @@ class Polygon(PointsObjectMixin, LineAndFillMixin, DrawObject):
             HTdc.SetBrush(self.HitBrush)
             HTdc.DrawPolygon(Points)
 
+    def _BatchKey(self):
+        if type(self)._Draw is not Polygon._Draw:
+            return None
+        return (Polygon, id(self.Pen), id(self.Brush))
+
+    @staticmethod
+    def _DrawBatch(ObjectList, dc, WorldToPixel, ScaleWorldToPixel, HTdc=None):
+        first = ObjectList[0]
+        Polygons = [WorldToPixel(obj._GetDrawPoints(ScaleWorldToPixel))
+                    for obj in ObjectList]
+        dc.SetPen(first.Pen)
+        dc.SetBrush(first.Brush)
+        dc.DrawPolygonList(Polygons)
+        if HTdc:
+            hit = [i for i, obj in enumerate(ObjectList) if obj.HitAble]
+            if hit:
+                HTdc.DrawPolygonList([Polygons[i] for i in hit],
+                                     [ObjectList[i].HitPen for i in hit],
+                                     [ObjectList[i].HitBrush for i in hit])
+
+    def _HitTest(self, xy, WorldToPixel, ScaleWorldToPixel):
+        Points = WorldToPixel(self.Points)
+        if self.HitFill and _PointInPolygon(xy, Points):
+            return True
+        return bool(self.HitLine and
+                    _DistanceToSegments(xy, Points, Closed=True) <= self.HitLineWidth / 2.0)
+
 class Line(PointsObjectMixin, LineOnlyMixin, DrawObject):
     """
     Draws a line
@@ -734,13 +971,17 @@ class Line(PointsObjectMixin, LineOnlyMixin, DrawObject):
 
 
     def _Draw(self, dc , WorldToPixel, ScaleWorldToPixel, HTdc=None):
-        Points = WorldToPixel(self.Points)
+        Points = WorldToPixel(self._GetDrawPoints(ScaleWorldToPixel))
         dc.SetPen(self.Pen)
         dc.DrawLines(Points)
         if HTdc and self.HitAble:
             HTdc.SetPen(self.HitPen)
             HTdc.DrawLines(Points)
 
+    def _HitTest(self, xy, WorldToPixel, ScaleWorldToPixel):
+        return bool(self.HitLine and
+                    _DistanceToSegments(xy, WorldToPixel(self.Points)) <= self.HitLineWidth / 2.0)
+
 class Spline(Line):
     """Draws a spline"""
     def __init__(self, *args, **kwargs):
@@ -975,6 +1216,10 @@ class ArrowLine(PointsObjectMixin, LineOnlyMixin, DrawObject):
             for arrow in ArrowPoints:
                 HTdc.DrawLines(arrow)
 
+    def _HitTest(self, xy, WorldToPixel, ScaleWorldToPixel):
+        return bool(self.HitLine and
+                    _DistanceToSegments(xy, WorldToPixel(self.Points)) <= self.HitLineWidth / 2.0)
+
 
 class PointSet(PointsObjectMixin, ColorOnlyMixin, DrawObject):
     """
@@ -1053,7 +1298,7 @@ class PointSet(PointsObjectMixin, ColorOnlyMixin, DrawObject):
 
     def _Draw(self, dc , WorldToPixel, ScaleWorldToPixel, HTdc=None):
         dc.SetPen(self.Pen)
-        Points = WorldToPixel(self.Points)
+        Points = WorldToPixel(self._GetDrawPoints(ScaleWorldToPixel, Unique=True))
         if self.Diameter <= 1:
             dc.DrawPointList(Points)
         elif self.Diameter <= 2:
@@ -1085,6 +1330,10 @@ class PointSet(PointsObjectMixin, ColorOnlyMixin, DrawObject):
                     for xy in Points:
                         HTdc.DrawCircle(xy[0],xy[1], radius)
 
+    def _HitTest(self, xy, WorldToPixel, ScaleWorldToPixel):
+        d = WorldToPixel(self.Points) - xy
+        return bool(np.hypot(d[:,0], d[:,1]).min() <= max(self.Diameter, self.HitLineWidth) / 2.0)
+
 class Point(XYObjectMixin, ColorOnlyMixin, DrawObject):
     """
     A point DrawObject
@@ -1144,6 +1393,38 @@ class Point(XYObjectMixin, ColorOnlyMixin, DrawObject):
                 HTdc.SetBrush(self.HitBrush)
                 HTdc.DrawCircle(xy[0],xy[1], radius)
 
+    def _HitTest(self, xy, WorldToPixel, ScaleWorldToPixel):
+        d = WorldToPixel(self.XY) - xy
+        return bool(np.hypot(*d) <= max(self.Diameter, self.HitLineWidth) / 2.0)
+
+    def _BatchKey(self):
+        if type(self)._Draw is not Point._Draw:
+            return None
+        return (Point, id(self.Pen), id(self.Brush), self.Diameter)
+
+    @staticmethod
+    def _DrawBatch(ObjectList, dc, WorldToPixel, ScaleWorldToPixel, HTdc=None):
+        first = ObjectList[0]
+        xy = WorldToPixel(np.array([obj.XY for obj in ObjectList]))
+        dc.SetPen(first.Pen)
+        if first.Diameter <= 1:
+            dc.DrawPointList(xy)
+        else:
+            dc.SetBrush(first.Brush)
+            radius = int(round(first.Diameter/2))
+            xywh = np.column_stack((xy - radius,
+                                    np.full(xy.shape, 2 * radius, int)))
+            dc.DrawEllipseList(xywh)
+        if HTdc:
+            hit = [i for i, obj in enumerate(ObjectList) if obj.HitAble]
+            if hit:
+                pens = [ObjectList[i].HitPen for i in hit]
+                if first.Diameter <= 1:
+                    HTdc.DrawPointList(xy[hit], pens)
+                else:
+                    brushes = [ObjectList[i].HitBrush for i in hit]
+                    HTdc.DrawEllipseList(xywh[hit], pens, brushes)
+
 class SquarePoint(XYObjectMixin, ColorOnlyMixin, DrawObject):
     """
     Draws a square point
@@ -1204,6 +1485,38 @@ class SquarePoint(XYObjectMixin, ColorOnlyMixin, DrawObject):
                 HTdc.SetBrush(self.HitBrush)
                 HTdc.DrawRectangle(int(x), int(y), Size, Size)
 
+    def _HitTest(self, xy, WorldToPixel, ScaleWorldToPixel):
+        d = WorldToPixel(self.XY) - xy
+        return bool(np.abs(d).max() <= max(self.Size, self.HitLineWidth) / 2.0)
+
+    def _BatchKey(self):
+        if type(self)._Draw is not SquarePoint._Draw:
+            return None
+        return (SquarePoint, id(self.Pen), id(self.Brush), self.Size)
+
+    @staticmethod
+    def _DrawBatch(ObjectList, dc, WorldToPixel, ScaleWorldToPixel, HTdc=None):
+        first = ObjectList[0]
+        Size = first.Size
+        xy = WorldToPixel(np.array([obj.XY for obj in ObjectList]))
+        dc.SetPen(first.Pen)
+        if Size <= 1:
+            dc.DrawPointList(xy)
+        else:
+            xywh = np.column_stack(((xy - Size/2.0).astype(int),
+                                    np.full(xy.shape, Size, int)))
+            dc.SetBrush(first.Brush)
+            dc.DrawRectangleList(xywh)
+        if HTdc:
+            hit = [i for i, obj in enumerate(ObjectList) if obj.HitAble]
+            if hit:
+                pens = [ObjectList[i].HitPen for i in hit]
+                if Size <= 1:
+                    HTdc.DrawPointList(xy[hit], pens)
+                else:
+                    brushes = [ObjectList[i].HitBrush for i in hit]
+                    HTdc.DrawRectangleList(xywh[hit], pens, brushes)
+
 class RectEllipse(XYObjectMixin, LineAndFillMixin, DrawObject):
     """A RectEllipse draw object."""
     def __init__(self, XY, WH,
@@ -1266,8 +1579,7 @@ class RectEllipse(XYObjectMixin, LineAndFillMixin, DrawObject):
         # you need this in case Width or Height are negative
         corners = np.array((self.XY, (self.XY + self.WH) ), float)
         self.BoundingBox = BBox.fromPoints(corners)
-        if self._Canvas:
-            self._Canvas.BoundingBoxDirty = True
+        self._BBoxChanged()
 
 
 class Rectangle(RectEllipse):
@@ -1283,6 +1595,38 @@ class Rectangle(RectEllipse):
             if HTdc and self.HitAble:
                 HTdc.DrawRectangle(XY, WH)
 
+    def _HitTest(self, xy, WorldToPixel, ScaleWorldToPixel):
+        XY = WorldToPixel(self.XY)
+        Corners = np.array((XY, XY + ScaleWorldToPixel(self.WH)))
+        Min, Max = Corners.min(0), Corners.max(0)
+        Tol = self.HitLineWidth / 2.0
+        if not ((xy >= Min - Tol).all() and (xy <= Max + Tol).all()):
+            return False
+        if self.HitFill:
+            return True
+        # only the outline is hit-able
+        return bool(self.HitLine and
+                    not ((xy > Min + Tol).all() and (xy < Max - Tol).all()))
+
+    def _BatchKey(self):
+        if type(self)._Draw is not Rectangle._Draw:
+            return None
+        return (Rectangle, id(self.Pen), id(self.Brush),
+                self.MinSize, self.DisappearWhenSmall)
+
+    @staticmethod
+    def _DrawBatch(ObjectList, dc, WorldToPixel, ScaleWorldToPixel, HTdc=None):
+        xywh, HitList, hit = LineAndFillMixin._SetUpDrawBatch(ObjectList,
+                                                              dc,
+                                                              WorldToPixel,
+                                                              ScaleWorldToPixel,
+                                                              HTdc)
+        dc.DrawRectangleList(xywh)
+        if HitList:
+            HTdc.DrawRectangleList(xywh[hit],
+                                   [obj.HitPen for obj in HitList],
+                                   [obj.HitBrush for obj in HitList])
+
 
 class Ellipse(RectEllipse):
     """Draws an ellipse see :class:`~lib.floatcanvas.FloatCanvas.RectEllipse`"""
@@ -1297,6 +1641,40 @@ class Ellipse(RectEllipse):
             if HTdc and self.HitAble:
                 HTdc.DrawEllipse(XY, WH)
 
+    def _HitTest(self, xy, WorldToPixel, ScaleWorldToPixel):
+        WH = np.abs(ScaleWorldToPixel(self.WH)) / 2.0
+        Center = WorldToPixel(self.XY) + ScaleWorldToPixel(self.WH) / 2.0
+        Tol = self.HitLineWidth / 2.0
+        def Inside(a, b):
+            if a <= 0 or b <= 0:
+                return False
+            dx, dy = (xy - Center) / (a, b)
+            return dx**2 + dy**2 <= 1
+        if not Inside(WH[0] + Tol, WH[1] + Tol):
+            return False
+        if self.HitFill:
+            return True
+        return bool(self.HitLine and not Inside(WH[0] - Tol, WH[1] - Tol))
+
+    def _BatchKey(self):
+        if type(self)._Draw is not Ellipse._Draw:
+            return None
+        return (Ellipse, id(self.Pen), id(self.Brush),
+                self.MinSize, self.DisappearWhenSmall)
+
+    @staticmethod
+    def _DrawBatch(ObjectList, dc, WorldToPixel, ScaleWorldToPixel, HTdc=None):
+        xywh, HitList, hit = LineAndFillMixin._SetUpDrawBatch(ObjectList,
+                                                              dc,
+                                                              WorldToPixel,
+                                                              ScaleWorldToPixel,
+                                                              HTdc)
+        dc.DrawEllipseList(xywh)
+        if HitList:
+            HTdc.DrawEllipseList(xywh[hit],
+                                 [obj.HitPen for obj in HitList],
+                                 [obj.HitBrush for obj in HitList])
+
 class Circle(XYObjectMixin, LineAndFillMixin, DrawObject):
     """Draws a circle"""
     def __init__(self, XY, Diameter,
@@ -1354,8 +1732,7 @@ class Circle(XYObjectMixin, LineAndFillMixin, DrawObject):
         """Calculate the bounding box of the object."""
         # you need this in case Width or Height are negative
         self.BoundingBox = BBox.fromPoints( (self.XY+self.WH, self.XY-self.WH) )
-        if self._Canvas:
-            self._Canvas.BoundingBoxDirty = True
+        self._BBoxChanged()
 
     def _Draw(self, dc , WorldToPixel, ScaleWorldToPixel, HTdc=None):
         ( XY, WH ) = self.SetUpDraw(dc,
@@ -1369,6 +1746,37 @@ class Circle(XYObjectMixin, LineAndFillMixin, DrawObject):
             if HTdc and self.HitAble:
                 HTdc.DrawCircle(XY, WH[0])
 
+    def _HitTest(self, xy, WorldToPixel, ScaleWorldToPixel):
+        Radius = abs(ScaleWorldToPixel(self.WH)[0])
+        Distance = np.hypot(*(WorldToPixel(self.XY) - xy))
+        Tol = self.HitLineWidth / 2.0
+        if self.HitFill and Distance <= Radius + Tol:
+            return True
+        return bool(self.HitLine and abs(Distance - Radius) <= Tol)
+
+    def _BatchKey(self):
+        if type(self)._Draw is not Circle._Draw:
+            return None
+        return (Circle, id(self.Pen), id(self.Brush),
+                self.MinSize, self.DisappearWhenSmall)
+
+    @staticmethod
+    def _DrawBatch(ObjectList, dc, WorldToPixel, ScaleWorldToPixel, HTdc=None):
+        xywh, HitList, hit = LineAndFillMixin._SetUpDrawBatch(ObjectList,
+                                                              dc,
+                                                              WorldToPixel,
+                                                              ScaleWorldToPixel,
+                                                              HTdc)
+        # a circle of radius r around (x, y) is the ellipse in the box
+        # (x - r, y - r, 2r, 2r)
+        R = xywh[:, 2]
+        xywh = np.column_stack((xywh[:, 0] - R, xywh[:, 1] - R, 2 * R, 2 * R))
+        dc.DrawEllipseList(xywh)
+        if HitList:
+            HTdc.DrawEllipseList(xywh[hit],
+                                 [obj.HitPen for obj in HitList],
+                                 [obj.HitBrush for obj in HitList])
+
 
 class TextObjectMixin(XYObjectMixin):
     """
@@ -1402,9 +1810,11 @@ class TextObjectMixin(XYObjectMixin):
 
     def SetColor(self, Color):
         self.Color = Color
+        self._AppearanceChanged()
 
     def SetBackgroundColor(self, BackgroundColor):
         self.BackgroundColor = BackgroundColor
+        self._AppearanceChanged()
 
     def SetText(self, String):
         """
@@ -2536,8 +2946,7 @@ class Arc(XYObjectMixin, LineAndFillMixin, DrawObject):
         self.EndXY += Delta
         self.BoundingBox += Delta
 
-        if self._Canvas:
-            self._Canvas.BoundingBoxDirty = True
+        self._BBoxChanged()
 
     def _Draw(self, dc , WorldToPixel, ScaleWorldToPixel, HTdc=None):
         self.SetUpDraw(dc , WorldToPixel, ScaleWorldToPixel, HTdc)
@@ -2553,8 +2962,7 @@ class Arc(XYObjectMixin, LineAndFillMixin, DrawObject):
         """Calculate the bounding box."""
         self.BoundingBox = BBox.asBBox( np.array((self.XY, (self.XY + self.WH) ),
                                                 float) )
-        if self._Canvas:
-            self._Canvas.BoundingBoxDirty = True
+        self._BBoxChanged()
 
 
 class PieChart(XYObjectMixin, LineOnlyMixin, DrawObject):
@@ -2672,8 +3080,7 @@ class PieChart(XYObjectMixin, LineOnlyMixin, DrawObject):
             self.BoundingBox = BBox.asBBox( ((self.XY-self.Diameter),(self.XY+self.Diameter)) )
         else:
             self.BoundingBox = BBox.asBBox((self.XY, self.XY))
-        if self._Canvas:
-            self._Canvas.BoundingBoxDirty = True
+        self._BBoxChanged()
 
     def _Draw(self, dc , WorldToPixel, ScaleWorldToPixel, HTdc=None):
         CenterXY = WorldToPixel(self.XY)
@@ -2784,6 +3191,7 @@ class Group(DrawObject):
         """
         for o in self.ObjectList:
             o.SetColor(Color)
+        self._AppearanceChanged()
 
     def SetLineColor(self, Color):
         """
@@ -2795,6 +3203,7 @@ class Group(DrawObject):
         """
         for o in self.ObjectList:
             o.SetLineColor(Color)
+        self._AppearanceChanged()
 
     def SetLineStyle(self, LineStyle):
         """
@@ -2806,6 +3215,7 @@ class Group(DrawObject):
         """
         for o in self.ObjectList:
             o.SetLineStyle(LineStyle)
+        self._AppearanceChanged()
 
     def SetLineWidth(self, LineWidth):
         """
@@ -2816,6 +3226,7 @@ class Group(DrawObject):
         """
         for o in self.ObjectList:
             o.SetLineWidth(LineWidth)
+        self._AppearanceChanged()
 
     def SetFillColor(self, Color):
         """
@@ -2827,6 +3238,7 @@ class Group(DrawObject):
         """
         for o in self.ObjectList:
             o.SetFillColor(Color)
+        self._AppearanceChanged()
 
     def SetFillStyle(self, FillStyle):
         """
@@ -2838,6 +3250,7 @@ class Group(DrawObject):
         """
         for o in self.ObjectList:
             o.SetFillStyle(FillStyle)
+        self._AppearanceChanged()
 
     def Move(self, Delta):
         """
@@ -2850,6 +3263,7 @@ class Group(DrawObject):
         for obj in self.ObjectList:
             obj.Move(Delta)
         self.BoundingBox += Delta
+        self._BBoxChanged()
 
     def Bind(self, Event, CallBackFun):
         """
@@ -2879,6 +3293,7 @@ class Group(DrawObject):
         self.CallBackFuncs[Event] = CallBackFun
         self.HitAble = True
         self._Canvas.UseHitTest = True
+        self._Canvas._InvalidateTiles() # the cached tiles have no hit test info for it
         if self.InForeground and self._Canvas._ForegroundHTBitmap is None:
             self._Canvas.MakeNewForegroundHTBitmap()
         elif self._Canvas._HTBitmap is None:
@@ -2908,3 +3323,9 @@ class Group(DrawObject):
     def _Draw(self, dc , WorldToPixel, ScaleWorldToPixel = None, HTdc=None):
         for obj in self.ObjectList:
             obj._Draw(dc, WorldToPixel, ScaleWorldToPixel, HTdc)
+
+    def _HitTest(self, xy, WorldToPixel, ScaleWorldToPixel):
+        for obj in self.ObjectList:
+            if obj._HitTest(xy, WorldToPixel, ScaleWorldToPixel):
+                return True
+        return False
@@ -44,6 +44,7 @@ Many samples are available in the `wxPhoenix/samples/floatcanvas` folder.
 
 import sys
 mac = sys.platform.startswith("darwin")
+from collections import OrderedDict
 
 import numpy as np
 try:
@@ -55,6 +56,7 @@ import wx
 from .FCObjects import *
 
 from .Utilities import BBox
+from .Utilities.SpatialIndex import SpatialIndex
 from . import GUIMode
 
 
@@ -192,15 +194,27 @@ class FloatCanvas(wx.Panel):
 
         self.HitColorGenerator = None
         self.UseHitTest = False
+        self.HitTestMode = "Bitmap"
+        ## pixels around the mouse position checked in the "Geometry" hit test mode
+        self.HitTestTolerance = 8
+        self._HitTestDirty = False
 
         self.NumBetweenBlits = 500
 
+        ## draw runs of similar objects (same type, pen and brush) with one
+        ## call to the DrawXXXList DC methods. See DrawObject._BatchKey
+        self.UseBatchDrawing = False
+
         ## create the Hit Test Dicts:
         self.HitDict = None
         self._HTdc = None
 
         self._DrawList = []
         self._ForeDrawList = []
+        self.UseSpatialIndex = False
+        self._DrawListIndex = None
+        self._ForeDrawListIndex = None
+        self._TileCache = None
         self.InitializePanel()
         self.MakeNewBuffers()
         self.BoundingBox = BBox.NullBBox()
@@ -276,6 +290,194 @@ class FloatCanvas(wx.Panel):
         self.GUIMode = Mode
         self.SetCursor(self.GUIMode.Cursor)
 
+    def SetSpatialIndex(self, Use=True, CellSize=None):
+        """
+        Turn the spatial index of the draw lists on or off.
+
+        Without the index, every :meth:`Draw` checks the bounding box of
+        every object on the canvas against the viewport. With it, only the
+        objects near the viewport are looked at, so re-drawing a zoomed in
+        view of a canvas with a very large number of objects is much faster.
+
+        The index is kept up to date as objects are added, removed or moved.
+        If you change the bounding box of an object directly, call
+        ``Draw(Force=True)`` to re-build it.
+
+        :param boolean `Use`: use the spatial index
+        :param float `CellSize`: the size of the grid cells of the index in
+         world coordinates, by default it is computed from the objects on the
+         canvas.
+
+        """
+        self.UseSpatialIndex = Use
+        if Use:
+            self._DrawListIndex = SpatialIndex(CellSize)
+            self._DrawListIndex.Rebuild(self._DrawList)
+            self._ForeDrawListIndex = SpatialIndex(CellSize)
+            self._ForeDrawListIndex.Rebuild(self._ForeDrawList)
+        else:
+            self._DrawListIndex = None
+            self._ForeDrawListIndex = None
+        self._BackgroundDirty = True
+
+    def SetTileCache(self, Use=True, TileSize=256, CacheSize=64, TileMargin=32):
+        """
+        Turn the caching of rendered background tiles on or off.
+
+        With the tile cache, the background is rendered in square tiles of
+        fixed pixel size, aligned to a grid in world coordinates at the
+        current scale. The tiles are kept in a least recently used cache, so
+        that when panning only the tiles that come into view have to be
+        rendered, the rest of the background is just copied from the cache.
+
+        The cache is emptied whenever an object is added, removed or moved,
+        or ``Draw(Force=True)`` is called.
+
+        :param boolean `Use`: use the tile cache
+        :param integer `TileSize`: the width and height of a tile in pixels
+        :param integer `CacheSize`: the maximum number of tiles kept in the
+         cache
+        :param integer `TileMargin`: objects this number of pixels outside
+         a tile are drawn into it too, so that parts of them that are sized
+         in pixels (text, points, thick lines) that cross into the tile are
+         not cut off at the tile edge.
+
+        """
+        if Use:
+            self._TileCache = OrderedDict()
+            self.TileSize = int(TileSize)
+            self.TileCacheSize = CacheSize
+            self.TileMargin = TileMargin
+        else:
+            self._TileCache = None
+        self._BackgroundDirty = True
+
+    def _InvalidateTiles(self):
+        if self._TileCache is not None:
+            self._TileCache.clear()
+
+    def _GetTile(self, i, j):
+        """
+        Returns the (Bitmap, HitTestBitmap) of the tile at (i, j), from the
+        cache if it is there, rendering it otherwise.
+        """
+        Key = (tuple(self.TransformVector), self.TileSize, i, j)
+        Cache = self._TileCache
+        try:
+            Cache.move_to_end(Key)
+            return Cache[Key]
+        except KeyError:
+            pass
+        Tile = self._RenderTile(i, j)
+        Cache[Key] = Tile
+        while len(Cache) > self.TileCacheSize:
+            Cache.popitem(last=False)
+        return Tile
+
+    def _RenderTile(self, i, j):
+        """
+        Render the background objects in the tile at (i, j).
+
+        The panel size and viewport of the canvas are temporarily set to
+        those of the tile, so that the objects, and the grid, draw
+        themselves in the tile exactly as they do on the whole panel.
+        """
+        TileSize = self.TileSize
+        Tile = wx.Bitmap(TileSize, TileSize)
+        dc = wx.MemoryDC()
+        dc.SelectObject(Tile)
+        dc.SetBackground(self.BackgroundBrush)
+        dc.Clear()
+        if self._HTBitmap is not None and self.HitTestMode == "Bitmap":
+            HTTile = wx.Bitmap(TileSize, TileSize, depth=self.HitTestBitmapDepth)
+            HTdc = wx.MemoryDC()
+            HTdc.SelectObject(HTTile)
+            HTdc.Clear()
+        else:
+            HTTile = HTdc = None
+
+        Saved = (self.PanelSize, self.HalfPanelSize, self.ViewPortCenter, self.ViewPortBB)
+        try:
+            self.PanelSize = np.array((TileSize, TileSize), np.int32)
+            self.HalfPanelSize = self.PanelSize / 2
+            # the world coordinates of the center of the tile
+            self.ViewPortCenter = (np.array((i, j), float) * TileSize +
+                                   self.HalfPanelSize) / self.TransformVector
+            Margin = self.TileMargin
+            Corners = self.PixelToWorld(((-Margin, -Margin),
+                                         (TileSize + Margin, TileSize + Margin)))
+            self.ViewPortBB = np.array((np.minimum.reduce(Corners),
+                                        np.maximum.reduce(Corners)))
+            if self.GridUnder is not None:
+                self.GridUnder._Draw(dc, self)
+            self._DrawObjects(dc, self._DrawList, None, self.ViewPortBB, HTdc,
+                              self._DrawListIndex)
+        finally:
+            self.PanelSize, self.HalfPanelSize, self.ViewPortCenter, self.ViewPortBB = Saved
+        dc.SelectObject(wx.NullBitmap)
+        if HTdc is not None:
+            HTdc.SelectObject(wx.NullBitmap)
+        return Tile, HTTile
+
+    def _DrawTiles(self, dc, HTdc=None):
+        """
+        Draw the background from the cached tiles, rendering the ones that
+        are not in the cache.
+        """
+        TileSize = self.TileSize
+        # the pixel coordinates of the top left corner of the panel, on a
+        # pixel grid with the world origin at (0, 0) where WorldToPixel puts
+        # it, so that the tiles are truncated the same way as the objects
+        x0, y0 = -self.WorldToPixel((0.0, 0.0))
+        for i in range(x0 // TileSize, (x0 + self.PanelSize[0]) // TileSize + 1):
+            for j in range(y0 // TileSize, (y0 + self.PanelSize[1]) // TileSize + 1):
+                Tile, HTTile = self._GetTile(i, j)
+                x = int(i * TileSize - x0)
+                y = int(j * TileSize - y0)
+                dc.DrawBitmap(Tile, x, y)
+                if HTdc is not None and HTTile is not None:
+                    HTdc.DrawBitmap(HTTile, x, y)
+
+    def _RebuildSpatialIndex(self):
+        if self.UseSpatialIndex:
+            self._DrawListIndex.Rebuild(self._DrawList)
+            self._ForeDrawListIndex.Rebuild(self._ForeDrawList)
+
+    def _ObjectBBoxChanged(self, Object):
+        """
+        Called by the DrawObjects when their bounding box has changed.
+        """
+        self.BoundingBoxDirty = True
+        if not Object.InForeground:
+            self._InvalidateTiles()
+        if self.UseSpatialIndex:
+            if Object.InForeground:
+                self._ForeDrawListIndex.Update(Object)
+            else:
+                self._DrawListIndex.Update(Object)
+
+    def _ObjectAppearanceChanged(self, Object):
+        """
+        Called by the DrawObjects when they are shown, hidden, or change
+        colour or style.
+        """
+        if not Object.InForeground:
+            self._InvalidateTiles()
+
+    def _ObjectChangedLayer(self, Object):
+        """
+        Called by the DrawObjects when they are moved between the
+        foreground and the background.
+        """
+        self._InvalidateTiles()
+        if self.UseSpatialIndex:
+            if Object.InForeground:
+                self._DrawListIndex.Remove(Object)
+                self._ForeDrawListIndex.Insert(Object)
+            else:
+                self._ForeDrawListIndex.Remove(Object)
+                self._DrawListIndex.Insert(Object)
+
     def MakeHitDict(self):
         """Initialize the Hit dictionary."""
         ##fixme: Should this just be None if nothing has been bound?
@@ -303,9 +505,9 @@ class FloatCanvas(wx.Panel):
     if wx.__version__ >= "2.8":
         HitTestBitmapDepth = 32
         #print("Using hit test code for 2.8")
-        def GetHitTestColor(self, xy):
+        def _GetBitmapHitTestColor(self, xy):
             """
-            Get the hit test colour
+            Get the hit test colour from the hit test bitmap
 
             :param `xy`: the position to get the hit test colour for
             """
@@ -321,9 +523,9 @@ class FloatCanvas(wx.Panel):
     else:
         HitTestBitmapDepth = 24
         #print("using pre-2.8 hit test code")
-        def GetHitTestColor(self,  xy ):
+        def _GetBitmapHitTestColor(self,  xy ):
             """
-            Get the hit test colour
+            Get the hit test colour from the hit test bitmap
 
             :param `xy`: the position to get the hit test colour for
             """
@@ -335,6 +537,114 @@ class FloatCanvas(wx.Panel):
             hitcolor = dc.GetPixel( xy )
             return hitcolor.Get()
 
+    def GetHitTestColor(self, xy):
+        """
+        Get the hit test colour, that is the ``HitColor`` of the hit-able
+        object on top at a given point.
+
+        Depending on the :meth:`SetHitTestMode`, it is looked up in the hit
+        test bitmap, that is re-drawn first if it is out of date, or found
+        from the geometry of the objects.
+
+        :param `xy`: the position to get the hit test colour for
+        """
+        if self.HitTestMode == "Geometry":
+            Object = self.GetHitObject(xy)
+            return Object.HitColor if Object is not None else None
+        if self._HitTestDirty:
+            self._DrawHitTest()
+        return self._GetBitmapHitTestColor(xy)
+
+    def SetHitTestMode(self, Mode):
+        """
+        Set how hit tests on the objects bound to mouse events are done.
+
+        :param string `Mode`: valid entries are:
+
+         ============== ======================================================
+         Mode           Description
+         ============== ======================================================
+         `Bitmap`       the hit-able objects are drawn on an off screen
+                        bitmap, each in its own colour, whenever the
+                        background or the foreground are drawn. This is
+                        the default.
+         `LazyBitmap`   the same, but the bitmap is only drawn when a hit
+                        test is done after the canvas has been re-drawn.
+         `Geometry`     there is no bitmap, the objects under the point are
+                        found from their bounding boxes, and then each is
+                        tested exactly with its ``_HitTest`` method.
+         ============== ======================================================
+
+        """
+        if Mode not in ("Bitmap", "LazyBitmap", "Geometry"):
+            raise FloatCanvasError('Mode must be either "Bitmap", "LazyBitmap" or "Geometry"')
+        self.HitTestMode = Mode
+        self._InvalidateTiles()
+        self.MakeNewBuffers()
+
+    def GetHitObject(self, xy):
+        """
+        Returns the hit-able object on top at a given point, found from the
+        geometry of the objects, or ``None``.
+
+        :param `xy`: the point, in pixel coordinates
+
+        """
+        xy = np.asarray(xy, float)
+        # a small box around the point, in world coordinates
+        Corners = self.PixelToWorld((xy - self.HitTestTolerance,
+                                     xy + self.HitTestTolerance))
+        BB = np.array((Corners.min(0), Corners.max(0)))
+        WorldToPixel = self.WorldToPixel
+        ScaleWorldToPixel = self.ScaleWorldToPixel
+        for DrawList, Index in ((self._ForeDrawList, self._ForeDrawListIndex),
+                                (self._DrawList, self._DrawListIndex)):
+            if Index is not None:
+                Candidates = Index.Query(BB)
+            else:
+                Candidates = [obj for obj in self._ShouldRedraw(DrawList, BB)
+                              if obj.HitAble]
+            # the last object drawn is on top
+            for Object in reversed(Candidates):
+                if (Object.HitAble and Object.Visible and
+                    Object._HitTest(xy, WorldToPixel, ScaleWorldToPixel)):
+                    return Object
+        return None
+
+    def _DrawHitTest(self):
+        """
+        Re-draw the hit test bitmaps, used when they are drawn lazily.
+        """
+        # the objects draw themselves on both a dc and the hit test dc, so
+        # give them a tiny bitmap to draw on that is thrown away.
+        dc = wx.MemoryDC()
+        dc.SelectObject(wx.Bitmap(1, 1))
+        WorldToPixel = self.WorldToPixel
+        ScaleWorldToPixel = self.ScaleWorldToPixel
+        def Visible(DrawList, Index):
+            if Index is not None:
+                return Index.Query(self.ViewPortBB)
+            return self._ShouldRedraw(DrawList, self.ViewPortBB)
+        if self._HTBitmap is not None:
+            HTdc = wx.MemoryDC()
+            HTdc.SelectObject(self._HTBitmap)
+            HTdc.Clear()
+            for Object in Visible(self._DrawList, self._DrawListIndex):
+                if Object.HitAble and Object.Visible:
+                    Object._Draw(dc, WorldToPixel, ScaleWorldToPixel, HTdc)
+            HTdc.SelectObject(wx.NullBitmap)
+        if self._ForegroundHTBitmap is not None:
+            HTdc = wx.MemoryDC()
+            HTdc.SelectObject(self._ForegroundHTBitmap)
+            HTdc.Clear()
+            if self._HTBitmap is not None:
+                HTdc.DrawBitmap(self._HTBitmap, 0, 0)
+            for Object in Visible(self._ForeDrawList, self._ForeDrawListIndex):
+                if Object.HitAble and Object.Visible:
+                    Object._Draw(dc, WorldToPixel, ScaleWorldToPixel, HTdc)
+            HTdc.SelectObject(wx.NullBitmap)
+        self._HitTestDirty = False
+
     def UnBindAll(self):
         """Removes all bindings to Objects."""
         self.HitDict = None
@@ -523,6 +833,9 @@ class FloatCanvas(wx.Panel):
         Off screen Bitmap used for Hit tests on background objects
 
         """
+        if self.HitTestMode == "Geometry":
+            self._HTBitmap = None
+            return
         self._HTBitmap = wx.Bitmap(self.PanelSize[0],
                                         self.PanelSize[1],
                                         depth=self.HitTestBitmapDepth)
@@ -535,6 +848,9 @@ class FloatCanvas(wx.Panel):
         Off screen Bitmap used for Hit tests on foreground objects
 
         """
+        if self.HitTestMode == "Geometry":
+            self._ForegroundHTBitmap = None
+            return
         self._ForegroundHTBitmap = wx.Bitmap(self.PanelSize[0],
                                                   self.PanelSize[1],
                                                   depth=self.HitTestBitmapDepth)
@@ -609,20 +925,35 @@ class FloatCanvas(wx.Panel):
         self.ViewPortBB = np.array( ( np.minimum.reduce(ViewPortWorld),
                               np.maximum.reduce(ViewPortWorld) ) )
 
+        # in the "LazyBitmap" mode the hit test bitmaps are only drawn when
+        # needed, after the layers they are made from have been re-drawn
+        DrawHitTest = self.HitTestMode == "Bitmap"
+        if not DrawHitTest and (
+                (self._HTBitmap is not None and (self._BackgroundDirty or Force)) or
+                (self._ForegroundHTBitmap is not None and self._ForeDrawList)):
+            self._HitTestDirty = True
+
         dc = wx.MemoryDC()
         dc.SelectObject(self._Buffer)
+        if Force:
+            self._RebuildSpatialIndex()
+            self._InvalidateTiles()
         if self._BackgroundDirty or Force:
             dc.SetBackground(self.BackgroundBrush)
             dc.Clear()
-            if self._HTBitmap is not None:
+            if self._HTBitmap is not None and DrawHitTest:
                 HTdc = wx.MemoryDC()
                 HTdc.SelectObject(self._HTBitmap)
                 HTdc.Clear()
             else:
                 HTdc = None
-            if self.GridUnder is not None:
-                self.GridUnder._Draw(dc, self)
-            self._DrawObjects(dc, self._DrawList, ScreenDC, self.ViewPortBB, HTdc)
+            if self._TileCache is not None:
+                self._DrawTiles(dc, HTdc)
+            else:
+                if self.GridUnder is not None:
+                    self.GridUnder._Draw(dc, self)
+                self._DrawObjects(dc, self._DrawList, ScreenDC, self.ViewPortBB, HTdc,
+                                  self._DrawListIndex)
             self._BackgroundDirty = False
             del HTdc
 
@@ -635,7 +966,7 @@ class FloatCanvas(wx.Panel):
             dc = wx.MemoryDC() ## I got some strange errors (linewidths wrong) if I didn't make a new DC here
             dc.SelectObject(self._ForegroundBuffer)
             dc.DrawBitmap(self._Buffer,0,0)
-            if self._ForegroundHTBitmap is not None:
+            if self._ForegroundHTBitmap is not None and DrawHitTest:
                 ForegroundHTdc = wx.MemoryDC()
                 ForegroundHTdc.SelectObject( self._ForegroundHTBitmap)
                 ForegroundHTdc.Clear()
@@ -648,7 +979,8 @@ class FloatCanvas(wx.Panel):
                               self._ForeDrawList,
                               ScreenDC,
                               self.ViewPortBB,
-                              ForegroundHTdc)
+                              ForegroundHTdc,
+                              self._ForeDrawListIndex)
         if self.GridOver is not None:
             self.GridOver._Draw(dc, self)
         ScreenDC.Blit(0, 0, self.PanelSize[0],self.PanelSize[1], dc, 0, 0)
@@ -841,11 +1173,16 @@ class FloatCanvas(wx.Panel):
         ##fixme: Using the list.remove method is kind of slow
         if Object.InForeground:
             self._ForeDrawList.remove(Object)
+            if self.UseSpatialIndex:
+                self._ForeDrawListIndex.Remove(Object)
             if not self._ForeDrawList:
                 self._ForegroundBuffer = None
                 self._ForegroundHTdc = None
         else:
             self._DrawList.remove(Object)
+            if self.UseSpatialIndex:
+                self._DrawListIndex.Remove(Object)
+            self._InvalidateTiles()
             self._BackgroundDirty = True
         if ResetBB:
             self.BoundingBoxDirty = True
@@ -861,6 +1198,10 @@ class FloatCanvas(wx.Panel):
         """
         self._DrawList = []
         self._ForeDrawList = []
+        if self.UseSpatialIndex:
+            self._DrawListIndex.Clear()
+            self._ForeDrawListIndex.Clear()
+        self._InvalidateTiles()
         self._BackgroundDirty = True
         self.HitColorGenerator = None
         self.UseHitTest = False
@@ -890,6 +1231,7 @@ class FloatCanvas(wx.Panel):
             self.TransformVector = np.array( (1,-1), float)
             self.MapProjectionVector = np.array( (1,1), float)
             self.Scale = 1
+        self._RebuildSpatialIndex()
         self.BoundingBoxDirty = False
 
     def PixelToWorld(self, Points):
@@ -949,9 +1291,14 @@ class FloatCanvas(wx.Panel):
         obj._Canvas = self
         if  obj.InForeground:
             self._ForeDrawList.append(obj)
+            if self.UseSpatialIndex:
+                self._ForeDrawListIndex.Insert(obj)
             self.UseForeground = True
         else:
             self._DrawList.append(obj)
+            if self.UseSpatialIndex:
+                self._DrawListIndex.Insert(obj)
+            self._InvalidateTiles()
             self._BackgroundDirty = True
         self.BoundingBoxDirty = True
         return obj
@@ -966,26 +1313,79 @@ class FloatCanvas(wx.Panel):
         for Object in Objects:
             self.AddObject(Object)
 
-    def _DrawObjects(self, dc, DrawList, ScreenDC, ViewPortBB, HTdc=None):
+    def _DrawObjects(self, dc, DrawList, ScreenDC, ViewPortBB, HTdc=None, Index=None):
         """
         This is a convenience function;
 
         This function takes the list of objects and draws them to specified
-        device context.
+        device context. If a :class:`SpatialIndex` of the list is passed in,
+        it is used to find the objects in the viewport. If ScreenDC is
+        ``None``, the partial results are not blitted to the screen.
         """
         dc.SetBackground(self.BackgroundBrush)
         #i = 0
         PanelSize0, PanelSize1 = self.PanelSize # for speed
         WorldToPixel = self.WorldToPixel # for speed
         ScaleWorldToPixel = self.ScaleWorldToPixel # for speed
-        Blit = ScreenDC.Blit # for speed
+        Blit = ScreenDC.Blit if ScreenDC else None # for speed
         NumBetweenBlits = self.NumBetweenBlits # for speed
-        for i, Object in enumerate(self._ShouldRedraw(DrawList, ViewPortBB)):
+        if Index is not None:
+            RedrawList = Index.Query(ViewPortBB)
+        else:
+            RedrawList = self._ShouldRedraw(DrawList, ViewPortBB)
+        if self.UseBatchDrawing:
+            self._DrawBatches(dc, RedrawList, ScreenDC, HTdc)
+            return
+        for i, Object in enumerate(RedrawList):
             if Object.Visible:
                 Object._Draw(dc, WorldToPixel, ScaleWorldToPixel, HTdc)
-                if (i+1) % NumBetweenBlits == 0:
+                if Blit and (i+1) % NumBetweenBlits == 0:
                     Blit(0, 0, PanelSize0, PanelSize1, dc, 0, 0)
 
+    def _DrawBatches(self, dc, RedrawList, ScreenDC, HTdc=None):
+        """
+        Draws the objects in RedrawList, drawing each run of consecutive
+        objects with the same batch key with a single call to ``_DrawBatch``.
+
+        Only consecutive objects are batched together, so the objects are
+        still drawn in the same order as they are in the list.
+        """
+        PanelSize0, PanelSize1 = self.PanelSize # for speed
+        WorldToPixel = self.WorldToPixel # for speed
+        ScaleWorldToPixel = self.ScaleWorldToPixel # for speed
+        Blit = ScreenDC.Blit if ScreenDC else None # for speed
+        NumBetweenBlits = self.NumBetweenBlits # for speed
+        NumDrawn = 0
+        Batch = []
+        BatchKey = None
+        for Object in RedrawList + [None]:
+            if Object is not None:
+                if not Object.Visible:
+                    continue
+                Key = Object._BatchKey()
+                if Key is not None and Key == BatchKey:
+                    Batch.append(Object)
+                    continue
+            # the current batch is finished, draw it
+            if len(Batch) > 1:
+                Batch[0]._DrawBatch(Batch, dc, WorldToPixel, ScaleWorldToPixel, HTdc)
+            elif Batch:
+                Batch[0]._Draw(dc, WorldToPixel, ScaleWorldToPixel, HTdc)
+            if Blit and (NumDrawn + len(Batch)) // NumBetweenBlits > NumDrawn // NumBetweenBlits:
+                Blit(0, 0, PanelSize0, PanelSize1, dc, 0, 0)
+            NumDrawn += len(Batch)
+            if Object is None:
+                break
+            if Key is None:
+                Object._Draw(dc, WorldToPixel, ScaleWorldToPixel, HTdc)
+                NumDrawn += 1
+                if Blit and NumDrawn % NumBetweenBlits == 0:
+                    Blit(0, 0, PanelSize0, PanelSize1, dc, 0, 0)
+                Batch = []
+            else:
+                Batch = [Object]
+            BatchKey = Key
+
     def SaveAsImage(self, filename, ImageType=wx.BITMAP_TYPE_PNG):
         """
         Saves the current image as an image file.
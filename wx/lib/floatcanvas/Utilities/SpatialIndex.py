@@ -0,0 +1,241 @@
+#----------------------------------------------------------------------------
+# Name:         SpatialIndex.py
+# Purpose:      A uniform grid spatial index for the FloatCanvas draw lists
+#
+# Author:       Robin Dunn
+#
+# Created:      18-Oct-2026
+# Licence:      wxWindows license
+# Tags:         phoenix-port
+#----------------------------------------------------------------------------
+"""
+A uniform grid spatial index for the objects on a FloatCanvas.
+
+The index maps each object's bounding box to the grid cells it covers, so
+that finding the objects that overlap a given bounding box (usually the
+viewport) only has to look at the objects in the cells the query covers,
+rather than at every object on the canvas.
+
+"""
+
+import math
+
+import numpy as np
+
+
+class SpatialIndex:
+    """
+    A uniform grid over world coordinates, holding DrawObjects.
+
+    Objects are kept in the order they were inserted, and :meth:`Query`
+    returns them in that order, so it can be used as a drop in replacement
+    for scanning a draw list.
+
+    The cell size is worked out from the extent and number of the objects
+    when the grid is (re)built, it is re-tuned automatically when the number
+    of objects has changed a lot since the last build.
+
+    """
+
+    ## objects that would cover more cells than this are kept in a separate
+    ## list that is checked on every query.
+    MaxCellsPerObject = 64
+
+    def __init__(self, CellSize=None):
+        """
+        Default class constructor.
+
+        :param float `CellSize`: the size of a grid cell in world
+         coordinates, if ``None`` it is computed from the objects in the
+         index.
+
+        """
+        self.CellSize = CellSize
+        self.Clear()
+
+    def Clear(self):
+        """Remove all objects from the index."""
+        self._Entries = {} # object: [sequence number, cells]
+        self._Cells = {}
+        self._Large = set()
+        self._NextSeq = 0
+        self._Origin = (0.0, 0.0)
+        self._Size = None
+        self._BuiltCount = 0
+
+    def __len__(self):
+        return len(self._Entries)
+
+    def __contains__(self, obj):
+        return obj in self._Entries
+
+    def _CellRange(self, BB):
+        """
+        Returns the (i0, j0, i1, j1) range of cells covered by BB, or None if
+        BB is not finite.
+        """
+        (x0, y0), (x1, y1) = BB
+        if not (math.isfinite(x0) and math.isfinite(y0) and
+                math.isfinite(x1) and math.isfinite(y1)):
+            return None
+        ox, oy = self._Origin
+        size = self._Size
+        return (int(math.floor((x0 - ox) / size)),
+                int(math.floor((y0 - oy) / size)),
+                int(math.floor((x1 - ox) / size)),
+                int(math.floor((y1 - oy) / size)))
+
+    def _Place(self, obj):
+        """Put obj in the cells covered by its bounding box."""
+        BB = obj.BoundingBox
+        if np.isnan(BB).all():
+            # Null bounding boxes don't overlap anything
+            return ()
+        cells = self._CellRange(BB)
+        if (cells is None or
+            (cells[2] - cells[0] + 1) * (cells[3] - cells[1] + 1) > self.MaxCellsPerObject):
+            self._Large.add(obj)
+            return None
+        i0, j0, i1, j1 = cells
+        keys = [(i, j) for i in range(i0, i1 + 1) for j in range(j0, j1 + 1)]
+        Cells = self._Cells
+        for key in keys:
+            try:
+                Cells[key].add(obj)
+            except KeyError:
+                Cells[key] = {obj}
+        return keys
+
+    def _Unplace(self, obj, keys):
+        """Remove obj from the cells it was put in."""
+        if keys is None:
+            self._Large.discard(obj)
+            return
+        Cells = self._Cells
+        for key in keys:
+            cell = Cells[key]
+            cell.discard(obj)
+            if not cell:
+                del Cells[key]
+
+    def _NeedsRebuild(self):
+        n = len(self._Entries)
+        return (self._Size is None or
+                (n > 64 and not (self._BuiltCount // 4 <= n <= self._BuiltCount * 4)))
+
+    def _Build(self):
+        """(Re)compute the grid and put all the objects into it."""
+        objects = sorted(self._Entries, key=lambda obj: self._Entries[obj][0])
+        self._Cells = {}
+        self._Large = set()
+        BBs = [obj.BoundingBox for obj in objects]
+        BBs = np.array(BBs, float).reshape(-1, 2, 2) if BBs else np.zeros((0, 2, 2))
+        finite = np.isfinite(BBs).all(axis=(1, 2))
+        if finite.any():
+            BBs = BBs[finite]
+            Min = BBs[:, 0, :].min(0)
+            Max = BBs[:, 1, :].max(0)
+            self._Origin = (float(Min[0]), float(Min[1]))
+            if self.CellSize is not None:
+                self._Size = float(self.CellSize)
+            else:
+                # aim for a few objects per cell, but don't make the cells
+                # much smaller than the objects themselves.
+                extent = Max - Min
+                area = max(extent[0] * extent[1], 0.0)
+                size = math.sqrt(area / len(BBs)) * 2 if area > 0 else max(extent)
+                typical = np.median(np.maximum(BBs[:, 1, 0] - BBs[:, 0, 0],
+                                               BBs[:, 1, 1] - BBs[:, 0, 1]))
+                size = max(size, typical)
+                self._Size = float(size) if size > 0 else 1.0
+        else:
+            self._Origin = (0.0, 0.0)
+            self._Size = float(self.CellSize) if self.CellSize else 1.0
+        for obj in objects:
+            self._Entries[obj][1] = self._Place(obj)
+        self._BuiltCount = len(objects)
+
+    def Insert(self, obj):
+        """
+        Add an object to the index, after all the objects already in it.
+
+        :param DrawObject `obj`: the object to add
+
+        """
+        if obj in self._Entries:
+            self.Remove(obj)
+        keys = self._Place(obj) if self._Size is not None else ()
+        self._Entries[obj] = [self._NextSeq, keys]
+        self._NextSeq += 1
+
+    def Remove(self, obj):
+        """
+        Remove an object from the index.
+
+        :param DrawObject `obj`: the object to remove, objects that are not
+         in the index are ignored.
+
+        """
+        entry = self._Entries.pop(obj, None)
+        if entry is not None and self._Size is not None:
+            self._Unplace(obj, entry[1])
+
+    def Update(self, obj):
+        """
+        Update the index for an object whose bounding box has changed,
+        keeping its position in the drawing order.
+
+        :param DrawObject `obj`: the object that changed, objects that are
+         not in the index are ignored.
+
+        """
+        entry = self._Entries.get(obj)
+        if entry is not None and self._Size is not None:
+            self._Unplace(obj, entry[1])
+            entry[1] = self._Place(obj)
+
+    def Rebuild(self, objects=None):
+        """
+        Rebuild the index.
+
+        :param list `objects`: if given, the index is reset to hold these
+         objects, in this order. Otherwise the objects already in the index
+         are re-indexed with their current bounding boxes.
+
+        """
+        if objects is not None:
+            self.Clear()
+            for seq, obj in enumerate(objects):
+                self._Entries[obj] = [seq, ()]
+            self._NextSeq = len(self._Entries)
+        self._Build()
+
+    def Query(self, BB):
+        """
+        Returns the objects whose bounding box overlaps BB, in the order
+        they were inserted.
+
+        :param `BB`: a bounding box, or any 2x2 array of
+         ((MinX, MinY), (MaxX, MaxY))
+
+        """
+        if self._NeedsRebuild():
+            self._Build()
+        BB = np.asarray(BB, float)
+        cells = self._CellRange(BB)
+        if cells is None or (cells[2] - cells[0] + 1) * (cells[3] - cells[1] + 1) >= len(self._Cells):
+            # the query covers most of the grid, so just check everything
+            candidates = self._Entries.keys()
+        else:
+            i0, j0, i1, j1 = cells
+            candidates = set(self._Large)
+            Cells = self._Cells
+            for i in range(i0, i1 + 1):
+                for j in range(j0, j1 + 1):
+                    cell = Cells.get((i, j))
+                    if cell:
+                        candidates.update(cell)
+        Entries = self._Entries
+        found = [obj for obj in candidates if obj.BoundingBox.Overlaps(BB)]
+        found.sort(key=lambda obj: Entries[obj][0])
+        return found
@@ -18,10 +18,16 @@ Description
 ===========
 
 This module contains a collection of functions for simple image manipulations.
-The 2 functions defined here (:func:`grayOut`, :func:`makeGray` and :func:`stepColour`)
+The functions defined here (:func:`grayOut`, :func:`makeGray` and :func:`stepColour`)
 can be used to convert a given image into a grey-scale representation and to
 darken/lighten a specific wxPython :class:`wx.Colour`.
 
+:func:`tintImage`, :func:`brightenImage`, :func:`blendAlpha` and the more general
+:func:`mapChannels` work on a whole :class:`wx.Image` at once. They operate on the
+image buffers directly, using NumPy when it is installed and byte translation
+tables otherwise, so no Python code runs per pixel. Pixels matching the image
+mask colour are left unchanged.
+
 
 Usage
 =====
@@ -44,6 +50,9 @@ Sample usage::
     # Lighter
     light_colour = stepColour(colour, 120)
 
+    # Tinted with 30% blue
+    tinted_bmp = wx.Bitmap(tintImage(bmp.ConvertToImage(), wx.BLUE, 0.3))
+
     app.MainLoop()
 
 """
@@ -51,6 +60,153 @@ Sample usage::
 
 import wx
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def mapChannels(anImage, red, green=None, blue=None):
+    """
+    Replace (in place) every red, green and blue value of the image by its
+    entry in a lookup table. Pixels matching the mask colour are not changed.
+
+    :param wx.Image `anImage`: the image we want to modify;
+    :param `red`: a sequence of 256 integers (or a 256 bytes object) giving the
+     new value of each red value;
+    :param `green`: the table for the green values, or ``None`` to use `red`;
+    :param `blue`: the table for the blue values, or ``None`` to use `red`.
+
+    :rtype: :class:`wx.Image`
+    :returns: The modified image.
+    """
+
+    if green is None:
+        green = red
+    if blue is None:
+        blue = red
+
+    tables = [bytes(bytearray(table)) for table in (red, green, blue)]
+    for table in tables:
+        if len(table) != 256:
+            raise ValueError("Lookup tables must have 256 entries")
+
+    if anImage.HasMask():
+        maskColor = (anImage.GetMaskRed(), anImage.GetMaskGreen(), anImage.GetMaskBlue())
+    else:
+        maskColor = None
+
+    buf = anImage.GetDataBuffer()
+
+    if np is not None:
+        pixels = np.frombuffer(buf, np.uint8).reshape(-1, 3)
+        mapped = np.empty_like(pixels)
+        for c, table in enumerate(tables):
+            mapped[:, c] = np.frombuffer(table, np.uint8)[pixels[:, c]]
+        if maskColor is not None:
+            keep = (pixels == maskColor).all(axis=1)
+            mapped[keep] = pixels[keep]
+        pixels[...] = mapped
+        return anImage
+
+    data = bytes(buf)
+    channels = [data[c::3] for c in range(3)]
+    mapped = [channel.translate(table) for channel, table in zip(channels, tables)]
+
+    if maskColor is not None:
+        # Work on each channel as one big integer: a byte of 'keep' is 0xff
+        # where the pixel has the mask colour and 0 elsewhere
+        keep = -1
+        for channel, value in zip(channels, maskColor):
+            equal = bytes(bytearray(255 if i == value else 0 for i in range(256)))
+            keep &= int.from_bytes(channel.translate(equal), 'big')
+        if keep:
+            size = len(channels[0])
+            for c in range(3):
+                new = int.from_bytes(mapped[c], 'big') & ~keep
+                old = int.from_bytes(channels[c], 'big') & keep
+                mapped[c] = (new | old).to_bytes(size, 'big')
+
+    data = bytearray(len(data))
+    for c in range(3):
+        data[c::3] = mapped[c]
+    buf[:] = data
+    return anImage
+
+
+def tintImage(anImage, colour, amount):
+    """
+    Blend (in place) every pixel of the image with the given colour.
+
+    :param wx.Image `anImage`: the image we want to tint;
+    :param wx.Colour `colour`: the tint colour;
+    :param float `amount`: how much of the tint colour to use, between 0 (the
+     image is not changed) and 1 (every pixel becomes `colour`).
+
+    :rtype: :class:`wx.Image`
+    :returns: The modified (tinted) image.
+    """
+
+    tables = []
+    for value in (colour.Red(), colour.Green(), colour.Blue()):
+        tables.append([int(min(max(x + (value - x)*amount, 0), 255)) for x in range(256)])
+
+    return mapChannels(anImage, *tables)
+
+
+def brightenImage(anImage, step):
+    """
+    Darken or lighten (in place) every pixel of the image, in the same way
+    :func:`stepColour` does for a single colour.
+
+    :param wx.Image `anImage`: the image we want to modify;
+    :param integer `step`: the step value, 0 is completely black, 200 is totally
+     white and 100 leaves the image unchanged.
+
+    :rtype: :class:`wx.Image`
+    :returns: The modified image.
+    """
+
+    if step == 100:
+        return anImage
+
+    step = min(step, 200)
+    step = max(step, 0)
+    dstep = (step - 100.0)/100.0
+
+    if step > 100:
+        bg = 255.0
+        dstep = 1.0 - dstep
+    else:
+        bg = 0.0
+        dstep = 1.0 + dstep
+
+    table = [int(min(max(bg + dstep*(x - bg), 0), 255)) for x in range(256)]
+    return mapChannels(anImage, table)
+
+
+def blendAlpha(anImage, opacity):
+    """
+    Scale (in place) the alpha channel of the image, so that it is blended
+    with the background when drawn. An alpha channel is added if needed.
+
+    :param wx.Image `anImage`: the image we want to fade;
+    :param float `opacity`: 0 is fully transparent and 1 leaves the image
+     unchanged.
+
+    :rtype: :class:`wx.Image`
+    :returns: The modified image.
+    """
+
+    if not anImage.HasAlpha():
+        anImage.InitAlpha()
+
+    table = bytes(bytearray(int(a*opacity) for a in range(256)))
+    buf = anImage.GetAlphaBuffer()
+    buf[:] = bytes(buf).translate(table)
+    return anImage
+
+
 def grayOut(anImage):
     """
     Convert the given image (in place) to a grayed-out
@@ -67,25 +223,9 @@ def grayOut(anImage):
     """
 
     factor = 0.7        # 0 < f < 1.  Higher is grayer.
-    if anImage.HasMask():
-        maskColor = (anImage.GetMaskRed(), anImage.GetMaskGreen(), anImage.GetMaskBlue())
-    else:
-        maskColor = None
-    if anImage.HasAlpha():
-        alpha = anImage.GetAlpha()
-    else:
-        alpha = None
-
-    data = anImage.GetData()
-
-    for i in range(0, len(data), 3):
-        pixel = (data[i], data[i+1], data[i+2])
-        pixel = makeGray(pixel, factor, maskColor)
-        for x in range(3):
-            data[i+x] = pixel[x]
-    anImage.SetData(data)  # ''.join(map(chr, data)))
-    if alpha:
-        anImage.SetAlpha(alpha)
+
+    # makeGray works on each channel separately, so it reduces to a lookup table
+    return mapChannels(anImage, [int((230 - x)*factor) + x for x in range(256)])
 
 
 def makeGray(rgb, factor, maskColor):
@@ -528,6 +528,7 @@ class Shape(ShapeEvtHandler):
             self.Draw(dc)
         else:
             self._shadowMode = mode
+        self.UpdateBounds()
 
     def GetShadowMode(self):
         """Get the current shadow mode setting."""
@@ -668,6 +669,32 @@ class Shape(ShapeEvtHandler):
             return nearest_attachment, nearest
         return False
 
+    def GetHitTestBounds(self):
+        """
+        Return the rectangle outside which :meth:`HitTest` always fails, as
+        a (left, top, right, bottom) tuple, or None if the shape must always
+        be tested.
+
+        The diagram uses this to index its shapes. Override it together with
+        :meth:`HitTest` if the shape can be hit outside its bounding box.
+        """
+        width, height = self.GetBoundingBoxMax()
+        width = max(abs(width), 4.0) + 4
+        height = max(abs(height), 4.0) + 4
+
+        return (self._xpos - width / 2.0, self._ypos - height / 2.0,
+                self._xpos + width / 2.0, self._ypos + height / 2.0)
+
+    def UpdateBounds(self):
+        """
+        Tell the diagram that the position or size of the shape has changed.
+
+        This is done by :meth:`Move` and :meth:`SetSize`; call it after changing
+        the geometry of the shape by other means.
+        """
+        if self._canvas and self._canvas.GetDiagram():
+            self._canvas.GetDiagram().UpdateShapeBounds(self)
+
     # Format a text string according to the region size, adding
     # strings with positions to region text list
 
@@ -1418,6 +1445,7 @@ class Shape(ShapeEvtHandler):
             self.Draw(dc)
 
         self.MoveLinks(dc)
+        self.UpdateBounds()
 
         self.GetEventHandler().OnMovePost(dc, x, y, old_x, old_y, display)
 
@@ -1495,6 +1523,7 @@ class Shape(ShapeEvtHandler):
         """
         self.SetAttachmentSize(x, y)
         self.SetDefaultRegionSize()
+        self.UpdateBounds()
 
     def SetAttachmentSize(self, w, h):
         """
@@ -2295,6 +2324,7 @@ class Shape(ShapeEvtHandler):
         :param `x`: the x position
         """
         self._xpos = x
+        self.UpdateBounds()
 
     def SetY(self, y):
         """
@@ -2304,6 +2334,7 @@ class Shape(ShapeEvtHandler):
 
         """
         self._ypos = y
+        self.UpdateBounds()
 
     def GetParent(self):
         """Get the parent of this shape, if it is part of a composite."""
@@ -2790,6 +2821,7 @@ class RectangleShape(Shape):
         self._width = max(x, 1)
         self._height = max(y, 1)
         self.SetDefaultRegionSize()
+        self.UpdateBounds()
 
     def GetCornerRadius(self):
         """Get the radius of the rectangle's rounded corners."""
@@ -2953,6 +2985,18 @@ class PolygonShape(Shape):
 
         self._boundWidth = right - left
         self._boundHeight = bottom - top
+        self.UpdateBounds()
+
+    def GetHitTestBounds(self):
+        """Return the bounds of the polygon vertices."""
+        if not self._points:
+            return None
+
+        xs = [point[0] for point in self._points]
+        ys = [point[1] for point in self._points]
+
+        return (self._xpos + min(xs) - 1, self._ypos + min(ys) - 1,
+                self._xpos + max(xs) + 1, self._ypos + max(ys) + 1)
 
     def CalculatePolygonCentre(self):
         """
@@ -3060,6 +3104,7 @@ class PolygonShape(Shape):
         self._boundWidth = abs(new_width)
         self._boundHeight = abs(new_height)
         self.SetDefaultRegionSize()
+        self.UpdateBounds()
 
     # Make the original points the same as the working points
     def UpdateOriginalPoints(self):
@@ -3459,6 +3504,7 @@ class EllipseShape(Shape):
         self._width = x
         self._height = y
         self.SetDefaultRegionSize()
+        self.UpdateBounds()
 
     def GetNumberOfAttachments(self):
         """Get number of attachments."""
@@ -3875,6 +3921,13 @@ class ControlPoint(RectangleShape):
         """not implemented???"""
         pass
 
+    def GetHitTestBounds(self):
+        """
+        Control points follow their shape and only take its position when
+        they are drawn, so they are never indexed.
+        """
+        return None
+
     def OnDraw(self, dc):
         """The draw handler."""
         self._xpos = self._shape.GetX() + self._xoffset
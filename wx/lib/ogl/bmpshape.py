@@ -54,6 +54,7 @@ class BitmapShape(RectangleShape):
         self._height = h
 
         self.SetDefaultRegionSize()
+        self.UpdateBounds()
 
     def GetBitmap(self):
         """Get the associated bitmap."""
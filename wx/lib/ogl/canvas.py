@@ -338,8 +338,10 @@ class ShapeCanvas(wx.ScrolledWindow):
         # (a) to have the control points drawn LAST to overlay
         #     the other objects
         # (b) to find the control points FIRST if they exist
+        # Only the shapes near the point, as found by the diagram's
+        # spatial index, can be hit.
 
-        rl = self.GetDiagram().GetShapeList()[:]
+        rl = self.GetDiagram().GetShapesInRect(x, y, x, y)
         rl.reverse()
         for object in rl:
             # First pass for lines, which might be inside a container, so we
@@ -421,9 +423,16 @@ class ShapeCanvas(wx.ScrolledWindow):
         """Get quick edit mode."""
         return self.GetDiagram().GetQuickEditMode()
 
-    def Redraw(self, dc):
-        """Redraw the diagram."""
-        self.GetDiagram().Redraw(dc)
+    def Redraw(self, dc, rect = None):
+        """
+        Redraw the diagram.
+
+        :param `dc`: the device context
+        :param `rect`: if not None, only redraw the shapes near this
+         :class:`wx.Rect`, see :meth:`~lib.ogl.Diagram.Redraw`
+
+        """
+        self.GetDiagram().Redraw(dc, rect)
 
     def Snap(self, x, y):
         """Snap ???
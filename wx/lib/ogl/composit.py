@@ -553,6 +553,7 @@ class CompositeShape(RectangleShape):
 
         self._width = w
         self._height = h
+        self.UpdateBounds()
 
         if not recursive:
             return
@@ -745,6 +746,7 @@ class CompositeShape(RectangleShape):
         self._height = maxY - minY
         self._xpos = self._width / 2.0 + minX
         self._ypos = self._height / 2.0 + minY
+        self.UpdateBounds()
 
     def Recompute(self):
         """
@@ -1196,6 +1198,7 @@ class DivisionShape(CompositeShape):
 
         self._xpos, self._ypos = self._canvas.Snap(self._xpos, self._ypos)
         self.GetEventHandler().OnMovePre(dc, x, y, self._oldX, self._oldY)
+        self.UpdateBounds()
 
         self.ResetControlPoints()
         self.Draw(dc)
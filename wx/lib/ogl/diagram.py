@@ -13,10 +13,19 @@
 """
 The :class:`~lib.ogl.diagram.Diagram` class.
 """
+import math
+
 import wx
 
 DEFAULT_MOUSE_TOLERANCE = 3
 
+# Size of the cells of the grid used to find the shapes near a point
+SPATIAL_INDEX_CELL_SIZE = 64.0
+# Shapes covering more cells than this are not indexed but always tested
+SPATIAL_INDEX_MAX_CELLS = 1024
+# Extra space around the damaged rectangle when redrawing part of a diagram
+REDRAW_MARGIN = 16
+
 
 class Diagram(object):
     """
@@ -35,10 +44,31 @@ class Diagram(object):
         self._shapeList = []
         self._mouseTolerance = DEFAULT_MOUSE_TOLERANCE
 
-    def Redraw(self, dc):
-        """Redraw the shapes in the diagram on the specified device context."""
+        # Spatial index: grid cell -> set of shapes, shape -> its cells
+        # (None for the shapes that are always tested) and shape -> position
+        # in the shape list
+        self._shapeIndex = None
+        self._shapeCells = {}
+        self._unindexedShapes = set()
+        self._shapeOrder = None
+
+    def Redraw(self, dc, rect = None):
+        """
+        Redraw the shapes in the diagram on the specified device context.
+
+        :param `dc`: the device context
+        :param `rect`: if not None, a :class:`wx.Rect` in logical coordinates;
+         only the shapes near it are drawn
+
+        """
         if self._shapeList:
-            for object in self._shapeList:
+            if rect is None:
+                shapes = self._shapeList
+            else:
+                shapes = self.GetShapesInRect(rect.x - REDRAW_MARGIN, rect.y - REDRAW_MARGIN,
+                                              rect.x + rect.width + REDRAW_MARGIN,
+                                              rect.y + rect.height + REDRAW_MARGIN)
+            for object in shapes:
                 object.Draw(dc)
 
     def Clear(self, dc):
@@ -61,6 +91,9 @@ class Diagram(object):
                 self._shapeList.append(object)
 
             object.SetCanvas(self.GetCanvas())
+            self._shapeOrder = None
+            if self._shapeIndex is not None:
+                self._IndexShape(object)
 
     def InsertShape(self, object):
         """
@@ -70,6 +103,10 @@ class Diagram(object):
 
         """
         self._shapeList.insert(0, object)
+        self._shapeOrder = None
+        if self._shapeIndex is not None:
+            self._UnindexShape(object)
+            self._IndexShape(object)
 
     def RemoveShape(self, object):
         """
@@ -81,10 +118,121 @@ class Diagram(object):
         """
         if object in self._shapeList:
             self._shapeList.remove(object)
+            self._shapeOrder = None
+            if self._shapeIndex is not None:
+                self._UnindexShape(object)
 
     def RemoveAllShapes(self):
         """Remove all shapes from the diagram but do not delete the shapes."""
         self._shapeList = []
+        self._shapeIndex = None
+        self._shapeOrder = None
+
+    def UpdateShapeBounds(self, shape = None):
+        """
+        Update the spatial index after the geometry of a shape has changed.
+
+        Shapes call this themselves when they are moved or resized; call it
+        after changing the geometry of a shape by other means.
+
+        :param `shape`: the :class:`~lib.ogl.Shape` that changed, or None to
+         rebuild the whole index the next time it is needed
+
+        """
+        if self._shapeIndex is None:
+            return
+        if shape is None:
+            self._shapeIndex = None
+        elif shape in self._shapeCells:
+            self._UnindexShape(shape)
+            self._IndexShape(shape)
+
+    def GetShapesInRect(self, x1, y1, x2, y2):
+        """
+        Return the shapes that may lie in the given rectangle, in the order
+        of the shape list.
+
+        The result is found with a grid over the shape bounds returned by
+        :meth:`~lib.ogl.Shape.GetHitTestBounds`, so it may include shapes
+        just outside the rectangle.
+
+        :param `x1`: the left position
+        :param `y1`: the top position
+        :param `x2`: the right position
+        :param `y2`: the bottom position
+
+        """
+        if self._shapeIndex is None or len(self._shapeCells) != len(self._shapeList):
+            self._shapeIndex = {}
+            self._shapeCells = {}
+            self._unindexedShapes = set()
+            for shape in self._shapeList:
+                self._IndexShape(shape)
+
+        left, top, right, bottom = self._GetCells(x1, y1, x2, y2)
+
+        found = set(self._unindexedShapes)
+        index = self._shapeIndex
+        if (right - left + 1) * (bottom - top + 1) > len(index):
+            for cell, shapes in index.items():
+                if left <= cell[0] <= right and top <= cell[1] <= bottom:
+                    found.update(shapes)
+        else:
+            for cx in range(left, right + 1):
+                for cy in range(top, bottom + 1):
+                    if (cx, cy) in index:
+                        found.update(index[cx, cy])
+
+        # The shape list may have been reordered through GetShapeList
+        order = self._shapeOrder
+        if order is not None:
+            for shape in found:
+                pos = order.get(shape)
+                if pos is None or pos >= len(self._shapeList) or self._shapeList[pos] is not shape:
+                    order = None
+                    break
+
+        if order is None:
+            order = self._shapeOrder = dict((shape, pos) for pos, shape in enumerate(self._shapeList))
+
+        return sorted([shape for shape in found if shape in order], key=order.__getitem__)
+
+    def _GetCells(self, x1, y1, x2, y2):
+        """Return the range of grid cells covered by a rectangle."""
+        size = SPATIAL_INDEX_CELL_SIZE
+        return (int(math.floor(min(x1, x2) / size)), int(math.floor(min(y1, y2) / size)),
+                int(math.floor(max(x1, x2) / size)), int(math.floor(max(y1, y2) / size)))
+
+    def _IndexShape(self, shape):
+        """Add a shape to the spatial index."""
+        cells = None
+        bounds = shape.GetHitTestBounds()
+        if bounds is not None:
+            left, top, right, bottom = self._GetCells(*bounds)
+            if (right - left + 1) * (bottom - top + 1) <= SPATIAL_INDEX_MAX_CELLS:
+                cells = [(cx, cy) for cx in range(left, right + 1) for cy in range(top, bottom + 1)]
+
+        if cells is None:
+            self._unindexedShapes.add(shape)
+        else:
+            for cell in cells:
+                self._shapeIndex.setdefault(cell, set()).add(shape)
+        self._shapeCells[shape] = cells
+
+    def _UnindexShape(self, shape):
+        """Remove a shape from the spatial index."""
+        if shape not in self._shapeCells:
+            return
+
+        cells = self._shapeCells.pop(shape)
+        if cells is None:
+            self._unindexedShapes.discard(shape)
+        else:
+            for cell in cells:
+                shapes = self._shapeIndex[cell]
+                shapes.discard(shape)
+                if not shapes:
+                    del self._shapeIndex[cell]
 
     def DeleteAllShapes(self):
         """Remove and delete all shapes in the diagram."""
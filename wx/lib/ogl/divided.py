@@ -248,6 +248,7 @@ class DividedShape(RectangleShape):
         self._width = w
         self._height = h
         self.SetRegionSizes()
+        self.UpdateBounds()
 
     def SetRegionSizes(self):
         """
@@ -673,6 +673,7 @@ class DrawnShape(RectangleShape):
         self._width = w
         self._height = h
         self.SetDefaultRegionSize()
+        self.UpdateBounds()
 
     def Scale(self, sx, sy):
         """Scale the shape by the given amount."""
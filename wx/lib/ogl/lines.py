@@ -415,6 +415,7 @@ class LineShape(Shape):
         # pi: added _initialised to keep track of when we have set
         # the middle points to something other than (-999, -999)
         self._initialised = False
+        self.UpdateBounds()
 
     def InsertLineControlPoint(self, dc = None, point = None):
         """
@@ -438,6 +439,7 @@ class LineShape(Shape):
 
         point = wx.RealPoint(line_x, line_y)
         self._lineControlPoints.insert(len(self._lineControlPoints)-1, point)
+        self.UpdateBounds()
 
     def DeleteLineControlPoint(self):
         """Delete an arbitrary point on the line."""
@@ -445,6 +447,7 @@ class LineShape(Shape):
             return False
 
         del self._lineControlPoints[-2]
+        self.UpdateBounds()
         return True
 
     def Initialise(self):
@@ -475,6 +478,7 @@ class LineShape(Shape):
                         y1 = last_point[1]
                     self._lineControlPoints[i] = wx.RealPoint((x2 - x1) / 2.0 + x1, (y2 - y1) / 2.0 + y1)
             self._initialised = True
+            self.UpdateBounds()
 
     def FormatText(self, dc, s, i):
         """
@@ -526,6 +530,7 @@ class LineShape(Shape):
 
         CentreText(dc, region.GetFormattedText(), self._xpos, self._ypos, actualW, actualH, region.GetFormatMode())
         self._formatted = True
+        self.UpdateBounds()
 
     def DrawRegion(self, dc, region, x, y):
         """
@@ -633,6 +638,8 @@ class LineShape(Shape):
         for i in range(len(self._lineControlPoints) - 2):
             GraphicsStraightenLine(self._lineControlPoints[i], self._lineControlPoints[i + 1])
 
+        self.UpdateBounds()
+
         if dc:
             self.Draw(dc)
 
@@ -672,6 +679,7 @@ class LineShape(Shape):
         # Find centre point
         self._xpos = (x1 + x2) / 2.0
         self._ypos = (y1 + y2) / 2.0
+        self.UpdateBounds()
 
     # Get absolute positions of ends
     def GetEnds(self):
@@ -745,6 +753,35 @@ class LineShape(Shape):
 
         return False
 
+    def GetHitTestBounds(self):
+        """Return the bounds of the line segments and of the labels."""
+        if not self._lineControlPoints:
+            return None
+
+        xs = [point[0] for point in self._lineControlPoints]
+        ys = [point[1] for point in self._lineControlPoints]
+
+        # Same corridor as in HitTest
+        extra = 4
+        left, top = min(xs) - extra, min(ys) - extra
+        right, bottom = max(xs) + extra, max(ys) + extra
+
+        for i in range(min(3, len(self._regions))):
+            region = self._regions[i]
+            if region and len(region._formattedText):
+                xp, yp = self.GetLabelPosition(i)
+                cx, cy = region.GetPosition()
+                cw, ch = region.GetSize()
+                cx += xp
+                cy += yp
+
+                left = min(left, cx - cw / 2.0)
+                top = min(top, cy - ch / 2.0)
+                right = max(right, cx + cw / 2.0)
+                bottom = max(bottom, cy + ch / 2.0)
+
+        return left, top, right, bottom
+
     def DrawArrows(self, dc):
         """Draw all arrows."""
         # Distance along line of each arrow: space them out evenly
@@ -1797,6 +1834,7 @@ class LineShape(Shape):
         # Set the region's offset, relative to the default position for
         # each region.
         labelShape._shapeRegion.SetPosition(x - xx, y - yy)
+        self.UpdateBounds()
         labelShape.SetX(x)
         labelShape.SetY(y)
 
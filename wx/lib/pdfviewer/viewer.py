@@ -27,12 +27,18 @@ import bisect
 import itertools
 import copy
 import shutil
+import threading
+from collections import OrderedDict
 from io import BytesIO
 
 import wx
 
 VERBOSE = True
 
+PAGE_CACHE_SIZE = 64 * 1024 * 1024  # memory cap of the rendered page cache (bytes)
+PRERENDER_PAGES = 2                 # pages rendered in advance above and below the view
+PLACEHOLDER_SCALE = 0.25            # relative resolution of the placeholder pages
+
 try:
     # see http://pythonhosted.org/PyMuPDF - documentation & installation
     try:
@@ -130,6 +136,7 @@ class pdfViewer(wx.ScrolledWindow):
         self.Bind(wx.EVT_SIZE, self.OnResize)
         self.Bind(wx.EVT_SCROLLWIN, self.OnScroll)
         self.Bind(wx.EVT_IDLE, self.OnIdle)
+        self.Bind(wx.EVT_WINDOW_DESTROY, self.OnDestroy)
         self.have_file = False
         self.resizing = False
         self.numpages = None
@@ -165,6 +172,23 @@ class pdfViewer(wx.ScrolledWindow):
         wx.CallAfter(self.Render)
         event.Skip()
 
+    def OnDestroy(self, event):
+        """
+        Stop the background page rendering, if any.
+        """
+        if event.GetEventObject() is self and hasattr(self, 'pdfdoc') and mupdf:
+            self.pdfdoc.Stop()
+        event.Skip()
+
+    def OnPageRendered(self, pageno, scale):
+        """
+        Redraw when a page rendered in the background is part of the current view.
+        """
+        if (self.have_file and self.cur_frompage <= pageno <= self.cur_topage and
+                self.scales[pageno] == scale):
+            self.page_buffer_valid = False
+            self.Render()
+
     def OnPaint(self, event):
         """
         Refresh visible window with bitmap contents.
@@ -205,6 +229,8 @@ class pdfViewer(wx.ScrolledWindow):
             # remove comment from next line to test using a file-like object
             # pdf_file = create_fileobject(pdf_file)
         if mupdf:
+            if hasattr(self, 'pdfdoc'):     # stop rendering the previous file
+                self.pdfdoc.Stop()
             self.pdfdoc = mupdfProcessor(self, pdf_file)
         else:
             self.pdfdoc = pypdfProcessor(self, pdf_file, self.ShowLoadProgress)
@@ -429,6 +455,9 @@ class pdfViewer(wx.ScrolledWindow):
         only when client view moves outside it.
         With PyPDF2, use gc.Translate to render each page wrt the pdf origin,
         which is at the bottom left corner of the page.
+        With PyMuPDF, pages are drawn from a cache of page bitmaps. Missing pages
+        are shown at low resolution while a background thread renders them at full
+        resolution, together with the pages adjacent to the visible ones.
         """
         if not self.have_file:
             return
@@ -458,13 +487,14 @@ class pdfViewer(wx.ScrolledWindow):
                 gc.PushState()
                 if mupdf:
                     gc.Translate(self.xpageoffset, self.ypageoffset)
-                    # scaling is done inside RenderPage
+                    # scaling is done when the page bitmap is rendered
+                    self.pdfdoc.DrawCachedPage(gc, pageno, scale)
                 else:
 
                     gc.Translate(self.xpageoffset, self.ypageoffset +
                                     self.pagesizes[pageno][1]*scale)
                     gc.Scale(scale, scale)
-                self.pdfdoc.RenderPage(gc, pageno, scale=scale)
+                    self.pdfdoc.RenderPage(gc, pageno, scale=scale)
                 
                 # Show non-page areas as gray
                 gc.PushState()
@@ -484,6 +514,9 @@ class pdfViewer(wx.ScrolledWindow):
         
                 gc.PopState() # Pop page area
 
+            if mupdf:
+                self.pdfdoc.SchedulePages(self.frompage, self.topage, self.scales)
+
         self.page_buffer_valid = True
         self.Refresh(0) # Blit appropriate area of new or existing page buffer to screen
 
@@ -526,14 +559,22 @@ class mupdfProcessor(object):
             self.numpages = self.pdfdoc.pageCount
 
         self.zoom_error = False     #set if memory errors during render
+        self.pagecache = pdfPageCache()
+        # the document is not thread safe, so all access to it is serialized
+        self.lock = threading.Lock()
+        self.condition = threading.Condition()
+        self.requests = []          # (pageno, scale) pages to render in background
+        self.thread = None
+        self.stopped = False
         
     def GetPageSize(self, pageNum):
         """ Return width, height for the page """
-        try:
-            page = self.pdfdoc.load_page(pageNum)
-        except AttributeError: # old PyMuPDF version
-            page = self.pdfdoc.loadPage(pageNum)
-        bound = page.bound()
+        with self.lock:
+            try:
+                page = self.pdfdoc.load_page(pageNum)
+            except AttributeError: # old PyMuPDF version
+                page = self.pdfdoc.loadPage(pageNum)
+            bound = page.bound()
         return bound.width, bound.height
         
     def DrawFile(self, frompage, topage):
@@ -543,29 +584,173 @@ class mupdfProcessor(object):
         """
         self.parent.GoPage(frompage)
 
-    def RenderPage(self, gc, pageno, scale=1.0):
-        " Render the set of pagedrawings into gc for specified page "
+    def RenderPixmap(self, pageno, scale):
+        """
+        Render the specified page and return its width, height and RGB data.
+        Must be called with self.lock held; may be called from any thread.
+        """
         try:
             page = self.pdfdoc.load_page(pageno)
         except AttributeError: # old PyMuPDF version
             page = self.pdfdoc.loadPage(pageno)
         matrix = pymupdf.Matrix(scale, scale)
         try:
-            try:
-                # MUST be keyword arg(s)
-                pix = page.get_pixmap(matrix=matrix, alpha=False)
-            except AttributeError: # old PyMuPDF version
-                pix = page.getPixmap(matrix=matrix, alpha=False)
-            bmp = wx.Bitmap.FromBuffer(pix.width, pix.height, pix.samples)
-            gc.DrawBitmap(bmp, 0, 0, pix.width, pix.height)
+            # MUST be keyword arg(s)
+            pix = page.get_pixmap(matrix=matrix, alpha=False)
+        except AttributeError: # old PyMuPDF version
+            pix = page.getPixmap(matrix=matrix, alpha=False)
+        return pix.width, pix.height, pix.samples
+
+    def RenderPage(self, gc, pageno, scale=1.0):
+        " Render the set of pagedrawings into gc for specified page "
+        try:
+            with self.lock:
+                width, height, samples = self.RenderPixmap(pageno, scale)
+            bmp = wx.Bitmap.FromBuffer(width, height, samples)
+            gc.DrawBitmap(bmp, 0, 0, width, height)
             self.zoom_error = False
         except (RuntimeError, MemoryError):
-            if not self.zoom_error:     # report once only
-                self.zoom_error = True
-                dlg = wx.MessageDialog(self.parent, 'Out of memory. Zoom level too high?',
-                              'pdf viewer' , wx.OK |wx.ICON_EXCLAMATION)
-                dlg.ShowModal()
-                dlg.Destroy()
+            self.ReportZoomError()
+
+    def ReportZoomError(self):
+        " Tell the user that a page could not be rendered "
+        if not self.zoom_error and not self.stopped:     # report once only
+            self.zoom_error = True
+            dlg = wx.MessageDialog(self.parent, 'Out of memory. Zoom level too high?',
+                          'pdf viewer' , wx.OK |wx.ICON_EXCLAMATION)
+            dlg.ShowModal()
+            dlg.Destroy()
+
+    def DrawCachedPage(self, gc, pageno, scale):
+        """
+        Draw the specified page into gc from the page cache. If the page has not
+        been rendered at this scale yet, draw it from a lower resolution bitmap,
+        scaled up, until the background thread has rendered it (see SchedulePages).
+        """
+        bmp = self.pagecache.Get(pageno, scale)
+        if bmp is not None:
+            gc.DrawBitmap(bmp, 0, 0, bmp.GetWidth(), bmp.GetHeight())
+            return
+
+        bmp = self.pagecache.GetPlaceholder(pageno)
+        # don't wait for the background thread, the page will be drawn when it is done
+        if bmp is None and self.lock.acquire(False):
+            lowscale = scale * PLACEHOLDER_SCALE
+            try:
+                width, height, samples = self.RenderPixmap(pageno, lowscale)
+                bmp = wx.Bitmap.FromBuffer(width, height, samples)
+                self.pagecache.Put(pageno, lowscale, bmp)
+            except (RuntimeError, MemoryError):
+                pass
+            finally:
+                self.lock.release()
+        if bmp is not None:
+            width, height = self.parent.pagesizes[pageno]
+            gc.DrawBitmap(bmp, 0, 0, width*scale, height*scale)
+
+    def SchedulePages(self, frompage, topage, scales):
+        """
+        Queue the visible pages that are not in the page cache for rendering in
+        the background, followed by the PRERENDER_PAGES pages below and above them.
+        Pages queued for a previous view and not rendered yet are dropped.
+        """
+        pagenos = list(range(frompage, topage+1))
+        for n in range(1, PRERENDER_PAGES+1):
+            pagenos.extend(p for p in (topage+n, frompage-n) if 0 <= p < self.numpages)
+        requests = [(p, scales[p]) for p in pagenos
+                    if self.pagecache.Get(p, scales[p]) is None]
+        with self.condition:
+            if self.stopped:
+                return
+            self.requests = requests
+            if requests and self.thread is None:
+                self.thread = threading.Thread(target=self.RenderLoop)
+                self.thread.daemon = True
+                self.thread.start()
+            self.condition.notify()
+
+    def RenderLoop(self):
+        " Background thread rendering the queued pages "
+        while True:
+            with self.condition:
+                while not self.requests and not self.stopped:
+                    self.condition.wait()
+                if self.stopped:
+                    return
+                pageno, scale = self.requests.pop(0)
+            try:
+                with self.lock:
+                    width, height, samples = self.RenderPixmap(pageno, scale)
+            except (RuntimeError, MemoryError):
+                wx.CallAfter(self.ReportZoomError)
+                continue
+            # wx.Bitmap must be created in the GUI thread
+            wx.CallAfter(self.OnPageRendered, pageno, scale, width, height, samples)
+
+    def OnPageRendered(self, pageno, scale, width, height, samples):
+        " Cache a page rendered in the background and show it if visible "
+        if self.stopped:
+            return
+        self.zoom_error = False
+        self.pagecache.Put(pageno, scale, wx.Bitmap.FromBuffer(width, height, samples))
+        self.parent.OnPageRendered(pageno, scale)
+
+    def Stop(self):
+        " Stop the background rendering thread "
+        with self.condition:
+            self.stopped = True
+            self.requests = []
+            self.condition.notify()
+
+#============================================================================
+
+class pdfPageCache(object):
+    """
+    Least recently used cache of rendered page bitmaps, keyed by (page, scale).
+    The oldest bitmaps are discarded when the memory they take exceeds maxsize.
+    """
+    def __init__(self, maxsize=PAGE_CACHE_SIZE):
+        """
+        :param integer `maxsize`: the memory cap of the cache, in bytes
+        """
+        self.maxsize = maxsize
+        self.size = 0
+        self.bitmaps = OrderedDict()
+
+    def BitmapSize(self, bmp):
+        " Return the approximate memory taken by bmp, in bytes "
+        return bmp.GetWidth() * bmp.GetHeight() * 4
+
+    def Get(self, pageno, scale):
+        " Return the bitmap of the page rendered at scale, or None "
+        key = (pageno, scale)
+        bmp = self.bitmaps.get(key)
+        if bmp is not None:
+            self.bitmaps.move_to_end(key)
+        return bmp
+
+    def GetPlaceholder(self, pageno):
+        " Return the largest bitmap of the page at any scale, or None "
+        bitmaps = [bmp for (p, s), bmp in self.bitmaps.items() if p == pageno]
+        if not bitmaps:
+            return None
+        return max(bitmaps, key=lambda bmp: bmp.GetWidth())
+
+    def Put(self, pageno, scale, bmp):
+        " Add the bitmap of the page rendered at scale "
+        key = (pageno, scale)
+        if key in self.bitmaps:
+            self.size -= self.BitmapSize(self.bitmaps.pop(key))
+        self.bitmaps[key] = bmp
+        self.size += self.BitmapSize(bmp)
+        while self.size > self.maxsize and len(self.bitmaps) > 1:
+            key, old = self.bitmaps.popitem(last=False)
+            self.size -= self.BitmapSize(old)
+
+    def Clear(self):
+        " Discard all the bitmaps "
+        self.bitmaps.clear()
+        self.size = 0
 
 #============================================================================
 
@@ -12,6 +12,7 @@ __docformat__ = "restructuredtext en"
 # For those who still use ``from package import *`` for some reason
 __all__ = [
     'PolyLine',
+    'StreamingPolyLine',
     'PolySpline',
     'PolyMarker',
     'PolyBars',
@@ -30,6 +31,7 @@ from .plotcanvas import PlotCanvas
 
 from .polyobjects import PolyPoints
 from .polyobjects import PolyLine
+from .polyobjects import StreamingPolyLine
 from .polyobjects import PolySpline
 from .polyobjects import PolyMarker
 from .polyobjects import PolyBars
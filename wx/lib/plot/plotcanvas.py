@@ -166,6 +166,11 @@ class PlotCanvas(wx.Panel):
         self._pointSize = (1.0, 1.0)
         self._fontScale = 1.0
 
+        # the background, title, legend and axes of the last screen draw,
+        # as (key, bitmap), so they are only redrawn when they change.
+        self._staticCacheEnabled = True
+        self._staticLayer = None
+
         self.canvas.Bind(wx.EVT_PAINT, self.OnPaint)
         self.canvas.Bind(wx.EVT_SIZE, self.OnSize)
         # OnSize called to make sure the buffer is initialized.
@@ -1400,6 +1405,32 @@ class PlotCanvas(wx.Panel):
         self._axesLabelsEnabled = value
         self.Redraw()
 
+    @property
+    def enableStaticCache(self):
+        """
+        The current enableStaticCache value.
+
+        When enabled, the background, title, axes labels, legend, grid and
+        axes of the plot are kept in a bitmap and only redrawn when the
+        axes ranges, the canvas size or one of the plot options change.
+        Redrawing the same ranges, e.g. for live data with fixed axes, then
+        only redraws the data.
+
+        :getter: Returns the value of enableStaticCache.
+        :setter: Sets the value of enableStaticCache.
+        :type:   bool
+        :raises: `TypeError` if setting a non-boolean value.
+        """
+        return self._staticCacheEnabled
+
+    @enableStaticCache.setter
+    def enableStaticCache(self, value):
+        """Set True to cache the static parts of the plot."""
+        if value not in [True, False]:
+            raise TypeError("Value should be True or False")
+        self._staticCacheEnabled = value
+        self._staticLayer = None
+
     def SetPointLabelFunc(self, func):
         """
         Set the enablePointLabel value.
@@ -1789,6 +1820,7 @@ class PlotCanvas(wx.Panel):
         If it's not, the offscreen buffer is used
         """
 
+        bufferDC = None
         if dc is None:
             # sets new dc and clears it
             dc = wx.BufferedDC(wx.ClientDC(self.canvas), self._Buffer)
@@ -1796,6 +1828,7 @@ class PlotCanvas(wx.Panel):
             dc.SetBackground(bbr)
             dc.SetBackgroundMode(wx.SOLID)
             dc.Clear()
+            bufferDC = dc
         if self._antiAliasingEnabled:
             if not isinstance(dc, wx.GCDC):
                 try:
@@ -1904,20 +1937,6 @@ class PlotCanvas(wx.Panel):
         # shift plot area by this amount
         textSize_shift = np.array([lhsW, bottomH])
 
-        # Draw the labels (title, axes labels)
-        self._drawPlotAreaLabels(dc, graphics, lhsW, rhsW, titleWH,
-                                 bottomH, topH, xLabelWH, yLabelWH)
-
-        # drawing legend makers and text
-        if self._legendEnabled:
-            self._drawLegend(dc,
-                             graphics,
-                             rhsW,
-                             topH,
-                             legendBoxWH,
-                             legendSymExt,
-                             legendTextExt)
-
         # allow for scaling and shifting plotted points
         scale = ((self.plotbox_size - textSize_scale) / (p2 - p1)
                  * np.array((1, -1)))
@@ -1926,7 +1945,33 @@ class PlotCanvas(wx.Panel):
         # make available for mouse events
         self._pointScale = scale / self._pointSize
         self._pointShift = shift / self._pointSize
-        self._drawPlotAreaItems(dc, p1, p2, scale, shift, xticks, yticks)
+
+        staticKey = None
+        if bufferDC is not None and self._staticCacheEnabled:
+            staticKey = self._staticLayerKey(graphics, p1, p2)
+        if staticKey is not None and self._staticLayer is not None \
+                and self._staticLayer[0] == staticKey:
+            # nothing but the data has changed
+            bufferDC.DrawBitmap(self._staticLayer[1], 0, 0)
+        else:
+            # Draw the labels (title, axes labels)
+            self._drawPlotAreaLabels(dc, graphics, lhsW, rhsW, titleWH,
+                                     bottomH, topH, xLabelWH, yLabelWH)
+
+            # drawing legend makers and text
+            if self._legendEnabled:
+                self._drawLegend(dc,
+                                 graphics,
+                                 rhsW,
+                                 topH,
+                                 legendBoxWH,
+                                 legendSymExt,
+                                 legendTextExt)
+
+            self._drawPlotAreaItems(dc, p1, p2, scale, shift, xticks, yticks)
+
+            if staticKey is not None:
+                self._saveStaticLayer(dc, bufferDC, staticKey)
 
         graphics.scaleAndShift(scale, shift)
         # thicken up lines and markers if printing
@@ -2173,6 +2218,7 @@ class PlotCanvas(wx.Panel):
         # current drawing in it, so it can be used to save the image to
         # a file, or whatever.
         self._Buffer = wx.Bitmap(Size.width, Size.height)
+        self._staticLayer = None
         self._setSize()
 
         self.last_PointLabel = None  # reset pointLabel
@@ -2232,6 +2278,48 @@ class PlotCanvas(wx.Panel):
             graphics, xSpec, ySpec = self.last_draw
             self._Draw(graphics, xSpec, ySpec, printDC)
 
+    def _staticLayerKey(self, graphics, p1, p2):
+        """
+        Returns everything the static parts of the plot depend on, to be
+        compared with the key of the cached static layer.
+        """
+        if self._legendEnabled:
+            # the legend draws a sample of each object
+            legend = [(type(o), dict(o.attributes)) for o in graphics]
+        else:
+            legend = None
+        return (self._Buffer.GetSize(),
+                tuple(p1), tuple(p2),
+                self._pointSize, self._fontScale, self.printerScale,
+                self._antiAliasingEnabled, self._hiResEnabled,
+                self._xSpec, self._ySpec, self._logscale, self._absScale,
+                self._gridEnabled, self._legendEnabled, self._titleEnabled,
+                self._xAxisLabelEnabled, self._yAxisLabelEnabled,
+                self._axesLabelsEnabled, self._centerLinesEnabled,
+                self._diagonalsEnabled, self._ticksEnabled,
+                self._axesEnabled, self._axesValuesEnabled,
+                self._useScientificNotation,
+                self._fontSizeAxis, self._fontSizeTitle, self._fontSizeLegend,
+                self._gridPen, self._centerLinePen, self._axesPen,
+                self._tickPen, self._diagonalPen, self._tickLength,
+                self.GetBackgroundColour(), self.GetForegroundColour(),
+                graphics.title, graphics.xLabel, graphics.yLabel,
+                legend)
+
+    def _saveStaticLayer(self, dc, bufferDC, key):
+        """Copies what has been drawn to the buffer so far to the cache."""
+        if dc is not bufferDC:
+            # make sure a wx.GCDC has drawn everything to the buffer
+            gc = dc.GetGraphicsContext()
+            if gc is not None:
+                gc.Flush()
+        width, height = self._Buffer.GetSize()
+        bmp = wx.Bitmap(width, height)
+        mdc = wx.MemoryDC(bmp)
+        mdc.Blit(0, 0, width, height, bufferDC, 0, 0)
+        mdc.SelectObject(wx.NullBitmap)
+        self._staticLayer = (key, bmp)
+
     def _drawPointLabel(self, mDataDict):
         """Draws and erases pointLabels"""
         width = self._Buffer.GetWidth()
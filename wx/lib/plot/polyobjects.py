@@ -36,6 +36,48 @@ from .utils import TempStyle
 from .utils import pairwise
 
 
+def _minMaxDecimate(scaled):
+    """
+    Min/max decimation of scaled (screen coordinate) points.
+
+    When the X values are sorted and there are many more points than pixel
+    columns, only the first, lowest, highest and last points of each pixel
+    column are kept, in their original order. The line drawn through them
+    covers the same pixels as the line drawn through all of the points.
+
+    :param scaled: the scaled points
+    :type scaled: numpy array of shape ``(N, 2)``
+    :returns: the points to draw, which may be `scaled` itself
+    """
+    n = len(scaled)
+    if n < 8:
+        return scaled
+    cols = np.floor(scaled[:, 0])
+    if not np.isfinite(cols[0]) or not np.isfinite(cols[-1]):
+        return scaled
+    # it is only worth it when there are several points per column
+    if n <= 4 * (abs(cols[-1] - cols[0]) + 1):
+        return scaled
+    step = np.diff(cols)
+    if not ((step >= 0).all() or (step <= 0).all()):
+        return scaled
+
+    starts = np.concatenate(([0], np.flatnonzero(step) + 1))
+    counts = np.diff(np.concatenate((starts, [n])))
+    group = np.repeat(np.arange(len(starts)), counts)
+    y = scaled[:, 1]
+
+    keep = [starts, starts + counts - 1]
+    for reduce in (np.minimum, np.maximum):
+        extreme = np.flatnonzero(y == np.repeat(reduce.reduceat(y, starts),
+                                                counts))
+        # only the first one in each column, in case of ties
+        g = group[extreme]
+        first = np.concatenate(([True], g[1:] != g[:-1]))
+        keep.append(extreme[first])
+    return scaled[np.unique(np.concatenate(keep))]
+
+
 class PolyPoints(object):
     """
     Base Class for lines and markers.
@@ -50,7 +92,7 @@ class PolyPoints(object):
     """
 
     def __init__(self, points, attr):
-        self._points = np.array(points).astype(np.float64)
+        self._points = np.array(points, dtype=np.float64)
         self._logscale = (False, False)
         self._absScale = (False, False)
         self._symlogscale = (False, False)
@@ -226,9 +268,21 @@ class PolyPoints(object):
            Only set unscaled points - do not perform the log, abs, or symlog
            adjustments yourself.
         """
-        data = np.array(self._points, copy=True)    # need the copy
-                                                    # TODO: get rid of the
-                                                    # need for copy
+        return self._getPoints()
+
+    @points.setter
+    def points(self, points):
+        self._points = points
+
+    def _getPoints(self):
+        """
+        Returns the points adjusted for the scale options, for use by the
+        methods of this class. See :attr:`points`.
+        """
+        data = self._points
+        if self.absScale[0] or self.absScale[1]:
+            # _abs works in place, so it needs a copy. _log10 makes its own.
+            data = np.array(data, copy=True)
 
         # work on X:
         if self.absScale[0]:
@@ -255,10 +309,6 @@ class PolyPoints(object):
 
         return data
 
-    @points.setter
-    def points(self, points):
-        self._points = points
-
     def _log10(self, data, index):
         """ Take the Log10 of the data, dropping any negative values """
         data = np.compress(data[:, index] > 0, data, 0)
@@ -280,14 +330,15 @@ class PolyPoints(object):
         :returns: boundingbox
         :rtype: numpy array of ``[[minX, minY], [maxX, maxY]]``
         """
-        if len(self.points) == 0:
+        points = self._getPoints()
+        if len(points) == 0:
             # no curves to draw
             # defaults to (-1,-1) and (1,1) but axis can be set in Draw
             minXY = np.array([-1.0, -1.0])
             maxXY = np.array([1.0, 1.0])
         else:
-            minXY = np.minimum.reduce(self.points)
-            maxXY = np.maximum.reduce(self.points)
+            minXY = np.minimum.reduce(points)
+            maxXY = np.maximum.reduce(points)
         return minXY, maxXY
 
     def scaleAndShift(self, scale=(1, 1), shift=(0, 0)):
@@ -301,7 +352,8 @@ class PolyPoints(object):
         :type shift: list of floats: ``[x_shift, y_shift]``
         :returns: None
         """
-        if len(self.points) == 0:
+        points = self._getPoints()
+        if len(points) == 0:
             # no curves to draw
             return
 
@@ -313,7 +365,7 @@ class PolyPoints(object):
         if (list(scale) != list(self.currentScale)
                 or list(shift) != list(self.currentShift)):
             # update point scaling
-            self.scaled = scale * self.points + shift
+            self.scaled = scale * points + shift
             self.currentScale = scale
             self.currentShift = shift
         # else unchanged use the current scaling
@@ -329,23 +381,94 @@ class PolyPoints(object):
         if pointScaled == True, then based on screen coords
         if pointScaled == False, then based on user coords
         """
+        points = self._getPoints()
         if pointScaled:
             # Using screen coords
             p = self.scaled
             pxy = self.currentScale * np.array(pntXY) + self.currentShift
+            weights = self.currentScale
         else:
             # Using user coords
-            p = self.points
+            p = points
             pxy = np.array(pntXY)
-        # determine distance for each point
-        d = np.sqrt(np.add.reduce((p - pxy) ** 2, 1))  # sqrt(dx^2+dy^2)
-        pntIndex = np.argmin(d)
-        dist = d[pntIndex]
+            weights = (1, 1)
+        pntIndex = self._closestIndex(np.array(pntXY, dtype=np.float64),
+                                      weights)
+        if pntIndex is None:
+            # determine distance for each point
+            d = np.sqrt(np.add.reduce((p - pxy) ** 2, 1))  # sqrt(dx^2+dy^2)
+            pntIndex = np.argmin(d)
+            dist = d[pntIndex]
+        else:
+            dist = np.sqrt(np.add.reduce((p[pntIndex] - pxy) ** 2))
         return [pntIndex,
-                self.points[pntIndex],
+                points[pntIndex].copy(),
                 self.scaled[pntIndex] / self._pointSize,
                 dist]
 
+    def _getSortedIndex(self):
+        """
+        Returns the points sorted by X, and their indices, for
+        :meth:`_closestIndex`.
+
+        The index is built the first time it is needed, and again after the
+        points or the log/abs scales change. The indices are ``None`` when
+        the points were already sorted.
+        """
+        cache = getattr(self, '_sortedIndex', None)
+        if (cache is None or cache[0] is not self._points
+                or cache[1] != (self.logScale, self.absScale)):
+            data = self._getPoints()
+            if len(data) and not np.isfinite(data).all():
+                order = np.flatnonzero(np.isfinite(data).all(1))
+                data = data[order]
+                sort = np.argsort(data[:, 0], kind='stable')
+                order, data = order[sort], data[sort]
+            elif len(data) and (np.diff(data[:, 0]) < 0).any():
+                order = np.argsort(data[:, 0], kind='stable')
+                data = data[order]
+            else:
+                order = None
+            cache = (self._points, (self.logScale, self.absScale),
+                     order, data)
+            self._sortedIndex = cache
+        return cache[2], cache[3]
+
+    def _closestIndex(self, pxy, weights):
+        """
+        Returns the index of the point closest to pxy, where the distance
+        along each axis is multiplied by weights, or None if there are no
+        (finite) points.
+
+        Only the points with X values near to pxy are looked at: the search
+        starts at pxy in the points sorted by X and widens until no point
+        further out can be closer than the closest one found.
+        """
+        order, data = self._getSortedIndex()
+        n = len(data)
+        if n == 0:
+            return None
+        wx_, wy = abs(float(weights[0])), abs(float(weights[1]))
+        x = data[:, 0]
+        i = int(np.searchsorted(x, pxy[0]))
+        width = 16
+        while True:
+            lo, hi = max(i - width, 0), min(i + width, n)
+            d2 = ((wx_ * (data[lo:hi, 0] - pxy[0])) ** 2
+                  + (wy * (data[lo:hi, 1] - pxy[1])) ** 2)
+            best = d2.min()
+            # points outside [lo, hi) are at least this far away in X
+            done = ((lo == 0 or (wx_ * (pxy[0] - x[lo - 1])) ** 2 > best)
+                    and (hi == n or (wx_ * (x[hi] - pxy[0])) ** 2 > best))
+            if done:
+                break
+            width *= 4
+        nearest = np.flatnonzero(d2 == best) + lo
+        if order is None:
+            return int(nearest[0])
+        # same as the first point found by a full search
+        return int(order[nearest].min())
+
 
 class PolyLine(PolyPoints):
     """
@@ -421,7 +544,11 @@ class PolyLine(PolyPoints):
         pen.SetCap(wx.CAP_BUTT)
         dc.SetPen(pen)
         if coord is None:
-            if len(self.scaled):  # bugfix for Mac OS X
+            if len(self.scaled) and drawstyle == 'line':
+                # one call for the whole line, with the points that would
+                # end up in the same pixel column thinned out.
+                dc.DrawLines(self._getDecimated().astype(int))
+            elif len(self.scaled):  # bugfix for Mac OS X
                 for c1, c2 in zip(self.scaled, self.scaled[1:]):
                     self._path(dc, c1, c2, drawstyle)
         else:
@@ -439,6 +566,18 @@ class PolyLine(PolyPoints):
         w = 5 * h
         return (w, h)
 
+    def _getDecimated(self):
+        """
+        Returns the scaled points, decimated for drawing.
+
+        The result is cached until the next time the points are rescaled.
+        """
+        cache = getattr(self, '_decimated', None)
+        if cache is None or cache[0] is not self.scaled:
+            cache = (self.scaled, _minMaxDecimate(self.scaled))
+            self._decimated = cache
+        return cache[1]
+
     def _path(self, dc, coord1, coord2, drawstyle):
         """
         Calculates the path from coord1 to coord 2 along X and Y
@@ -483,6 +622,149 @@ class PolyLine(PolyPoints):
         dc.DrawLines(line)
 
 
+class StreamingPolyLine(PolyLine):
+    """
+    A :class:`PolyLine` that new points can be appended to, keeping only
+    the most recent `capacity` points. Used for real time "strip charts".
+
+    :param points: The initial points of the line
+    :type points: list of ``[x, y]`` values
+    :param capacity: The maximum number of points kept, once it is reached
+                     the oldest points are dropped as new ones are added.
+    :type capacity: int
+    :param **attr: keyword attributes, the same as for :class:`PolyLine`
+
+    Points are stored in a ring buffer, so adding points does not copy the
+    ones that are already there, and the bounding box is updated as points
+    are added rather than recomputed from all of them.
+
+    .. warning::
+
+       All methods except ``__init__``, ``append``, ``extend`` and
+       ``clear`` are private.
+    """
+
+    def __init__(self, points=(), capacity=10000, **attr):
+        if capacity < 1:
+            raise ValueError("`capacity` must be at least 1")
+        self._capacity = int(capacity)
+        PolyLine.__init__(self, [], **attr)
+        self.clear()
+        self.extend(points)
+
+    @property
+    def capacity(self):
+        """
+        The maximum number of points kept.
+
+        :getter: Returns the current value of capacity
+        :type: int
+        """
+        return self._capacity
+
+    @property
+    def points(self):
+        """
+        Get or set the plotted points, see
+        :attr:`~wx.lib.plot.polyobjects.PolyPoints.points`. Setting them
+        replaces all of the points in the line.
+
+        The getter returns a copy, so the array is not changed by points
+        added later on.
+        """
+        data = self._getPoints()
+        if data is self._points:
+            data = data.copy()
+        return data
+
+    @points.setter
+    def points(self, points):
+        self.clear()
+        self.extend(points)
+
+    def clear(self):
+        """Remove all of the points."""
+        # every point is stored twice, at i and i + capacity, so that the
+        # most recent points are always a contiguous slice of the buffer.
+        self._buffer = np.empty((2 * self._capacity, 2), dtype=np.float64)
+        self._head = 0
+        self._count = 0
+        self._minXY = None
+        self._maxXY = None
+        self._updatePoints()
+
+    def append(self, point):
+        """
+        Add a point to the end of the line.
+
+        :param point: The point to add
+        :type point: ``(x, y)``
+        """
+        self.extend((point,))
+
+    def extend(self, points):
+        """
+        Add points to the end of the line.
+
+        :param points: The points to add
+        :type points: list of ``(x, y)`` pairs
+        """
+        new = np.array(points, dtype=np.float64).reshape(-1, 2)
+        cap = self._capacity
+        if len(new) == 0:
+            return
+        if len(new) >= cap:
+            self.clear()
+            new = new[-cap:]
+
+        slots = (self._head + np.arange(len(new))) % cap
+        n_evicted = max(self._count + len(new) - cap, 0)
+        if self._count == n_evicted:
+            # none of the old points are left
+            self._minXY, self._maxXY = new.min(0), new.max(0)
+        elif self._minXY is not None:
+            # the oldest points are the ones being overwritten
+            oldest = self._head - self._count
+            evicted = self._buffer[(oldest + np.arange(n_evicted)) % cap]
+            if ((evicted <= self._minXY).any()
+                    or (evicted >= self._maxXY).any()):
+                # an extreme value is being dropped, recompute when needed
+                self._minXY = self._maxXY = None
+            else:
+                self._minXY = np.minimum(self._minXY, new.min(0))
+                self._maxXY = np.maximum(self._maxXY, new.max(0))
+
+        self._buffer[slots] = new
+        self._buffer[slots + cap] = new
+        self._head = (self._head + len(new)) % cap
+        self._count = min(self._count + len(new), cap)
+        self._updatePoints()
+
+    def _updatePoints(self):
+        end = self._head + self._capacity
+        self._points = self._buffer[end - self._count:end]
+        # force scaleAndShift to rescale the new points
+        self.currentScale = (None, None)
+        self.currentShift = (None, None)
+
+    def boundingBox(self):
+        """
+        Returns the bounding box for the entire dataset as a tuple with this
+        format::
+
+            ((minX, minY), (maxX, maxY))
+
+        :returns: boundingbox
+        :rtype: numpy array of ``[[minX, minY], [maxX, maxY]]``
+        """
+        if (self._count == 0 or any(self.logScale) or any(self.absScale)):
+            return PolyLine.boundingBox(self)
+        if self._minXY is None:
+            self._minXY = self._points.min(0)
+            self._maxXY = self._points.max(0)
+        return self._minXY.copy(), self._maxXY.copy()
+
+
 class PolySpline(PolyLine):
     """
     Creates PolySpline object
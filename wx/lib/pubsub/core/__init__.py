@@ -43,6 +43,7 @@ from .. import policies
 _prependModulePath(policies.msgDataProtocol)
 
 from .publisher import Publisher
+from .asyncsender import AsyncSender
 
 from .callables import (
     AUTO_TOPIC,
@@ -24,7 +24,12 @@ class PublisherMixin:
 
     ############## IMPLEMENTATION ###############
 
-    def _mix_prePublish(self, data, topicObj=None, iterState=None):
+    def _mix_getArgsFilter(self, topicObj, prevTopicObj=None):
+        """Used to make the dispatch plan of a topic: the data is sent
+        as is to all topics, so there is nothing to filter."""
+        return None
+
+    def _mix_prePublish(self, data, topicObj=None, iterState=None, argsFilter=None):
         """Called just before the __sendMessage, to perform any argument
         checking, set iterState, etc"""
         return None
@@ -0,0 +1,114 @@
+"""
+Provide the AsyncSender class, to send messages from any thread and have
+them delivered on the wx GUI thread.
+
+:copyright: Copyright since 2006 by Oliver Schoenborn, all rights reserved.
+:license: BSD, see LICENSE_BSD_Simple.txt for details.
+"""
+
+from collections import deque
+
+
+class AsyncSender:
+    """
+    Queue messages for a publisher, and deliver them later, in batches, on
+    the GUI thread. The sendMessage() method can be called from any thread:
+    it only puts the message at the end of a queue, and makes sure a drain
+    of the queue is scheduled via wx.CallAfter (one for the whole burst,
+    rather than one per message).
+
+    Messages are delivered in the order they were queued, so the order of
+    messages of any one topic is kept. Each drain delivers at most
+    drainBudget messages; if more are waiting, another drain is scheduled
+    so that the event loop gets to process other events in between.
+
+    If coalesce is true, a message is dropped if it has the same topic and
+    data as the last message of that topic still waiting to be delivered.
+    """
+
+    def __init__(self, publisher, drainBudget=100, coalesce=False, callAfter=None):
+        """
+        :param publisher: the Publisher that will send the messages
+        :param drainBudget: maximum number of messages delivered per drain
+        :param coalesce: if True, drop duplicate messages (see class doc)
+        :param callAfter: function used to call the drain on the GUI thread,
+            wx.CallAfter if None
+        """
+        self.__publisher = publisher
+        self.drainBudget = drainBudget
+        self.coalesce = coalesce
+        self.__callAfter = callAfter
+
+        # deque append() and popleft() are atomic, so no lock needed
+        self.__queue = deque()
+        self.__lastPending = {}  # topic name -> last message queued
+        self.__scheduled = False
+
+    def sendMessage(self, topicName, *args, **kwargs):
+        """Queue a message for topicName, to be sent with the given data
+        (same as for the publisher's sendMessage()) on the GUI thread.
+        Can be called from any thread."""
+        msg = [topicName, args, kwargs, False] # last item: delivered yet?
+        if self.coalesce:
+            last = self.__lastPending.get(topicName)
+            if last is not None and not last[3] and self.__sameData(last, msg):
+                return
+            self.__lastPending[topicName] = msg
+
+        self.__queue.append(msg)
+        if not self.__scheduled:
+            self.__scheduled = True
+            self.__schedule()
+
+    def getNumPending(self):
+        """Get the number of messages waiting to be delivered."""
+        return len(self.__queue)
+
+    def flush(self):
+        """Deliver all waiting messages now. Must be called from the GUI
+        thread."""
+        while self.__queue:
+            self.__deliver(len(self.__queue))
+
+    ############## IMPLEMENTATION ###############
+
+    def __schedule(self):
+        callAfter = self.__callAfter
+        if callAfter is None:
+            import wx
+            callAfter = wx.CallAfter
+        callAfter(self.__drain)
+
+    def __drain(self):
+        # reset first: a message queued from now on gets a new drain
+        # scheduled if this one doesn't get to it
+        self.__scheduled = False
+        try:
+            self.__deliver(self.drainBudget)
+        finally:
+            if self.__queue and not self.__scheduled:
+                self.__scheduled = True
+                self.__schedule()
+
+    def __deliver(self, budget):
+        """Send up to budget messages from the queue."""
+        queue = self.__queue
+        sendMessage = self.__publisher.sendMessage
+        for dummy in range(budget):
+            try:
+                msg = queue.popleft()
+            except IndexError:
+                break
+            topicName, args, kwargs, dummy = msg
+            msg[3] = True
+            if self.__lastPending.get(topicName) is msg:
+                self.__lastPending.pop(topicName, None)
+            sendMessage(topicName, *args, **kwargs)
+
+    @staticmethod
+    def __sameData(msg1, msg2):
+        try:
+            return bool(msg1[1] == msg2[1] and msg1[2] == msg2[2])
+        except Exception:
+            # data that can't be compared (like numpy arrays) never coalesces
+            return False
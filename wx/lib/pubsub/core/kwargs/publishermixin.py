@@ -34,14 +34,28 @@ class PublisherMixin:
             spec.check(self.filteredArgs)
             self.argsChecked = True
 
-        def filterMsgArgs(self, topicObj):
-            if self.argsChecked:
-                self.filteredArgs = topicObj.filterMsgArgs(self.filteredArgs)
-            else:
+        def filterMsgArgs(self, topicObj, argsFilter=None):
+            if not self.argsChecked:
                 self.filteredArgs = topicObj.filterMsgArgs(self.filteredArgs, True)
                 self.argsChecked = True
+            elif argsFilter is not None:
+                filteredArgs = self.filteredArgs
+                if len(filteredArgs) != len(argsFilter):
+                    self.filteredArgs = dict( (k,v) for (k,v) in filteredArgs.items()
+                                              if k in argsFilter )
+
+    def _mix_getArgsFilter(self, topicObj, prevTopicObj=None):
+        """Get the names of the message args to keep when the message is
+        sent to topicObj's listeners, after prevTopicObj's listeners.
+        Returns None if there is nothing to filter: topicObj has the same
+        args as prevTopicObj. Used to make the dispatch plan of a topic."""
+        argNames = topicObj._getListenerSpec().allArgNames
+        if (prevTopicObj is not None and prevTopicObj.hasMDS()
+                and prevTopicObj._getListenerSpec().allArgNames == argNames):
+            return None
+        return argNames
 
-    def _mix_prePublish(self, msgKwargs, topicObj=None, iterState=None):
+    def _mix_prePublish(self, msgKwargs, topicObj=None, iterState=None, argsFilter=None):
         if iterState is None:
             # do a first check that all args are there, costly so only do once
             iterState = self.IterState(msgKwargs)
@@ -51,7 +65,7 @@ class PublisherMixin:
                 assert not self.hasListeners()
 
         else:
-            iterState.filterMsgArgs(topicObj)
+            iterState.filterMsgArgs(topicObj, argsFilter)
 
         assert iterState is not None
         return iterState
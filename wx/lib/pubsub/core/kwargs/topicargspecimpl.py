@@ -68,6 +68,7 @@ class ArgsInfo:
         self.allOptional = () # topic message optional arg names
         self.allDocs     = {} # doc for each arg
         self.allRequired = () # topic message required arg names
+        self.allArgNames = frozenset() # all of the above, for filterArgs()
         self.argsSpecType = self.SPEC_MISSING
         self.parentAI = WeakNone()
         if parentArgsInfo is not None:
@@ -142,9 +143,13 @@ class ArgsInfo:
         #argNames = self.__msgArgs.getArgs()
         #newKwargs = dict( (key, val) for (key, val) in msgKwargs.iteritems() if key in argNames )
 
-        # method 3: FASTEST:
-        argNames = set(self.getArgs()).intersection(msgKwargs)
-        newKwargs = dict( (k,msgKwargs[k]) for k in argNames )
+        # method 3: FAST, but makes a set of the arg names every time:
+        #argNames = set(self.getArgs()).intersection(msgKwargs)
+        #newKwargs = dict( (k,msgKwargs[k]) for k in argNames )
+
+        # method 4: FASTEST, with the set of arg names made once:
+        argNames = self.allArgNames
+        newKwargs = dict( (k,v) for (k,v) in msgKwargs.items() if k in argNames )
 
         return newKwargs
 
@@ -204,6 +209,7 @@ class ArgsInfo:
         self.allOptional = tuple( specGiven.getOptional() )
         self.allRequired = specGiven.reqdArgs
         self.allDocs     = specGiven.argsDocs.copy() # doc for each arg
+        self.allArgNames = frozenset(self.allOptional + tuple(self.allRequired))
         self.argsSpecType= self.SPEC_COMPLETE
 
         if self.parentAI() is not None:
@@ -61,6 +61,11 @@ class NotificationMgr:
             for handler in self.__handlers:
                 handler.notifyUnsubscribe(*args, **kwargs)
 
+    def notifiesSend(self):
+        """Return true if notifySend() would call any handlers. Used
+        to skip the notifySend() calls altogether while sending messages."""
+        return bool(self.__notifyOnSend and self.__handlers)
+
     def notifySend(self, *args, **kwargs):
         if self.__notifyOnSend and self.__handlers:
             for handler in self.__handlers:
@@ -90,6 +90,8 @@ class Topic(PublisherMixin):
         # Listener instance which satisfies Listener == callable, and will return
         # the Listener. 
         self.__listeners = dict()
+        # [(topic, listeners, args filter), ...] for _publish
+        self.__dispatchPlan = None
 
         # specification:
         self.__description  = None
@@ -143,6 +145,7 @@ class Topic(PublisherMixin):
                 exc = getexcobj()
                 raise exc
             self.__finalize()
+            self.__invalidateDispatch()
 
         else:
             raise RuntimeError('Not allowed to call this: msg spec already set!')
@@ -302,6 +305,7 @@ class Topic(PublisherMixin):
             weakListener = Listener(
                 listener, argsInfo, onDead=self.__onDeadListener)
             self.__listeners[weakListener] = weakListener
+            self.__invalidateDispatch()
             subdLisnr, newSub = weakListener, True
 
         # notify of subscription
@@ -319,6 +323,7 @@ class Topic(PublisherMixin):
         unsubdLisnr = self.__listeners.pop(listener, None)
         if unsubdLisnr is None: 
             return None
+        self.__invalidateDispatch()
 
         unsubdLisnr._unlinkFromTopic_()
         assert listener == unsubdLisnr.getCallable()
@@ -347,6 +352,9 @@ class Topic(PublisherMixin):
                     listener._unlinkFromTopic_()
                     del self.__listeners[listener]
 
+        if unsubd:
+            self.__invalidateDispatch()
+
         # send notification regarding all listeners actually unsubscribed
         notificationMgr = self._treeConfig.notificationMgr
         for unsubdLisnr in unsubd:
@@ -369,31 +377,79 @@ class Topic(PublisherMixin):
         If an exception is raised in a listener, the publish is
         aborted, except if there is a handler (see
         pub.setListenerExcHandler)."""
-        self._treeConfig.notificationMgr.notifySend('pre', self)
+        notificationMgr = self._treeConfig.notificationMgr
+        notify = notificationMgr.notifiesSend()
+        if notify:
+            notificationMgr.notifySend('pre', self)
 
-        # send to ourself
+        # send to ourself, then up the chain: the plan has self first,
+        # followed by each parent topic that has listeners
         iterState = self._mix_prePublish(data)
-        self.__sendMessage(data, self, iterState)
+        for topicObj, listeners, argsFilter in self.__iterDispatchPlan():
+            if topicObj is not self:
+                iterState = self._mix_prePublish(data, topicObj, iterState, argsFilter)
+            self.__sendMessage(data, topicObj, listeners, iterState, notify)
+
+        if notify:
+            notificationMgr.notifySend('post', self)
+
+    def __getDispatchPlan(self):
+        """Get the list of (topic, listeners, args filter) that a message of
+        this topic is sent to. The list is re-made only after listeners or
+        topic definitions have changed for this topic or one of its parents."""
+        if self.__dispatchPlan is None:
+            plan = [(self, tuple(self.__listeners), None)]
+            prevTopic = self
+            topicObj = self.getParent()
+            while topicObj is not None:
+                if topicObj.hasListeners():
+                    plan.append((topicObj, tuple(topicObj.getListenersIter()),
+                                 self._mix_getArgsFilter(topicObj, prevTopic)))
+                    prevTopic = topicObj
+                topicObj = topicObj.getParent()
+            self.__dispatchPlan = plan
+        return self.__dispatchPlan
+
+    def __iterDispatchPlan(self):
+        """Iterate over the dispatch plan while a message is sent. If a
+        listener subscribes or unsubscribes listeners during the send, the
+        rest of the topics get their listeners as they are at the time the
+        message reaches them, as they would without the plan."""
+        plan = self.__getDispatchPlan()
+        nextTopic = self
+        for topicObj, listeners, argsFilter in plan:
+            # any change to the listeners of this topic or of its parents
+            # discards the plan
+            if self.__dispatchPlan is not plan:
+                break
+            yield topicObj, listeners, argsFilter
+            nextTopic = topicObj.getParent()
+        else:
+            return
+
+        topicObj = nextTopic
 
-        # send up the chain
-        topicObj = self.getParent()
         while topicObj is not None:
             if topicObj.hasListeners():
-                iterState = self._mix_prePublish(data, topicObj, iterState)
-                self.__sendMessage(data, topicObj, iterState)
-
-            # done for this topic, continue up branch to parent towards root
+                yield (topicObj, tuple(topicObj.getListenersIter()),
+                       self._mix_getArgsFilter(topicObj))
             topicObj = topicObj.getParent()
 
-        self._treeConfig.notificationMgr.notifySend('post', self)
+    def __invalidateDispatch(self):
+        """Listeners changed: the dispatch plans of this topic and all of
+        its subtopics are out of date."""
+        self.__dispatchPlan = None
+        for subObj in self.__subTopics.values():
+            subObj.__invalidateDispatch()
 
-    def __sendMessage(self, data, topicObj, iterState):
+    def __sendMessage(self, data, topicObj, listeners, iterState, notify):
         # now send message data to each listener for current topic;
-        # use list of listeners rather than iterator, so that if listeners added/removed during
-        # send loop, no runtime exception:
-        for listener in topicObj.getListeners():
+        # the listeners are a snapshot (tuple), so that if listeners added/removed
+        # during send loop, no runtime exception:
+        for listener in listeners:
             try:
-                self._treeConfig.notificationMgr.notifySend('in', topicObj, pubListener=listener)
+                if notify:
+                    self._treeConfig.notificationMgr.notifySend('in', topicObj, pubListener=listener)
                 self._mix_callListener(listener, data, iterState)
 
             except Exception:
@@ -448,6 +504,7 @@ class Topic(PublisherMixin):
 
         self.__subTopics = {}
         del topicsMap[self.getName()]
+        self.__invalidateDispatch()
 
     def __adoptSubtopic(self, topicObj):
         """Add topicObj as child topic."""
@@ -463,6 +520,7 @@ class Topic(PublisherMixin):
     def __onDeadListener(self, weakListener):
         """One of our subscribed listeners has died, so remove it and notify"""
         pubListener = self.__listeners.pop(weakListener)
+        self.__invalidateDispatch()
         # notify:
         self._treeConfig.notificationMgr.notifyDeadListener(pubListener, self)
 
@@ -34,6 +34,7 @@ VERSION_SVN = "$Rev: 243 $".split()[1]  # DO NOT CHANGE: automatically updated b
 
 from .core import (
     Publisher as _Publisher,
+    AsyncSender as _AsyncSender,
 
     AUTO_TOPIC,
 
@@ -107,6 +108,8 @@ __all__ = [
     # publisher stuff:
 
     'sendMessage', 
+    'sendMessageAsync',
+    'getAsyncSender',
     'SenderMissingReqdMsgDataError', 
     'SenderUnknownMsgDataError',
 
@@ -149,6 +152,18 @@ def getDefaultPublisher():
     return _publisher
 
 
+# ---------- sending from other threads ----------------------------------------------
+
+_asyncSender = _AsyncSender(_publisher)
+
+sendMessageAsync = _asyncSender.sendMessage
+
+def getAsyncSender():
+    """Get the AsyncSender used by sendMessageAsync(), to configure it
+    (drainBudget, coalesce) or flush() it."""
+    return _asyncSender
+
+
 # ---------- default TopicManager instance and bound methods ------------------------
 
 _topicMgr = _publisher.getTopicMgr()
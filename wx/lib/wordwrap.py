@@ -10,6 +10,110 @@
 # Tags:        phoenix-port
 #----------------------------------------------------------------------
 
+from bisect import bisect_right
+from collections import OrderedDict
+
+# Maximum number of measured lines kept by _getExtents
+_MAX_CACHED_EXTENTS = 1000
+_extentsCache = OrderedDict()
+
+
+def _getFontKey(dc):
+    """
+    Returns what, besides the text, determines the extents measured on `dc`.
+    """
+    return (dc.__class__, dc.GetFont().GetNativeFontInfoDesc(), tuple(dc.GetUserScale()))
+
+
+def _getExtents(dc, text, fontKey):
+    """
+    Returns ``dc.GetPartialTextExtents(text)``, remembering the results for
+    the most recently measured font, scale and text combinations.
+    """
+    key = (fontKey, text)
+    extents = _extentsCache.get(key)
+    if extents is None:
+        extents = _extentsCache[key] = list(dc.GetPartialTextExtents(text))
+        if len(_extentsCache) > _MAX_CACHED_EXTENTS:
+            _extentsCache.popitem(last=False)
+    else:
+        _extentsCache.move_to_end(key)
+    return extents
+
+
+class WordWrapper(object):
+    """
+    Measures some text once on the given `wx.DC`, so that it can then be
+    wrapped to any number of widths cheaply, for example each time a window
+    is resized.  ``WordWrapper(text, dc).Wrap(width)`` gives the same result
+    as ``wordwrap(text, width, dc)``.
+    """
+
+    def __init__(self, text, dc, breakLongWords=True, margin=0):
+        self.breakLongWords = breakLongWords
+        self.margin = margin
+        self.spaceWidth = dc.GetTextExtent(' ')[0]
+        self.lines = []
+        fontKey = _getFontKey(dc)
+        for line in text.split('\n'):
+            pte = _getExtents(dc, line, fontKey)
+            widest = max([0] + [pte[i]-pte[i-1] for i in range(1,len(pte))])
+            self.lines.append((line, pte, widest))
+        self._wrapped = {}
+
+
+    def Wrap(self, width):
+        """
+        Returns the text with newline characters inserted where lines should
+        be broken to fit within the given width.
+        """
+        if width not in self._wrapped:
+            if len(self._wrapped) > 16:
+                self._wrapped.clear()
+            self._wrapped[width] = '\n'.join(self.WrapLines(width))
+        return self._wrapped[width]
+
+
+    def WrapLines(self, width):
+        """
+        Returns the list of wrapped lines for the given width.
+        """
+        margin = ' '*self.margin
+        wrapped_lines = []
+        for line, pte, widest in self.lines:
+            wid = width - (2*self.margin+1)*self.spaceWidth - widest
+            count = len(pte)
+            start = 0
+            startIdx = 0
+            scanIdx = 0
+            while scanIdx < count:
+                # the first character that does not fit
+                overIdx = bisect_right(pte, start + wid, scanIdx)
+                if overIdx >= count:
+                    break
+
+                # break after the last space before it, if any
+                spcIdx = line.rfind(' ', scanIdx, overIdx + 1)
+                if spcIdx == -1 and not self.breakLongWords:
+                    spcIdx = line.find(' ', overIdx + 1, count)
+                    if spcIdx == -1:
+                        break
+                if spcIdx != -1:
+                    idx = min(spcIdx + 1, count - 1)
+                else:
+                    idx = overIdx
+
+                wrapped_lines.append(margin + line[startIdx : idx] + margin)
+                start = pte[idx]
+                startIdx = idx
+                scanIdx = idx + 1
+
+            wrapped_lines.append(margin + line[startIdx : count] + margin)
+
+        return wrapped_lines
+
+
+
 def wordwrap(text, width, dc, breakLongWords=True, margin=0):
     """
     Returns a copy of text with newline characters inserted where long
@@ -19,37 +123,12 @@ def wordwrap(text, width, dc, breakLongWords=True, margin=0):
     than the margin-adjusted width will be broken at the nearest
     character boundary, but this can be disabled by passing ``False``
     for the ``breakLongWords`` parameter.
-    """
 
-    wrapped_lines = []
-    text = text.split('\n')
-    for line in text:
-        pte = dc.GetPartialTextExtents(line)
-        wid = ( width - (2*margin+1)*dc.GetTextExtent(' ')[0]
-              - max([0] + [pte[i]-pte[i-1] for i in range(1,len(pte))]) )
-        idx = 0
-        start = 0
-        startIdx = 0
-        spcIdx = -1
-        while idx < len(pte):
-            # remember the last seen space
-            if line[idx] == ' ':
-                spcIdx = idx
-
-            # have we reached the max width?
-            if pte[idx] - start > wid and (spcIdx != -1 or breakLongWords):
-                if spcIdx != -1:
-                    idx = min(spcIdx + 1, len(pte) - 1)
-                wrapped_lines.append(' '*margin + line[startIdx : idx] + ' '*margin)
-                start = pte[idx]
-                startIdx = idx
-                spcIdx = -1
-
-            idx += 1
-
-        wrapped_lines.append(' '*margin + line[startIdx : idx] + ' '*margin)
+    Text extents are cached, so wrapping the same text again is cheap.  Use
+    a `WordWrapper` to wrap the same text to several widths.
+    """
 
-    return '\n'.join(wrapped_lines)
+    return WordWrapper(text, dc, breakLongWords, margin).Wrap(width)
 
 
 
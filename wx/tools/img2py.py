@@ -74,6 +74,13 @@ Options:
     -f             Generate code compatible with the old function interface.
                    (This option is ON by default in 2.8, use -f to turn off.)
 
+    -r             Embed the raw RGB and alpha pixels, compressed with zlib,
+                   instead of a PNG file.  The data is usually larger but
+                   loading it does not need the PNG decoder, which makes
+                   programs with many embedded images start faster.
+                   Can't be used with -f, the getXData functions of the old
+                   interface return the data of an image file.
+
 You can also import this module from your Python scripts, and use its img2py()
 function. See its docstring for more info.
 """
@@ -84,6 +91,7 @@ import os
 import re
 import sys
 import tempfile
+import zlib
 
 import wx
 from wx.tools import img2img
@@ -101,6 +109,7 @@ DEFAULT_IMGNAME = ""
 DEFAULT_ICON = False
 DEFAULT_CATALOG = False
 DEFAULT_COMPATIBLE = False
+DEFAULT_RAW = False
 
 # THIS IS USED TO IDENTIFY, IN THE GENERATED SCRIPT, LINES IN THE FORM
 # "index.append('Image name')"
@@ -166,6 +175,7 @@ def img2py(image_file, python_file,
            catalog=DEFAULT_CATALOG,
            functionCompatible=DEFAULT_COMPATIBLE,
            functionCompatibile=-1,   # typo version for backward compatibility
+           raw=DEFAULT_RAW,
            ):
     """
     Converts an image file to a data structure written in a Python file
@@ -178,6 +188,10 @@ def img2py(image_file, python_file,
     if functionCompatibile != -1:
         functionCompatible = functionCompatibile
 
+    if raw and functionCompatible:
+        print("The -r and -f options can't be used together")
+        return
+
     global app
     if not wx.GetApp():
         app = wx.App(0)
@@ -192,15 +206,28 @@ def img2py(image_file, python_file,
             print(msg)
             return
 
+        if raw:
+            image = wx.Image(tfname, wx.BITMAP_TYPE_PNG)
+            if image.HasMask():
+                image.InitAlpha()
+            pixels = bytes(image.GetDataBuffer())
+            if image.HasAlpha():
+                pixels += bytes(image.GetAlphaBuffer())
+            data = b64encode(zlib.compress(pixels, 9) if compressed else pixels)
+            args = ", size=(%d, %d), hasAlpha=%s, compressed=%s" % (
+                image.GetWidth(), image.GetHeight(), image.HasAlpha(), bool(compressed))
+        else:
+            with open(tfname, "rb") as fid:
+                data = b64encode(fid.read())
+            args = ""
+
         lines = []
-        with open(tfname, "rb") as fid:
-            data = b64encode(fid.read())
         while data:
             part = data[:72]
             data = data[72:]
             output = '    %s' % part
             if not data:
-                output += ")"
+                output += args + ")"
             lines.append(output)
         data = "\n".join(lines)
     finally:
@@ -270,9 +297,10 @@ def main(args=None):
     icon = DEFAULT_ICON
     catalog = DEFAULT_CATALOG
     compatible = DEFAULT_COMPATIBLE
+    raw = DEFAULT_RAW
 
     try:
-        opts, fileArgs = getopt.getopt(args, "auicfFn:m:")
+        opts, fileArgs = getopt.getopt(args, "auicfFrn:m:")
     except getopt.GetoptError:
         print(__doc__)
         return
@@ -292,6 +320,8 @@ def main(args=None):
             compatible = True
         elif opt == "-F":
             compatible = False
+        elif opt == "-r":
+            raw = True
 
     if len(fileArgs) != 2:
         print(__doc__)
@@ -299,7 +329,7 @@ def main(args=None):
 
     image_file, python_file = fileArgs
     img2py(image_file, python_file,
-           append, compressed, maskClr, imgName, icon, catalog, compatible)
+           append, compressed, maskClr, imgName, icon, catalog, compatible, raw=raw)
 
 
 if __name__ == "__main__":